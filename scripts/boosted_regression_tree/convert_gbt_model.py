@@ -0,0 +1,255 @@
+#! /usr/bin/env python
+import sys
+import os
+import glob
+import numpy
+from argparse import ArgumentParser
+from log_it import *
+from gbt_model import *
+
+
+#######################################################################
+# Created on October 17, 2026, USGS/EROS LSRD Project
+#     Created Python script to convert the gradient boosted trees XML models
+#     (gbt_*_model.xml) to the binary model format (.gbtb), which is
+#     memory-mapped by predict_burned_area and by gbtModel.load rather than
+#     parsed.  Each binary model is checked against its XML model before it
+#     is kept.
+#
+# Usage: convert_gbt_model.py --help prints the help message
+#######################################################################
+
+# number of samples predicted by both models to check the binary model
+CHECK_SAMPLES = 20000
+
+# seed of the samples predicted to check the binary model
+CHECK_SEED = 2026
+
+class GBTModelConverter():
+    """Class for converting the XML models to the binary model format.
+    """
+
+    def __init__(self):
+        pass
+
+
+    def checkSamples (self, model, nsamples=CHECK_SAMPLES, seed=CHECK_SEED):
+        """Generates the samples used to check a converted model.
+        Description: routine to generate samples whose values are at, just
+            below, and just above the split values of the model, so both
+            sides of the splits of the trees are taken.  The values of the
+            columns which are never split on are random.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args:
+          model - gbtModel to generate the samples for
+          nsamples - number of samples to generate
+          seed - seed of the random values
+
+        Returns:
+          samples - 2D float32 array of the samples
+        """
+
+        random = numpy.random.RandomState (seed)
+        samples = random.uniform (-10000, 10000, (nsamples,
+            model.sample_size)).astype (numpy.float32)
+        splits = model.left <> numpy.arange (len (model.left))
+        for col in range (0, model.sample_size):
+            thresholds = model.threshold[splits & (model.feature == col)]
+            if len (thresholds) == 0:
+                continue
+            values = random.choice (thresholds, nsamples)
+            steps = random.randint (-1, 2, nsamples).astype (numpy.float32)
+            samples[:,col] = values + steps * numpy.maximum (  \
+                numpy.float32(0.5), numpy.abs (values) * numpy.float32(1e-6))
+        return samples
+
+
+    def compareModels (self, xml_model, bin_model, log_handler=None):
+        """Checks that the binary model is equivalent to the XML model.
+        Description: routine to compare the parameters and the arrays of the
+            trees of the two models, then compare the probabilities they
+            predict for each class for the check samples.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args:
+          xml_model - gbtModel read from the XML model
+          bin_model - gbtModel mapped from the binary model
+          log_handler - log file handler; if None then print to stdout
+
+        Returns:
+            ERROR - the models are not equivalent
+            SUCCESS - the models are equivalent
+        """
+
+        for name in ['class_count', 'sample_size', 'max_depth', 'base_value',
+            'shrinkage']:
+            if getattr (xml_model, name) != getattr (bin_model, name):
+                msg = 'Error: %s of the binary model (%s) does not match '  \
+                    'the XML model (%s)' % (name,
+                    str (getattr (bin_model, name)),
+                    str (getattr (xml_model, name)))
+                logIt (msg, log_handler)
+                return ERROR
+
+        for name in ['roots', 'tree_class', 'feature', 'threshold', 'left',
+            'right', 'inversed', 'value', 'weighted']:
+            if not numpy.array_equal (getattr (xml_model, name),
+                getattr (bin_model, name)):
+                msg = 'Error: the %s array of the binary model does not '  \
+                    'match the XML model' % name
+                logIt (msg, log_handler)
+                return ERROR
+
+        samples = self.checkSamples (xml_model)
+        for k in range (0, max (xml_model.class_count, 1)):
+            xml_probs = xml_model.predictProb (samples, k)
+            bin_probs = bin_model.predictProb (samples, k)
+            if not numpy.array_equal (xml_probs.view (numpy.int32),
+                bin_probs.view (numpy.int32)):
+                msg = 'Error: the probabilities of class %d predicted by '  \
+                    'the binary model do not match the XML model' % k
+                logIt (msg, log_handler)
+                return ERROR
+
+        msg = 'Checked the binary model against the XML model with %d '  \
+            'samples' % len (samples)
+        logIt (msg, log_handler)
+        return SUCCESS
+
+
+    def convertModel (self, xml_file, bin_file=None, log_handler=None):
+        """Converts an XML model to the binary model format.
+        Description: routine to read the XML model, write its binary model,
+            map the binary model, and check it against the XML model.  The
+            binary model is removed if it doesn't match.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args:
+          xml_file - name of the XML model file
+          bin_file - name of the binary model file; if None then it is the
+              XML model file with the .gbtb extension, which is where the
+              model loaders look for it
+          log_handler - log file handler; if None then print to stdout
+
+        Returns:
+            ERROR - error converting the model
+            SUCCESS - successful processing
+        """
+
+        if bin_file is None:
+            bin_file = binaryModelFile (xml_file)
+
+        xml_model = gbtModel()
+        if xml_model.readXML (xml_file, log_handler) != SUCCESS:
+            return ERROR
+        if xml_model.writeBinary (bin_file, log_handler) != SUCCESS:
+            return ERROR
+
+        bin_model = gbtModel()
+        status = bin_model.readBinary (bin_file, log_handler)
+        if status == SUCCESS:
+            status = self.compareModels (xml_model, bin_model, log_handler)
+        bin_model = None
+        if status != SUCCESS:
+            os.remove (bin_file)
+            msg = 'Error converting %s; removed %s' % (xml_file, bin_file)
+            logIt (msg, log_handler)
+            return ERROR
+
+        msg = 'Converted %s to %s' % (xml_file, bin_file)
+        logIt (msg, log_handler)
+        return SUCCESS
+
+
+    def runConversion (self, xml_file=None, bin_file=None, model_dir=None,
+        logfile=None):
+        """Runs the conversion of the XML models to binary models.
+        Description: runConversion converts the specified XML model, or all
+        the gbt_*_model.xml models in the model directory.  If neither is
+        specified then the command-line parameters will be parsed for this
+        information.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args:
+          xml_file - name of the XML model file to convert
+          bin_file - name of the binary model file for xml_file; if None then
+              it is the XML model file with the .gbtb extension
+          model_dir - directory of the XML models to convert, if xml_file is
+              None
+          logfile - name of the logfile for logging information; if None then
+              the output will be written to stdout
+
+        Returns:
+            ERROR - error converting the models
+            SUCCESS - successful processing
+        """
+
+        # if no parameters were passed then get the info from the command line
+        if xml_file is None and model_dir is None:
+            parser = ArgumentParser(  \
+                description='Convert the gradient boosted trees XML models '  \
+                    'to binary models')
+            parser.add_argument ('-x', '--xml_file', type=str,
+                dest='xml_file',
+                help='name of the XML model to convert', metavar='FILE')
+            parser.add_argument ('-o', '--bin_file', type=str,
+                dest='bin_file',
+                help='name of the binary model (default is the XML model '  \
+                    'with the %s extension)' % GBT_BINARY_SUFFIX,
+                metavar='FILE')
+            parser.add_argument ('-d', '--model_dir', type=str,
+                dest='model_dir',
+                help='directory of the gbt_*_model.xml models to convert, '  \
+                    'if the XML model is not specified')
+            parser.add_argument ('-l', '--logfile', type=str,
+                dest='logfile',
+                help='name of optional log file', metavar='FILE')
+
+            options = parser.parse_args()
+            xml_file = options.xml_file
+            bin_file = options.bin_file
+            model_dir = options.model_dir
+            logfile = options.logfile
+            if xml_file is None and model_dir is None:
+                parser.error ('missing XML model or model directory '  \
+                    'command-line argument');
+                return ERROR
+
+        # open the log file if it exists; use line buffering for the output
+        log_handler = None
+        if logfile is not None:
+            log_handler = open (logfile, 'w', buffering=1)
+
+        if xml_file is not None:
+            xml_list = [xml_file]
+        else:
+            xml_list = sorted (glob.glob (os.path.join (model_dir,
+                'gbt_*_model.xml')))
+            bin_file = None
+            if len (xml_list) == 0:
+                msg = 'Error: no gbt_*_model.xml models in ' + model_dir
+                logIt (msg, log_handler)
+                return ERROR
+
+        status = SUCCESS
+        for xml_file in xml_list:
+            if self.convertModel (xml_file, bin_file, log_handler) != SUCCESS:
+                status = ERROR
+
+        if logfile is not None:
+            log_handler.close()
+        return status
+
+######end of GBTModelConverter class######
+
+if __name__ == "__main__":
+    sys.exit (GBTModelConverter().runConversion())
@@ -13,6 +13,13 @@ from log_it import *
 #     Created Python script to run the boosted regression tree algorithm.
 # 
 # History:
+# Updated on 10/17/2026, USGS/EROS LSRD Project
+#     Added the BoostedRegressionServer class, which runs the boosted
+#     regression for a series of scenes through one predict_burned_area
+#     process, so each model is only loaded once.
+# Updated on 10/17/2026, USGS/EROS LSRD Project
+#     Added the num_threads option, which is the number of threads used by
+#     predict_burned_area to run the predictions.
 # 
 # Usage: do_boosted_regression.py --help prints the help message
 #######################################################################
@@ -25,7 +32,7 @@ class BoostedRegression():
 
 
     def runBoostedRegression (self, config_file=None, logfile=None, \
-        usebin=None):
+        usebin=None, num_threads=None):
         """Runs the boosted regression algorithm for the specified file.
         Description: runBoostedRegression will use the parameter passed for
         the input configuration file.  If input config file is None (i.e. not
@@ -42,6 +49,8 @@ class BoostedRegression():
           Updated on Dec. 2, 2013 by Gail Schmidt, USGS/EROS LSRD Project
               Modified to use argparser vs. optionparser, since optionparser
               is deprecated.
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Added the num_threads option.
         Args:
           config_file - name of the input configuration file to be processed
           logfile - name of the logfile for logging information; if None then
@@ -49,6 +58,8 @@ class BoostedRegression():
           usebin - this specifies if the boosted regression tree exe resides
               in the $BIN directory; if None then the boosted regression exe
               is expected to be in the PATH
+          num_threads - number of threads used to run the predictions; if
+              None then predict_burned_area uses its default (1)
         
         Returns:
             ERROR - error running the boosted regression tree application
@@ -73,6 +84,10 @@ class BoostedRegression():
                 action='store_true',
                 help='use BIN environment variable as the location of ' \
                      'boosted regression tree application')
+            parser.add_argument ('-t', '--num_threads', type=int,
+                dest='num_threads',
+                help='number of threads used to run the predictions '  \
+                    '(default = 1)')
             parser.add_argument ('-l', '--logfile', type=str,
                 dest='logfile',
                 help='name of optional log file', metavar='FILE')
@@ -82,6 +97,7 @@ class BoostedRegression():
             # validate the command-line options
             usebin = options.usebin          # should $BIN directory be used
             logfile = options.logfile        # name of the log file
+            num_threads = options.num_threads  # number of prediction threads
 
             # surface reflectance file
             config_file = options.config_file
@@ -140,6 +156,8 @@ class BoostedRegression():
         # if any errors occur.
         cmdstr = "%spredict_burned_area --config_file %s --verbose" %  \
             (bin_dir, config_file)
+        if num_threads is not None:
+            cmdstr += " --num_threads %d" % num_threads
         cmdlist = cmdstr.split(' ')
         try:
             output = subprocess.check_output (cmdlist, stderr=None)
@@ -161,5 +179,165 @@ class BoostedRegression():
 
 ######end of BoostedRegression class######
 
+
+# prefix of the status line written by predict_burned_area --server for each
+# scene
+SERVER_STATUS = 'PBA_SERVER_STATUS'
+
+class BoostedRegressionServer():
+    """Class for running the boosted regression tree for a series of scenes
+       through one predict_burned_area process.
+    """
+
+    def __init__(self):
+        self.process = None
+        self.log_handler = None
+
+
+    def startServer (self, log_handler=None, usebin=None, num_threads=None):
+        """Starts the boosted regression tree application in server mode.
+        Description: startServer starts predict_burned_area --server, which
+        reads the configuration file of each scene from its stdin.  The models
+        are loaded by the application the first time they are used and kept
+        for the scenes that follow, rather than being loaded for every scene.
+        
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Added the num_threads option.
+        
+        Args:
+          log_handler - log file handler; if None then the output will be
+              written to stdout
+          usebin - this specifies if the boosted regression tree exe resides
+              in the $BIN directory; if None then the boosted regression exe
+              is expected to be in the PATH
+          num_threads - number of threads used to run the predictions; if
+              None then predict_burned_area uses its default (1)
+        
+        Returns:
+            ERROR - error starting the boosted regression tree application
+            SUCCESS - successful processing
+        """
+
+        self.log_handler = log_handler
+        if usebin:
+            bin_dir = os.environ.get('BIN') + '/'
+        else:
+            bin_dir = ""
+
+        cmdstr = "%spredict_burned_area --server --verbose" % bin_dir
+        if num_threads is not None:
+            cmdstr += " --num_threads %d" % num_threads
+        try:
+            self.process = subprocess.Popen (cmdstr.split(' '),
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        except OSError, e:
+            msg = 'Error starting the boosted regression server: ' + str(e)
+            logIt (msg, self.log_handler)
+            self.process = None
+            return ERROR
+
+        return SUCCESS
+
+
+    def runScene (self, config_file):
+        """Runs the boosted regression for the specified configuration
+           file through the server.
+        Description: runScene passes the configuration file to the server
+        and logs the output of the application until the status of the scene
+        is returned.
+        
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+        
+        Args:
+          config_file - name of the input configuration file to be processed
+        
+        Returns:
+            ERROR - error running the boosted regression tree application
+            SUCCESS - successful processing
+        
+        Notes:
+          1. The application processes the scene from the directory of the
+             configuration file, as done by runBoostedRegression.
+        """
+
+        if self.process is None:
+            msg = 'Error: the boosted regression server is not running'
+            logIt (msg, self.log_handler)
+            return ERROR
+
+        # make sure the configuration file exists
+        if not os.path.isfile(config_file):
+            msg = 'Error: configuration file does not exist or is not ' \
+                'accessible: %s' % config_file
+            logIt (msg, self.log_handler)
+            return ERROR
+
+        config_file = os.path.abspath (config_file)
+        try:
+            self.process.stdin.write (config_file + '\n')
+            self.process.stdin.flush ()
+        except IOError, e:
+            msg = 'Error passing %s to the boosted regression server: %s' %  \
+                (config_file, str(e))
+            logIt (msg, self.log_handler)
+            return ERROR
+
+        # log the output until the status line for this scene
+        output = []
+        while True:
+            line = self.process.stdout.readline()
+            if line == '':
+                msg = 'Error: the boosted regression server exited while '  \
+                    'processing ' + config_file
+                logIt (''.join(output) + msg, self.log_handler)
+                return ERROR
+            if line.startswith (SERVER_STATUS):
+                break
+            output.append (line)
+        if len(output) > 0:
+            logIt (''.join(output).rstrip('\n'), self.log_handler)
+
+        status = line.split(' ')[1]
+        if status != 'SUCCESS':
+            msg = 'Error running boosted regression for ' + config_file
+            logIt (msg, self.log_handler)
+            return ERROR
+
+        msg = 'Completion of boosted regression.'
+        logIt (msg, self.log_handler)
+        return SUCCESS
+
+
+    def stopServer (self):
+        """Stops the server, after the scenes passed to it are done.
+        
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+        
+        Returns:
+            ERROR - the application didn't exit successfully
+            SUCCESS - successful processing
+        """
+
+        if self.process is None:
+            return SUCCESS
+
+        self.process.stdin.close ()
+        self.process.stdout.read ()
+        status = self.process.wait ()
+        self.process = None
+        if status != 0:
+            msg = 'Error: the boosted regression server exited with '  \
+                'status %d' % status
+            logIt (msg, self.log_handler)
+            return ERROR
+
+        return SUCCESS
+
+######end of BoostedRegressionServer class######
+
 if __name__ == "__main__":
     sys.exit (BoostedRegression().runBoostedRegression())
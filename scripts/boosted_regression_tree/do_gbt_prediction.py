@@ -0,0 +1,492 @@
+#! /usr/bin/env python
+import sys
+import os
+import shutil
+import numpy
+from argparse import ArgumentParser
+from osgeo import gdal
+from log_it import *
+from gbt_model import *
+from feature_cube import openFeatureCube, FEATURE_CUBE_NBANDS
+
+# seasons, bands/indices of the seasonal summaries, and indices of the annual
+# maximums, in the order they are stacked in the samples
+SEASONS = ['winter', 'spring', 'summer', 'fall']
+SUMMARY_BANDS = ['band3', 'band4', 'band5', 'band7', 'ndvi', 'ndmi', 'nbr',
+    'nbr2']
+MAX_INDICES = ['ndvi', 'ndmi', 'nbr', 'nbr2']
+
+# reflectance bands of the input surface reflectance product
+REFL_BANDS = ['sr_band1', 'sr_band2', 'sr_band3', 'sr_band4', 'sr_band5',
+    'sr_band7']
+
+# columns of the reflectance bands and indices in the samples
+B3 = 2
+B4 = 3
+B5 = 4
+B7 = 5
+NDVI = 6
+
+# number of values in each sample, which is the number of inputs used for
+# training plus the response
+NUM_SAMPLE_VALUES = 51
+
+# output values for cloud/shadow/snow/water and fill pixels
+PBA_CLOUD_WATER = -9998
+PBA_FILL = -9999
+
+# default number of lines of the grid processed at a time
+GBT_BLOCK_LINES = 64
+
+
+#############################################################################
+# Created on October 17, 2026, USGS/EROS LSRD Project
+# Created Python script to run the boosted regression tree predictions for a
+#     scene with the numpy gradient boosted trees engine (gbt_model), rather
+#     than the predict_burned_area application.  It reads the same
+#     configuration file, stacks the same samples, and writes the same burn
+#     probabilities, a block of lines at a time.
+#
+# History:
+# Updated on 10/17/2026, USGS/EROS LSRD Project
+#     Modified to read the seasonal summaries and annual maximums from the
+#     feature cube of the previous year, if there is one.
+# Updated on 10/17/2026, USGS/EROS LSRD Project
+#     Modified to only stack and predict the valid pixels of each block.
+#
+# Usage: do_gbt_prediction.py --help prints the help message
+############################################################################
+class GBTPrediction():
+    """Class for running the boosted regression tree predictions in numpy.
+    """
+
+    def __init__(self):
+        pass
+
+
+    def readConfig (self, config_file, log_handler=None):
+        """Reads the boosted regression configuration file.
+        Description: routine to read the PARAMETER=value lines of the
+            configuration file written by BoostedRegressionConfig.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args:
+          config_file - name of the configuration file
+          log_handler - log file handler; if None then print to stdout
+
+        Returns:
+          config - dictionary of the parameters; None if there was an error
+        """
+
+        config = {}
+        try:
+            config_handler = open (config_file, 'r')
+            for line in config_handler:
+                line = line.strip()
+                if line == '' or line.startswith('#') or '=' not in line:
+                    continue
+                (name, value) = line.split('=', 1)
+                config[name.strip()] = value.strip()
+            config_handler.close()
+        except IOError, e:
+            msg = 'Error reading the configuration file %s: %s' %  \
+                (config_file, str(e))
+            logIt (msg, log_handler)
+            return None
+
+        for name in ['INPUT_BASE_FILE', 'INPUT_MASK_FILE', 'INPUT_FILL_VALUE',
+            'SEASONAL_SUMMARIES_DIR', 'OUTPUT_IMG_FILE', 'LOAD_MODEL_XML']:
+            if name not in config:
+                msg = 'Error: %s is a required parameter in the '  \
+                    'configuration file %s' % (name, config_file)
+                logIt (msg, log_handler)
+                return None
+
+        return config
+
+
+    def readGridBlock (self, dataset, y, nlines, ncol, line_offset,
+        samp_offset, fill):
+        """Reads a block of lines of the grid from an input scene.
+        Description: routine to read the lines of the seasonal summaries
+            grid from the input scene, placing the scene at its line/sample
+            offsets and filling the rest of the grid, as done by
+            PredictBurnedArea::GetInputData.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args:
+          dataset - GDAL dataset of the input band
+          y - first line of the grid to read
+          nlines - number of lines to read
+          ncol - number of samples in the grid
+          line_offset - line in the grid of the first line of the scene
+          samp_offset - sample in the grid of the first sample of the scene
+          fill - fill value
+
+        Returns:
+          data - 2D int16 array of the block of the grid
+        """
+
+        data = numpy.empty ((nlines, ncol), dtype=numpy.int16)
+        data.fill (fill)
+        in_y0 = max (y - line_offset, 0)
+        in_y1 = min (y + nlines - line_offset, dataset.RasterYSize)
+        in_x0 = max (-samp_offset, 0)
+        in_x1 = min (ncol - samp_offset, dataset.RasterXSize)
+        if in_y1 > in_y0 and in_x1 > in_x0:
+            data[in_y0+line_offset-y:in_y1+line_offset-y,
+                in_x0+samp_offset:in_x1+samp_offset] =  \
+                dataset.GetRasterBand(1).ReadAsArray (in_x0, in_y0,
+                in_x1 - in_x0, in_y1 - in_y0)
+        return data
+
+
+    def stackSamples (self, refl, qa, qa_indices, summaries, maxes, fill):
+        """Stacks the samples of a block of pixels.
+        Description: routine to compute the spectral indices and the deltas
+            of the annual maximums, and stack them with the reflectance
+            bands, the previous year seasonal summaries, and the annual
+            maximums in the order used for training, in single precision as
+            done by PredictBurnedArea::calcBands and predictModel.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args:
+          refl - 2D array of the 6 reflectance bands of each pixel
+          qa - array of the QA value of each pixel
+          qa_indices - array of the QA value used to flag the fill pixels
+              for the spectral indices
+          summaries - 2D array of the 32 seasonal summaries of each pixel,
+              grouped by season
+          maxes - 2D array of the 4 annual maximums of each pixel
+          fill - fill value
+
+        Returns:
+          samples - 2D float32 array of the samples
+
+        Notes:
+          1. predict_burned_area computes the indices of a line before it
+             reads the QA of that line, so the indices are flagged as fill
+             using the QA of the line before.  qa_indices is expected to hold
+             those values, so the samples match.
+        """
+
+        npix = qa.shape[0]
+        samples = numpy.zeros ((npix, NUM_SAMPLE_VALUES), dtype=numpy.float32)
+        samples[:,0:6] = refl
+        index_fill = qa_indices == fill
+
+        # NDVI (bands 4 and 3), NDMI (bands 4 and 5), NBR (bands 4 and 7),
+        # and NBR2 (bands 5 and 7), scaled by 1000
+        for (i, (band1, band2)) in enumerate ([(B4, B3), (B4, B5), (B4, B7),
+            (B5, B7)]):
+            total = samples[:,band1] + samples[:,band2]
+            zero = index_fill | (total == 0)
+            total[zero] = 1
+            index = ((samples[:,band1] - samples[:,band2]) / total) *  \
+                numpy.float32(1000)
+            index[zero] = 0
+            samples[:,NDVI+i] = index
+
+        samples[:,10:42] = summaries
+        samples[:,42:46] = maxes
+        samples[:,46:50] = samples[:,NDVI:NDVI+4] - samples[:,42:46]
+        samples[qa == fill,46:50] = fill
+        return samples
+
+
+    def predictScene (self, model, input_base_file, input_mask_file,
+        fill_value, seasonal_sum_dir, output_file, line_offset=None,
+        samp_offset=None, block_lines=GBT_BLOCK_LINES, log_handler=None):
+        """Runs the predictions for a scene.
+        Description: routine to read the input scene, its mask, and the
+            previous year seasonal summaries and annual maximums a block of
+            lines at a time, run the model predictions, and write the burn
+            probabilities.  The output matches that of predict_burned_area.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Modified to read the feature cube of the previous year, if
+              there is one, rather than the seasonal summaries and annual
+              maximums.
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Modified to gather the valid pixels of each block, so only
+              they are stacked and predicted.
+
+        Args:
+          model - gbtModel to run the predictions with
+          input_base_file - base name of the input surface reflectance file
+          input_mask_file - name of the mask file of the input scene
+          fill_value - fill value of the input scene
+          seasonal_sum_dir - directory of the seasonal summaries
+          output_file - name of the output burn probability file (.img)
+          line_offset - line in the seasonal summaries grid of the first line
+              of the input scene; if None (and samp_offset is None) then the
+              scene is expected to be resampled to the grid
+          samp_offset - sample in the seasonal summaries grid of the first
+              sample of the input scene
+          block_lines - number of lines of the grid processed at a time
+          log_handler - log file handler; if None then print to stdout
+
+        Returns:
+            ERROR - error running the predictions
+            SUCCESS - successful processing
+        """
+
+        virtual_input = (line_offset is not None) or  \
+            (samp_offset is not None)
+        if line_offset is None:
+            line_offset = 0
+        if samp_offset is None:
+            samp_offset = 0
+
+        # the acquisition year is 9 characters into the scene name
+        # (ex. LT50350321989265XXX03)
+        acq_year = int (os.path.basename (input_base_file)[9:13])
+
+        # open the input scene and mask
+        refl_datasets = []
+        for band in REFL_BANDS:
+            fname = '%s_%s.img' % (input_base_file, band)
+            dataset = gdal.Open (fname)
+            if dataset is None:
+                msg = 'Error opening input reflectance file: ' + fname
+                logIt (msg, log_handler)
+                return ERROR
+            refl_datasets.append (dataset)
+        mask_dataset = gdal.Open (input_mask_file)
+        if mask_dataset is None:
+            msg = 'Error opening input mask file: ' + input_mask_file
+            logIt (msg, log_handler)
+            return ERROR
+
+        # open the previous year seasonal summaries and annual maximums, or
+        # map the feature cube which holds them all if there is one
+        summary_files = []
+        for season in SEASONS:
+            for band in SUMMARY_BANDS:
+                if band.startswith ('band'):
+                    fname = '%s/refl/%d_%s_%s.img' % (seasonal_sum_dir,
+                        acq_year-1, season, band)
+                else:
+                    fname = '%s/%s/%d_%s_%s.img' % (seasonal_sum_dir, band,
+                        acq_year-1, season, band)
+                summary_files.append (fname)
+        max_files = []
+        for indx in MAX_INDICES:
+            max_files.append ('%s/%s/%d_maximum_%s.img' % (seasonal_sum_dir,
+                indx, acq_year-1, indx))
+
+        cube = openFeatureCube (seasonal_sum_dir, acq_year-1, log_handler)
+        summary_datasets = []
+        max_datasets = []
+        if cube is None:
+            for fname in summary_files + max_files:
+                dataset = gdal.Open (fname)
+                if dataset is None:
+                    msg = 'Error opening file: ' + fname
+                    logIt (msg, log_handler)
+                    return ERROR
+                if fname in max_files:
+                    max_datasets.append (dataset)
+                else:
+                    summary_datasets.append (dataset)
+
+        # the output grid is the seasonal summaries grid for an input scene
+        # which has not been resampled, otherwise the input scene; the output
+        # header is copied from the file which defines the grid
+        if virtual_input:
+            if cube is None:
+                nrow = summary_datasets[0].RasterYSize
+                ncol = summary_datasets[0].RasterXSize
+            else:
+                (nrow, ncol) = cube.shape[0:2]
+            input_hdr = os.path.splitext (summary_files[0])[0] + '.hdr'
+        else:
+            nrow = refl_datasets[0].RasterYSize
+            ncol = refl_datasets[0].RasterXSize
+            input_hdr = input_base_file + '_sr_band1.hdr'
+
+        output_hdr = os.path.splitext (output_file)[0] + '.hdr'
+        try:
+            shutil.copyfile (input_hdr, output_hdr)
+            output_handler = open (output_file, 'wb')
+        except IOError, e:
+            msg = 'Error creating the output file %s: %s' %  \
+                (output_file, str(e))
+            logIt (msg, log_handler)
+            return ERROR
+
+        # the QA of the line before the first line is not fill
+        qa_before = numpy.zeros (ncol, dtype=numpy.int16)
+        for y in range (0, nrow, block_lines):
+            nlines = min (block_lines, nrow - y)
+            npix = nlines * ncol
+
+            refl = numpy.empty ((npix, len (REFL_BANDS)), dtype=numpy.int16)
+            for (i, dataset) in enumerate (refl_datasets):
+                refl[:,i] = self.readGridBlock (dataset, y, nlines, ncol,
+                    line_offset, samp_offset, fill_value).ravel()
+            qa = self.readGridBlock (mask_dataset, y, nlines, ncol,
+                line_offset, samp_offset, fill_value)
+            qa_indices = numpy.concatenate ((qa_before, qa[:-1].ravel()))
+            qa_before = qa[-1].copy()
+            qa = qa.ravel()
+
+            # the summaries and maximums of each pixel are contiguous in the
+            # feature cube
+            if cube is not None:
+                features = cube[y:y+nlines].reshape (npix,
+                    FEATURE_CUBE_NBANDS)
+                summaries = features[:,0:len (summary_files)]
+                maxes = features[:,len (summary_files):]
+            else:
+                summaries = numpy.empty ((npix, len (summary_files)),
+                    dtype=numpy.int16)
+                for (i, dataset) in enumerate (summary_datasets):
+                    summaries[:,i] = dataset.GetRasterBand(1).ReadAsArray (0,
+                        y, ncol, nlines).ravel()
+                maxes = numpy.empty ((npix, len (max_files)),
+                    dtype=numpy.int16)
+                for (i, dataset) in enumerate (max_datasets):
+                    maxes[:,i] = dataset.GetRasterBand(1).ReadAsArray (0, y,
+                        ncol, nlines).ravel()
+
+            # flag the fill and the cloudy, snow, or water pixels, then
+            # gather the valid pixels and only run the predictions for them
+            output = numpy.zeros (npix, dtype=numpy.int16)
+            output[qa < 0] = PBA_CLOUD_WATER
+            output[qa == fill_value] = PBA_FILL
+            valid = numpy.flatnonzero ((qa >= 0) & (qa != fill_value))
+            if len (valid) > 0:
+                samples = self.stackSamples (refl[valid], qa[valid],
+                    qa_indices[valid], summaries[valid], maxes[valid],
+                    fill_value)
+                probs = model.predictProb (samples, 1)
+                output[valid] = (probs.astype (numpy.float64) * 100.0 +  \
+                    0.5).astype (numpy.int16)
+            output.tofile (output_handler)
+
+        output_handler.close()
+        return SUCCESS
+
+
+    def runGBTPrediction (self, config_file=None, model=None, logfile=None,
+        block_lines=GBT_BLOCK_LINES, log_handler=None):
+        """Runs the boosted regression tree predictions for a scene.
+        Description: runGBTPrediction reads the boosted regression
+            configuration file, loads the model (unless it is passed in), and
+            runs the predictions for the scene in numpy.  If the
+            configuration file is None then the command-line parameters will
+            be parsed for this information.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Modified to map the binary model converted from the XML model,
+              if there is one.
+
+        Args:
+          config_file - name of the input configuration file to be processed
+          model - gbtModel already loaded from the LOAD_MODEL_XML of the
+              configuration file; if None then the model is loaded
+          logfile - name of the logfile for logging information; if None then
+              the output will be written to log_handler
+          block_lines - number of lines of the grid processed at a time
+          log_handler - log file handler to use if logfile is None; if None
+              then the output will be written to stdout
+
+        Returns:
+            ERROR - error running the predictions
+            SUCCESS - successful processing
+
+        Notes:
+          1. As in runBoostedRegression, the scene is processed from the
+             directory of the configuration file.
+        """
+
+        # if no parameters were passed then get the info from the command line
+        if config_file is None:
+            parser = ArgumentParser(  \
+                description='Run the boosted regression tree predictions '  \
+                    'for the scene in numpy')
+            parser.add_argument ('-c', '--config_file', type=str,
+                dest='config_file',
+                help='name of configuration file', metavar='FILE')
+            parser.add_argument ('-b', '--block_lines', type=int,
+                dest='block_lines',
+                help='number of lines processed at a time (default = %d)' %  \
+                    GBT_BLOCK_LINES)
+            parser.add_argument ('-l', '--logfile', type=str,
+                dest='logfile',
+                help='name of optional log file', metavar='FILE')
+
+            options = parser.parse_args()
+            logfile = options.logfile
+            if options.block_lines is not None:
+                block_lines = options.block_lines
+            config_file = options.config_file
+            if config_file is None:
+                parser.error ('missing configuration file command-line ' \
+                    'argument');
+                return ERROR
+
+        # open the log file if it exists; use line buffering for the output
+        if logfile is not None:
+            log_handler = open (logfile, 'w', buffering=1)
+
+        if block_lines < 1:
+            msg = 'Error: block_lines must be at least 1: %d' % block_lines
+            logIt (msg, log_handler)
+            return ERROR
+
+        config = self.readConfig (config_file, log_handler)
+        if config is None:
+            return ERROR
+
+        # process the scene from the directory of the configuration file
+        mydir = os.getcwd()
+        os.chdir (os.path.dirname (os.path.abspath (config_file)))
+
+        if model is None:
+            model = gbtModel()
+            if model.load (config['LOAD_MODEL_XML'], log_handler) <>  \
+                SUCCESS:
+                os.chdir (mydir)
+                return ERROR
+
+        line_offset = None
+        samp_offset = None
+        if 'INPUT_LINE_OFFSET' in config:
+            line_offset = int (config['INPUT_LINE_OFFSET'])
+        if 'INPUT_SAMP_OFFSET' in config:
+            samp_offset = int (config['INPUT_SAMP_OFFSET'])
+
+        msg = 'Running the numpy predictions for ' + config['INPUT_BASE_FILE']
+        logIt (msg, log_handler)
+        status = self.predictScene (model, config['INPUT_BASE_FILE'],
+            config['INPUT_MASK_FILE'], int (config['INPUT_FILL_VALUE']),
+            config['SEASONAL_SUMMARIES_DIR'], config['OUTPUT_IMG_FILE'],
+            line_offset, samp_offset, block_lines, log_handler)
+        os.chdir (mydir)
+        if status <> SUCCESS:
+            msg = 'Error running the numpy predictions for ' + config_file
+            logIt (msg, log_handler)
+            return ERROR
+
+        msg = 'Completion of the numpy predictions.'
+        logIt (msg, log_handler)
+        if logfile is not None:
+            log_handler.close()
+        return SUCCESS
+
+######end of GBTPrediction class######
+
+if __name__ == "__main__":
+    sys.exit (GBTPrediction().runGBTPrediction())
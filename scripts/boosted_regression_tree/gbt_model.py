@@ -0,0 +1,512 @@
+#! /usr/bin/env python
+#############################################################################
+# Created on October 17, 2026, USGS/EROS LSRD Project
+# Created module to hold the gradient boosted trees model saved by the
+# boosted regression tree application (CvGBTrees::save) and to run its
+# predictions in numpy.  The trees are flattened into arrays of nodes, and
+# a block of samples is pushed down all the trees at once, one level of the
+# trees at a time.  The sums and the probabilities are computed in single
+# precision in the same order as CvGBTrees::predict_prob, so the
+# probabilities match those of predict_burned_area.
+#
+# History:
+# Updated on 10/17/2026, USGS/EROS LSRD Project
+#     Added the binary model format (.gbtb), which holds the flattened
+#     trees as contiguous arrays and is memory-mapped rather than parsed.
+#############################################################################
+
+import os
+import struct
+import numpy
+import xml.etree.ElementTree as ElementTree
+from log_it import *
+
+# type_id of the gradient boosted trees model in the OpenCV XML file
+GBT_TYPE_ID = 'opencv-ml-gradient-boosting-trees'
+
+# largest number of samples pushed down the trees at once, which bounds the
+# (trees x samples) arrays of the nodes
+GBT_BATCH_SAMPLES = 4096
+
+# binary model format; gbt_binary.h in predict_burned_area must match.  The
+# header is the magic string, the version, class_count, sample_size,
+# max_depth, the number of trees and nodes, base_value, and shrinkage,
+# padded to GBT_BINARY_HEADER_SIZE bytes.  It is followed by the little
+# endian arrays of the trees (roots, tree_class) and of the nodes (feature,
+# threshold, left, right, inversed, value), each 4 bytes per element.
+GBT_BINARY_SUFFIX = '.gbtb'
+GBT_BINARY_MAGIC = 'PBA-GBTB'
+GBT_BINARY_VERSION = 1
+GBT_BINARY_HEADER = '<8s6i2f'
+GBT_BINARY_HEADER_SIZE = 64
+GBT_MAX_CLASSES = 16
+GBT_BINARY_TREE_ARRAYS = [('roots', '<i4'), ('tree_class', '<i4')]
+GBT_BINARY_NODE_ARRAYS = [('feature', '<i4'), ('threshold', '<f4'),
+    ('left', '<i4'), ('right', '<i4'), ('inversed', '<i4'), ('value', '<f4')]
+
+
+def binaryModelFile (xml_file):
+    """Returns the name of the binary model converted from an XML model.
+    """
+
+    return os.path.splitext (xml_file)[0] + GBT_BINARY_SUFFIX
+
+
+def xmlChild (elem, tag):
+    """Returns the child element with the specified tag, or None.
+    """
+
+    return elem.find (tag)
+
+
+def xmlNumbers (elem, dtype):
+    """Returns the whitespace separated numbers of an element as an array.
+    """
+
+    return numpy.array (elem.text.split(), dtype=dtype)
+
+
+def xmlMatrix (elem, dtype):
+    """Returns the data of an opencv-matrix element as a flat array.
+    """
+
+    return xmlNumbers (xmlChild (elem, 'data'), dtype)
+
+
+class gbtModel():
+    """Class for the gradient boosted trees model.
+    """
+
+    def __init__(self):
+        self.class_count = 0       # number of ensembles (classes)
+        self.base_value = numpy.float32(0)
+        self.shrinkage = numpy.float32(1)
+        self.max_depth = 0         # depth of the deepest tree
+        self.var_count = 0         # number of variables used by the model
+        self.sample_size = 0       # number of values needed in each sample
+        self.roots = None          # root node of each tree
+        self.tree_class = None     # ensemble (class) of each tree
+        self.feature = None        # sample column of the split of each node
+        self.threshold = None      # split value of each node
+        self.inversed = None       # True if the node goes left when > value
+        self.left = None           # left child of each node, or itself
+        self.right = None          # right child of each node, or itself
+        self.value = None          # value of each node
+        self.weighted = None       # shrinkage * value of each node
+
+
+    def readTreeNodes (self, nodes_elem, best_tree_idx, var_type, var_idx,
+        nodes):
+        """Reads the nodes of one tree.
+        Description: routine to read the nodes of a tree, as written by
+            CvDTree::write_tree_nodes in depth-first order, and add them to
+            the lists of nodes.  The children of each node are found the
+            same way as CvDTree::read_tree_nodes.  A node only splits if it
+            has splits and its Tn is greater than the best tree index, as in
+            CvDTree::predict; the other nodes are terminal, and their
+            children are themselves so they can be pushed down any number of
+            levels.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args:
+          nodes_elem - nodes element of the tree
+          best_tree_idx - pruned tree index of the tree
+          var_type - array of the type of each variable; 1 if categorical
+          var_idx - array of the sample column of each variable, or None
+          nodes - dictionary of the lists of the node arrays, to which the
+              nodes of the tree are added
+
+        Returns:
+          (root, depth) - index of the root node of the tree and the depth
+              of the tree
+        """
+
+        base = len (nodes['value'])
+        depth = 0
+        stack = []         # internal nodes still waiting for a right child
+        for node_elem in nodes_elem.findall ('_'):
+            index = len (nodes['value'])
+            node_depth = int (xmlChild (node_elem, 'depth').text)
+            depth = max (depth, node_depth)
+            tn = int (xmlChild (node_elem, 'Tn').text)
+            nodes['value'].append (float (xmlChild (node_elem, 'value').text))
+            nodes['left'].append (index)
+            nodes['right'].append (index)
+            nodes['feature'].append (0)
+            nodes['threshold'].append (0.0)
+            nodes['inversed'].append (False)
+
+            # link the node to its parent
+            if len (stack) > 0:
+                parent = stack[-1]
+                if nodes['left'][parent] == parent:
+                    nodes['left'][parent] = index
+                else:
+                    nodes['right'][parent] = index
+                    stack.pop ()
+
+            splits_elem = xmlChild (node_elem, 'splits')
+            if splits_elem is None:
+                continue
+            stack.append (index)
+
+            # only the first split is used, since no values are missing
+            split = splits_elem.find ('_')
+            var = int (xmlChild (split, 'var').text)
+            if var_type[var] <> 0:
+                raise ValueError ('categorical splits are not supported')
+            if xmlChild (split, 'le') is not None:
+                threshold = float (xmlChild (split, 'le').text)
+            else:
+                threshold = float (xmlChild (split, 'gt').text)
+                nodes['inversed'][index] = True
+            if var_idx is not None:
+                var = var_idx[var]
+            nodes['feature'][index] = var
+            nodes['threshold'][index] = threshold
+            nodes['split'].append ((index, tn > best_tree_idx))
+
+        return (base, depth)
+
+
+    def readXML (self, xml_file, log_handler=None):
+        """Reads the model from the OpenCV XML file.
+        Description: routine to read the gradient boosted trees model saved
+            by CvGBTrees::save, and flatten its trees into arrays of nodes.
+            The trees of each ensemble (class) are kept in the order they
+            are saved, which is the order they are summed.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args:
+          xml_file - name of the XML model file
+          log_handler - log file handler; if None then print to stdout
+
+        Returns:
+            ERROR - error reading the model
+            SUCCESS - successful processing
+        """
+
+        try:
+            root = ElementTree.parse (xml_file).getroot ()
+        except (IOError, ElementTree.ParseError), e:
+            msg = 'Error reading the XML model file %s: %s' %  \
+                (xml_file, str(e))
+            logIt (msg, log_handler)
+            return ERROR
+
+        # the model is the element with the GBT type, or the first element
+        model = None
+        for elem in root:
+            if elem.get ('type_id') == GBT_TYPE_ID:
+                model = elem
+                break
+        if model is None and len (root) > 0:
+            model = root[0]
+        if model is None or xmlChild (model, 'class_count') is None:
+            msg = 'Error: no gradient boosted trees model in ' + xml_file
+            logIt (msg, log_handler)
+            return ERROR
+
+        try:
+            self.class_count = int (xmlChild (model, 'class_count').text)
+            self.base_value = numpy.float32 (float (xmlChild (model,
+                'base_value').text))
+            self.shrinkage = numpy.float32 (float (xmlChild (model,
+                'shrinkage').text))
+            self.var_count = int (xmlChild (model, 'var_count').text)
+            var_type = xmlNumbers (xmlChild (model, 'var_type'), numpy.int32)
+            var_idx = None
+            if xmlChild (model, 'var_idx') is not None:
+                var_idx = xmlMatrix (xmlChild (model, 'var_idx'), numpy.int32)
+                self.sample_size = int (var_idx.max()) + 1
+            else:
+                self.sample_size = self.var_count
+
+            nodes = {'value': [], 'left': [], 'right': [], 'feature': [],
+                'threshold': [], 'inversed': [], 'split': []}
+            roots = []
+            tree_class = []
+            self.max_depth = 0
+            for k in range (0, self.class_count):
+                trees_elem = xmlChild (model, 'trees_%d' % k)
+                if trees_elem is None:
+                    continue
+                for tree_elem in trees_elem.findall ('_'):
+                    best_elem = xmlChild (tree_elem, 'best_tree_idx')
+                    best_tree_idx = -1
+                    if best_elem is not None:
+                        best_tree_idx = int (best_elem.text)
+                    (tree_root, depth) = self.readTreeNodes (xmlChild (  \
+                        tree_elem, 'nodes'), best_tree_idx, var_type,
+                        var_idx, nodes)
+                    roots.append (tree_root)
+                    tree_class.append (k)
+                    self.max_depth = max (self.max_depth, depth)
+        except (AttributeError, TypeError, ValueError, IndexError), e:
+            msg = 'Error reading the trees of the XML model file %s: %s' %  \
+                (xml_file, str(e))
+            logIt (msg, log_handler)
+            return ERROR
+
+        # nodes which don't split (pruned) are terminal
+        for (index, splits) in nodes['split']:
+            if not splits:
+                nodes['left'][index] = index
+                nodes['right'][index] = index
+
+        self.roots = numpy.array (roots, dtype=numpy.int32)
+        self.tree_class = numpy.array (tree_class, dtype=numpy.int32)
+        self.feature = numpy.array (nodes['feature'], dtype=numpy.int32)
+        self.threshold = numpy.array (nodes['threshold'],
+            dtype=numpy.float32)
+        self.inversed = numpy.array (nodes['inversed'], dtype=bool)
+        self.left = numpy.array (nodes['left'], dtype=numpy.int32)
+        self.right = numpy.array (nodes['right'], dtype=numpy.int32)
+        self.value = numpy.array (nodes['value'], dtype=numpy.float32)
+        self.weighted = self.shrinkage * self.value
+
+        msg = 'Read %d trees for %d classes from %s' %  \
+            (len (roots), self.class_count, xml_file)
+        logIt (msg, log_handler)
+        return SUCCESS
+
+
+    def writeBinary (self, bin_file, log_handler=None):
+        """Writes the model in the binary model format.
+        Description: routine to write the flattened trees of the model to a
+            binary model file, which can be memory-mapped by readBinary and
+            by predict_burned_area.  The file is written under a temporary
+            name and renamed once it is complete.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args:
+          bin_file - name of the binary model file (.gbtb)
+          log_handler - log file handler; if None then print to stdout
+
+        Returns:
+            ERROR - error writing the model
+            SUCCESS - successful processing
+        """
+
+        header = struct.pack (GBT_BINARY_HEADER, GBT_BINARY_MAGIC,
+            GBT_BINARY_VERSION, self.class_count, self.sample_size,
+            self.max_depth, len (self.roots), len (self.feature),
+            self.base_value, self.shrinkage)
+        temp_file = bin_file + '.tmp'
+        try:
+            bin_handler = open (temp_file, 'wb')
+            bin_handler.write (header.ljust (GBT_BINARY_HEADER_SIZE, '\0'))
+            for (name, dtype) in GBT_BINARY_TREE_ARRAYS +  \
+                GBT_BINARY_NODE_ARRAYS:
+                getattr (self, name).astype (dtype).tofile (bin_handler)
+            bin_handler.close ()
+            os.rename (temp_file, bin_file)
+        except (IOError, OSError), e:
+            msg = 'Error writing the binary model file %s: %s' %  \
+                (bin_file, str(e))
+            logIt (msg, log_handler)
+            return ERROR
+
+        return SUCCESS
+
+
+    def readBinary (self, bin_file, log_handler=None):
+        """Maps the model from the binary model file.
+        Description: routine to memory-map the binary model file written by
+            writeBinary.  The arrays of the trees and nodes are read-only
+            views of the mapping; only the weighted values and the inversed
+            flags are computed.  The header and the indices of the trees and
+            nodes are validated the same as by OpenGbtModel.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args:
+          bin_file - name of the binary model file (.gbtb)
+          log_handler - log file handler; if None then print to stdout
+
+        Returns:
+            ERROR - error reading the model
+            SUCCESS - successful processing
+        """
+
+        try:
+            data = numpy.memmap (bin_file, dtype=numpy.uint8, mode='r')
+        except (IOError, ValueError), e:
+            msg = 'Error mapping the binary model file %s: %s' %  \
+                (bin_file, str(e))
+            logIt (msg, log_handler)
+            return ERROR
+
+        header_size = struct.calcsize (GBT_BINARY_HEADER)
+        if len (data) < GBT_BINARY_HEADER_SIZE:
+            msg = 'Error: %s is not a binary model file' % bin_file
+            logIt (msg, log_handler)
+            return ERROR
+        (magic, version, class_count, sample_size, max_depth, ntrees, nnodes,
+            base_value, shrinkage) = struct.unpack (GBT_BINARY_HEADER,
+            data[0:header_size].tostring())
+        if magic != GBT_BINARY_MAGIC or version != GBT_BINARY_VERSION:
+            msg = 'Error: %s is not a version %d binary model file' %  \
+                (bin_file, GBT_BINARY_VERSION)
+            logIt (msg, log_handler)
+            return ERROR
+        if class_count < 1 or class_count > GBT_MAX_CLASSES or  \
+            sample_size < 1 or ntrees < 0 or nnodes < 0 or  \
+            len (data) != GBT_BINARY_HEADER_SIZE + 4 *  \
+            (ntrees * len (GBT_BINARY_TREE_ARRAYS) +  \
+            nnodes * len (GBT_BINARY_NODE_ARRAYS)):
+            msg = 'Error: the header of the binary model file %s does not '  \
+                'match the model' % bin_file
+            logIt (msg, log_handler)
+            return ERROR
+
+        # map the arrays of the trees and nodes
+        arrays = {}
+        offset = GBT_BINARY_HEADER_SIZE
+        for (names, count) in [(GBT_BINARY_TREE_ARRAYS, ntrees),
+            (GBT_BINARY_NODE_ARRAYS, nnodes)]:
+            for (name, dtype) in names:
+                arrays[name] = data[offset:offset+4*count].view (dtype)
+                offset += 4 * count
+
+        # validate the indices of the trees and nodes once, the same as
+        # OpenGbtModel, so the predictions don't need to check them
+        for (name, limit) in [('roots', nnodes), ('tree_class', class_count),
+            ('left', nnodes), ('right', nnodes), ('feature', sample_size)]:
+            if len (arrays[name]) > 0 and (arrays[name].min() < 0 or  \
+                arrays[name].max() >= limit):
+                msg = 'Error: invalid trees in the binary model file %s (%s '  \
+                    'out of range)' % (bin_file, name)
+                logIt (msg, log_handler)
+                return ERROR
+
+        self.class_count = class_count
+        self.sample_size = sample_size
+        self.max_depth = max_depth
+        self.base_value = numpy.float32 (base_value)
+        self.shrinkage = numpy.float32 (shrinkage)
+        for name in arrays.keys():
+            setattr (self, name, arrays[name])
+        self.inversed = self.inversed.astype (bool)
+        self.weighted = self.shrinkage * self.value
+
+        msg = 'Mapped %d trees for %d classes from %s' %  \
+            (ntrees, self.class_count, bin_file)
+        logIt (msg, log_handler)
+        return SUCCESS
+
+
+    def load (self, xml_file, log_handler=None):
+        """Loads the model, from its binary model file if there is one.
+        Description: routine to map the binary model converted from the XML
+            model, if it exists and is not older than the XML model.
+            Otherwise the XML model is read.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args:
+          xml_file - name of the XML model file
+          log_handler - log file handler; if None then print to stdout
+
+        Returns:
+            ERROR - error reading the model
+            SUCCESS - successful processing
+        """
+
+        bin_file = binaryModelFile (xml_file)
+        if os.path.exists (bin_file) and (not os.path.exists (xml_file) or  \
+            os.path.getmtime (bin_file) >= os.path.getmtime (xml_file)):
+            return self.readBinary (bin_file, log_handler)
+
+        return self.readXML (xml_file, log_handler)
+
+
+    def ensembleSums (self, samples):
+        """Returns the sum of each ensemble for each sample.
+        Description: routine to push the samples down all the trees at
+            once, one level at a time, and sum the weighted values of the
+            leaves of the trees of each ensemble in tree order, in single
+            precision, plus the base value.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args:
+          samples - 2D float32 array with a row of features for each sample
+
+        Returns:
+          sums - 2D float32 array with a row of sums for each ensemble
+        """
+
+        nsamples = samples.shape[0]
+        cols = numpy.arange (nsamples)
+        nodes = numpy.repeat (self.roots[:,numpy.newaxis], nsamples, axis=1)
+        for level in range (0, self.max_depth):
+            values = samples[cols, self.feature[nodes]]
+            with numpy.errstate (invalid='ignore'):   # NaN is never <=
+                go_left = (values <= self.threshold[nodes]) <>  \
+                    self.inversed[nodes]
+            nodes = numpy.where (go_left, self.left[nodes], self.right[nodes])
+
+        sums = numpy.zeros ((self.class_count, nsamples), dtype=numpy.float32)
+        weighted = self.weighted[nodes]
+        for k in range (0, self.class_count):
+            trees = self.tree_class == k
+            if numpy.any (trees):
+                sums[k] = numpy.cumsum (weighted[trees], axis=0,
+                    dtype=numpy.float32)[-1]
+        sums += self.base_value
+        return sums
+
+
+    def predictProb (self, samples, k=1):
+        """Predicts the probability that each sample is of class k.
+        Description: routine to run the predictions the same way as
+            CvGBTrees::predict_prob, in batches of GBT_BATCH_SAMPLES
+            samples.  The exponentials are computed in double precision and
+            rounded to single precision, as expf does.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args:
+          samples - 2D array with a row of features for each sample; it has
+              at least sample_size columns
+          k - class to predict the probability of
+
+        Returns:
+          probs - float32 array of the probability of each sample; the sum
+              of the ensemble if there is only one class
+        """
+
+        samples = numpy.asarray (samples, dtype=numpy.float32)
+        nsamples = samples.shape[0]
+        probs = numpy.zeros (nsamples, dtype=numpy.float32)
+        if self.class_count > 1 and (k < 0 or k >= self.class_count):
+            return probs
+
+        for start in range (0, nsamples, GBT_BATCH_SAMPLES):
+            end = min (start + GBT_BATCH_SAMPLES, nsamples)
+            sums = self.ensembleSums (samples[start:end])
+            if self.class_count == 1:
+                probs[start:end] = sums[0]
+                continue
+
+            exps = numpy.exp (sums.astype (numpy.float64)).astype (  \
+                numpy.float32)
+            exp_sum = numpy.zeros (end - start, dtype=numpy.float32)
+            for i in range (0, self.class_count):
+                exp_sum += exps[i]
+            probs[start:end] = exps[k] / exp_sum
+
+        return probs
+
+######end of gbtModel class######
@@ -27,7 +27,8 @@ class BoostedRegressionConfig():
 
     def runGenerateConfig (self, config_file=None, seasonal_sum_dir=None,
         input_base_file=None, input_mask_file=None, output_dir=None,
-        model_file=None, logfile=None):
+        model_file=None, logfile=None, input_line_offset=None,
+        input_samp_offset=None):
         """Generates the configuration file.
         Description: runGenerateConfig will use the input parameters to
         generate the configuration file needed for running the boosted
@@ -44,6 +45,9 @@ class BoostedRegressionConfig():
               Modified to support ESPA internal file format as input and output.
           Updated on April 9, 2014 by Gail Schmidt, USGS/EROS LSRD Project
               Modified to support the use of a log file.
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Added the optional input line/sample offsets for scenes which
+              have not been resampled to the seasonal summaries grid.
 
         Args:
           config_file - name of the configuration file to be created or
@@ -58,6 +62,12 @@ class BoostedRegressionConfig():
           model_file - name of the geographic model to be used
           logfile - name of the logfile for logging information; if None then
               the output will be written to stdout
+          input_line_offset - line in the seasonal summaries grid of the
+              first line of the input scene; if None then the input scene is
+              expected to be resampled to the seasonal summaries grid
+          input_samp_offset - sample in the seasonal summaries grid of the
+              first sample of the input scene; if None then the input scene
+              is expected to be resampled to the seasonal summaries grid
        
         Returns:
             ERROR - error generating the configuration file
@@ -93,6 +103,14 @@ class BoostedRegressionConfig():
                 metavar='FILE')
             parser.add_argument ('-l', '--logfile', type=str, dest='logfile',
                 help='name of optional log file', metavar='FILE')
+            parser.add_argument ('--input_line_offset', type=int,
+                dest='input_line_offset',
+                help='line offset of the input image in the seasonal ' \
+                  'summaries grid, if not resampled to the grid')
+            parser.add_argument ('--input_samp_offset', type=int,
+                dest='input_samp_offset',
+                help='sample offset of the input image in the seasonal ' \
+                  'summaries grid, if not resampled to the grid')
 
             options = parser.parse_args()
     
@@ -133,6 +151,8 @@ class BoostedRegressionConfig():
             model_file = options.model_file
 
             logfile = options.logfile
+            input_line_offset = options.input_line_offset
+            input_samp_offset = options.input_samp_offset
 
         # open the log file if it exists; use line buffering for the output
         log_handler = None
@@ -203,6 +223,12 @@ class BoostedRegressionConfig():
         config_handler.write (config_line + '\n')
         config_line = 'LOAD_MODEL_XML=%s' % model_file
         config_handler.write (config_line + '\n')
+        if input_line_offset is not None:
+            config_line = 'INPUT_LINE_OFFSET=%d' % input_line_offset
+            config_handler.write (config_line + '\n')
+        if input_samp_offset is not None:
+            config_line = 'INPUT_SAMP_OFFSET=%d' % input_samp_offset
+            config_handler.write (config_line + '\n')
 
         # successful completion
         config_handler.close()
@@ -15,6 +15,14 @@
 #       burned area products
 #   Updated on 5/19/2014 by Gail Schmimdt, USGS/EROS LSRD Project
 #       Changed the use of burn scar to burned area
+#   Updated on 10/17/2026, USGS/EROS LSRD Project
+#       Modified to compute the annual summaries a block of lines at a time,
+#       in one pass over the scenes, with preallocated buffers.
+#       Modified to process the bands of lines of each year in parallel.
+#       Modified to transform the scene edges in bulk for the XML bounding
+#       coordinates.
+#       Added the fused mode, which classifies the burn probabilities in
+#       memory rather than reading back the burn classification files.
 #############################################################################
 
 import sys
@@ -24,6 +32,7 @@ import time
 import datetime as datetime_
 import getopt
 import csv
+import multiprocessing, Queue
 
 import numpy
 
@@ -35,10 +44,18 @@ from osgeo import gdal_array
 from osgeo import gdalconst
 
 import metadata_api
+from geographic_bounds import *
+from do_threshold_stack import BurnAreaThreshold
 
 ERROR = 1
 SUCCESS = 0
 
+# number of lines to summarize at a time for each year
+ANNUAL_BLOCK_LINES = 256
+
+# number of parallel tasks (bands of lines of a year) for each processor
+ANNUAL_TASKS_PER_PROCESSOR = 4
+
 def logIt (msg, log_handler):
     """Logs the user-specified message.
     logIt logs the information to the logfile (if valid) or to stdout if the
@@ -88,6 +105,53 @@ def convert_imageXY_to_mapXY (image_x, image_y, transform):
 
 
 
+#############################################################################
+# Created on October 17, 2026, USGS/EROS LSRD Project
+# Created Python class to handle the multiprocessing of the annual burn
+# summaries, one band of lines of a year per task.
+#
+# History:
+#
+############################################################################
+class parallelAnnualSummaryWorker(multiprocessing.Process):
+    """Runs the annual burn summaries in parallel for a stack of years.
+    """
+ 
+    def __init__ (self, work_queue, result_queue, stackObject):
+        # base class initialization
+        multiprocessing.Process.__init__(self)
+ 
+        # job management stuff
+        self.work_queue = work_queue
+        self.result_queue = result_queue
+        self.stackObject = stackObject
+        self.kill_received = False
+ 
+
+    def run(self):
+        while not self.kill_received:
+            # get a task
+            try:
+                (year, start_line, end_line) = self.work_queue.get_nowait()
+            except Queue.Empty:
+                break
+ 
+            # process the band of lines for the year
+            msg = 'Processing year %d, lines %d - %d ...' %  \
+                (year, start_line, end_line - 1)
+            logIt (msg, self.stackObject.log_handler)
+            status = self.stackObject.generateYearSummaries (year,  \
+                start_line, end_line)
+            if status != SUCCESS:
+                msg = 'Error processing the annual burn summaries for year '  \
+                    '%d, lines %d - %d. Processing will terminate.' %  \
+                    (year, start_line, end_line - 1)
+                logIt (msg, self.stackObject.log_handler)
+ 
+            # store the result
+            self.result_queue.put(status)
+
+
 #############################################################################
 # Created on December 2, 2013 by Gail Schmidt, USGS/EROS LSRD Project
 # Turned into a class to run the overall annual burn summaries.
@@ -119,6 +183,9 @@ class AnnualBurnSummary():
         
         History:
           Created on May 12, 2014 by Gail Schmidt, USGS/EROS LSRD Project
+          Updated on Oct. 17, 2026, USGS/EROS LSRD Project
+              Modified to determine the bounding coordinates via
+              geographicBounds, which transforms the edge points in bulk.
 
         Args:
           scene_xml_file - scene-based XML file to be used as the base XML
@@ -220,59 +287,10 @@ class AnnualBurnSummary():
                 mycorner.set_longitude (lon)
                 mycorner.set_latitude (lat)
 
-        # determine the bounding coordinates; initialize using the UL and LR
-        # then work around the scene edges
-        # UL
-        (map_x, map_y) = convert_imageXY_to_mapXY (0.0, 0.0, ds_transform)
-        (ul_lon, ul_lat, height) = coord_tf.TransformPoint (map_x, map_y)
-        # LR
-        (map_x, map_y) = convert_imageXY_to_mapXY (nsamps, nlines, ds_transform)
-        (lr_lon, lr_lat, height) = coord_tf.TransformPoint (map_x, map_y)
-
-        # find the min and max values accordingly, for initialization
-        west_lon = min (ul_lon, lr_lon)
-        east_lon = max (ul_lon, lr_lon)
-        north_lat = max (ul_lat, lr_lat)
-        south_lat = min (ul_lat, lr_lat)
-
-        # traverse the boundaries of the image to determine the bounding
-        # coords; traverse one extra line and sample to get the the outer
-        # extents of the image vs. just the UL of the outer edge.
-        # top and bottom edges
-        for samp in range (0, nsamps_int+1):
-            # top edge
-            (map_x, map_y) = convert_imageXY_to_mapXY (samp, 0.0, ds_transform)
-            (top_lon, top_lat, height) = coord_tf.TransformPoint (map_x, map_y)
-
-            # lower edge
-            (map_x, map_y) = convert_imageXY_to_mapXY (samp, nlines,
-                ds_transform)
-            (low_lon, low_lat, height) = coord_tf.TransformPoint (map_x, map_y)
-
-            # update the min and max values
-            west_lon = min (top_lon, low_lon, west_lon)
-            east_lon = max (top_lon, low_lon, east_lon)
-            north_lat = max (top_lat, low_lat, north_lat)
-            south_lat = min (top_lat, low_lat, south_lat)
-
-        # left and right edges
-        for line in range (0, nlines_int+1):
-            # left edge
-            (map_x, map_y) = convert_imageXY_to_mapXY (0.0, line, ds_transform)
-            (left_lon, left_lat, height) = coord_tf.TransformPoint (map_x,
-                map_y)
-
-            # right edge
-            (map_x, map_y) = convert_imageXY_to_mapXY (nsamps, line,
-                ds_transform)
-            (right_lon, right_lat, height) = coord_tf.TransformPoint (map_x,
-                map_y)
-
-            # update the min and max values
-            west_lon = min (left_lon, right_lon, west_lon)
-            east_lon = max (left_lon, right_lon, east_lon)
-            north_lat = max (left_lat, right_lat, north_lat)
-            south_lat = min (left_lat, right_lat, south_lat)
+        # determine the bounding coordinates by walking the scene edges,
+        # transforming all the edge points at once
+        (west_lon, east_lon, north_lat, south_lat) = geographicBounds (  \
+            nlines_int, nsamps_int, ds_transform, coord_tf)
 
         # update the XML
         bounding_coords = meta_global.get_bounding_coordinates()
@@ -437,8 +455,461 @@ class AnnualBurnSummary():
         return SUCCESS
 
 
+    def annualBlockBuffers(self, block_lines, ncol):
+        """Allocates the buffers for annualBurnBlock.
+        Description: routine to allocate the input and output buffers used
+            by annualBurnBlock, so they can be reused for each block of lines.
+        
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+        
+        Args:
+          block_lines - maximum number of lines in a block
+          ncol - number of samples in each line
+        
+        Returns:
+          buffers - dictionary of the int16 and boolean block buffers
+        """
+
+        buffers = {}
+        for name in ['bp', 'bc', 'bp_max', 'burn_count', 'burn_doy',  \
+            'good_count']:
+            buffers[name] = numpy.empty((block_lines, ncol),  \
+                dtype=numpy.int16)
+        for name in ['burned', 'first_burn', 'fill']:
+            buffers[name] = numpy.empty((block_lines, ncol), dtype=bool)
+        return buffers
+
+
+    def annualBurnBlock(self, input_bands, julian, y, nlines, ncol, nodata,
+        buffers):
+        """Computes the annual burn summaries for a block of lines.
+        Description: routine to compute the maximum burn probability, burn
+            count, first DOY of burn, and good looks count for a block of
+            lines in one pass over the scenes of the year.  Each scene is
+            read into the same buffers and added to the running summaries,
+            rather than reading all the scenes and reducing over them.  The
+            summaries are the same as those of the line at a time reductions.
+        
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+        
+        Args:
+          input_bands - array of the burn probability (column 0) and burn
+              classification (column 1) GDAL bands of each scene of the year,
+              in stack order
+          julian - int16 array of the julian day of each scene of the year;
+              its length is the number of scenes
+          y - first line of the block
+          nlines - number of lines in the block
+          ncol - number of samples in each line
+          nodata - nodata value of the burn probabilities and the summaries
+          buffers - buffers allocated by annualBlockBuffers
+        
+        Returns:
+          (bd, bc, gc, bp_max) - views into the buffers of the first DOY of
+              burn, burn count, good looks count, and maximum burn
+              probability for the block
+        """
+
+        bp = buffers['bp'][0:nlines,:]
+        bc = buffers['bc'][0:nlines,:]
+        self.annualBlockStart(buffers, nlines)
+
+        # add each scene to the running summaries
+        for i in range(0, len(julian)):
+            input_bands[i,0].ReadAsArray(0, y, ncol, nlines, buf_obj=bp)
+            input_bands[i,1].ReadAsArray(0, y, ncol, nlines, buf_obj=bc)
+            self.annualBlockAdd(buffers, nlines, bp, bc, julian[i])
+
+        return self.annualBlockFinish(buffers, nlines, nodata)
+
+
+    def annualBlockStart(self, buffers, nlines):
+        """Starts the running annual burn summaries for a block of lines.
+        Description: routine to reset the running summaries of a block of
+            lines.  The maximum burn probability starts at the int16
+            minimum, which annualBlockFinish maps to nodata where no scene
+            was added.
+        
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+        """
+
+        buffers['bp_max'][0:nlines,:].fill(numpy.iinfo(numpy.int16).min)
+        buffers['burn_count'][0:nlines,:].fill(0)
+        buffers['burn_doy'][0:nlines,:].fill(0)
+        buffers['good_count'][0:nlines,:].fill(0)
+
+
+    def annualBlockAdd(self, buffers, nlines, bp, bc, julian):
+        """Adds a scene to the running annual burn summaries.
+        Description: routine to add the burn probabilities and burn
+            classifications of a scene to the running summaries of a block
+            of lines.  The scenes are added in stack order, so the first DOY
+            of burn is that of the first scene which is burned.
+        
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+              Pulled from annualBurnBlock.
+        
+        Args:
+          buffers - buffers allocated by annualBlockBuffers
+          nlines - number of lines in the block
+          bp - burn probabilities of the scene for the block
+          bc - burn classifications of the scene for the block
+          julian - julian day of the scene
+        
+        Returns:
+            Nothing
+        """
+
+        bp_max = buffers['bp_max'][0:nlines,:]
+        burn_count = buffers['burn_count'][0:nlines,:]
+        burn_doy = buffers['burn_doy'][0:nlines,:]
+        good_count = buffers['good_count'][0:nlines,:]
+        burned = buffers['burned'][0:nlines,:]
+        first_burn = buffers['first_burn'][0:nlines,:]
+
+        numpy.maximum(bp_max, bp, out=bp_max)
+
+        numpy.greater_equal(bc, 1, out=burned)
+        numpy.equal(burn_count, 0, out=first_burn)
+        first_burn &= burned
+        burn_doy[first_burn] = julian
+        burn_count += burned
+
+        numpy.greater_equal(bc, 0, out=burned)
+        good_count += burned
+
+
+    def annualBlockFinish(self, buffers, nlines, nodata):
+        """Finishes the running annual burn summaries for a block of lines.
+        Description: routine to set the summaries to nodata where the
+            maximum burn probability is nodata, or is still the int16
+            minimum it started at since there were no scenes.
+        
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+              Pulled from annualBurnBlock.
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Modified to write nodata rather than the int16 minimum for a
+              year or block without scenes.
+        
+        Args:
+          buffers - buffers allocated by annualBlockBuffers
+          nlines - number of lines in the block
+          nodata - nodata value of the burn probabilities and the summaries
+        
+        Returns:
+          (bd, bc, gc, bp_max) - views into the buffers of the first DOY of
+              burn, burn count, good looks count, and maximum burn
+              probability for the block
+        """
+
+        bp_max = buffers['bp_max'][0:nlines,:]
+        burn_count = buffers['burn_count'][0:nlines,:]
+        burn_doy = buffers['burn_doy'][0:nlines,:]
+        good_count = buffers['good_count'][0:nlines,:]
+        fill = buffers['fill'][0:nlines,:]
+
+        numpy.equal(bp_max, numpy.iinfo(numpy.int16).min, out=fill)
+        bp_max[fill] = nodata
+        numpy.equal(bp_max, nodata, out=fill)
+        burn_count[fill] = nodata
+        burn_doy[fill] = nodata
+        good_count[fill] = nodata
+
+        return (burn_doy, burn_count, good_count, bp_max)
+
+
+    def annualBandLines(self, num_years):
+        """Determines the number of lines in each parallel task for the
+           annual burn summaries.
+        Description: routine to split the lines of each year into bands, so
+            there are ANNUAL_TASKS_PER_PROCESSOR tasks for each processor over
+            all the years.  Each task is a whole number of blocks of
+            ANNUAL_BLOCK_LINES lines where possible.
+        
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+        
+        Args:
+          num_years - number of years to be processed
+        
+        Returns:
+          band_lines - number of lines in each task
+        """
+
+        num_bands = (ANNUAL_TASKS_PER_PROCESSOR * self.num_processors +  \
+            num_years - 1) // num_years
+        num_bands = max(num_bands, 1)
+        band_lines = (self.nrow + num_bands - 1) // num_bands
+
+        # round up to a whole number of blocks
+        if band_lines > ANNUAL_BLOCK_LINES:
+            band_lines = ((band_lines + ANNUAL_BLOCK_LINES - 1) //  \
+                ANNUAL_BLOCK_LINES) * ANNUAL_BLOCK_LINES
+        return int(max(min(band_lines, self.nrow), 1))
+
+
+    def annualOutputFiles(self, year):
+        """Returns the names of the annual burn summary products for a year.
+        Description: routine to return the names of the first DOY of burn
+            (burned_area), burn count, good looks count, and maximum burn
+            probability products for the year, in that order.
+        
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+        
+        Args:
+          year - year of the products
+        
+        Returns:
+          file_list - list of the product filenames
+        """
+
+        file_list = []
+        for product in ['burned_area_', 'burn_count_', 'good_looks_count_',  \
+            'max_burn_prob_']:
+            file_list.append(self.output_dir + '/' + product + str(year) +  \
+                '.img')
+        return file_list
+
+
+    def createYearOutputs(self, year):
+        """Creates the annual burn summary products for a year.
+        Description: routine to create the int16 products for the year, with
+            the geographic information and nodata value of the burn
+            probabilities, so the parallel tasks can each write their own
+            band of lines.
+        
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+              Pulled from runAnnualBurnSummaries.
+        
+        Args:
+          year - year of the products
+        
+        Returns:
+            ERROR - error creating the products
+            SUCCESS - successful processing
+        """
+
+        # create the ENVI driver for output data
+        driver = gdal.GetDriverByName('ENVI')
+
+        for fname in self.annualOutputFiles(year):
+            output_dataset = driver.Create(fname, self.ncol, self.nrow, 1,  \
+                gdal.GDT_Int16)
+            if output_dataset is None:
+                msg = 'GDAL could not create output file: ' + fname
+                logIt (msg, self.log_handler)
+                return ERROR
+            output_dataset.SetGeoTransform(self.geotrans)
+            output_dataset.SetProjection(self.prj)
+            output_band = output_dataset.GetRasterBand(1)
+            output_band.SetNoDataValue(self.nodata)
+            output_band = None
+            output_dataset = None
+
+        return SUCCESS
+
+
+    def generateYearSummaries(self, year, start_line=0, end_line=None):
+        """Processes the annual burn summaries for a band of lines of a year.
+        Description: routine to compute the annual burn summaries for the
+            lines of the year from start_line up to end_line, a block of
+            lines at a time, and write them to the products created by
+            createYearOutputs.  Only the lines of the band are written, so
+            the bands of a year can be processed in parallel.
+        
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+              Pulled from runAnnualBurnSummaries.
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Modified to process the whole year via
+              generateFusedYearSummaries in the fused mode.
+        
+        Args:
+          year - year to process
+          start_line - first line of the band to process
+          end_line - line after the last line of the band to process; default
+              is the end of the image
+        
+        Returns:
+            ERROR - error processing the annual burn summaries
+            SUCCESS - successful processing
+        """
+
+        if self.fused:
+            return self.generateFusedYearSummaries(year)
+
+        if end_line is None:
+            end_line = self.nrow
+        ncol = self.ncol
+
+        stack_mask = self.stack['year'] == year
+        stack3 = self.stack[stack_mask]
+
+        # open the input datasets - 1st band is burn probability,
+        # 2nd band is burn classification
+        input_datasets = numpy.empty((stack3.shape[0],2), dtype=object)
+        input_bands = numpy.empty((stack3.shape[0],2), dtype=object)
+        for i in range(0, stack3.shape[0]):
+            xml_file = stack3['file_'][i]
+            for (j, suffix, input_dir) in  \
+                [(0, '_burn_probability.img', self.bp_dir),  \
+                 (1, '_burn_class.img', self.bc_dir)]:
+                fname = input_dir + '/' +  \
+                    os.path.basename(xml_file).replace('.xml', suffix)
+                input_datasets[i,j] = gdal.Open(fname)
+                if input_datasets[i,j] is None:
+                    msg = 'GDAL could not open input file: ' + fname
+                    logIt (msg, self.log_handler)
+                    return ERROR
+                input_bands[i,j] = input_datasets[i,j].GetRasterBand(1)
+
+        # open the output datasets for update
+        output_datasets = []
+        output_bands = []
+        for fname in self.annualOutputFiles(year):
+            output_dataset = gdal.Open(fname, gdalconst.GA_Update)
+            if output_dataset is None:
+                msg = 'GDAL could not open output file: ' + fname
+                logIt (msg, self.log_handler)
+                return ERROR
+            output_datasets.append(output_dataset)
+            output_bands.append(output_dataset.GetRasterBand(1))
+
+        # process the band in blocks of lines, reusing the buffers for each
+        # block
+        block_lines = min(ANNUAL_BLOCK_LINES, end_line - start_line)
+        buffers = self.annualBlockBuffers(block_lines, ncol)
+        julian = numpy.clip(stack3['julian'], -32768, 32767).astype(  \
+            numpy.int16)
+        for y in range (start_line, end_line, block_lines):
+            nlines = min(block_lines, end_line - y)
+            (bd, bc, gc, bp_max) = self.annualBurnBlock(input_bands,  \
+                julian, y, nlines, ncol, self.nodata, buffers)
+        
+            # write output data for the burned area DOY, burn count, good
+            # looks count, and the maximum burn probability
+            output_bands[0].WriteArray(bd, xoff=0, yoff=y)
+            output_bands[1].WriteArray(bc, xoff=0, yoff=y)
+            output_bands[2].WriteArray(gc, xoff=0, yoff=y)
+            output_bands[3].WriteArray(bp_max, xoff=0, yoff=y)
+        buffers = None
+
+        # close the input and output datasets
+        input_bands = None
+        input_datasets = None
+        output_bands = None
+        output_datasets = None
+
+        return SUCCESS
+
+
+    def generateFusedYearSummaries(self, year):
+        """Classifies the scenes of a year and processes their annual burn
+           summaries.
+        Description: routine to find the burn classification of each scene
+            of the year from its burn probabilities, as done by
+            BurnAreaThreshold.sceneBurnThreshold, and add the classification
+            and probabilities to the running annual summaries while they are
+            in memory.  The burn classifications are only written if
+            write_burn_class is set.  The summaries are the same as those
+            from the burn classification files.
+        
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+        
+        Args:
+          year - year to process
+        
+        Returns:
+            ERROR - error processing the annual burn summaries
+            SUCCESS - successful processing
+        """
+
+        nrow = self.nrow
+        ncol = self.ncol
+        stack_mask = self.stack['year'] == year
+        stack3 = self.stack[stack_mask]
+        julian = numpy.clip(stack3['julian'], -32768, 32767).astype(  \
+            numpy.int16)
+        threshold = BurnAreaThreshold()
+
+        # the whole image is one block, since each scene is classified as a
+        # whole
+        buffers = self.annualBlockBuffers(nrow, ncol)
+        bp = buffers['bp']
+        self.annualBlockStart(buffers, nrow)
+        for i in range(0, stack3.shape[0]):
+            xml_file = stack3['file_'][i]
+            fname = os.path.basename(xml_file).replace  \
+                ('.xml','_burn_probability.img')
+            bp_file = self.bp_dir + '/' + fname
+            bp_dataset = gdal.Open(bp_file)
+            if bp_dataset is None:
+                msg = 'GDAL could not open input file: ' + bp_file
+                logIt (msg, self.log_handler)
+                return ERROR
+            bp_band = bp_dataset.GetRasterBand(1)
+            bp_band.ReadAsArray(0, 0, ncol, nrow, buf_obj=bp)
+
+            # find the burn classification, with the negative (fill) burn
+            # probabilities carried over
+            bc = threshold.findBurnScars(bp, self.seed_prob_thresh,  \
+                self.seed_size_thresh, self.flood_fill_prob_thresh,  \
+                self.log_handler)
+            bc[0][bp < 0] = bp[bp < 0]
+
+            if self.write_burn_class:
+                nodata = bp_band.GetNoDataValue()
+                if nodata is None:
+                    nodata = -9999
+                fname = os.path.basename(xml_file).replace  \
+                    ('.xml','_burn_class.img')
+                bc_name = self.bc_dir + '/' + fname
+                msg = 'Writing output to %s ... ' % bc_name
+                logIt (msg, self.log_handler)
+                threshold.writeResults(outputData=bc[0],
+                    outputFilename=bc_name,
+                    geotrans=bp_dataset.GetGeoTransform(),
+                    prj=bp_dataset.GetProjectionRef(), nodata=nodata,
+                    outputRAT=bc[1])
+            bp_band = None
+            bp_dataset = None
+
+            self.annualBlockAdd(buffers, nrow, bp, bc[0], julian[i])
+            bc = None
+
+        (bd, bc, gc, bp_max) = self.annualBlockFinish(buffers, nrow,  \
+            self.nodata)
+
+        # write output data for the burned area DOY, burn count, good looks
+        # count, and the maximum burn probability
+        output_list = [bd, bc, gc, bp_max]
+        for (fname, output_data) in zip(self.annualOutputFiles(year),  \
+            output_list):
+            output_dataset = gdal.Open(fname, gdalconst.GA_Update)
+            if output_dataset is None:
+                msg = 'GDAL could not open output file: ' + fname
+                logIt (msg, self.log_handler)
+                return ERROR
+            output_dataset.GetRasterBand(1).WriteArray(output_data,  \
+                xoff=0, yoff=0)
+            output_dataset = None
+        buffers = None
+
+        return SUCCESS
+
+
     def runAnnualBurnSummaries(self, stack_file=None, bp_dir=None, bc_dir=None,
-        output_dir=None, start_year=None, end_year=None, logfile=None):
+        output_dir=None, start_year=None, end_year=None, logfile=None,
+        num_processors=1, fused=False, write_burn_class=True,
+        seed_prob_thresh=97.5, seed_size_thresh=5, flood_fill_prob_thresh=75):
         """Processes the annual burn summaries for each year in the stack.
         Description: routine to process the annual burn summaries for each
             pixel.
@@ -464,6 +935,15 @@ class AnnualBurnSummary():
               Modified the recfromcsv calls to not specify the datatype and to
               instead use the automatically-determined datatype from the read
               itself.
+          Updated on Oct. 17, 2026, USGS/EROS LSRD Project
+              Modified to compute the summaries in blocks of lines via
+              annualBurnBlock, reusing the buffers for each block.
+          Updated on Oct. 17, 2026, USGS/EROS LSRD Project
+              Modified to process the bands of lines of each year in
+              parallel via generateYearSummaries.
+          Updated on Oct. 17, 2026, USGS/EROS LSRD Project
+              Added the fused mode, which classifies the burn probabilities
+              in memory rather than reading the burn classifications.
 
         Args:
           stack_file - input CSV file with information about the files to be
@@ -478,6 +958,21 @@ class AnnualBurnSummary():
               with the highest year
           logfile - name of the logfile for logging information; if None then
               the output will be written to stdout
+          num_processors - how many processors should be used for parallel
+              processing of the years and bands of lines
+          fused - if True then the burn probabilities of each scene are
+              classified in memory, as done by BurnAreaThreshold, and the
+              classifications are added to the annual summaries without
+              reading them from bc_dir.  The years are processed in parallel
+              rather than the bands of lines.
+          write_burn_class - if True (default) then the burn classifications
+              are written to bc_dir in the fused mode
+          seed_prob_thresh - seed probability threshold for the burn
+              classifications in the fused mode; default is 97.5%
+          seed_size_thresh - seed size threshold for the burn
+              classifications in the fused mode; default is 5 pixels
+          flood_fill_prob_thresh - flood fill probability threshold for the
+              burn classifications in the fused mode; default is 75%
    
         Returns:
             ERROR - error running the annual burn summary application
@@ -519,6 +1014,19 @@ class AnnualBurnSummary():
                 metavar='YEAR')
             parser.add_argument ('-l', '--logfile', type=str, dest='logfile',
                 help='name of optional log file', metavar='FILE')
+            parser.add_argument ('-n', '--num_processors', type=int,
+                dest='num_processors',
+                help='how many processors should be used for parallel '  \
+                    'processing of the years and bands of lines '  \
+                    '(default = 1, single threaded)')
+            parser.add_argument ('--fused', dest='fused', default=False,
+                action='store_true',
+                help='classify the burn probabilities in memory rather '  \
+                    'than reading the burn classification files')
+            parser.add_argument ('--skip_burn_class', dest='write_burn_class',
+                default=True, action='store_false',
+                help='don\'t write the burn classification files in the '  \
+                    'fused mode')
 
             options = parser.parse_args()
 
@@ -551,6 +1059,13 @@ class AnnualBurnSummary():
             if options.end_year is not None:
                 end_year = options.end_year
 
+            # number of processors
+            if options.num_processors is not None:
+                num_processors = options.num_processors
+
+            fused = options.fused
+            write_burn_class = options.write_burn_class
+
         # open the log file if it exists; use line buffering for the output
         log_handler = None
         if logfile is not None:
@@ -684,172 +1199,100 @@ class AnnualBurnSummary():
         bp_band = None
         bp_dataset = None
 
-        # create the ENVI driver for output data
-        driver = gdal.GetDriverByName('ENVI')
-    
+        # make sure the burn probabilities and classifications exist for all
+        # the scenes of the years to be processed
+        for i in range(0, stack2.shape[0]):
+            xml_file = stack2['file_'][i]
+            fname = os.path.basename(xml_file).replace  \
+                ('.xml','_burn_probability.img')
+            bp_file = bp_dir + '/' + fname
+            if not os.path.exists(bp_file):
+                msg = 'burn probability file does not exist: ' + bp_file
+                logIt (msg, log_handler)
+                os.chdir (mydir)
+                return ERROR
+
+            if fused:
+                continue
+            fname = os.path.basename(xml_file).replace  \
+                ('.xml','_burn_class.img')
+            bc_name = bc_dir + '/' + fname
+            if not os.path.exists(bc_name):
+                msg = 'burn classification file does not exist: ' + bc_name
+                logIt (msg, log_handler)
+                os.chdir (mydir)
+                return ERROR
+
+        # save the information needed by the parallel tasks
+        self.log_handler = log_handler
+        self.bp_dir = bp_dir
+        self.bc_dir = bc_dir
+        self.output_dir = output_dir
+        self.stack = stack2
+        self.nrow = nrow
+        self.ncol = ncol
+        self.geotrans = geotrans
+        self.prj = prj
+        self.nodata = nodata
+        self.num_processors = num_processors
+        self.fused = fused
+        self.write_burn_class = write_burn_class
+        self.seed_prob_thresh = seed_prob_thresh
+        self.seed_size_thresh = seed_size_thresh
+        self.flood_fill_prob_thresh = flood_fill_prob_thresh
+
         # process the data for the years specified
         # create images for:
         #    1. first date a burned area was observed (burned_area)
         #    2. number of times burn was observed (burn_count)
         #    3. number of good looks (good_looks_count)
         #    4. maximum probability for burned area (max_burn_prob)
-    
-        # loop through the years in the stack
+        # the images for all the years are created up front, so the parallel
+        # tasks can each write their own band of lines
         msg = 'Processing burn files for %d-%d' % (start_year, end_year)
         logIt (msg, log_handler)
+        num_years = end_year - start_year + 1
         for year in range(start_year,end_year+1):
-            msg = '########################################################'
-            logIt (msg, log_handler)
-            msg = 'Processing %d ...' % year
-            logIt (msg, log_handler)
-                
-            stack_mask = stack2['year'] == year
-            stack3 = stack2[stack_mask]
-
-            # initialize the input and output datasets
-            input_datasets = numpy.empty( (stack2.shape[0],2), dtype=object )
-            input_bands = numpy.empty( (stack2.shape[0],2), dtype=object )
-            
-            output_datasets = numpy.empty((4), dtype=object)
-            output_bands = numpy.empty((4), dtype=object)
-        
-            # open the input datasets - 1st band is burn probability,
-            # 2nd band is burn classification
-            for i in range(0, stack3.shape[0]):
-                xml_file = stack3['file_'][i]
-                
-                # construct the burn probability and classification filenames
-                # from the XML filenames in the CSV
-                fname = os.path.basename(xml_file).replace  \
-                    ('.xml','_burn_probability.img')
-                bp_file = bp_dir + '/' + fname
-                if not os.path.exists(bp_file):
-                    msg = 'burn probability file does not exist: ' + bp_file
-                    logIt (msg, log_handler)
-                    os.chdir (mydir)
-                    return ERROR
-
-                msg = '    Reading %s ...' % bp_file
-                logIt (msg, log_handler)
-                input_datasets[i,0] = gdal.Open(bp_file)
-                input_bands[i,0] = input_datasets[i,0].GetRasterBand(1)
-
-                fname = os.path.basename(xml_file).replace  \
-                    ('.xml','_burn_class.img')
-                bc_name = bc_dir + '/' + fname
-                if not os.path.exists(bc_name):
-                    msg = 'burn classification file does not exist: ' + bc_name
-                    logIt (msg, log_handler)
-                    os.chdir (mydir)
-                    return ERROR
+            status = self.createYearOutputs(year)
+            if status != SUCCESS:
+                # error message already written
+                os.chdir (mydir)
+                return ERROR
 
-                msg = '    Reading %s ...' % bc_name
+        # load up the work queue with a task for each band of lines of each
+        # year
+        band_lines = self.annualBandLines(num_years)
+        if fused:
+            band_lines = nrow
+        work_queue = multiprocessing.Queue()
+        num_tasks = 0
+        for year in range(start_year,end_year+1):
+            for start_line in range (0, nrow, band_lines):
+                end_line = min (start_line + band_lines, nrow)
+                work_queue.put((year, start_line, end_line))
+                num_tasks += 1
+
+        # create a queue to pass to workers to store the processing status
+        result_queue = multiprocessing.Queue()
+
+        # spawn workers to process each band of lines of each year
+        msg = 'Spawning %d tasks (%d years, %d lines each) for the annual '  \
+            'burn summaries via %d processors ....' %  \
+            (num_tasks, num_years, band_lines, num_processors)
+        logIt (msg, log_handler)
+        for i in range(num_processors):
+            worker = parallelAnnualSummaryWorker(work_queue, result_queue,
+                self)
+            worker.start()
+
+        # collect the annual burn summary results off the queue
+        for i in range(num_tasks):
+            status = result_queue.get()
+            if status != SUCCESS:
+                msg = 'Error processing the annual burn summaries'
                 logIt (msg, log_handler)
-                input_datasets[i,1] = gdal.Open(bc_name)
-                input_bands[i,1] = input_datasets[i,1].GetRasterBand(1)
-
-            # open the output datasets
-            # first date of burned area (burned_area)
-            fname = output_dir + '/burned_area_' + str(year) + '.img'
-            output_datasets[0] = driver.Create(fname, ncol, nrow, 1, \
-                gdal.GDT_Int16)
-            output_datasets[0].SetGeoTransform(geotrans)
-            output_datasets[0].SetProjection(prj)
-            output_bands[0] = output_datasets[0].GetRasterBand(1)
-            output_bands[0].SetNoDataValue(nodata)
-            
-            # count of times a pixel was burned (burn_count)
-            fname = output_dir + '/burn_count_' + str(year) + '.img'
-            output_datasets[1] = driver.Create(fname, ncol, nrow, 1,  \
-                gdal.GDT_Int16)
-            output_datasets[1].SetGeoTransform(geotrans)
-            output_datasets[1].SetProjection(prj)
-            output_bands[1] = output_datasets[1].GetRasterBand(1)
-            output_bands[1].SetNoDataValue(nodata)
-            
-            # count of good looks (good_looks_count)
-            fname = output_dir + '/good_looks_count_' + str(year) + '.img'
-            output_datasets[2] = driver.Create(fname, ncol, nrow, 1,  \
-                gdal.GDT_Int16)
-            output_datasets[2].SetGeoTransform(geotrans)
-            output_datasets[2].SetProjection(prj)
-            output_bands[2] = output_datasets[2].GetRasterBand(1)
-            output_bands[2].SetNoDataValue(nodata)
-            
-            # maximum burn probability (max_burn_prob)
-            fname = output_dir + '/max_burn_prob_' + str(year) + '.img'
-            output_datasets[3] = driver.Create(fname, ncol, nrow, 1,  \
-                gdal.GDT_Int16)
-            output_datasets[3].SetGeoTransform(geotrans)
-            output_datasets[3].SetProjection(prj)
-            output_bands[3] = output_datasets[3].GetRasterBand(1)
-            output_bands[3].SetNoDataValue(nodata)
-
-            # loop through the lines in the images
-            for y in range (0, nrow):
-                # create the arrays to hold input and output data (one line)
-                input_data = numpy.empty((stack3.shape[0], 2, 1, ncol),  \
-                    dtype=numpy.int16)
-                input_data.fill(nodata)
-
-                output_data = numpy.empty((1, 4, 1, ncol), dtype=numpy.int16)
-                output_data.fill(nodata)
-
-                # read input data for burn probs and burn classes
-                for i in range(0, stack3.shape[0]):
-                    input_data[i,0,:,:] = input_bands[i,0].ReadAsArray(  \
-                        0, y, ncol, 1)
-                    input_data[i,1,:,:] = input_bands[i,1].ReadAsArray(  \
-                        0, y, ncol, 1)
-
-                # find the maximum burn probability (using burn prob)
-                bp_max = numpy.apply_over_axes(numpy.max, input_data[:,0,:,:], \
-                    axes=[0])[0,:,:]
-
-                # find the count of burns - how many times a pixel burned
-                # (using burn class)
-                bc = numpy.apply_over_axes(numpy.sum,  \
-                    input_data[:,1,:,:] >= 1, axes=[0])[0,:,:]
-                bc[bp_max == nodata] = nodata
-    
-                # find the first date of burn (using burn class)
-                bdi = numpy.apply_over_axes(numpy.argmax,  \
-                    input_data[:,1,:,:] >= 1, axes=[0])[0,:,:]
-                
-                # convert bdi to julian date
-                bd = stack3['julian'][bdi]
-                bd[bc == 0] = 0
-                bd[bp_max == nodata] = nodata
-                
-                # find the number of good looks (using burn class)
-                gc = numpy.apply_over_axes(numpy.sum,  \
-                    input_data[:,1,:,:] >= 0, axes=[0])[0,:,:]
-                gc[bp_max == nodata] = nodata
-            
-                # write output data for the burned area DOY, burn count, good
-                # looks count, and the maximum burn probability
-                output_bands[0].WriteArray(bd, xoff=0, yoff=y)
-                output_bands[1].WriteArray(bc, xoff=0, yoff=y)
-                output_bands[2].WriteArray(gc, xoff=0, yoff=y)
-                output_bands[3].WriteArray(bp_max, xoff=0, yoff=y)
-
-            # close the input datasets 
-            for i in range(0, stack3.shape[0]):
-                input_datasets[i,0] = None
-                input_bands[i,0] = None
-                input_datasets[i,1] = None
-                input_bands[i,1] = None
-
-            # close the output datasets 
-            output_datasets[0] = None
-            output_datasets[1] = None
-            output_datasets[2] = None
-            output_datasets[3] = None
-            output_bands[0] = None
-            output_bands[1] = None
-            output_bands[2] = None
-            output_bands[3] = None
-        # end for year
+                os.chdir (mydir)
+                return ERROR
 
         # remove the .img.aux.xml files that are generated by GDAL as these
         # won't be delivered to the user
@@ -21,12 +21,25 @@
 #   Updated on 2/11/2015 by Gail Schmidt, USGS/EROS
 #       Modified the recfromcsv calls to not specify the datatype and to
 #       instead use the automatically-determined datatype from the read itself.
+#   Updated on 10/17/2026, USGS/EROS LSRD Project
+#       Modified to grow the seed patches by labeling the connected components
+#       of the flood fill pixels (hysteresis thresholding), rather than flood
+#       filling one pixel at a time.
+#       Modified to compute the region statistics for all the burn areas at
+#       once and write the raster attribute table a column at a time.
+#       Modified to optionally find the burn scars a band of lines at a time,
+#       merging the burn areas across the bands via union-find, for images
+#       which are too large to process at once.
+#       Modified to optionally sweep a grid of threshold settings, writing
+#       the burned area of each setting to a table.
 #############################################################################
 
 import sys
 import os
 import time
 import getopt
+import csv
+import tempfile
 import multiprocessing, Queue
 
 import numpy
@@ -39,6 +52,8 @@ from osgeo import ogr
 from osgeo import osr
 from osgeo import gdal_array
 from osgeo import gdalconst
+from union_find import *
+from threshold_sweep import *
 
 ERROR = 1
 SUCCESS = 0
@@ -231,8 +246,109 @@ class BurnAreaThreshold():
         return nFill
         
         
+    def hysteresisFill(self, input_image, seed_regions, seed_labels,
+        local_threshold=75, nodata=-9999):
+        """Flood fills the burned areas from all the seed regions at once.
+        Description: routine to find the pixels which floodFill would fill
+            from each of the specified seed regions, using connected
+            component labeling (hysteresis thresholding) instead of filling
+            one pixel at a time.  floodFill starts from the first pixel of the
+            seed region and adds the 4-connected neighbors which are above
+            the threshold, so the filled pixels are the connected components
+            of the pixels above the threshold which contain the starting
+            pixels.  The runtime doesn't depend on the size of the burned
+            areas.
+        
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+   
+        Args:
+          input_image - input image of burn probabilities
+          seed_regions - labeled image of the seed regions
+          seed_labels - labels of the seed regions to be flood filled
+          local_threshold - threshold to be used to add burn pixels from the
+              burn probability image to the burn classification; default is 75%
+          nodata - pixel value used to identify nodata pixels in the input image
+   
+        Returns:
+            filled - boolean image of the flood filled pixels
+   
+        Notes:
+          1. floodFill doesn't step from the second line (sample) back to the
+             first line (sample), but does step from the first line (sample)
+             to the second.  The first line and first sample are labeled
+             separately from the rest of the image so the filled pixels are
+             the same as those from floodFill.
+        """
+
+        (nrow, ncol) = input_image.shape
+
+        # pixels which can be flood filled
+        fill_pixels = (input_image <> nodata) & (input_image > local_threshold)
+
+        # floodFill starts from the first pixel, in raster order, of each seed
+        # region; nothing is filled if that pixel can't be filled
+        (labels, first) = numpy.unique(seed_regions.ravel(),  \
+            return_index=True)
+        first = first[numpy.in1d(labels, seed_labels)]
+        (rows, cols) = numpy.unravel_index(first, input_image.shape)
+        start = fill_pixels[rows, cols]
+        rows = rows[start]
+        cols = cols[start]
+
+        # label the connected components of the pixels which can be filled,
+        # keeping the first line and first sample separate
+        interior = fill_pixels.copy()
+        interior[0,:] = False
+        interior[:,0] = False
+        interior_regions = numpy.zeros_like(interior, dtype=numpy.int32)
+        scipy.ndimage.label(interior, output=interior_regions)
+        line_pixels = fill_pixels[0,:].copy()
+        line_pixels[0] = False
+        line_regions = numpy.zeros_like(line_pixels, dtype=numpy.int32)
+        scipy.ndimage.label(line_pixels, output=line_regions)
+        samp_pixels = fill_pixels[:,0].copy()
+        samp_pixels[0] = False
+        samp_regions = numpy.zeros_like(samp_pixels, dtype=numpy.int32)
+        scipy.ndimage.label(samp_pixels, output=samp_regions)
+
+        # fill the components of the first line and first sample which
+        # contain a starting pixel.  the first pixel of the image steps to
+        # both.
+        corner = numpy.any((rows == 0) & (cols == 0))
+        line_labels = line_regions[cols[rows == 0]]
+        samp_labels = samp_regions[rows[cols == 0]]
+        if corner and ncol > 1:
+            line_labels = numpy.append(line_labels, line_regions[1])
+        if corner and nrow > 1:
+            samp_labels = numpy.append(samp_labels, samp_regions[1])
+        line_filled = numpy.in1d(line_regions,  \
+            line_labels[line_labels > 0])
+        samp_filled = numpy.in1d(samp_regions,  \
+            samp_labels[samp_labels > 0])
+
+        # fill the components of the rest of the image which contain a
+        # starting pixel, or which are stepped to from the filled pixels of
+        # the first line and first sample
+        interior_labels = interior_regions[rows, cols]
+        if nrow > 1:
+            interior_labels = numpy.append(interior_labels,  \
+                interior_regions[1, line_filled])
+        if ncol > 1:
+            interior_labels = numpy.append(interior_labels,  \
+                interior_regions[samp_filled, 1])
+        filled = numpy.in1d(interior_regions,  \
+            interior_labels[interior_labels > 0]).reshape(input_image.shape)
+        filled[0,:] |= line_filled
+        filled[:,0] |= samp_filled
+        filled[0,0] = corner
+
+        return filled
+        
+        
     def findBurnScars(self, bp_image, seed_prob_thresh=97.5,
-        seed_size_thresh=5, flood_fill_prob_thresh=75, log_handler=None):
+        seed_size_thresh=5, flood_fill_prob_thresh=75, log_handler=None,
+        hysteresis=True):
         """Identify the seeds for burn scars from the input burn probabilities.
         Description: routine to find burn scars using the flood-fill approach.
           Seed pixels are found by using the seed threshold.  Any pixels with
@@ -253,6 +369,13 @@ class BurnAreaThreshold():
               deprecated 'properties' parameter.  Also changed the properties
               values to match the correct names of the dynamic list of props
               which is now created.
+          Updated on Oct. 17, 2026, USGS/EROS LSRD Project
+              Added the hysteresis mode, which grows all the seed areas at
+              once via hysteresisFill rather than flood filling each one a
+              pixel at a time.  The burn scars are the same.
+          Updated on Oct. 17, 2026, USGS/EROS LSRD Project
+              Modified to compute the region statistics via regionStatistics
+              and to write the RAT a column at a time.
         
         Args:
           bp_image - input image of burn probabilities
@@ -270,6 +393,9 @@ class BurnAreaThreshold():
               flood filling; default is 75%
           log_handler - file handler for the log file; if this is None then
               informational/error messages will be written to stdout
+          hysteresis - if True (default) then the seed areas are grown via
+              hysteresisFill, otherwise they are grown one at a time via
+              floodFill
         
         Returns:
           nFill - number of pixels that were flood filled
@@ -293,11 +419,24 @@ class BurnAreaThreshold():
         n_seed_labels = scipy.ndimage.label(bp_seeds, output=bp_seed_regions)
         msg = 'Found %d seeds to use for flood fill' % n_seed_labels
         logIt (msg, log_handler)
-        
-        # get list of region pixel coordinates, use the first pixel from each
-        # as the seed for the region
-        bp_region_coords = skimage.measure.regionprops(  \
-            label_image=bp_seed_regions)
+
+        # grow all the seed regions which are at least the seed size
+        # threshold at once
+        if hysteresis:
+            seed_area = numpy.bincount(bp_seed_regions.ravel())
+            seed_labels = numpy.nonzero(seed_area >= seed_size_thresh)[0]
+            seed_labels = seed_labels[seed_labels > 0]
+            bc2 = self.hysteresisFill(input_image=bp_image,  \
+                seed_regions=bp_seed_regions, seed_labels=seed_labels,  \
+                local_threshold=flood_fill_prob_thresh, nodata=-9999)
+
+            # there are no regions left to flood fill one at a time
+            bp_region_coords = []
+        else:
+            # get list of region pixel coordinates, use the first pixel from
+            # each as the seed for the region
+            bp_region_coords = skimage.measure.regionprops(  \
+                label_image=bp_seed_regions)
 
         # loop through regions and flood fill to expand them where they are of
         # an appropriate size
@@ -325,15 +464,102 @@ class BurnAreaThreshold():
                     print 'First coordinate:', temp_coords
                     print 'Filled pixels:', nFilled
         
+        if not hysteresis:
+            bc2 = bp_regions > 0
         
         # find region properties for the flood filled burn areas
-        bc2 = bp_regions > 0
         bp_regions2 = numpy.zeros_like(bc2, dtype=numpy.int32)
         n_labels = scipy.ndimage.label(bc2, output=bp_regions2)
+        bp_region2_props = self.regionStatistics(label_image=bp_regions2,  \
+            n_labels=n_labels, intensity_image=bp_image)
+        label_rat = self.regionRAT(bp_region2_props, n_labels)
+        
+        return ([bp_regions2, label_rat])
+
+
+    def regionStatistics(self, label_image, n_labels, intensity_image):
+        """Computes the statistics of the labeled burn areas.
+        Description: routine to compute the area, filled area, and the
+            maximum, mean, and minimum intensity of every labeled region at
+            once, rather than one region at a time.  The values are the same
+            as those of skimage.measure.regionprops.  The filled area is the
+            area once the holes in the region (within its bounding box, with
+            8-connected background) are filled.  Only the regions which can
+            have a hole are hole filled.
+        
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+        
+        Args:
+          label_image - labeled image of the regions, labeled 1 to n_labels
+          n_labels - number of labeled regions
+          intensity_image - intensity image for the region statistics
+        
+        Returns:
+          props - dictionary of arrays, indexed by label - 1, of the label
+              (int32) and of the area, filled_area, max_intensity,
+              mean_intensity, and min_intensity (float64) of each region
+        """
+
+        labels = numpy.arange(1, n_labels+1, dtype=numpy.int32)
+        flat_labels = label_image.ravel()
+        area = numpy.bincount(flat_labels, minlength=n_labels+1)[1:]
+        intensity_sum = numpy.bincount(flat_labels,  \
+            weights=intensity_image.ravel().astype(numpy.float64),  \
+            minlength=n_labels+1)[1:]
+
+        props = {}
+        props['label'] = labels
+        props['area'] = area.astype(numpy.float64)
+        props['filled_area'] = area.astype(numpy.float64)
+        props['mean_intensity'] = intensity_sum / numpy.maximum(area, 1)
+        props['max_intensity'] = numpy.zeros(n_labels, dtype=numpy.float64)
+        props['min_intensity'] = numpy.zeros(n_labels, dtype=numpy.float64)
+        if n_labels == 0:
+            return props
+        props['max_intensity'][:] = scipy.ndimage.maximum(intensity_image,  \
+            label_image, labels)
+        props['min_intensity'][:] = scipy.ndimage.minimum(intensity_image,  \
+            label_image, labels)
+
+        # a region can only have a hole if its bounding box has an interior
+        # which isn't completely covered by the region, and it has enough
+        # pixels to surround a hole
+        slices = scipy.ndimage.find_objects(label_image, max_label=n_labels)
+        strel_8 = numpy.ones((3, 3), dtype=numpy.uint8)
+        for i in range(0, n_labels):
+            nrow = slices[i][0].stop - slices[i][0].start
+            ncol = slices[i][1].stop - slices[i][1].start
+            if (nrow < 3) or (ncol < 3) or (area[i] < 8) or  \
+                (area[i] == nrow * ncol):
+                continue
+            region = label_image[slices[i]] == labels[i]
+            props['filled_area'][i] = numpy.count_nonzero(  \
+                scipy.ndimage.binary_fill_holes(region, strel_8))
+
+        return props
+    
+    
+    def regionRAT(self, props, n_labels):
+        """Creates the raster attribute table of the burn areas.
+        Description: routine to create the raster attribute table (RAT) of
+            the burn areas from their region statistics, writing the table a
+            column at a time.
+        
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+        
+        Args:
+          props - dictionary of the region statistics, as returned by
+              regionStatistics
+          n_labels - number of labeled regions
+        
+        Returns:
+          label_rat - raster attribute table of the burn areas
+        """
+
         prop_names = ['area','filled_area','max_intensity','mean_intensity',  \
             'min_intensity']
-        bp_region2_props = skimage.measure.regionprops(  \
-            label_image=bp_regions2, intensity_image=bp_image)
         
         # define the RAT (raster attribute table)
         #print 'Creating raster attribute table...'
@@ -348,20 +574,498 @@ class BurnAreaThreshold():
         # resize the RAT
         label_rat.SetRowCount(n_labels)
         
-        # set values in the RAT
+        # set values in the RAT, a column at a time
         #print 'Populating raster attribute table...'
-        for i in range(0, n_labels):
+        if n_labels > 0:
             # label id
-            label_rat.SetValueAsInt(i, 0, bp_region2_props[i]['label'])
+            label_rat.WriteArray(props['label'], 0)
             
             for j in range(0, len(prop_names)):
                 temp_prop = prop_names[j]
-                label_rat.SetValueAsDouble(i, j+1,  \
-                    float(bp_region2_props[i][temp_prop]))
+                label_rat.WriteArray(props[temp_prop], j+1)
         
-        return ([bp_regions2, label_rat])
-    
-    
+        return label_rat
+
+
+    def bandFillNodes(self, bp_rows, first_line, uf=None, bases=None,
+        local_threshold=75, nodata=-9999):
+        """Labels the pixels which can be flood filled in a band of lines.
+        Description: routine to label the pixels of a band of lines which can
+            be flood filled, in the same way as hysteresisFill.  The first
+            line and the first sample of the image are labeled separately
+            from the rest of the image.  Each label is a node of the
+            union-find structure, so the labels of the bands can be merged
+            across the seams between the bands.  The labeling of a band is
+            the same each time it is done, so the nodes of a band can be
+            found again from the bases of its labels.
+        
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+        
+        Args:
+          bp_rows - band of lines of the burn probabilities
+          first_line - line in the image of the first line of the band
+          uf - unionFind to add the nodes to; not used if bases is specified
+          bases - ids of the first interior, first sample, and first line
+              nodes of the band, as returned by a previous call
+          local_threshold - threshold to be used to add burn pixels from the
+              burn probability image to the burn classification; default is 75%
+          nodata - pixel value used to identify nodata pixels in the input image
+        
+        Returns:
+          nodes - node id of each pixel of the band; -1 if the pixel can't be
+              filled and -2 for the first pixel of the image, if it can be
+              filled
+          bases - ids of the first interior, first sample, and first line
+              nodes of the band
+        """
+
+        fill_pixels = (bp_rows <> nodata) & (bp_rows > local_threshold)
+
+        interior = fill_pixels.copy()
+        interior[:,0] = False
+        samp_pixels = fill_pixels[:,0].copy()
+        if first_line == 0:
+            interior[0,:] = False
+            samp_pixels[0] = False
+            line_pixels = fill_pixels[0,:].copy()
+            line_pixels[0] = False
+        else:
+            line_pixels = numpy.zeros(0, dtype=bool)
+        interior_regions = numpy.zeros_like(interior, dtype=numpy.int32)
+        n_interior = scipy.ndimage.label(interior, output=interior_regions)
+        samp_regions = numpy.zeros_like(samp_pixels, dtype=numpy.int32)
+        n_samp = scipy.ndimage.label(samp_pixels, output=samp_regions)
+        line_regions = numpy.zeros_like(line_pixels, dtype=numpy.int32)
+        n_line = 0
+        if first_line == 0:
+            n_line = scipy.ndimage.label(line_pixels, output=line_regions)
+
+        if bases is None:
+            bases = (uf.add(n_interior), uf.add(n_samp), uf.add(n_line))
+
+        nodes = numpy.where(interior_regions > 0,  \
+            interior_regions + (bases[0] - 1), -1).astype(numpy.int64)
+        nodes[:,0] = numpy.where(samp_regions > 0,  \
+            samp_regions + (bases[1] - 1), -1)
+        if first_line == 0:
+            nodes[0,:] = numpy.where(line_regions > 0,  \
+                line_regions + (bases[2] - 1), -1)
+            if fill_pixels[0,0]:
+                nodes[0,0] = -2
+            else:
+                nodes[0,0] = -1
+
+        return (nodes, bases)
+
+
+    def bandFilledRegions(self, bp_rows, first_line, fill_bases,
+        reached_nodes, reached_corner, local_threshold=75, nodata=-9999):
+        """Labels the flood filled burn areas in a band of lines.
+        Description: routine to find the flood filled pixels of a band of
+            lines from the nodes reached by the seed regions, and to label
+            their connected components within the band.
+        
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+        
+        Args:
+          bp_rows - band of lines of the burn probabilities
+          first_line - line in the image of the first line of the band
+          fill_bases - bases of the flood fill nodes of the band
+          reached_nodes - boolean array of the flood fill nodes which are
+              reached from the seed regions
+          reached_corner - True if the first pixel of the image is filled
+          local_threshold - threshold to be used to add burn pixels from the
+              burn probability image to the burn classification; default is 75%
+          nodata - pixel value used to identify nodata pixels in the input image
+        
+        Returns:
+          regions - labeled image of the flood filled pixels of the band
+          n_regions - number of labeled regions in the band
+        """
+
+        (nodes, bases) = self.bandFillNodes(bp_rows, first_line,  \
+            bases=fill_bases, local_threshold=local_threshold, nodata=nodata)
+        filled = numpy.zeros(nodes.shape, dtype=bool)
+        filled[nodes >= 0] = reached_nodes[nodes[nodes >= 0]]
+        if first_line == 0:
+            filled[0,0] = reached_corner
+        regions = numpy.zeros_like(filled, dtype=numpy.int32)
+        n_regions = scipy.ndimage.label(filled, output=regions)
+        return (regions, n_regions)
+
+
+    def tiledBurnScars(self, bp_band, bc_band, nrow, ncol, tile_lines,
+        seed_prob_thresh=97.5, seed_size_thresh=5, flood_fill_prob_thresh=75,
+        log_handler=None):
+        """Finds the burn scars a band of lines at a time.
+        Description: routine to find the burn scars, as done by findBurnScars
+            in hysteresis mode, without holding the whole burn probability
+            image in memory.  The image is read in bands of lines, and the
+            connected components of each band are merged with those of the
+            previous band across the seam between them using union-find.
+            The first pass finds the seed regions and the components of the
+            pixels which can be flood filled, and resolves which of those
+            components are reached from the seed regions.  The second pass
+            labels the flood filled burn areas and gathers their statistics,
+            and resolves their global labels, which are numbered in the same
+            order as the labels of the whole image.  The third pass writes
+            the burn classification.  The labels are also written to a
+            temporary file, from which the holes of the burn areas are
+            filled for the filled area.  The results are the same as those
+            of findBurnScars.
+        
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+        
+        Args:
+          bp_band - GDAL band of the burn probabilities
+          bc_band - GDAL band of the burn classification to write
+          nrow - number of lines in the image
+          ncol - number of samples in the image
+          tile_lines - number of lines in each band of lines
+          seed_prob_thresh - threshold to be used to identify burn pixels
+              in the burn probability image as seed pixels for the burn area;
+              default is 97.5%
+          seed_size_thresh - threshold to be used to identify burn areas in the
+              probability image; default is 5 pixels
+          flood_fill_prob_thresh - threshold to be used to add burn pixels
+              from the burn probability image to the burn classification via
+              flood filling; default is 75%
+          log_handler - file handler for the log file; if this is None then
+              informational/error messages will be written to stdout
+        
+        Returns:
+          label_rat - raster attribute table of the burn areas
+        """
+
+        # first pass: label the seed regions and the pixels which can be
+        # flood filled, and merge them across the seams
+        seed_uf = unionFind()
+        fill_uf = unionFind()
+        fill_bases = []
+        seed_area = []
+        seed_first = []
+        seed_start = []
+        edge_src = []
+        edge_dst = []
+        corner_targets = []
+        corner_fill = False
+        prev_seeds = None
+        prev_nodes = None
+        for y in range(0, nrow, tile_lines):
+            nlines = min(tile_lines, nrow - y)
+            bp_rows = bp_band.ReadAsArray(0, y, ncol, nlines)
+
+            # seed regions of the band and where each one starts
+            seed_regions = numpy.zeros_like(bp_rows, dtype=numpy.int32)
+            n_seeds = scipy.ndimage.label(bp_rows >= seed_prob_thresh,  \
+                output=seed_regions)
+            seed_base = seed_uf.add(n_seeds)
+            seeds = seed_regions.astype(numpy.int64) + (seed_base - 1)
+            seeds[seed_regions == 0] = -1
+            (labels, first) = numpy.unique(seed_regions.ravel(),  \
+                return_index=True)
+            first = first[labels > 0]
+            seed_area.append(numpy.bincount(seed_regions.ravel(),  \
+                minlength=n_seeds+1)[1:])
+            seed_first.append(first + y * ncol)
+
+            # pixels which can be flood filled, and the node of the first
+            # pixel of each seed region
+            (nodes, bases) = self.bandFillNodes(bp_rows, y, uf=fill_uf,  \
+                local_threshold=flood_fill_prob_thresh, nodata=-9999)
+            fill_bases.append(bases)
+            seed_start.append(nodes.ravel()[first])
+
+            # merge the seed regions and the flood fill components across the
+            # seam with the previous band.  the first line only steps to the
+            # second line, so those are kept as edges.
+            if prev_seeds is not None:
+                merge = (prev_seeds >= 0) & (seeds[0] >= 0)
+                seed_uf.union(prev_seeds[merge], seeds[0][merge])
+                merge = (prev_nodes >= 0) & (nodes[0] >= 0)
+                if y == 1:
+                    merge[0] = False
+                    edge_src.append(prev_nodes[merge])
+                    edge_dst.append(nodes[0][merge])
+                    if corner_fill:
+                        corner_targets.append(nodes[0,0])
+                else:
+                    fill_uf.union(prev_nodes[merge], nodes[0][merge])
+            if y == 0:
+                corner_fill = (nodes[0,0] == -2)
+                if corner_fill and ncol > 1:
+                    corner_targets.append(nodes[0,1])
+                if nlines > 1:
+                    merge = (nodes[0] >= 0) & (nodes[1] >= 0)
+                    merge[0] = False
+                    edge_src.append(nodes[0][merge])
+                    edge_dst.append(nodes[1][merge])
+                    if corner_fill:
+                        corner_targets.append(nodes[1,0])
+
+            # the first sample only steps to the second sample
+            if ncol > 1:
+                merge = (nodes[:,0] >= 0) & (nodes[:,1] >= 0)
+                edge_src.append(nodes[:,0][merge])
+                edge_dst.append(nodes[:,1][merge])
+
+            prev_seeds = seeds[-1].copy()
+            prev_nodes = nodes[-1].copy()
+            bp_rows = seed_regions = seeds = nodes = None
+
+        # resolve the seed regions; each starts from its first pixel, in
+        # raster order, and is grown if it is at least the seed size
+        seed_roots = seed_uf.roots()
+        seed_area = numpy.concatenate(seed_area)
+        seed_first = numpy.concatenate(seed_first)
+        seed_start = numpy.concatenate(seed_start)
+        root_area = numpy.bincount(seed_roots, weights=seed_area,  \
+            minlength=seed_uf.size)
+        order = numpy.lexsort((seed_first, seed_roots))
+        first_piece = numpy.ones(len(order), dtype=bool)
+        first_piece[1:] = seed_roots[order][1:] <> seed_roots[order][:-1]
+        starts = order[first_piece]
+        msg = 'Found %d seeds to use for flood fill' % len(starts)
+        logIt (msg, log_handler)
+        starts = starts[root_area[seed_roots[starts]] >= seed_size_thresh]
+        start_nodes = seed_start[starts]
+
+        # resolve the flood fill components reached from the seed regions,
+        # then those stepped to from the first line and first sample
+        fill_roots = fill_uf.roots()
+        reached = numpy.zeros(fill_uf.size, dtype=bool)
+        reached[fill_roots[start_nodes[start_nodes >= 0]]] = True
+        reached_corner = bool(numpy.any(start_nodes == -2))
+        if reached_corner:
+            corner_targets = numpy.array(corner_targets, dtype=numpy.int64)
+            corner_targets = corner_targets[corner_targets >= 0]
+            reached[fill_roots[corner_targets]] = True
+        if len(edge_src) > 0:
+            edge_src = numpy.concatenate(edge_src)
+            edge_dst = numpy.concatenate(edge_dst)
+            step = reached[fill_roots[edge_src]]
+            reached[fill_roots[edge_dst[step]]] = True
+        reached_nodes = reached[fill_roots]
+        seed_uf = seed_roots = root_area = fill_roots = reached = None
+
+        # second pass: label the flood filled burn areas, merge them across
+        # the seams, and gather their statistics
+        region_uf = unionFind()
+        region_bases = []
+        stats = {}
+        for key in ['area', 'sum', 'min', 'max', 'first', 'row0', 'row1',  \
+            'col0', 'col1']:
+            stats[key] = []
+        prev_regions = None
+        for (i, y) in enumerate(range(0, nrow, tile_lines)):
+            nlines = min(tile_lines, nrow - y)
+            bp_rows = bp_band.ReadAsArray(0, y, ncol, nlines)
+            (regions, n_regions) = self.bandFilledRegions(bp_rows, y,  \
+                fill_bases[i], reached_nodes, reached_corner,  \
+                local_threshold=flood_fill_prob_thresh, nodata=-9999)
+            region_base = region_uf.add(n_regions)
+            region_bases.append(region_base)
+            region_ids = regions.astype(numpy.int64) + (region_base - 1)
+            region_ids[regions == 0] = -1
+            if prev_regions is not None:
+                merge = (prev_regions >= 0) & (region_ids[0] >= 0)
+                region_uf.union(prev_regions[merge], region_ids[0][merge])
+            prev_regions = region_ids[-1].copy()
+
+            if n_regions > 0:
+                labels = numpy.arange(1, n_regions+1)
+                stats['area'].append(numpy.bincount(regions.ravel(),  \
+                    minlength=n_regions+1)[1:])
+                stats['sum'].append(numpy.bincount(regions.ravel(),  \
+                    weights=bp_rows.ravel().astype(numpy.float64),  \
+                    minlength=n_regions+1)[1:])
+                stats['min'].append(numpy.asarray(scipy.ndimage.minimum(  \
+                    bp_rows, regions, labels), dtype=numpy.float64))
+                stats['max'].append(numpy.asarray(scipy.ndimage.maximum(  \
+                    bp_rows, regions, labels), dtype=numpy.float64))
+                (labels, first) = numpy.unique(regions.ravel(),  \
+                    return_index=True)
+                stats['first'].append(first[labels > 0] + y * ncol)
+                slices = scipy.ndimage.find_objects(regions)
+                stats['row0'].append(numpy.array(  \
+                    [s[0].start + y for s in slices]))
+                stats['row1'].append(numpy.array(  \
+                    [s[0].stop + y for s in slices]))
+                stats['col0'].append(numpy.array([s[1].start for s in slices]))
+                stats['col1'].append(numpy.array([s[1].stop for s in slices]))
+            bp_rows = regions = region_ids = None
+
+        # resolve the global labels of the burn areas, numbered in raster
+        # order of their first pixels as for the whole image, and combine
+        # the statistics of their pieces
+        region_roots = region_uf.roots()
+        for key in stats.keys():
+            if len(stats[key]) > 0:
+                stats[key] = numpy.concatenate(stats[key])
+            else:
+                stats[key] = numpy.zeros(0, dtype=numpy.int64)
+        root_first = numpy.zeros(region_uf.size, dtype=numpy.int64)
+        root_first[:] = nrow * ncol
+        numpy.minimum.at(root_first, region_roots, stats['first'])
+        roots = numpy.unique(region_roots)
+        roots = roots[numpy.argsort(root_first[roots])]
+        n_labels = len(roots)
+        root_label = numpy.zeros(region_uf.size, dtype=numpy.int32)
+        root_label[roots] = numpy.arange(1, n_labels+1)
+        region_labels = numpy.zeros(region_uf.size + 1, dtype=numpy.int32)
+        region_labels[1:] = root_label[region_roots]
+        piece_labels = region_labels[1:] - 1
+
+        props = {}
+        props['label'] = numpy.arange(1, n_labels+1, dtype=numpy.int32)
+        props['area'] = numpy.bincount(piece_labels, weights=stats['area'],  \
+            minlength=n_labels)
+        props['mean_intensity'] = numpy.bincount(piece_labels,  \
+            weights=stats['sum'], minlength=n_labels) /  \
+            numpy.maximum(props['area'], 1)
+        props['min_intensity'] = numpy.zeros(n_labels, dtype=numpy.float64)
+        props['min_intensity'][:] = numpy.inf
+        numpy.minimum.at(props['min_intensity'], piece_labels, stats['min'])
+        props['max_intensity'] = numpy.zeros(n_labels, dtype=numpy.float64)
+        props['max_intensity'][:] = -numpy.inf
+        numpy.maximum.at(props['max_intensity'], piece_labels, stats['max'])
+        bbox = {}
+        for key in ['row0', 'col0']:
+            bbox[key] = numpy.zeros(n_labels, dtype=numpy.int64)
+            bbox[key][:] = max(nrow, ncol)
+            numpy.minimum.at(bbox[key], piece_labels, stats[key])
+        for key in ['row1', 'col1']:
+            bbox[key] = numpy.zeros(n_labels, dtype=numpy.int64)
+            numpy.maximum.at(bbox[key], piece_labels, stats[key])
+        region_uf = region_roots = root_first = root_label = stats = None
+
+        # third pass: write the burn classification, with the labels of the
+        # burn areas and the negative (fill) burn probabilities.  the labels
+        # are also kept in a temporary file for filling the holes.
+        (label_fd, label_file) = tempfile.mkstemp(suffix='_labels.dat',  \
+            dir=self.output_dir)
+        os.close(label_fd)
+        label_image = numpy.memmap(label_file, dtype=numpy.int32, mode='w+',  \
+            shape=(nrow, ncol))
+        for (i, y) in enumerate(range(0, nrow, tile_lines)):
+            nlines = min(tile_lines, nrow - y)
+            bp_rows = bp_band.ReadAsArray(0, y, ncol, nlines)
+            (regions, n_regions) = self.bandFilledRegions(bp_rows, y,  \
+                fill_bases[i], reached_nodes, reached_corner,  \
+                local_threshold=flood_fill_prob_thresh, nodata=-9999)
+            regions = numpy.where(regions > 0,  \
+                region_labels[regions + region_bases[i]], 0)
+            label_image[y:y+nlines,:] = regions
+            bp_scars = regions.astype(numpy.int32)
+            bp_scars[bp_rows < 0] = bp_rows[bp_rows < 0]
+            bc_band.WriteArray(bp_scars, 0, y)
+            bp_rows = regions = bp_scars = None
+        label_image.flush()
+
+        # fill the holes of the burn areas which can have holes, as done by
+        # regionStatistics
+        props['filled_area'] = props['area'].copy()
+        nrows = bbox['row1'] - bbox['row0']
+        ncols = bbox['col1'] - bbox['col0']
+        holes = numpy.nonzero((nrows >= 3) & (ncols >= 3) &  \
+            (props['area'] >= 8) & (props['area'] < nrows * ncols))[0]
+        strel_8 = numpy.ones((3, 3), dtype=numpy.uint8)
+        for i in holes:
+            region = label_image[bbox['row0'][i]:bbox['row1'][i],  \
+                bbox['col0'][i]:bbox['col1'][i]] == props['label'][i]
+            props['filled_area'][i] = numpy.count_nonzero(  \
+                scipy.ndimage.binary_fill_holes(region, strel_8))
+        label_image = None
+        os.remove(label_file)
+
+        return self.regionRAT(props, n_labels)
+
+
+    def sceneThresholdSweep(self, bp_file, bp_band, geotrans, prj, nodata):
+        """Sweeps the burn threshold settings on the current scene.
+        Description: sceneThresholdSweep builds the threshold sweep
+            structure for the current burn probability file, then writes the
+            burned pixels and burned area for each threshold setting of the
+            sweep grid to the scene's threshold sweep table.  The burn
+            classifications are also written for the chosen settings.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+        
+        Args:
+          bp_file - name of burn probability file to process
+          bp_band - GDAL band of the burn probabilities
+          geotrans - geographic transform of the burn probabilities
+          prj - projection of the burn probabilities
+          nodata - fill or nodata data value for the burn classifications
+        
+        Returns:
+            ERROR - error writing the threshold sweep table
+            SUCCESS - successful processing
+        """
+
+        bp_data = bp_band.ReadAsArray()
+
+        # the structure covers the settings of the chosen rasters as well
+        seed_probs = list(self.sweep_seed_prob)
+        flood_probs = list(self.sweep_flood_fill_prob)
+        for (seed_prob, seed_size, flood_prob) in self.sweep_rasters:
+            if seed_prob not in seed_probs:
+                seed_probs.append(seed_prob)
+            if flood_prob not in flood_probs:
+                flood_probs.append(flood_prob)
+        sweep = thresholdSweep(bp_data, seed_probs, flood_probs,  \
+            nodata=-9999)
+
+        # burned pixels and area for each setting of the sweep grid
+        sweep_file = self.output_dir + '/' + os.path.basename(bp_file).  \
+            replace('burn_probability.img', THRESHOLD_SWEEP_SUFFIX)
+        try:
+            fd = open(sweep_file, 'w')
+        except IOError:
+            msg = 'Could not create the threshold sweep table: ' + sweep_file
+            logIt (msg, self.log_handler)
+            return ERROR
+        pixel_area = abs(geotrans[1] * geotrans[5])
+        writer = csv.writer(fd)
+        writer.writerow(THRESHOLD_SWEEP_HEADER)
+        for seed_prob in self.sweep_seed_prob:
+            for flood_prob in self.sweep_flood_fill_prob:
+                burned = sweep.burnedPixels(seed_prob, self.sweep_seed_size,  \
+                    flood_prob)
+                for i in range(0, len(self.sweep_seed_size)):
+                    writer.writerow([seed_prob, self.sweep_seed_size[i],  \
+                        flood_prob, burned[i], burned[i] * pixel_area])
+        fd.close()
+
+        # burn classifications for the chosen settings, named by setting
+        for (seed_prob, seed_size, flood_prob) in self.sweep_rasters:
+            seed_size = int(seed_size)
+            bc2 = sweep.burnedImage(seed_prob, seed_size, flood_prob)
+            bp_regions2 = numpy.zeros_like(bc2, dtype=numpy.int32)
+            n_labels = scipy.ndimage.label(bc2, output=bp_regions2)
+            bc2 = None
+            props = self.regionStatistics(label_image=bp_regions2,  \
+                n_labels=n_labels, intensity_image=bp_data)
+            label_rat = self.regionRAT(props, n_labels)
+            bp_regions2[bp_data < 0] = bp_data[bp_data < 0]
+
+            fname = os.path.basename(bp_file).replace(  \
+                'burn_probability.img', 'burn_class_s%g_z%d_f%g.img' %  \
+                (seed_prob, seed_size, flood_prob))
+            bc_file_name = self.output_dir + '/' + fname
+            msg = 'Writing output to %s ... ' % bc_file_name
+            logIt (msg, self.log_handler)
+            self.writeResults(outputData=bp_regions2,
+                outputFilename=bc_file_name, geotrans=geotrans, prj=prj,
+                nodata=nodata, outputRAT=label_rat)
+
+        return SUCCESS
+
+
     def sceneBurnThreshold(self, bp_file):
         """Runs the burn thresholding on the current scene.
         Description: sceneBurnThreshold will run the burn thresholding
@@ -372,6 +1076,12 @@ class BurnAreaThreshold():
               Geographic Science Center
           Updated on 4/10/2014 by Gail Schmidt, USGS/EROS LSRD Project
               Modified to run as a multi-threaded process.
+          Updated on Oct. 17, 2026, USGS/EROS LSRD Project
+              Modified to find the burn scars a band of lines at a time via
+              tiledBurnScars if tile_lines is specified.
+          Updated on Oct. 17, 2026, USGS/EROS LSRD Project
+              Modified to sweep the threshold settings via
+              sceneThresholdSweep in sweep mode.
         
         Args:
           bp_file - name of burn probability file to process
@@ -432,6 +1142,33 @@ class BurnAreaThreshold():
                 (bp_file, nodata)
             logIt (msg, self.log_handler)
             
+        # sweep the threshold settings rather than finding the burn scars
+        if self.sweep:
+            return self.sceneThresholdSweep(bp_file, bp_band, geotrans, prj,  \
+                nodata)
+
+        # find the burn scars a band of lines at a time, writing the burn
+        # classifications as they go
+        if self.tile_lines is not None:
+            driver = gdal.GetDriverByName('ENVI')
+            bc_dataset = driver.Create(bc_file_name, ncol, nrow, 1,  \
+                gdal.GDT_Int16)
+            bc_dataset.SetGeoTransform(geotrans)
+            bc_dataset.SetProjection(prj)
+            bc_band = bc_dataset.GetRasterBand(1)
+            bc_band.SetNoDataValue(nodata)
+
+            msg = 'Writing output to %s ... ' % bc_file_name
+            logIt (msg, self.log_handler)
+            label_rat = self.tiledBurnScars(bp_band, bc_band, nrow, ncol,  \
+                self.tile_lines, self.seed_prob_thresh,  \
+                self.seed_size_thresh, self.flood_fill_prob_thresh,  \
+                self.log_handler)
+            bc_band.SetDefaultRAT(label_rat)
+            bc_band = None
+            bc_dataset = None
+            return SUCCESS
+
         # array to hold burn scars
         bp_scars = numpy.zeros((nrow, ncol))
         bp_rats = []
@@ -442,7 +1179,7 @@ class BurnAreaThreshold():
         # find the final burn scars from the burn probabilities
         bp_scar_results = self.findBurnScars(bp_data, self.seed_prob_thresh,
             self.seed_size_thresh, self.flood_fill_prob_thresh,
-            self.log_handler)
+            self.log_handler, not self.flood_fill)
         bp_scars = bp_scar_results[0]
         bp_scars[ bp_data < 0 ] = bp_data[ bp_data < 0 ]
         bp_rats.append(bp_scar_results[1])
@@ -460,7 +1197,9 @@ class BurnAreaThreshold():
     def runBurnThreshold(self, stack_file=None, input_dir=None,
         output_dir=None, start_year=None, end_year=None, seed_prob_thresh=97.5,
         seed_size_thresh=5, flood_fill_prob_thresh=75, num_processors=1,
-        logfile=None):
+        logfile=None, flood_fill=False, tile_lines=None,
+        sweep_seed_prob=None, sweep_seed_size=None,
+        sweep_flood_fill_prob=None, sweep_rasters=None):
         """Runs the burn thresholding algorithm to find the burn scars from the
            input burn probabilities.
         Description: routine to find the burn scars using the flood-fill
@@ -482,6 +1221,19 @@ class BurnAreaThreshold():
               is deprecated.
           Updated on April 13, 2014 by Gail Schmidt, USGS/EROS LSRD Project
               Modified to utilize the ESPA internal file format.
+          Updated on Oct. 17, 2026, USGS/EROS LSRD Project
+              Modified to grow the seed areas via hysteresis thresholding by
+              default, with the flood_fill option to use the original flood
+              fill.
+          Updated on Oct. 17, 2026, USGS/EROS LSRD Project
+              Added the tile_lines option to find the burn scars a band of
+              lines at a time.
+          Updated on Oct. 17, 2026, USGS/EROS LSRD Project
+              Added the sweep mode, which writes the burned area for a grid
+              of threshold settings rather than the burn classifications.
+          Updated on Oct. 17, 2026, USGS/EROS LSRD Project
+              Modified sweep_rasters to turn on the sweep mode by itself
+              rather than being ignored without a sweep list.
 
         Args:
           stack_file - input CSV file with information about the files to be
@@ -509,6 +1261,28 @@ class BurnAreaThreshold():
               processing sections of the application
           logfile - name of the logfile for logging information; if None then
               the output will be written to stdout
+          flood_fill - if True then the seed areas are grown one pixel at a
+              time via floodFill rather than via hysteresisFill; the burn
+              scars are the same, but the flood fill is much slower for large
+              burn scars
+          tile_lines - if specified then the burn scars are found this many
+              lines at a time, without reading the whole burn probability
+              image into memory; the burn scars are the same.  Not used with
+              flood_fill.
+          sweep_seed_prob - list of the seed probability thresholds to sweep;
+              if any of the sweep lists are specified then the burned area
+              for each setting of the sweep grid is written to a threshold
+              sweep table per scene, and to the combined threshold sweep
+              table, rather than writing the burn classifications.  The sweep
+              lists which aren't specified only hold the corresponding
+              threshold.
+          sweep_seed_size - list of the seed size thresholds to sweep
+          sweep_flood_fill_prob - list of the flood fill probability
+              thresholds to sweep
+          sweep_rasters - list of the (seed_prob_thresh, seed_size_thresh,
+              flood_fill_prob_thresh) settings for which to write the burn
+              classifications in sweep mode; specifying any of them turns
+              on the sweep mode, like the sweep lists
         
         Returns:
             ERROR - error running the burn threshold application
@@ -568,6 +1342,38 @@ class BurnAreaThreshold():
                     '(default = 1, single threaded)')
             parser.add_argument ('-l', '--logfile', type=str, dest='logfile',
                 help='name of optional log file', metavar='FILE')
+            parser.add_argument ('--flood_fill', dest='flood_fill',
+                default=False, action='store_true',
+                help='grow the seed patches one pixel at a time via the '  \
+                    'original flood fill rather than via hysteresis '  \
+                    'thresholding; the results are the same')
+            parser.add_argument ('--tile_lines', type=int, dest='tile_lines',
+                help='number of lines to process at a time when finding '  \
+                    'the burn scars, for images which are too large to '  \
+                    'process at once; default is to process the whole '  \
+                    'image at once',
+                metavar='LINES')
+            parser.add_argument ('--sweep_seed_prob', type=float, nargs='+',
+                dest='sweep_seed_prob',
+                help='seed probability thresholds to sweep; sweeping any '  \
+                    'of the thresholds writes the burned area for each '  \
+                    'threshold setting to a table rather than writing the '  \
+                    'burn classifications',
+                metavar='THRESHOLD')
+            parser.add_argument ('--sweep_seed_size', type=int, nargs='+',
+                dest='sweep_seed_size',
+                help='seed size thresholds to sweep',
+                metavar='THRESHOLD')
+            parser.add_argument ('--sweep_flood_fill_prob', type=float,
+                nargs='+', dest='sweep_flood_fill_prob',
+                help='flood fill probability thresholds to sweep',
+                metavar='THRESHOLD')
+            parser.add_argument ('--sweep_raster', type=float, nargs=3,
+                dest='sweep_rasters', action='append',
+                help='threshold setting for which to write the burn '  \
+                    'classifications; turns on sweeping like the sweep '  \
+                    'thresholds and may be repeated',
+                metavar=('SEED_PROB', 'SEED_SIZE', 'FLOOD_FILL_PROB'))
 
             options = parser.parse_args()
 
@@ -605,6 +1411,16 @@ class BurnAreaThreshold():
             # number of processors
             if options.num_processors is not None:
                 num_processors = options.num_processors
+
+            flood_fill = options.flood_fill
+
+            if options.tile_lines is not None:
+                tile_lines = options.tile_lines
+
+            sweep_seed_prob = options.sweep_seed_prob
+            sweep_seed_size = options.sweep_seed_size
+            sweep_flood_fill_prob = options.sweep_flood_fill_prob
+            sweep_rasters = options.sweep_rasters
         else:
             num_processors = num_processors
 
@@ -616,6 +1432,29 @@ class BurnAreaThreshold():
         self.seed_prob_thresh = seed_prob_thresh
         self.seed_size_thresh = seed_size_thresh
         self.flood_fill_prob_thresh = flood_fill_prob_thresh
+        self.flood_fill = flood_fill
+        self.tile_lines = tile_lines
+        if flood_fill:
+            self.tile_lines = None
+
+        # the sweep grid; thresholds which aren't swept keep their setting.
+        # the chosen rasters needn't be on the grid, so they sweep by themselves
+        self.sweep = (sweep_seed_prob is not None) or  \
+            (sweep_seed_size is not None) or  \
+            (sweep_flood_fill_prob is not None) or  \
+            (sweep_rasters is not None and len(sweep_rasters) > 0)
+        if sweep_seed_prob is None:
+            sweep_seed_prob = [seed_prob_thresh]
+        if sweep_seed_size is None:
+            sweep_seed_size = [seed_size_thresh]
+        if sweep_flood_fill_prob is None:
+            sweep_flood_fill_prob = [flood_fill_prob_thresh]
+        if sweep_rasters is None:
+            sweep_rasters = []
+        self.sweep_seed_prob = sweep_seed_prob
+        self.sweep_seed_size = sweep_seed_size
+        self.sweep_flood_fill_prob = sweep_flood_fill_prob
+        self.sweep_rasters = sweep_rasters
 
         # validate options and arguments
         if start_year is not None:
@@ -630,6 +1469,12 @@ class BurnAreaThreshold():
                 logIt (msg, log_handler)
                 return ERROR
 
+        if tile_lines is not None:
+            if (tile_lines < 1):
+                msg = 'tile_lines must be at least 1: %d' % tile_lines
+                logIt (msg, log_handler)
+                return ERROR
+
         if (end_year is not None) & (start_year is not None):
             if end_year < start_year:
                 msg = 'end_year (%d) is less than start_year (%d)' %  \
@@ -732,6 +1577,35 @@ class BurnAreaThreshold():
                 logIt (msg, log_handler)
                 return ERROR
 
+        # combine the threshold sweep tables of the scenes
+        if self.sweep:
+            sweep_file = output_dir + '/' + THRESHOLD_SWEEP_FILE
+            msg = 'Writing the threshold sweep table to ' + sweep_file
+            logIt (msg, log_handler)
+            try:
+                with open(sweep_file, 'w') as sweep_fd:
+                    writer = csv.writer(sweep_fd)
+                    writer.writerow(['file'] + THRESHOLD_SWEEP_HEADER)
+                    for i in range(num_scenes):
+                        bp_file_name = stack2['file_'][i].replace('.xml',  \
+                            '_burn_probability.img')
+                        scene_file = output_dir + '/' +  \
+                            os.path.basename(bp_file_name).replace(  \
+                            'burn_probability.img', THRESHOLD_SWEEP_SUFFIX)
+                        with open(scene_file, 'r') as scene_fd:
+                            reader = csv.reader(scene_fd)
+                            reader.next()
+                            for row in reader:
+                                writer.writerow([bp_file_name] + row)
+            except (IOError, StopIteration), e:
+                msg = 'Error writing the threshold sweep table %s: %s' %  \
+                    (sweep_file, str(e))
+                logIt (msg, log_handler)
+                if logfile is not None:
+                    log_handler.close()
+                os.chdir (mydir)
+                return ERROR
+
         # successful completion.  return to the original directory.
         msg = 'Completion of burn threshold.'
         logIt (msg, log_handler)
@@ -0,0 +1,209 @@
+#! /usr/bin/env python
+#############################################################################
+# Created on October 17, 2026, USGS/EROS LSRD Project
+# Created module to determine the geographic (lat/long) bounding coordinates
+# of an image by walking its edges.  The edge points are built as numpy
+# arrays and transformed in bulk via TransformPoints, rather than calling
+# TransformPoint once per point.  The full walk visits every sample of the
+# top and bottom edges and every line of the left and right edges, one
+# extra sample and line to get the outer extents of the image.  The
+# adaptive walk starts with a few points per edge and only adds points
+# where the edge curves away from the straight line between them.
+#############################################################################
+
+import numpy
+
+# number of segments each edge starts with for the adaptive walk
+ADAPTIVE_EDGE_SEGMENTS = 8
+
+
+def edgeImageCoords (nlines, nsamps):
+    """Returns the image coordinates of the full edge walk.
+    Description: edgeImageCoords returns the sample and line of each point
+        on the top and bottom edges (samples 0 to nsamps) and the left and
+        right edges (lines 0 to nlines) of the image.
+
+    History:
+      Created on 10/17/2026, USGS/EROS LSRD Project
+
+    Args:
+      nlines - number of lines in the image
+      nsamps - number of samples in the image
+
+    Returns:
+        (image_x, image_y) - arrays of the samples and lines of the points
+    """
+
+    samps = numpy.arange (0, nsamps+1, dtype=numpy.float64)
+    lines = numpy.arange (0, nlines+1, dtype=numpy.float64)
+    image_x = numpy.concatenate ((samps, samps,  \
+        numpy.zeros_like (lines), numpy.zeros_like (lines) + nsamps))
+    image_y = numpy.concatenate ((numpy.zeros_like (samps),  \
+        numpy.zeros_like (samps) + nlines, lines, lines))
+    return (image_x, image_y)
+
+
+def transformImagePoints (image_x, image_y, transform, coord_tf):
+    """Transforms image coordinates to geographic coordinates in bulk.
+    Description: transformImagePoints converts the image coordinates to map
+        coordinates using the geotransform, then transforms all the map
+        coordinates in one TransformPoints call.
+
+    History:
+      Created on 10/17/2026, USGS/EROS LSRD Project
+
+    Args:
+      image_x - array of the samples of the points
+      image_y - array of the lines of the points
+      transform - geotransform array from GDAL GetGeoTransform()
+      coord_tf - osr.CoordinateTransformation from the map projection to
+          geographic coordinates
+
+    Returns:
+        (lon, lat) - arrays of the longitude and latitude of the points
+    """
+
+    map_x = transform[0] + image_x * transform[1] + image_y * transform[2]
+    map_y = transform[3] + image_x * transform[4] + image_y * transform[5]
+    if len (map_x) == 0:
+        return (numpy.zeros(0), numpy.zeros(0))
+
+    points = numpy.array (coord_tf.TransformPoints (  \
+        zip (map_x.tolist(), map_y.tolist())), dtype=numpy.float64)
+    return (points[:,0], points[:,1])
+
+
+def adaptiveEdgeBounds (nlines, nsamps, transform, coord_tf, tolerance):
+    """Transforms the points of the adaptive edge walk.
+    Description: adaptiveEdgeBounds starts each edge with
+        ADAPTIVE_EDGE_SEGMENTS segments.  Each pass transforms the midpoints
+        of all the segments at once, and splits the segments whose midpoint
+        is more than the tolerance from the straight line between its ends,
+        until no segment needs to be split or the segments are a pixel long.
+
+    History:
+      Created on 10/17/2026, USGS/EROS LSRD Project
+
+    Args:
+      nlines - number of lines in the image
+      nsamps - number of samples in the image
+      transform - geotransform array from GDAL GetGeoTransform()
+      coord_tf - osr.CoordinateTransformation from the map projection to
+          geographic coordinates
+      tolerance - largest allowed distance, in degrees, between the edge
+          and the straight line between the points of the walk
+
+    Returns:
+        (lon, lat) - arrays of the longitude and latitude of the points
+    """
+
+    # each edge (top, bottom, left, right) is walked by a position along it
+    edge_len = [nsamps, nsamps, nlines, nlines]
+    def edgePoints (positions):
+        image_x = numpy.concatenate ((positions[0], positions[1],  \
+            numpy.zeros_like (positions[2]),  \
+            numpy.zeros_like (positions[3]) + nsamps))
+        image_y = numpy.concatenate ((numpy.zeros_like (positions[0]),  \
+            numpy.zeros_like (positions[1]) + nlines, positions[2],  \
+            positions[3]))
+        return transformImagePoints (image_x, image_y, transform, coord_tf)
+
+    # start each edge with a few segments, all of which are to be checked
+    knots = []
+    active = []
+    for i in range (0, 4):
+        knots.append (numpy.unique (numpy.round (numpy.linspace (0,  \
+            edge_len[i], ADAPTIVE_EDGE_SEGMENTS + 1))))
+        active.append (numpy.ones (len (knots[i]) - 1, dtype=bool))
+    (lon, lat) = edgePoints (knots)
+    knot_lon = []
+    knot_lat = []
+    start = 0
+    for i in range (0, 4):
+        knot_lon.append (lon[start:start+len(knots[i])])
+        knot_lat.append (lat[start:start+len(knots[i])])
+        start += len(knots[i])
+    all_lon = [lon]
+    all_lat = [lat]
+
+    while True:
+        # midpoints of the segments to be checked which are more than a
+        # pixel long
+        mids = []
+        for i in range (0, 4):
+            split = numpy.nonzero (active[i] &  \
+                (numpy.diff (knots[i]) > 1))[0]
+            mids.append ((split, numpy.floor ((knots[i][split] +  \
+                knots[i][split+1]) / 2.0)))
+        if sum ([len (mid[0]) for mid in mids]) == 0:
+            break
+        (lon, lat) = edgePoints ([mid[1] for mid in mids])
+        all_lon.append (lon)
+        all_lat.append (lat)
+
+        # split the segments whose midpoint is off the straight line; only
+        # the halves of those segments are checked on the next pass
+        start = 0
+        for i in range (0, 4):
+            (split, mid) = mids[i]
+            mid_lon = lon[start:start+len(split)]
+            mid_lat = lat[start:start+len(split)]
+            start += len(split)
+            frac = (mid - knots[i][split]) /  \
+                (knots[i][split+1] - knots[i][split])
+            line_lon = knot_lon[i][split] + frac *  \
+                (knot_lon[i][split+1] - knot_lon[i][split])
+            line_lat = knot_lat[i][split] + frac *  \
+                (knot_lat[i][split+1] - knot_lat[i][split])
+            keep = (numpy.abs (mid_lon - line_lon) > tolerance) |  \
+                (numpy.abs (mid_lat - line_lat) > tolerance)
+            new_knot = numpy.concatenate ((numpy.zeros (len (knots[i]),  \
+                dtype=bool), numpy.ones (numpy.count_nonzero (keep),  \
+                dtype=bool)))
+            order = numpy.argsort (numpy.concatenate ((knots[i],  \
+                mid[keep])), kind='mergesort')
+            knots[i] = numpy.concatenate ((knots[i], mid[keep]))[order]
+            knot_lon[i] = numpy.concatenate ((knot_lon[i],  \
+                mid_lon[keep]))[order]
+            knot_lat[i] = numpy.concatenate ((knot_lat[i],  \
+                mid_lat[keep]))[order]
+            new_knot = new_knot[order]
+            active[i] = new_knot[:-1] | new_knot[1:]
+
+    return (numpy.concatenate (all_lon), numpy.concatenate (all_lat))
+
+
+def geographicBounds (nlines, nsamps, transform, coord_tf, tolerance=None):
+    """Determines the geographic bounding coordinates of an image.
+    Description: geographicBounds walks the edges of the image, one extra
+        sample and line to get the outer extents of the image vs. just the
+        UL of the outer edge, and returns the extents of the transformed
+        points.
+
+    History:
+      Created on 10/17/2026, USGS/EROS LSRD Project
+          Pulled from AnnualBurnSummary.createXML.
+
+    Args:
+      nlines - number of lines in the image
+      nsamps - number of samples in the image
+      transform - geotransform array from GDAL GetGeoTransform()
+      coord_tf - osr.CoordinateTransformation from the map projection to
+          geographic coordinates
+      tolerance - if None (default) then every sample and line of the edges
+          is walked, otherwise the edges are walked adaptively to within
+          this tolerance, in degrees (see adaptiveEdgeBounds)
+
+    Returns:
+        (west_lon, east_lon, north_lat, south_lat) - bounding coordinates
+    """
+
+    if tolerance is None:
+        (image_x, image_y) = edgeImageCoords (nlines, nsamps)
+        (lon, lat) = transformImagePoints (image_x, image_y, transform,  \
+            coord_tf)
+    else:
+        (lon, lat) = adaptiveEdgeBounds (nlines, nsamps, transform,  \
+            coord_tf, tolerance)
+
+    return (lon.min(), lon.max(), lat.max(), lat.min())
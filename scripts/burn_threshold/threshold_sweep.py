@@ -0,0 +1,235 @@
+#! /usr/bin/env python
+#############################################################################
+# Created on October 17, 2026, USGS/EROS LSRD Project
+# Created module to hold the component structure used to sweep the burn
+# threshold settings for a burn probability image.  The seed regions are
+# labeled once for each seed probability threshold, and the pixels which
+# can be flood filled are labeled once for each flood fill probability
+# threshold, the same way as hysteresisFill labels them.  Each (seed, flood
+# fill) pair then only maps the starting pixel of each seed region to its
+# flood fill component, and each component keeps the size of the largest
+# seed region which reaches it, so every seed size threshold is answered
+# from that one value.  The burn classifications are the same as those of
+# findBurnScars.
+#############################################################################
+
+import numpy
+import scipy.ndimage
+
+# suffix of the threshold sweep table of each scene, which replaces the
+# burn_probability.img suffix, and the name of the combined table in the
+# output directory
+THRESHOLD_SWEEP_SUFFIX = 'threshold_sweep.csv'
+THRESHOLD_SWEEP_FILE = 'threshold_sweep.csv'
+
+# header of the threshold sweep table
+THRESHOLD_SWEEP_HEADER = ['seed_prob_thresh', 'seed_size_thresh',  \
+    'flood_fill_prob_thresh', 'burned_pixels', 'burned_area']
+
+
+class thresholdSweep():
+    """Class for sweeping the burn threshold settings of an image.
+    """
+
+    def __init__(self, bp_image, seed_prob_threshs, flood_fill_prob_threshs,
+        nodata=-9999):
+        """Class constructor which builds the component structure.
+        Description: labels the seed regions of the image for each seed
+            probability threshold, and the pixels which can be flood filled
+            for each flood fill probability threshold.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args:
+          bp_image - input image of burn probabilities
+          seed_prob_threshs - list of the seed probability thresholds
+          flood_fill_prob_threshs - list of the flood fill probability
+              thresholds
+          nodata - pixel value used to identify nodata pixels in the input
+              image
+        """
+
+        self.shape = bp_image.shape
+
+        # size and starting pixel of each seed region, for each seed
+        # probability threshold
+        self.seeds = {}
+        for seed_prob in seed_prob_threshs:
+            seed_regions = numpy.zeros(self.shape, dtype=numpy.int32)
+            n_seeds = scipy.ndimage.label(bp_image >= seed_prob,  \
+                output=seed_regions)
+            (labels, first) = numpy.unique(seed_regions.ravel(),  \
+                return_index=True)
+            area = numpy.bincount(seed_regions.ravel(),  \
+                minlength=n_seeds+1)[1:]
+            self.seeds[seed_prob] = (area, first[labels > 0])
+        seed_regions = None
+
+        # flood fill components, and the steps between them, for each flood
+        # fill probability threshold
+        self.components = {}
+        for flood_prob in flood_fill_prob_threshs:
+            self.components[flood_prob] = self.fillComponents(bp_image,  \
+                flood_prob, nodata)
+
+
+    def fillComponents(self, bp_image, local_threshold, nodata):
+        """Labels the components of the pixels which can be flood filled.
+        Description: routine to label the pixels which can be flood filled,
+            keeping the first line and the first sample of the image (and
+            its first pixel) apart from the rest of the image, as done by
+            hysteresisFill.  All the labels are numbered together from 1, so
+            each labeled pixel has the id of its component.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args:
+          bp_image - input image of burn probabilities
+          local_threshold - flood fill probability threshold
+          nodata - pixel value used to identify nodata pixels in the input
+              image
+
+        Returns:
+          nodes - image of the component id of each pixel; 0 if the pixel
+              can't be flood filled
+          size - number of pixels in each component, indexed by id
+          steps - list of the 2 x n arrays of the (from, to) ids of the
+              steps from the first pixel to the first line and sample, and
+              of the steps from the first line and sample to the rest of
+              the image
+        """
+
+        (nrow, ncol) = bp_image.shape
+        fill_pixels = (bp_image <> nodata) & (bp_image > local_threshold)
+
+        nodes = numpy.zeros((nrow, ncol), dtype=numpy.int32)
+        interior = fill_pixels.copy()
+        interior[0,:] = False
+        interior[:,0] = False
+        n_nodes = scipy.ndimage.label(interior, output=nodes)
+        interior = None
+
+        line_regions = numpy.zeros(ncol, dtype=numpy.int32)
+        line_pixels = fill_pixels[0,:].copy()
+        line_pixels[0] = False
+        n_line = scipy.ndimage.label(line_pixels, output=line_regions)
+        nodes[0,:] = numpy.where(line_regions > 0, line_regions + n_nodes, 0)
+        n_nodes += n_line
+
+        samp_regions = numpy.zeros(nrow, dtype=numpy.int32)
+        samp_pixels = fill_pixels[:,0].copy()
+        samp_pixels[0] = False
+        n_samp = scipy.ndimage.label(samp_pixels, output=samp_regions)
+        nodes[:,0] = numpy.where(samp_regions > 0, samp_regions + n_nodes, 0)
+        n_nodes += n_samp
+
+        if fill_pixels[0,0]:
+            n_nodes += 1
+            nodes[0,0] = n_nodes
+
+        size = numpy.bincount(nodes.ravel(), minlength=n_nodes+1)
+        size[0] = 0
+
+        # the first pixel steps to the first line and first sample, which
+        # step to the rest of the image
+        corner_steps = numpy.zeros((2, 0), dtype=numpy.int32)
+        if fill_pixels[0,0]:
+            to_nodes = numpy.concatenate((nodes[0,1:2], nodes[1:2,0]))
+            to_nodes = to_nodes[to_nodes > 0]
+            corner_steps = numpy.array([numpy.zeros_like(to_nodes) +  \
+                nodes[0,0], to_nodes])
+        edge_steps = numpy.zeros((2, 0), dtype=numpy.int32)
+        if nrow > 1 and ncol > 1:
+            edge_steps = numpy.array([  \
+                numpy.concatenate((nodes[0,1:], nodes[1:,0])),  \
+                numpy.concatenate((nodes[1,1:], nodes[1:,1]))])
+            edge_steps = edge_steps[:,numpy.all(edge_steps > 0, axis=0)]
+
+        return (nodes, size, [corner_steps, edge_steps])
+
+
+    def reachSizes(self, seed_prob, flood_prob):
+        """Finds the largest seed region which reaches each component.
+        Description: routine to find, for each flood fill component, the
+            size of the largest seed region which fills it, either by
+            starting within it or by stepping to it from the first pixel,
+            line, or sample.  A component is filled for a seed size
+            threshold if this size is at least the threshold.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args:
+          seed_prob - seed probability threshold
+          flood_prob - flood fill probability threshold
+
+        Returns:
+          reach - size of the largest seed region which reaches each
+              component, indexed by id; 0 if none
+        """
+
+        (area, first) = self.seeds[seed_prob]
+        (nodes, size, steps) = self.components[flood_prob]
+
+        # each seed region starts at its first pixel, in raster order
+        reach = numpy.zeros(len(size), dtype=numpy.int64)
+        numpy.maximum.at(reach, nodes.ravel()[first], area)
+        reach[0] = 0
+
+        for (from_nodes, to_nodes) in steps:
+            numpy.maximum.at(reach, to_nodes, reach[from_nodes])
+
+        return reach
+
+
+    def burnedPixels(self, seed_prob, seed_size_threshs, flood_prob):
+        """Counts the burned pixels for each seed size threshold.
+        Description: routine to count the pixels which are flood filled
+            for the seed and flood fill probability thresholds, for all the
+            seed size thresholds at once.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args:
+          seed_prob - seed probability threshold
+          seed_size_threshs - list of the seed size thresholds
+          flood_prob - flood fill probability threshold
+
+        Returns:
+          burned - number of burned pixels for each seed size threshold
+        """
+
+        reach = self.reachSizes(seed_prob, flood_prob)
+        size = self.components[flood_prob][1]
+
+        # sum the component sizes from the largest reach down
+        order = numpy.argsort(reach)
+        total = numpy.concatenate(([0], numpy.cumsum(size[order][::-1])))
+        sizes = numpy.maximum(numpy.asarray(seed_size_threshs), 1)
+        n_reached = len(reach) - numpy.searchsorted(reach[order], sizes)
+        return total[n_reached]
+
+
+    def burnedImage(self, seed_prob, seed_size, flood_prob):
+        """Returns the flood filled pixels for a threshold setting.
+        Description: routine to find the pixels which are flood filled for
+            the threshold setting, which are the same as those found by
+            hysteresisFill.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args:
+          seed_prob - seed probability threshold
+          seed_size - seed size threshold
+          flood_prob - flood fill probability threshold
+
+        Returns:
+          filled - boolean image of the flood filled pixels
+        """
+
+        reach = self.reachSizes(seed_prob, flood_prob)
+        return (reach >= max(seed_size, 1))[self.components[flood_prob][0]]
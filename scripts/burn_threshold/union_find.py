@@ -0,0 +1,115 @@
+#! /usr/bin/env python
+#############################################################################
+# Created on October 17, 2026, USGS/EROS LSRD Project
+# Created module to hold the union-find (disjoint set) structure used to
+# merge the connected components of row bands of an image across the seams
+# between the bands.  The operations work on numpy arrays of node ids, so
+# all the components along a seam are merged at once.  The root of each set
+# is its smallest node id.
+#############################################################################
+
+import numpy
+
+
+class unionFind():
+    """Class for merging sets of nodes, which are numbered from 0.
+    """
+
+    def __init__(self):
+        self.parent = numpy.zeros(0, dtype=numpy.int64)
+        self.size = 0
+
+
+    def add(self, count):
+        """Adds new nodes, each in its own set.
+        Description: routine to add the specified number of nodes.  The ids of
+            the new nodes follow those of the existing nodes.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args:
+          count - number of nodes to add
+
+        Returns:
+            base - id of the first new node
+        """
+
+        base = self.size
+        if base + count > len(self.parent):
+            parent = numpy.empty(max(2 * len(self.parent), base + count,  \
+                1024), dtype=numpy.int64)
+            parent[0:base] = self.parent[0:base]
+            self.parent = parent
+        self.parent[base:base+count] = numpy.arange(base, base + count)
+        self.size = base + count
+        return base
+
+
+    def find(self, nodes):
+        """Finds the root of each node.
+        Description: routine to find the root of the set of each node,
+            compressing the paths to the roots along the way.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args:
+          nodes - array of node ids
+
+        Returns:
+            roots - array of the root of each node
+        """
+
+        nodes = numpy.asarray(nodes, dtype=numpy.int64)
+        roots = self.parent[nodes]
+        while True:
+            next_roots = self.parent[roots]
+            if numpy.array_equal(next_roots, roots):
+                break
+            roots = next_roots
+        self.parent[nodes] = roots
+        return roots
+
+
+    def union(self, nodes1, nodes2):
+        """Merges the sets of pairs of nodes.
+        Description: routine to merge the set of each node in nodes1 with the
+            set of the corresponding node in nodes2.  The smaller root becomes
+            the root of the merged set.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args:
+          nodes1 - array of node ids
+          nodes2 - array of node ids, the same length as nodes1
+
+        Returns:
+            Nothing
+        """
+
+        nodes1 = numpy.asarray(nodes1, dtype=numpy.int64)
+        nodes2 = numpy.asarray(nodes2, dtype=numpy.int64)
+        while len(nodes1) > 0:
+            roots1 = self.find(nodes1)
+            roots2 = self.find(nodes2)
+            differ = roots1 <> roots2
+            if not numpy.any(differ):
+                break
+            nodes1 = nodes1[differ]
+            nodes2 = nodes2[differ]
+            roots1 = roots1[differ]
+            roots2 = roots2[differ]
+
+            # when several pairs link the same root only one of them takes
+            # effect; the rest are merged on the next pass
+            self.parent[numpy.maximum(roots1, roots2)] =  \
+                numpy.minimum(roots1, roots2)
+
+
+    def roots(self):
+        """Returns the root of every node.
+        """
+
+        return self.find(numpy.arange(self.size))
@@ -11,8 +11,11 @@ import multiprocessing, Queue
 from model_hash import get_model_name
 from argparse import ArgumentParser
 from process_temporal_ba_stack import temporalBAStack
+from virtual_stack import readVirtualStack, VIRTUAL_STACK_FILE
 from generate_boosted_regression_config import BoostedRegressionConfig
-from do_boosted_regression import BoostedRegression
+from do_boosted_regression import BoostedRegression, BoostedRegressionServer
+from do_gbt_prediction import GBTPrediction
+from gbt_model import gbtModel
 from do_threshold_stack import BurnAreaThreshold
 from do_annual_burn_summaries import AnnualBurnSummary
 from do_spectral_indices import SpectralIndices
@@ -43,6 +46,14 @@ def logIt (msg, log_handler):
 # Created Python class to handle the multiprocessing of a stack of scenes.
 #
 # History:
+# Updated on 10/17/2026, USGS/EROS LSRD Project
+#     Modified to run the scenes of each worker through one boosted
+#     regression server, if predict_server is set.
+# Updated on 10/17/2026, USGS/EROS LSRD Project
+#     Modified to load the model once per worker and run the scenes through
+#     the numpy predictions, if python_predict is set.
+# Updated on 10/17/2026, USGS/EROS LSRD Project
+#     Modified to pass the number of prediction threads to the server.
 #
 ############################################################################
 class parallelSceneRegressionWorker(multiprocessing.Process):
@@ -61,6 +72,21 @@ class parallelSceneRegressionWorker(multiprocessing.Process):
  
 
     def run(self):
+        # the scenes of this worker share one server, which only loads the
+        # model once
+        server = None
+        if self.stackObject.predict_server:
+            server = BoostedRegressionServer()
+            if server.startServer (self.stackObject.log_handler,
+                num_threads=self.stackObject.predict_threads) != SUCCESS:
+                server = None
+        model = None
+        if self.stackObject.python_predict:
+            model = gbtModel()
+            if model.load (self.stackObject.model_file,
+                self.stackObject.log_handler) != SUCCESS:
+                model = None
+
         while not self.kill_received:
             # get a task
             try:
@@ -71,7 +97,12 @@ class parallelSceneRegressionWorker(multiprocessing.Process):
             # process the scene
             msg = 'Processing %s ...' % xml_file
             logIt (msg, self.stackObject.log_handler)
-            status = self.stackObject.sceneBoostedRegression (xml_file)
+            if (self.stackObject.predict_server and server is None) or  \
+                (self.stackObject.python_predict and model is None):
+                status = ERROR
+            else:
+                status = self.stackObject.sceneBoostedRegression (xml_file,
+                    server, model)
             if status != SUCCESS:
                 msg = 'Error running boosted regression on the XML file ' \
                     '(%s). Processing will terminate.' % xml_file
@@ -80,6 +111,9 @@ class parallelSceneRegressionWorker(multiprocessing.Process):
             # store the result
             self.result_queue.put(status)
 
+        if server is not None:
+            server.stopServer ()
+
 
 #############################################################################
 # Created on December 5, 2013 by Gail Schmidt, USGS/EROS
@@ -95,10 +129,15 @@ class BurnedArea():
        path/row temporal stack of surface reflectance products.
     """
 
+    virtual_scenes = None     # scene offsets for a virtual stack
+    predict_server = False    # run the boosted regression via a server
+    python_predict = False    # run the boosted regression in numpy
+    predict_threads = None    # threads per boosted regression process
+
     def __init__(self):
         pass
 
-    def sceneBoostedRegression(self, xml_file):
+    def sceneBoostedRegression(self, xml_file, server=None, model=None):
         """Runs the boosted resgression model on the current scene.
         Description: sceneBoostedRegression will run the boosted regression
             model on the current XML file.  A configuration file is created
@@ -114,9 +153,24 @@ class BurnedArea():
               Modified to use the ESPA internal raw binary format
           Updated on 4/10/2014 by Gail Schmidt, USGS/EROS LSRD Project
               Modified to run as a multi-threaded process.
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Modified to run on the native scene, via its offsets in the
+              stack grid, for a virtual stack.
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Added the server argument, to run the model through an already
+              running boosted regression server.
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Added the model argument, to run the predictions in numpy with
+              an already loaded model.
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Modified to pass the number of prediction threads.
         
         Args:
           xml_file - name of XML file to process
+          server - BoostedRegressionServer to run the model through; if None
+              then predict_burned_area is run for this scene alone
+          model - gbtModel to run the predictions with in numpy; if None then
+              the predictions are run by predict_burned_area
         
         Returns:
             ERROR - error running the model on the XML file
@@ -153,23 +207,45 @@ class BurnedArea():
 
         # determine the base surface reflectance filename, already been
         # resampled to the maximum extents to match the seasonal summaries
-        # and annual maximums
-        base_file = dir_name + '/refl/' + base_name.replace('.xml', '')
-        mask_file = dir_name + '/mask/' + base_name.replace('.xml', '_mask.img')
+        # and annual maximums.  for a virtual stack the scene may be at its
+        # native size, in which case the offsets place it in the stack grid.
+        line_offset = None
+        samp_offset = None
+        scene_name = base_name.replace('.xml', '')
+        if self.virtual_scenes is not None and  \
+            scene_name in self.virtual_scenes:
+            scene = self.virtual_scenes[scene_name]
+            base_file = scene['base_file']
+            mask_file = scene['mask_file']
+            if not scene['resampled']:
+                line_offset = scene['line_offset']
+                samp_offset = scene['samp_offset']
+        else:
+            base_file = dir_name + '/refl/' + scene_name
+            mask_file = dir_name + '/mask/' + scene_name + '_mask.img'
 
         # generate the configuration file for boosted regression
         status = BoostedRegressionConfig().runGenerateConfig(
             config_file=config_file, seasonal_sum_dir=dir_name,
             input_base_file=base_file, input_mask_file=mask_file,
-            output_dir=self.output_dir, model_file=self.model_file)
+            output_dir=self.output_dir, model_file=self.model_file,
+            input_line_offset=line_offset, input_samp_offset=samp_offset)
         if status != SUCCESS:
             msg = 'Error creating the configuration file for ' + xml_file
             logIt (msg, self.log_handler)
             return ERROR
 
         # run the boosted regression, passing the configuration file
-        status = BoostedRegression().runBoostedRegression(  \
-            config_file=config_file, logfile=self.logfile)
+        if model is not None:
+            status = GBTPrediction().runGBTPrediction(  \
+                config_file=config_file, model=model,  \
+                log_handler=self.log_handler)
+        elif server is not None:
+            status = server.runScene (config_file)
+        else:
+            status = BoostedRegression().runBoostedRegression(  \
+                config_file=config_file, logfile=self.logfile,  \
+                num_threads=self.predict_threads)
         if status != SUCCESS:
             msg = 'Error running boosted regression for ' + xml_file
             logIt (msg, self.log_handler)
@@ -182,7 +258,10 @@ class BurnedArea():
 
 
     def runBurnedArea(self, sr_list_file=None, input_dir=None,  \
-        output_dir=None, model_dir=None, num_processors=1, logfile=None):
+        output_dir=None, model_dir=None, num_processors=1, logfile=None,  \
+        virtual_stack=False, fused=False, keep_burn_class=False,  \
+        predict_server=False, python_predict=False, predict_threads=None,  \
+        feature_cube=False):
         """Runs the burned area processing from end-to-end for a given
            stack of surface reflectance products.
         Description: Reads the XML list file to determine the path/row and
@@ -208,6 +287,31 @@ class BurnedArea():
             Updated to support the exclude_rmse and exclude_cloud_cover
             options in processStack. These are turned on for the call to
             process seasonal summaries and annual maximums.
+          Modified on 10/17/2026, USGS/EROS LSRD Project
+            Added the virtual_stack option, which leaves the scenes at their
+            native size rather than resampling them to the stack extents.
+          Modified on 10/17/2026, USGS/EROS LSRD Project
+            Passed num_processors on to the annual burn summaries.
+          Modified on 10/17/2026, USGS/EROS LSRD Project
+            Added the fused option, which classifies the burn probabilities
+            within the annual burn summaries rather than writing the burn
+            classifications and reading them back.
+          Modified on 10/17/2026, USGS/EROS LSRD Project
+            Added the predict_server option, which runs the boosted
+            regression for all the scenes of a processor through one
+            predict_burned_area process, so the model is only loaded once
+            per processor.
+          Modified on 10/17/2026, USGS/EROS LSRD Project
+            Added the python_predict option, which runs the boosted
+            regression predictions in numpy, loading the model once per
+            processor.
+          Modified on 10/17/2026, USGS/EROS LSRD Project
+            Added the predict_threads option, which is the number of threads
+            each predict_burned_area process uses to run the predictions.
+          Modified on 10/17/2026, USGS/EROS LSRD Project
+            Added the feature_cube option, which packs the seasonal summaries
+            and annual maximums of each year into one file for the boosted
+            regression.
 
         Args:
           sr_list_file - input file listing the surface reflectance scenes
@@ -224,6 +328,27 @@ class BurnedArea():
               processing sections of the application
           logfile - name of the logfile for logging information; if None then
               the output will be written to stdout
+          virtual_stack - if True then the scenes are not resampled to the
+              stack extents; they are read through their offsets in the stack
+              grid
+          fused - if True then the burn threshold classification is done
+              in memory as part of the annual burn summaries
+          keep_burn_class - if True then the burn classifications are still
+              written for each scene in the fused mode
+          predict_server - if True then the boosted regression for the scenes
+              is run through one predict_burned_area --server process per
+              processor, rather than one process per scene
+          python_predict - if True then the boosted regression predictions
+              for the scenes are run in numpy (see do_gbt_prediction.py)
+              rather than by predict_burned_area
+          predict_threads - number of threads each predict_burned_area
+              process uses to run the predictions; if None then it uses its
+              default (1).  num_processors scenes are processed at a time,
+              so num_processors * predict_threads threads are used.
+          feature_cube - if True then the seasonal summaries and annual
+              maximums of each year are packed into a pixel interleaved
+              feature cube, which the boosted regression of each scene of
+              the following year maps rather than reading the 36 products
         
         Returns:
             ERROR - error running the burned area applications
@@ -273,11 +398,49 @@ class BurnedArea():
                     '(default = 1, single threaded)')
             parser.add_argument ('-l', '--logfile', type=str, dest='logfile',
                 help='name of optional log file', metavar='FILE')
+            parser.add_argument ('--virtual_stack', dest='virtual_stack',
+                default=False, action='store_true',
+                help='leave the scenes at their native size rather than '  \
+                    'resampling them to the maximum extents of the stack')
+            parser.add_argument ('--fused', dest='fused', default=False,
+                action='store_true',
+                help='classify the burn probabilities within the annual '  \
+                    'burn summaries rather than writing the burn '  \
+                    'classifications and reading them back')
+            parser.add_argument ('--keep_burn_class', dest='keep_burn_class',
+                default=False, action='store_true',
+                help='write the burn classifications of each scene in the '  \
+                    'fused mode')
+            parser.add_argument ('--predict_server', dest='predict_server',
+                default=False, action='store_true',
+                help='run the boosted regression for the scenes through one '  \
+                    'predict_burned_area server per processor, which only '  \
+                    'loads the model once')
+            parser.add_argument ('--python_predict', dest='python_predict',
+                default=False, action='store_true',
+                help='run the boosted regression predictions for the scenes '  \
+                    'in numpy rather than with predict_burned_area')
+            parser.add_argument ('--predict_threads', type=int,
+                dest='predict_threads',
+                help='number of threads each predict_burned_area process '  \
+                    'uses to run the predictions (default = 1)')
+            parser.add_argument ('--feature_cube', dest='feature_cube',
+                default=False, action='store_true',
+                help='pack the seasonal summaries and annual maximums of '  \
+                    'each year into a feature cube, which is mapped by the '  \
+                    'boosted regression of each scene')
 
             options = parser.parse_args()
 
             # validate command-line options and arguments
             logfile = options.logfile
+            virtual_stack = options.virtual_stack
+            fused = options.fused
+            keep_burn_class = options.keep_burn_class
+            predict_server = options.predict_server
+            python_predict = options.python_predict
+            predict_threads = options.predict_threads
+            feature_cube = options.feature_cube
             sr_list_file = options.sr_list_file
             if sr_list_file is None:
                 parser.error ('missing surface reflectance list file '  \
@@ -360,6 +523,9 @@ class BurnedArea():
 
         # save the output directory for the configuration file usage
         self.output_dir = output_dir
+        self.predict_server = predict_server
+        self.python_predict = python_predict
+        self.predict_threads = predict_threads
 
         # loop through the scenes and determine the path/row along with the
         # starting and ending year in the stack
@@ -421,13 +587,25 @@ class BurnedArea():
         msg = '\nProcessing seasonal summaries and annual maximums ...'
         status = temporalBAStack().processStack(input_dir=input_dir,  \
             exclude_l1g=True, exclude_rmse=True, exclude_cloud_cover=True,  \
-            logfile=logfile, num_processors=num_processors)
+            logfile=logfile, num_processors=num_processors,  \
+            virtual_stack=virtual_stack, feature_cube=feature_cube)
         if status != SUCCESS:
             msg = 'Error running seasonal summaries and annual maximums'
             logIt (msg, self.log_handler)
             os.chdir (mydir)
             return ERROR
 
+        # read the location of each scene in the stack grid
+        self.virtual_scenes = None
+        if virtual_stack:
+            self.virtual_scenes = readVirtualStack (  \
+                input_dir + '/' + VIRTUAL_STACK_FILE, self.log_handler)
+            if self.virtual_scenes is None:
+                msg = 'Error reading the virtual stack file'
+                logIt (msg, self.log_handler)
+                os.chdir (mydir)
+                return ERROR
+
         # open and read the stack file generated by the seasonal summaries
         # which excludes the L1G products if any were found
         text_file = open("input_list.txt", "r")
@@ -503,23 +681,27 @@ class BurnedArea():
                 logIt (msg, self.log_handler)
                 return ERROR
 
-        # run the burn threshold algorithm to identify burned areas
+        # run the burn threshold algorithm to identify burned areas; in the
+        # fused mode this is done by the annual burn summaries
         stack_file = input_dir + '/input_stack.csv'
-        status = BurnAreaThreshold().runBurnThreshold(stack_file=stack_file,
-            input_dir=output_dir, output_dir=output_dir,
-            start_year=start_year+1, end_year=end_year,
-            num_processors=num_processors)
-        if status != SUCCESS:
-            msg = 'Error running burn thresholds'
-            logIt (msg, self.log_handler)
-            os.chdir (mydir)
-            return ERROR
+        if not fused:
+            status = BurnAreaThreshold().runBurnThreshold(  \
+                stack_file=stack_file, input_dir=output_dir,
+                output_dir=output_dir, start_year=start_year+1,
+                end_year=end_year, num_processors=num_processors)
+            if status != SUCCESS:
+                msg = 'Error running burn thresholds'
+                logIt (msg, self.log_handler)
+                os.chdir (mydir)
+                return ERROR
 
         # run the algorithm to generate annual summaries for the burn
         # probabilities and burned areas
         status = AnnualBurnSummary().runAnnualBurnSummaries(
             stack_file=stack_file, bp_dir=output_dir, bc_dir=output_dir,
-            output_dir=output_dir, start_year=start_year+1, end_year=end_year)
+            output_dir=output_dir, start_year=start_year+1, end_year=end_year,
+            num_processors=num_processors, fused=fused,
+            write_burn_class=keep_burn_class)
         if status != SUCCESS:
             msg = 'Error running annual burn summaries'
             logIt (msg, self.log_handler)
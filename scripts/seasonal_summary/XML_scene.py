@@ -21,6 +21,9 @@ from log_it import *
 #   Updated on 3/26/2014 by Gail Schmidt, USGS/EROS
 #       Removed metadata reads from the old HDF files that were not being
 #       used
+#   Updated on 10/17/2026, USGS/EROS LSRD Project
+#       Added getBandBlock to read the bands, and combine the QA bands, in
+#       blocks of lines
 ############################################################################
 class XML_Scene:
     """Class for handling ESPA scene related functions.
@@ -637,13 +640,49 @@ class XML_Scene:
             return (self.band7.ReadAsArray())
 
         elif band == 'band_qa':        
+            # read and combine all the QA-related bands
+            return self.getBandBlock ('band_qa', 0, 0, self.NCol, self.NRow)
+
+
+    def getBandBlock(self, band, xoff, yoff, ncol, nrow):
+        """Reads a block of the specified band.
+        Description: getBandBlock reads a block of lines/samples for the
+            specified band.  If it's the QA band, then the various QA band
+            values for the block are combined into one representative band.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+              Based on getBandValues, for reading the scene in blocks.
+
+        Args:
+          band - string representing which band to read (band1, band2, band3,
+                 band4, band5, band6, band7, band_qa)
+          xoff - starting sample of the block
+          yoff - starting line of the block
+          ncol - number of samples in the block
+          nrow - number of lines in the block
+
+        Returns:
+            None - if the band is not supported
+            Array - associated block of data
+        """
+
+        band_ptr = {'band1':self.band1, 'band2':self.band2,  \
+            'band3':self.band3, 'band4':self.band4, 'band5':self.band5,  \
+            'band6':self.band6, 'band7':self.band7}
+        if band in band_ptr:
+            return (band_ptr[band].ReadAsArray(xoff, yoff, ncol, nrow))
+
+        elif band == 'band_qa':
             # read all the QA-related bands
-            fill_QA = self.band_fill_QA.ReadAsArray()
-            snow_QA = self.band_snow_QA.ReadAsArray()
-            land_water_QA = self.band_land_water_QA.ReadAsArray()
-            adjacent_cloud_QA = self.band_adjacent_cloud_QA.ReadAsArray()
-            shadow_QA = self.band_shadow_QA.ReadAsArray()
-            cloud_QA = self.band_cloud_QA.ReadAsArray()
+            fill_QA = self.band_fill_QA.ReadAsArray(xoff, yoff, ncol, nrow)
+            snow_QA = self.band_snow_QA.ReadAsArray(xoff, yoff, ncol, nrow)
+            land_water_QA =  \
+                self.band_land_water_QA.ReadAsArray(xoff, yoff, ncol, nrow)
+            adjacent_cloud_QA =  \
+                self.band_adjacent_cloud_QA.ReadAsArray(xoff, yoff, ncol, nrow)
+            shadow_QA = self.band_shadow_QA.ReadAsArray(xoff, yoff, ncol, nrow)
+            cloud_QA = self.band_cloud_QA.ReadAsArray(xoff, yoff, ncol, nrow)
         
             # combine all the QA bands to one output with negative values to
             # indicate the various types of QA values, with -9999 representing
@@ -657,6 +696,10 @@ class XML_Scene:
             QA[fill_QA > 0] = -9999  # fill
             return QA
 
+        print 'Band ' + band + 'is not supported. Needs to be one of ' \
+            'band1, band2, band3, band4, band5, band6, band7, or band_qa.'
+        return None
+
 
     def createQaBand(self, log_handler=None):
         """Creates a single QA band from the multiple QA bands in the surface
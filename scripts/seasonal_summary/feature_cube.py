@@ -0,0 +1,189 @@
+#! /usr/bin/env python
+import os
+import numpy
+
+from log_it import *
+
+# directory, in the input directory, of the feature cubes
+FEATURE_CUBE_DIR = 'features'
+
+# suffix of the feature cube of a year, and of the cube while it is being
+# written; the cube is only renamed once it is complete
+FEATURE_CUBE_SUFFIX = '_features.img'
+FEATURE_CUBE_TEMP_SUFFIX = '_features.tmp'
+
+# seasons and bands/indices of the seasonal summaries, followed by the
+# indices of the annual maximums, in the order they are stacked for each
+# pixel.  this is the order of the samples used by the boosted regression.
+FEATURE_CUBE_SEASONS = ['winter', 'spring', 'summer', 'fall']
+FEATURE_CUBE_BANDS = ['band3', 'band4', 'band5', 'band7', 'ndvi', 'ndmi',
+    'nbr', 'nbr2']
+FEATURE_CUBE_MAXIMUMS = ['ndvi', 'ndmi', 'nbr', 'nbr2']
+FEATURE_CUBE_NBANDS = len(FEATURE_CUBE_SEASONS) * len(FEATURE_CUBE_BANDS) +  \
+    len(FEATURE_CUBE_MAXIMUMS)
+
+# map lines copied from the header of the seasonal summaries
+FEATURE_CUBE_MAP_KEYS = ['map info', 'projection info',
+    'coordinate system string']
+
+#############################################################################
+# Created on October 17, 2026, USGS/EROS LSRD Project
+# Created module to support the feature cube of each year.  The seasonal
+# summaries and annual maximums of a year are packed into one pixel
+# interleaved (BIP) int16 ENVI file, so the boosted regression for each
+# scene of the following year maps the one file and reads the contiguous
+# values of each pixel, rather than reading 36 files a line at a time.
+############################################################################
+
+def featureCubeFile (input_dir, year):
+    """Returns the name of the feature cube of a year.
+    """
+
+    return os.path.join (input_dir, FEATURE_CUBE_DIR,  \
+        str(year) + FEATURE_CUBE_SUFFIX)
+
+
+def featureCubeTempFile (input_dir, year):
+    """Returns the name of the feature cube of a year while it is written.
+    """
+
+    return os.path.join (input_dir, FEATURE_CUBE_DIR,  \
+        str(year) + FEATURE_CUBE_TEMP_SUFFIX)
+
+
+def removeFeatureCube (input_dir, year):
+    """Removes the feature cube of a year, if it exists.
+    """
+
+    cube_file = featureCubeFile (input_dir, year)
+    for fname in [cube_file, os.path.splitext (cube_file)[0] + '.hdr',  \
+        featureCubeTempFile (input_dir, year)]:
+        if os.path.exists (fname):
+            os.remove (fname)
+
+
+def featureCubeBandNames ():
+    """Returns the names of the bands of the feature cube, in order.
+    """
+
+    names = []
+    for season in FEATURE_CUBE_SEASONS:
+        for band in FEATURE_CUBE_BANDS:
+            names.append (season + '_' + band)
+    for ind in FEATURE_CUBE_MAXIMUMS:
+        names.append ('maximum_' + ind)
+    return names
+
+
+def writeFeatureCubeHeader (cube_file, nrow, ncol, template_hdr=None):
+    """Writes the ENVI header of the feature cube.
+    Description: writeFeatureCubeHeader writes the ENVI header for the pixel
+        interleaved int16 feature cube.  The map information is copied from
+        the header of one of the seasonal summaries, if one is specified.
+
+    History:
+      Created on 10/17/2026, USGS/EROS LSRD Project
+
+    Args:
+      cube_file - name of the feature cube (.img)
+      nrow - number of lines in the feature cube
+      ncol - number of samples in the feature cube
+      template_hdr - name of the ENVI header to copy the map information
+          from; None if there isn't one
+
+    Returns: None
+    """
+
+    map_lines = []
+    if template_hdr is not None and os.path.exists (template_hdr):
+        for line in open (template_hdr, 'r'):
+            if line.split('=')[0].strip() in FEATURE_CUBE_MAP_KEYS:
+                map_lines.append (line.rstrip('\n'))
+
+    # the sizes are written as GDAL does, which is what the boosted
+    # regression application expects
+    hdr_file = os.path.splitext (cube_file)[0] + '.hdr'
+    hdr = open (hdr_file, 'w')
+    hdr.write ('ENVI\n')
+    hdr.write ('description = {Seasonal summaries and annual maximums}\n')
+    hdr.write ('samples = %d\n' % ncol)
+    hdr.write ('lines   = %d\n' % nrow)
+    hdr.write ('bands   = %d\n' % FEATURE_CUBE_NBANDS)
+    hdr.write ('header offset = 0\n')
+    hdr.write ('file type = ENVI Standard\n')
+    hdr.write ('data type = 2\n')
+    hdr.write ('interleave = bip\n')
+    hdr.write ('byte order = 0\n')
+    for line in map_lines:
+        hdr.write (line + '\n')
+    hdr.write ('band names = {\n' + ',\n'.join (featureCubeBandNames()) +  \
+        '}\n')
+    hdr.close()
+
+
+def readFeatureCubeHeader (cube_file):
+    """Reads the sizes from the ENVI header of the feature cube.
+    Description: readFeatureCubeHeader returns the number of lines, samples,
+        and bands of the feature cube.
+
+    History:
+      Created on 10/17/2026, USGS/EROS LSRD Project
+
+    Args:
+      cube_file - name of the feature cube (.img)
+
+    Returns:
+        None - the header doesn't exist or is not a feature cube
+        (nrow, ncol, nbands) - sizes of the feature cube
+    """
+
+    hdr_file = os.path.splitext (cube_file)[0] + '.hdr'
+    if not os.path.exists (hdr_file):
+        return None
+
+    values = {}
+    for line in open (hdr_file, 'r'):
+        if '=' in line:
+            (name, value) = line.split('=', 1)
+            values[name.strip()] = value.strip()
+    try:
+        if values['interleave'] != 'bip' or values['data type'] != '2' or  \
+            values.get('byte order', '0') != '0':
+            return None
+        return (int (values['lines']), int (values['samples']),  \
+            int (values['bands']))
+    except (KeyError, ValueError):
+        return None
+
+
+def openFeatureCube (input_dir, year, log_handler=None):
+    """Maps the feature cube of a year.
+    Description: openFeatureCube maps the feature cube of the specified year
+        as a read-only (lines, samples, bands) int16 array, if it exists.
+
+    History:
+      Created on 10/17/2026, USGS/EROS LSRD Project
+
+    Args:
+      input_dir - directory of the seasonal summaries
+      year - year of the seasonal summaries and annual maximums
+      log_handler - log file handler; if None then print to stdout
+
+    Returns:
+        None - there is no feature cube for the year
+        cube - numpy.memmap of the feature cube
+    """
+
+    cube_file = featureCubeFile (input_dir, year)
+    if not os.path.exists (cube_file):
+        return None
+
+    sizes = readFeatureCubeHeader (cube_file)
+    if sizes is None or sizes[2] != FEATURE_CUBE_NBANDS or  \
+        os.path.getsize (cube_file) != sizes[0] * sizes[1] * sizes[2] * 2:
+        msg = 'Ignoring the feature cube %s, which does not match its '  \
+            'header' % cube_file
+        logIt (msg, log_handler)
+        return None
+
+    return numpy.memmap (cube_file, dtype='<i2', mode='r', shape=sizes)
@@ -0,0 +1,265 @@
+#! /usr/bin/env python
+import sys
+import os
+
+from numpy import *
+from osgeo import gdal
+from osgeo import gdal_array
+from osgeo import gdalconst
+from log_it import *
+
+# suffix of the bit-packed mask file, which replaces the _mask.img suffix of
+# the combined QA (mask) file
+MASK_BITS_SUFFIX = '_mask_bits.img'
+
+# number of lines to pack at a time when packing an existing mask file
+MASK_BITS_BLOCK_LINES = 256
+
+#############################################################################
+# Created on October 17, 2026, USGS/EROS LSRD Project
+# Created module to support bit-packed valid pixel masks.  The seasonal
+# summaries only need to know which pixels of the combined QA (mask) band
+# are good (mask >= 0), so the scene processing also writes that as one bit
+# per pixel.  Each line of the mask is packed into (nsamps + 7) / 8 bytes,
+# most significant bit first, and written to a single band ENVI byte file.
+# The bits are unpacked a block of lines at a time when reading, which cuts
+# the mask reads by 8x over the int16 mask.
+############################################################################
+
+def maskBitsFile (mask_file):
+    """Returns the name of the bit-packed mask file for a mask file.
+    """
+
+    return mask_file.replace ('_mask.img', MASK_BITS_SUFFIX)
+
+
+def createMaskBitsFile (filename, ncol, nrow, log_handler=None):
+    """Creates the bit-packed mask file.
+    Description: createMaskBitsFile creates the single band ENVI byte file to
+        hold the bit-packed mask, creating the output directory if needed.
+
+    History:
+      Created on 10/17/2026, USGS/EROS LSRD Project
+
+    Args:
+      filename - name of the bit-packed mask file to create
+      ncol - number of samples in the mask
+      nrow - number of lines in the mask
+      log_handler - open log file for logging or None for stdout
+
+    Returns:
+        None - error creating the file
+        (dataset, band) - GDAL dataset and band of the bit-packed mask file
+    """
+
+    output_dir = os.path.dirname (filename)
+    if output_dir != '' and not os.path.exists (output_dir):
+        msg = 'Creating output directory ' + output_dir
+        logIt (msg, log_handler)
+        os.makedirs (output_dir)
+
+    mydriver = gdal.GetDriverByName('ENVI')
+    my_ds = mydriver.Create (filename, (ncol + 7) // 8, nrow, 1,  \
+        gdal.GDT_Byte)
+    if my_ds is None:
+        msg = 'GDAL could not create output file: ' + filename
+        logIt (msg, log_handler)
+        return None
+    return (my_ds, my_ds.GetRasterBand(1))
+
+
+def packMaskBlock (mask):
+    """Packs a block of the combined QA (mask) band.
+    Description: packMaskBlock packs the good pixels (mask >= 0) of each line
+        of the block into bits.
+
+    History:
+      Created on 10/17/2026, USGS/EROS LSRD Project
+
+    Args:
+      mask - block of the mask band
+
+    Returns:
+        Array - block of bit-packed lines
+    """
+
+    return packbits (greater_equal (mask, 0), axis=1)
+
+
+def packMaskFile (mask_file, mask_bits_file, log_handler=None):
+    """Writes the bit-packed mask for an existing mask file.
+    Description: packMaskFile reads the combined QA (mask) file in blocks of
+        lines and writes the bit-packed mask file.
+
+    History:
+      Created on 10/17/2026, USGS/EROS LSRD Project
+
+    Args:
+      mask_file - name of the mask file to read
+      mask_bits_file - name of the bit-packed mask file to write
+      log_handler - open log file for logging or None for stdout
+
+    Returns:
+        ERROR - error reading or writing the mask
+        SUCCESS - successful processing
+    """
+
+    mask_ds = gdal.Open (mask_file, gdalconst.GA_ReadOnly)
+    if mask_ds is None:
+        msg = 'GDAL could not open input file: ' + mask_file
+        logIt (msg, log_handler)
+        return ERROR
+    mask_band = mask_ds.GetRasterBand(1)
+    ncol = mask_ds.RasterXSize
+    nrow = mask_ds.RasterYSize
+
+    my_out = createMaskBitsFile (mask_bits_file, ncol, nrow, log_handler)
+    if my_out is None:
+        return ERROR
+    (bits_ds, bits_band) = my_out
+
+    for y in range (0, nrow, MASK_BITS_BLOCK_LINES):
+        nlines = min (MASK_BITS_BLOCK_LINES, nrow - y)
+        mask = mask_band.ReadAsArray (0, y, ncol, nlines)
+        if mask is None:
+            msg = 'Error reading the mask file: ' + mask_file
+            logIt (msg, log_handler)
+            return ERROR
+        bits_band.WriteArray (packMaskBlock (mask), 0, y)
+
+    mask = None
+    bits_band = None
+    bits_ds = None
+    mask_band = None
+    mask_ds = None
+    return SUCCESS
+
+
+#############################################################################
+# Created on October 17, 2026, USGS/EROS LSRD Project
+# Created class to read the good pixels of a bit-packed mask through its
+# offset into the stack grid.  The ReadAsArray method follows the GDAL band
+# method of the same name (and stackWindowBand), but returns a boolean
+# array which is True for the good pixels.
+############################################################################
+class maskBitsBand:
+    """Class for reading a bit-packed mask in the stack grid coordinates.
+    """
+
+    dataset = None          # dataset created by gdal.Open
+    band = None             # band 1 of the dataset
+    line_offset = 0         # line offset of the scene in the stack grid
+    samp_offset = 0         # sample offset of the scene in the stack grid
+    nlines = 0              # number of lines in the scene
+    nsamps = 0              # number of samples in the scene
+    stack_nlines = 0        # number of lines in the stack grid
+    stack_nsamps = 0        # number of samples in the stack grid
+
+    def __init__ (self, filename, nsamps, line_offset, samp_offset,  \
+        stack_nlines, stack_nsamps, log_handler=None):
+        """Class constructor which opens the bit-packed mask file.
+        Description: maskBitsBand class constructor opens the bit-packed
+            mask file and saves the location of the scene within the stack
+            grid.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args:
+          filename - name of the bit-packed mask file to be opened
+          nsamps - number of samples in the (unpacked) mask
+          line_offset - line in the stack grid of the first scene line
+          samp_offset - sample in the stack grid of the first scene sample
+          stack_nlines - number of lines in the stack grid
+          stack_nsamps - number of samples in the stack grid
+          log_handler - open log file for logging or None for stdout
+
+        Returns:
+            None - error opening the file
+            Object - successful processing
+        """
+
+        self.dataset = gdal.Open (filename, gdalconst.GA_ReadOnly)
+        if self.dataset is None:
+            msg = 'GDAL could not open input file: ' + filename
+            logIt (msg, log_handler)
+            return None
+
+        self.band = self.dataset.GetRasterBand(1)
+        if self.band is None:
+            msg = 'Input band connection failed: ' + filename
+            logIt (msg, log_handler)
+            return None
+
+        self.line_offset = line_offset
+        self.samp_offset = samp_offset
+        self.nlines = self.dataset.RasterYSize
+        self.nsamps = nsamps
+        self.stack_nlines = stack_nlines
+        self.stack_nsamps = stack_nsamps
+
+
+    def __del__ (self):
+        """Class destructor to clean up the band pointers.
+        """
+
+        self.band = None
+        self.dataset = None
+
+
+    def ReadAsArray (self, xoff=0, yoff=0, win_xsize=None, win_ysize=None,  \
+        buf_obj=None):
+        """Reads the good pixels for a window of the stack grid.
+        Description: ReadAsArray reads the bytes of the bit-packed mask which
+            cover the portion of the window within the scene footprint, and
+            unpacks them.  The pixels outside of the scene footprint are not
+            good.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args:
+          xoff - starting sample of the window in the stack grid
+          yoff - starting line of the window in the stack grid
+          win_xsize - number of samples in the window; default is the
+              remainder of the stack line
+          win_ysize - number of lines in the window; default is the
+              remainder of the stack
+          buf_obj - optional preallocated boolean array (win_ysize x
+              win_xsize) to read the good pixels into
+
+        Returns:
+            Array - boolean window of the good pixels
+        """
+
+        if win_xsize is None:
+            win_xsize = self.stack_nsamps - xoff
+        if win_ysize is None:
+            win_ysize = self.stack_nlines - yoff
+        if buf_obj is None:
+            buf_obj = empty ((win_ysize, win_xsize), dtype=bool)
+
+        # determine the window in scene coordinates and the portion which
+        # overlaps the scene
+        s_xoff = xoff - self.samp_offset
+        s_yoff = yoff - self.line_offset
+        x0 = max (s_xoff, 0)
+        y0 = max (s_yoff, 0)
+        x1 = min (s_xoff + win_xsize, self.nsamps)
+        y1 = min (s_yoff + win_ysize, self.nlines)
+        if x0 != s_xoff or y0 != s_yoff or x1 - x0 != win_xsize or  \
+            y1 - y0 != win_ysize:
+            buf_obj.fill (False)
+        if x1 <= x0 or y1 <= y0:
+            return buf_obj
+
+        # read the bytes which hold the samples and unpack them
+        byte0 = x0 // 8
+        byte1 = (x1 + 7) // 8
+        bits = unpackbits (self.band.ReadAsArray (byte0, y0, byte1 - byte0,  \
+            y1 - y0), axis=1)
+        buf_obj[y0-s_yoff:y1-s_yoff,x0-s_xoff:x1-s_xoff] =  \
+            bits[:,x0-byte0*8:x1-byte0*8]
+
+        return buf_obj
+######end of maskBitsBand class######
@@ -44,8 +44,9 @@ class parallelSceneWorker(multiprocessing.Process):
             self.result_queue.put(status)
 
 
-class parallelSummaryWorker(multiprocessing.Process):
-    """Runs the seasonal summaries in parallel for a temporal stack.
+class parallelProductWorker(multiprocessing.Process):
+    """Runs the seasonal summaries and annual maximums in parallel for a
+       temporal stack, one band of lines of a year per task.
     """
  
     def __init__ (self, work_queue, result_queue, stackObject):
@@ -63,26 +64,30 @@ class parallelSummaryWorker(multiprocessing.Process):
         while not self.kill_received:
             # get a task
             try:
-                year = self.work_queue.get_nowait()
+                (year, start_line, end_line) = self.work_queue.get_nowait()
             except Queue.Empty:
                 break
  
-            # process the scene
-            msg = 'Processing year %d ...' % year
+            # process the band of lines for the year
+            msg = 'Processing year %d, lines %d - %d ...' %  \
+                (year, start_line, end_line - 1)
             logIt (msg, self.stackObject.log_handler)
             status = SUCCESS
-            status = self.stackObject.generateYearSeasonalSummaries (year)
+            status = self.stackObject.generateYearProducts (year,  \
+                start_line, end_line)
             if status != SUCCESS:
-                msg = 'Error processing seasonal summaries for year %d. '  \
-                    'Processing will terminate.' % year
+                msg = 'Error processing seasonal summaries and maximums '  \
+                    'for year %d, lines %d - %d. Processing will '  \
+                    'terminate.' % (year, start_line, end_line - 1)
                 logIt (msg, self.stackObject.log_handler)
  
             # store the result
             self.result_queue.put(status)
 
 
-class parallelMaxWorker(multiprocessing.Process):
-    """Runs the annual maximums in parallel for a temporal stack.
+class parallelFeatureCubeWorker(multiprocessing.Process):
+    """Runs the feature cubes in parallel for a temporal stack, one band of
+       lines of a year per task.
     """
  
     def __init__ (self, work_queue, result_queue, stackObject):
@@ -95,25 +100,22 @@ class parallelMaxWorker(multiprocessing.Process):
         self.stackObject = stackObject
         self.kill_received = False
  
-
     def run(self):
         while not self.kill_received:
             # get a task
             try:
-                year = self.work_queue.get_nowait()
+                (year, start_line, end_line) = self.work_queue.get_nowait()
             except Queue.Empty:
                 break
  
-            # process the scene
-            msg = 'Processing year %d ...' % year
-            logIt (msg, self.stackObject.log_handler)
-            status = SUCCESS
-            status = self.stackObject.generateYearMaximums (year)
+            # process the band of lines for the year
+            status = self.stackObject.generateFeatureCube (year,  \
+                start_line, end_line)
             if status != SUCCESS:
-                msg = 'Error processing maximums for year %d. Processing '  \
-                    'will terminate.' % year
+                msg = 'Error processing the feature cube for year %d, '  \
+                    'lines %d - %d. Processing will terminate.' %  \
+                    (year, start_line, end_line - 1)
                 logIt (msg, self.stackObject.log_handler)
  
             # store the result
             self.result_queue.put(status)
-
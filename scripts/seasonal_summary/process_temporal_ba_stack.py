@@ -21,9 +21,33 @@ from spectral_indices import *
 from spectral_index_from_espa import *
 from log_it import *
 from parallel_worker import *
+from stack_resample import *
+from virtual_stack import *
+from scene_processor import *
+from summary_state import *
+from mask_bits import *
+from feature_cube import *
 
 NUM_SR_BANDS = 13
 
+# seasons, and the bands and indices for which the seasonal summaries are
+# generated
+SUMMARY_SEASONS = ['winter', 'spring', 'summer', 'fall']
+SUMMARY_BANDS = ['band3', 'band4', 'band5', 'band7', 'ndvi', 'ndmi', 'nbr',  \
+    'nbr2']
+
+# indices for which the annual maximums are generated
+MAXIMUM_INDICES = ['ndvi', 'ndmi', 'nbr', 'nbr2']
+
+# number of tasks (bands of lines of each year) per processor for the
+# seasonal summaries and annual maximums, so the processors are kept busy
+# when the years have different numbers of scenes
+SUMMARY_TASKS_PER_PROCESSOR = 4
+
+# default memory budget (MB), split between the parallel workers, for the
+# seasonal summaries
+SUMMARY_MEMORY_MB = 1024
+
 #############################################################################
 # Created on April 29, 2013 by Gail Schmidt, USGS/EROS
 # Created class to hold the methods which process various aspects of the
@@ -40,6 +64,28 @@ NUM_SR_BANDS = 13
 # Updated on Feb. 18, 2015 by Gail Schmidt, USGS/EROS
 # Modified to also exclude high RMSE and high cloud cover scenes in addition
 #   to the current L1G exclusion.
+# Updated on Oct. 17, 2026, USGS/EROS LSRD Project
+# Modified to resample the bands to the stack extents in process rather than
+#   calling gdal_merge.py for each band.
+# Modified to support a virtual stack, where the scenes are left at their
+#   native size and read through their offsets into the stack grid.
+# Modified to process the scenes on the stack grid in a single blocked pass
+#   which combines the QA bands, places the bands in the stack grid, and
+#   computes the spectral indices.
+# Modified to stream the seasonal summaries in blocks of lines within a
+#   configurable memory budget.
+# Modified to generate the seasonal summaries and annual maximums for a year
+#   in a single pass which reads each scene once.
+# Modified to process bands of lines of each year in parallel for the
+#   seasonal summaries and annual maximums.
+# Modified to keep the sums and good looks counts behind the seasonal
+#   summaries as state, so added and removed scenes only update the affected
+#   years and seasons.
+# Modified to write a bit-packed mask for each scene, which is read by the
+#   seasonal summaries in place of the int16 mask.
+# Modified to write the feature cube of each year, which packs the seasonal
+#   summaries and annual maximums of each pixel together for the boosted
+#   regression.
 #
 # Usage: process_temporal_stack.py --help prints the help message
 ############################################################################
@@ -65,6 +111,19 @@ class temporalBAStack():
     geotrans = None           # geographic trans for seasonal summaries
     prj = None                # geographic projection for seasonal summaries
     nodata = None             # noData value of the HDF files for seasonal summ
+    virtual_stack = False     # leave the scenes at their native size and
+                              # read them through offsets into the stack grid
+    scene_offsets = None      # dictionary of the virtual stack scene info
+    extra_indices = []        # additional spectral indices to generate for
+                              # each scene, in <input_dir>/<index>/
+    summary_memory = SUMMARY_MEMORY_MB   # memory budget (MB) for the
+                              # seasonal summaries
+    summary_state = False     # keep the seasonal summary state files
+    summary_prior = None      # dictionary of the scenes in the saved
+                              # summary state, if it is being updated
+    summary_updates = None    # dictionary of the updates for each year
+                              # (see summaryUpdates)
+    feature_cube = False      # write the feature cube of each year
 
     def __init__ (self):
         pass
@@ -465,6 +524,11 @@ class temporalBAStack():
               Make the histograms and overviews optional.
           Updated on 3/17/2014 by Gail Schmidt, USGS/EROS LSRD Project
               Modified to use the ESPA raw binary internal file format.
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Modified to record the scene offsets for a virtual stack.
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Modified to skip the scenes which have already been processed
+              for the saved summary state.
         
         Args:
           bounding_extents_file - name of file which contains the bounding
@@ -523,22 +587,53 @@ class temporalBAStack():
             msg = 'Creating directory for resampled mask files'
             logIt (msg, self.log_handler)
             os.makedirs (self.mask_dir)
+        for index in self.extra_indices:
+            if not os.path.exists (self.input_dir + index):
+                msg = 'Creating directory for resampled %s files' %  \
+                    index.upper()
+                logIt (msg, self.log_handler)
+                os.makedirs (self.input_dir + index)
 
-        # load up the work queue for processing scenes in parallel
-        work_queue = multiprocessing.Queue()
-        num_scenes = 0
+        # get the list of scenes in the stack
+        xml_list = []
         for scene in enumerate (stack):
             xml_file = scene[1][header_row.index('file')]
-            work_queue.put(xml_file)
-            num_scenes += 1
+            xml_list.append(xml_file)
 
         # make sure we have scenes to be processed
-        if num_scenes == 0:
+        if len (xml_list) == 0:
             msg = 'Error resampling bands stack file.  No bands were '  \
                 'specified in ' + stack_file
             logIt (msg, self.log_handler)
             return ERROR
 
+        # for a virtual stack, determine where each scene resides in the
+        # stack grid before the scenes are processed
+        if self.virtual_stack:
+            status = self.buildVirtualStack (xml_list)
+            if status != SUCCESS:
+                msg = 'Error determining the virtual stack offsets'
+                logIt (msg, self.log_handler)
+                return ERROR
+
+        # load up the work queue for processing scenes in parallel; the
+        # scenes in the saved summary state have already been processed
+        work_queue = multiprocessing.Queue()
+        num_scenes = 0
+        for xml_file in xml_list:
+            scene_name = os.path.basename (xml_file).replace ('.xml', '')
+            if self.summary_prior is not None and  \
+                scene_name in self.summary_prior and  \
+                self.sceneProcessed (xml_file):
+                continue
+            work_queue.put(xml_file)
+            num_scenes += 1
+
+        if num_scenes == 0:
+            msg = 'All the scenes in the stack have already been processed'
+            logIt (msg, self.log_handler)
+            return SUCCESS
+
         # create a queue to pass to workers to store the processing status
         result_queue = multiprocessing.Queue()
  
@@ -567,6 +662,270 @@ class temporalBAStack():
         return SUCCESS
 
 
+    def sceneProcessed (self, xml_file):
+        """Determines if the scene has already been processed for the stack.
+        Description: sceneProcessed checks that the mask and the spectral
+            indices (including any additional indices) of the scene exist,
+            along with the reflectance bands used by the seasonal summaries.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args:
+          xml_file - name of the XML file for the scene
+
+        Returns:
+            True - the scene has been processed
+            False - the scene needs to be processed
+        """
+
+        scene_name = os.path.basename (xml_file).replace ('.xml', '')
+        file_list = []
+        for ind in ['mask'] + SUMMARY_BANDS:
+            file_list.append (self.stackBandFile (xml_file, ind))
+        for index in self.extra_indices:
+            file_list.append (self.input_dir + index + '/' + scene_name +  \
+                '_%s.img' % index)
+        for filename in file_list:
+            if not os.path.exists (filename):
+                return False
+        return True
+
+
+    def buildVirtualStack (self, xml_list):
+        """Determines where each scene resides within the stack grid.
+        Description: buildVirtualStack determines the line/sample offset of
+            each scene within the stack grid and writes them to the virtual
+            stack file.  Scenes which fall on the stack grid are left at
+            their native size.  Any scene which does not fall on the stack
+            grid is flagged to be resampled to the stack extents, as is done
+            for the traditional (non-virtual) stack.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args:
+          xml_list - list of XML files in the stack
+
+        Returns:
+            ERROR - error reading the scenes or writing the virtual stack file
+            SUCCESS - successful processing
+        """
+
+        scene_list = []
+        self.scene_offsets = {}
+        for xml_file in xml_list:
+            # open band 1 of the scene to get its size and location
+            band1_file = xml_file.replace ('.xml', '_sr_band1.img')
+            band1_ds = gdal.Open (band1_file, gdalconst.GA_ReadOnly)
+            if band1_ds is None:
+                msg = 'GDAL could not open input file: ' + band1_file
+                logIt (msg, self.log_handler)
+                return ERROR
+            geotrans = band1_ds.GetGeoTransform()
+            nsamps = band1_ds.RasterXSize
+            nlines = band1_ds.RasterYSize
+            band1_ds = None
+
+            # determine where the scene falls in the stack grid
+            grid = stackGrid (self.spatial_extent, geotrans)
+            window = sceneWindow (grid, geotrans, nsamps, nlines)
+            scene_name = os.path.basename (xml_file).replace ('.xml', '')
+            scene = {}
+            scene['file'] = xml_file
+            if window is not None and window['aligned'] and  \
+                window['s_xoff'] == 0 and window['s_yoff'] == 0 and  \
+                window['s_xsize'] == nsamps and window['s_ysize'] == nlines:
+                # the scene is left as-is in the input directory
+                scene['base_file'] = os.path.abspath (  \
+                    xml_file.replace ('.xml', ''))
+                scene['mask_file'] = os.path.abspath (  \
+                    xml_file.replace ('.xml', '_mask.img'))
+                scene['line_offset'] = window['t_yoff']
+                scene['samp_offset'] = window['t_xoff']
+                scene['nlines'] = nlines
+                scene['nsamps'] = nsamps
+                scene['resampled'] = 0
+            else:
+                # the scene will be resampled to the stack extents
+                msg = '    Scene %s is not on the stack grid and will be '  \
+                    'resampled to the stack extents' % scene_name
+                logIt (msg, self.log_handler)
+                scene['base_file'] = self.refl_dir + scene_name
+                scene['mask_file'] = self.mask_dir + scene_name + '_mask.img'
+                scene['line_offset'] = 0
+                scene['samp_offset'] = 0
+                scene['nlines'] = grid['nrow']
+                scene['nsamps'] = grid['ncol']
+                scene['resampled'] = 1
+            scene_list.append (scene)
+            self.scene_offsets[scene_name] = scene
+
+        return writeVirtualStack (self.input_dir + VIRTUAL_STACK_FILE,  \
+            scene_list, self.log_handler)
+
+
+    def stackBandFile (self, xml_file, ind):
+        """Determines the filename of a band, index, or mask for a scene.
+        Description: stackBandFile returns the name of the file which holds
+            the specified band, spectral index, or QA mask of the scene for
+            the stack processing.  For a virtual stack the reflectance bands
+            and mask are the native files in the input directory, unless
+            the scene was resampled to the stack extents.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Added the bit-packed mask.
+
+        Args:
+          xml_file - name of the XML file for the scene
+          ind - band (band1 ... band7), index (ndvi, ndmi, nbr, nbr2), mask,
+              or mask_bits (bit-packed mask)
+
+        Returns:
+            filename - name of the file
+        """
+
+        scene_name = os.path.basename (xml_file).replace ('.xml', '')
+        if ind == 'mask_bits':
+            return maskBitsFile (self.stackBandFile (xml_file, 'mask'))
+        elif ind == 'mask':
+            if self.virtual_stack:
+                return self.scene_offsets[scene_name]['mask_file']
+            return self.mask_dir + scene_name + '_mask.img'
+        elif ind == 'ndvi':
+            return self.ndvi_dir + scene_name + '_ndvi.img'
+        elif ind == 'ndmi':
+            return self.ndmi_dir + scene_name + '_ndmi.img'
+        elif ind == 'nbr':
+            return self.nbr_dir + scene_name + '_nbr.img'
+        elif ind == 'nbr2':
+            return self.nbr2_dir + scene_name + '_nbr2.img'
+        else:   # refl file
+            if self.virtual_stack:
+                return self.scene_offsets[scene_name]['base_file'] +  \
+                    '_sr_' + ind + '.img'
+            return self.refl_dir + scene_name + '_sr_' + ind + '.img'
+
+
+    def openStackBand (self, xml_file, ind):
+        """Opens a band, index, or mask of a scene in the stack grid.
+        Description: openStackBand opens the specified band, spectral index,
+            or QA mask of the scene so that it can be read in stack grid
+            coordinates.  For a virtual stack the reads go through the offset
+            of the scene within the stack grid, returning fill outside of the
+            scene footprint.  The bit-packed mask is read as a boolean array
+            of the good pixels, which are False outside of the scene
+            footprint.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Added the bit-packed mask.
+
+        Args:
+          xml_file - name of the XML file for the scene
+          ind - band (band1 ... band7), index (ndvi, ndmi, nbr, nbr2), mask,
+              or mask_bits (bit-packed mask)
+
+        Returns:
+            None - error opening the file
+            stackWindowBand - band to be read in stack grid coordinates
+            maskBitsBand - bit-packed mask to be read in stack grid
+                coordinates
+        """
+
+        filename = self.stackBandFile (xml_file, ind)
+        line_offset = 0
+        samp_offset = 0
+        nsamps = self.ncol
+        if self.virtual_stack:
+            scene_name = os.path.basename (xml_file).replace ('.xml', '')
+            line_offset = self.scene_offsets[scene_name]['line_offset']
+            samp_offset = self.scene_offsets[scene_name]['samp_offset']
+            nsamps = self.scene_offsets[scene_name]['nsamps']
+
+        if ind == 'mask_bits':
+            mask_band = maskBitsBand (filename, nsamps, line_offset,  \
+                samp_offset, self.nrow, self.ncol, self.log_handler)
+            if mask_band.band is None:
+                # error message already written
+                return None
+            return mask_band
+
+        stack_band = stackWindowBand (filename, line_offset, samp_offset,  \
+            self.nrow, self.ncol, -9999, self.log_handler)
+        if stack_band.band is None:
+            # error message already written
+            return None
+        return stack_band
+
+
+    def readStackGrid (self):
+        """Reads the size and geolocation of the stack grid.
+        Description: readStackGrid determines the number of lines and samples,
+            the geographic transform, projection, and noData value of the
+            stack grid.  For the traditional stack these come from band 1 of
+            the first scene, which has been resampled to the stack extents.
+            For a virtual stack the grid is computed from the stack extents.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+              Pulled from generateSeasonalSummaries and
+              generateAnnualMaximums and added support for a virtual stack.
+
+        Args: None
+
+        Returns:
+            ERROR - error reading the stack information
+            SUCCESS - successful processing
+        """
+
+        # read the virtual stack and extents if they haven't already been read
+        if self.virtual_stack:
+            if self.scene_offsets is None:
+                self.scene_offsets = readVirtualStack (self.input_dir +  \
+                    VIRTUAL_STACK_FILE, self.log_handler)
+                if self.scene_offsets is None:
+                    # error message already written
+                    return ERROR
+            if self.spatial_extent is None:
+                self.spatial_extent = self.stackSpatialExtent (  \
+                    self.input_dir + 'bounding_box_coordinates.csv')
+                if self.spatial_extent is None:
+                    # error message already written
+                    return ERROR
+
+        # determine band1 file for the first scene listed in the stack
+        first_file = self.stackBandFile (self.csv_data['file_'][0], 'band1')
+
+        # open band1 for the first file in the stack to get ncols and nrows
+        # and other associated info for the stack of scenes
+        enviMask = ENVI_Scene (first_file, self.log_handler)
+        if enviMask is None:
+             msg = 'Error reading the ENVI file: ' + first_file
+             logIt (msg, self.log_handler)
+             return ERROR
+
+        if self.virtual_stack:
+            grid = stackGrid (self.spatial_extent,  \
+                enviMask.dataset.GetGeoTransform())
+            self.ncol = grid['ncol']
+            self.nrow = grid['nrow']
+            self.geotrans = grid['geotrans']
+            self.nodata = -9999.0
+        else:
+            self.ncol = enviMask.NCol
+            self.nrow = enviMask.NRow
+            self.geotrans = enviMask.dataset.GetGeoTransform()
+            self.nodata = enviMask.NoData
+        self.prj = enviMask.dataset.GetProjectionRef()
+        enviMask = None
+
+        return SUCCESS
+
+
     def sceneResample(self, xml_file):
         """Resamples the surface reflectance bands in the XML file to the
            specified geographic extent, creates a single QA band, and computes
@@ -574,7 +933,10 @@ class temporalBAStack():
         Description: sceneResample will resample the suface reflectance bands
             in the XML file to the bounding extents.  It then creates a single
             QA band from the surface reflectance QA bands.  Finally it computes
-            the spectral indices for the scene.
+            the spectral indices for the scene.  Scenes which lie on the stack
+            grid (or are left at their native size for a virtual stack) are
+            processed in a single blocked pass via processScene.  Other
+            scenes are resampled via sceneResampleBands.
         
         History:
           Created in 2013 by Jodi Riegle and Todd Hawbaker, USGS Rocky Mountain
@@ -583,6 +945,17 @@ class temporalBAStack():
               Modified to allow for multiprocessing at the scene level.
           Updated on 3/17/2014 by Gail Schmidt, USGS/EROS LSRD Project
               Modified to use the ESPA internal raw binary format
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Modified to place the bands into the stack grid in process via
+              resampleToExtent instead of calling gdal_merge.py per band.
+              Modified to leave the scene at its native size for a virtual
+              stack.
+              Modified to combine the QA bands, place the bands in the stack
+              grid, and compute the spectral indices in a single pass for
+              scenes on the stack grid.  The thermal band is no longer
+              placed in the stack grid since it isn't used.
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Modified to also write the bit-packed mask.
         
         Args:
           xml_file - name of XML file to process
@@ -602,6 +975,101 @@ class temporalBAStack():
             logIt (msg, self.log_handler)
             return ERROR
 
+        # set up the spectral index filenames
+        idx_dict = {}
+        idx_dict['ndvi'] = self.ndvi_dir +  \
+            os.path.basename (xml_file.replace ('.xml', '_ndvi.img'))
+        idx_dict['ndmi'] = self.ndmi_dir +  \
+            os.path.basename (xml_file.replace ('.xml', '_ndmi.img'))
+        idx_dict['nbr'] = self.nbr_dir +  \
+            os.path.basename (xml_file.replace ('.xml', '_nbr.img'))
+        idx_dict['nbr2'] = self.nbr2_dir +  \
+            os.path.basename (xml_file.replace ('.xml', '_nbr2.img'))
+        for index in self.extra_indices:
+            idx_dict[index] = self.input_dir + index + '/' +  \
+                os.path.basename (xml_file.replace ('.xml', '_%s.img' % index))
+
+        # for a virtual stack the scenes on the stack grid are left at their
+        # native size; only the mask and spectral indices are written
+        scene_name = os.path.basename (xml_file).replace ('.xml', '')
+        if self.virtual_stack and  \
+            not self.scene_offsets[scene_name]['resampled']:
+            msg = '   Processing the native scene...'
+            logIt (msg, self.log_handler)
+            mask_file = xml_file.replace ('.xml', '_mask.img')
+            status = processScene (xmlAttr, {}, mask_file, idx_dict,  \
+                mask_bits_file=maskBitsFile (mask_file),  \
+                log_handler=self.log_handler)
+        else:
+            # determine where the scene falls in the stack grid
+            geotrans = xmlAttr.dataset1.GetGeoTransform()
+            grid = stackGrid (self.spatial_extent, geotrans)
+            window = sceneWindow (grid, geotrans, xmlAttr.NCol, xmlAttr.NRow)
+            if window is not None and window['aligned']:
+                # place the reflectance bands in the reflectance directory;
+                # the mask file goes in the mask directory
+                refl_dict = {}
+                for i in SCENE_REFL_BANDS:
+                    refl_dict[i] = self.refl_dir +  \
+                        os.path.basename (xmlAttr.band_dict[i])
+                mask_file = self.mask_dir +  \
+                    os.path.basename (xml_file.replace ('.xml', '_mask.img'))
+                msg = '   Placing the scene in the stack grid and ' \
+                    'calculating spectral indices...'
+                logIt (msg, self.log_handler)
+                status = processScene (xmlAttr, refl_dict, mask_file,  \
+                    idx_dict, grid, window,  \
+                    mask_bits_file=maskBitsFile (mask_file),  \
+                    log_handler=self.log_handler)
+            else:
+                status = self.sceneResampleBands (xmlAttr, idx_dict)
+        if status != SUCCESS:
+            msg = 'Error processing the bands and spectral indices for ' +  \
+                xml_file
+            logIt (msg, self.log_handler)
+            return ERROR
+
+        # clean up the classes and dictionaries
+        del (idx_dict)
+        xmlAttr = None
+
+        endTime0 = time.time()
+        msg = '***Total scene processing time = %f seconds' %  \
+            (endTime0 - startTime0)
+        logIt (msg, self.log_handler)
+        return SUCCESS
+
+
+    def sceneResampleBands(self, xmlAttr, idx_dict):
+        """Resamples the surface reflectance bands of a scene which is not on
+           the stack grid, creates a single QA band, and computes spectral
+           indices.
+        Description: sceneResampleBands creates a single QA band from the
+            surface reflectance QA bands.  It then resamples the surface
+            reflectance bands and the QA band to the bounding extents, and
+            computes the spectral indices from the resampled bands.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+              Moved from sceneResample, which now processes the scenes on
+              the stack grid in a single pass.
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Modified to also write the bit-packed mask.
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Modified to resample the bands in SCENE_REFL_BANDS, so the
+              unused thermal band isn't resampled.
+
+        Args:
+          xmlAttr - XML_Scene for the scene to be processed
+          idx_dict - dictionary of the index types and the associated output
+              filenames
+
+        Returns:
+            ERROR - error resampling each band, or determining the spectral
+                indices
+            SUCCESS - successful processing
+        """
+
         # create a single QA band from the surface reflectance QA bands
         xmlAttr.createQaBand (self.log_handler)
 
@@ -609,8 +1077,7 @@ class temporalBAStack():
         # and place in the reflectance directory; QA file goes in the mask
         # directory
         resamp_band_dict = {}
-        for i in ['band1', 'band2', 'band3', 'band4', 'band5', 'band6',  \
-            'band7', 'band_qa']:
+        for i in SCENE_REFL_BANDS + ['band_qa']:
             if i == 'band_qa':
                 resamp_band_dict[i] = self.mask_dir + \
                     os.path.basename (xmlAttr.band_dict[i])
@@ -620,64 +1087,74 @@ class temporalBAStack():
             msg = '   Resizing file (%s) to max bounds (%s)' %  \
                 (xmlAttr.band_dict[i], resamp_band_dict[i])
             logIt (msg, self.log_handler)
-            cmd = 'gdal_merge.py -o %s -init -9999 -n -9999 -a_nodata -9999 ' \
-                '-ul_lr %d %d %d %d -of ENVI %s' % (resamp_band_dict[i],  \
-                self.spatial_extent['West'], self.spatial_extent['North'],  \
-                self.spatial_extent['East'], self.spatial_extent['South'],  \
-                xmlAttr.band_dict[i])
-            msg = '    ' + cmd
+            status = resampleToExtent (xmlAttr.band_dict[i],  \
+                resamp_band_dict[i], self.spatial_extent,  \
+                log_handler=self.log_handler)
+            if status != SUCCESS:
+                msg = 'Error resizing file (%s) to max bounds' %  \
+                    xmlAttr.band_dict[i]
+                logIt (msg, self.log_handler)
+                return ERROR
+
+        # pack the good pixels of the resampled QA band
+        status = packMaskFile (resamp_band_dict['band_qa'],  \
+            maskBitsFile (resamp_band_dict['band_qa']), self.log_handler)
+        if status != SUCCESS:
+            msg = 'Error packing the mask for ' + xmlAttr.xml_file
             logIt (msg, self.log_handler)
-            os.system(cmd)
+            return ERROR
 
         # calculate ndvi, ndmi, nbr, nbr2 from the resampled files
         msg = '   Calculating spectral indices...'
         logIt (msg, self.log_handler)
         specIndx = spectralIndex (resamp_band_dict, self.log_handler)
         if specIndx == None:
-            msg = 'Error generating the spectral indices for ' + xml_file
+            msg = 'Error generating the spectral indices for ' +  \
+                xmlAttr.xml_file
             logIt (msg, self.log_handler)
             return ERROR
 
-        idx_dict = {}
-        idx_dict['ndvi'] = self.ndvi_dir +  \
-            os.path.basename (xml_file.replace ('.xml', '_ndvi.img'))
-        idx_dict['ndmi'] = self.ndmi_dir +  \
-            os.path.basename (xml_file.replace ('.xml', '_ndmi.img'))
-        idx_dict['nbr'] = self.nbr_dir +  \
-            os.path.basename (xml_file.replace ('.xml', '_nbr.img'))
-        idx_dict['nbr2'] = self.nbr2_dir +  \
-            os.path.basename (xml_file.replace ('.xml', '_nbr2.img'))
         status = specIndx.createSpectralIndices (idx_dict, self.log_handler)
         if status != SUCCESS:
-            msg = 'Error creating the spectral indices for ' + xml_file
+            msg = 'Error creating the spectral indices for ' + xmlAttr.xml_file
             logIt (msg, self.log_handler)
             return ERROR
 
-        # clean up the classes and dictionaries
-        del (idx_dict)
-        xmlAttr = None
         specIndx = None
-
-        endTime0 = time.time()
-        msg = '***Total scene processing time = %f seconds' %  \
-            (endTime0 - startTime0)
-        logIt (msg, self.log_handler)
         return SUCCESS
 
 
-    def generateSeasonalSummaries (self, stack_file):
-        """Generates the seasonal summaries for the temporal stack.
-        Description: generateSeasonalSummaries will generate the seasonal
-        summaries for the temporal stack.  If a log file was specified then the
+    def generateSummaryProducts (self, stack_file):
+        """Generates the seasonal summaries and annual maximums for the
+           temporal stack.
+        Description: generateSummaryProducts will generate the seasonal
+        summaries and the annual maximums for each year in the temporal stack.
+        The products are created up front, then bands of lines of each year
+        are processed in parallel.  If a log file was specified then the
         output from each application will be logged to that file.
         
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+              Combined generateSeasonalSummaries and generateAnnualMaximums,
+              so the summaries and maximums for a year are generated in the
+              same pass through the scenes.
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Modified to process bands of lines of each year in parallel,
+              rather than only the years.
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Modified to update only the affected years and seasons from the
+              saved summary state, and to save the summary state.
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Modified to remove the feature cubes of the years which are
+              processed, and to write the feature cubes if they are kept.
+
         Args:
           stack_file - name of stack file to create; list of the XML products
               to be processed in addition to the date, path/row, sensor,
               bounding coords, pixel size, and UTM zone
         
         Returns:
-            ERROR - error generating the seasonal summaries
+            ERROR - error generating the seasonal summaries or maximums
             SUCCESS - successful processing
         
         Notes:
@@ -688,7 +1165,9 @@ class temporalBAStack():
              fall = sep, oct, nov
           2. Seasonal summaries are the mean value for each season for bands
              3, 4, 5, 7, ndvi, ndmi, nbr, and nbr2.
-          3. Good count is the number of 'lloks' with no QA flag set
+          3. Good count is the number of 'looks' with no QA flag set
+          4. Maximums are the max value for each year for ndvi, ndmi, nbr,
+             and nbr2.  The seasons are ignored.
         """
 
         # make sure the stack file exists
@@ -717,54 +1196,104 @@ class temporalBAStack():
         msg = '\nProcessing stack for %d - %d' % (start_year, end_year)
         logIt (msg, self.log_handler)
 
-        # determine band1 file for the first scene listed in the stack
-        first_file = self.csv_data['file_'][0]
-        base_file = os.path.basename(  \
-            first_file.replace('.xml', '_sr_band1.img'))
-        first_file = '%s%s' % (self.refl_dir, base_file)
+        # determine the ncols and nrows and other associated info for the
+        # stack of scenes
+        status = self.readStackGrid ()
+        if status != SUCCESS:
+            # error message already written
+            return ERROR
 
-        # open the mask for the first file in the stack to get ncols and nrows
-        # and other associated info for the stack of scenes
-        enviMask = ENVI_Scene (first_file, self.log_handler)
-        if enviMask is None:
-             msg = 'Error reading the ENVI file: ' + first_file
-             logIt (msg, self.log_handler)
-             return ERROR
+        # determine the years to be processed; when updating from the saved
+        # summary state, only the years affected by the added and removed
+        # scenes are processed
+        self.summary_updates = None
+        year_list = range (start_year, end_year+1)
+        if self.summary_prior is not None:
+            year_list = self.summaryUpdates (start_year, end_year)
+
+        # the feature cubes of the years to be processed are out of date
+        for year in year_list:
+            removeFeatureCube (self.input_dir, year)
+
+        # create the products for each year which is rebuilt (and the
+        # maximums which are rebuilt for the updated years), so the parallel
+        # tasks can each write their own window of lines
+        num_years = len (year_list)
+        for year in year_list:
+            update = None
+            if self.summary_updates is not None:
+                update = self.summary_updates.get (year)
+            if update is None:
+                status = self.createYearProducts (year)
+                if status != SUCCESS:
+                    # error message already written
+                    return ERROR
+            elif update['maximum'] == 'build':
+                product_dict = self.yearProductFiles (year)
+                for ind in MAXIMUM_INDICES:
+                    if self.createProductBand (product_dict[ind],  \
+                        gdalconst.GDT_Int16, self.nodata) is None:
+                        return ERROR
 
-        self.ncol = enviMask.NCol
-        self.nrow = enviMask.NRow
-        self.geotrans = enviMask.dataset.GetGeoTransform()
-        self.prj = enviMask.dataset.GetProjectionRef()
-        self.nodata = enviMask.NoData
-        enviMask = None
+        if num_years == 0:
+            msg = 'No changes to the seasonal summaries or annual maximums'
+            logIt (msg, self.log_handler)
+            status = self.generateFeatureCubes (start_year, end_year,  \
+                year_list)
+            if status != SUCCESS:
+                # error message already written
+                return ERROR
+            return self.saveSummaryState ()
+
+        # split each year into bands of lines, so there are enough tasks to
+        # keep all the processors busy regardless of the number of years
+        band_lines = self.summaryBandLines (num_years)
 
-        # load up the work queue for processing yearly summaries in parallel
+        # load up the work queue with a task for each band of lines of each
+        # year
         work_queue = multiprocessing.Queue()
-        num_years = end_year - start_year + 1
-        for year in range (start_year, end_year+1):
-            work_queue.put(year)
+        num_tasks = 0
+        for year in year_list:
+            for start_line in range (0, self.nrow, band_lines):
+                end_line = min (start_line + band_lines, self.nrow)
+                work_queue.put((year, start_line, end_line))
+                num_tasks += 1
 
         # create a queue to pass to workers to store the processing status
         result_queue = multiprocessing.Queue()
  
-        # spawn workers to process each year in the stack - generate the
-        # seasonal summaries
-        msg = 'Spawning %d years for processing seasonal summaries via %d '  \
-            'processors ....' % (num_years, self.num_processors)
+        # spawn workers to process each band of lines of each year in the
+        # stack - generate the seasonal summaries and annual maximums
+        msg = 'Spawning %d tasks (%d years, %d lines each) for processing '  \
+            'seasonal summaries and annual maximums via %d processors ....' %  \
+            (num_tasks, num_years, band_lines, self.num_processors)
         logIt (msg, self.log_handler)
         for i in range(self.num_processors):
-            worker = parallelSummaryWorker(work_queue, result_queue, self)
+            worker = parallelProductWorker(work_queue, result_queue, self)
             worker.start()
  
         # collect the results off the queue
-        for i in range(num_years):
+        for i in range(num_tasks):
             status = result_queue.get()
             if status != SUCCESS:
-                msg = 'Error processing seasonal summaries for year %d' %  \
-                    start_year + i
+                msg = 'Error processing seasonal summaries and annual '  \
+                    'maximums'
                 logIt (msg, self.log_handler)
                 return ERROR
 
+        # pack the seasonal summaries and annual maximums into the feature
+        # cubes
+        status = self.generateFeatureCubes (start_year, end_year, year_list)
+        if status != SUCCESS:
+            # error message already written
+            return ERROR
+
+        # record the scenes in the saved state
+        status = self.saveSummaryState ()
+        if status != SUCCESS:
+            # error message already written
+            return ERROR
+
         endTime = time.time()
         msg = 'Processing time = %f seconds' % (endTime-startTime)
         logIt (msg, self.log_handler)
@@ -772,539 +1301,936 @@ class temporalBAStack():
         return SUCCESS
 
 
-    def generateYearSeasonalSummaries (self, year):
-        """Generates the seasonal summaries for the specified year.
-        Description: generateYearSeasonalSummaries will generate the seasonal
-        summaries for the current year.  If a log file was specified then the
-        output from each application will be logged to that file.
+    def saveSummaryState (self):
+        """Records the scenes which have been added to the summary state.
+        Description: saveSummaryState writes the stack extents and the scenes
+            in the stack to the summary state file, once the seasonal
+            summaries and their state have been generated.  Nothing is
+            written if the summary state isn't being kept.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args: None
+
+        Returns:
+            ERROR - error writing the summary state file
+            SUCCESS - successful processing
+        """
+
+        if not self.summary_state:
+            return SUCCESS
+
+        if self.spatial_extent is None:
+            self.spatial_extent = self.stackSpatialExtent (  \
+                self.input_dir + 'bounding_box_coordinates.csv')
+            if self.spatial_extent is None:
+                # error message already written
+                return ERROR
+
+        scene_list = []
+        for i in range (0, len(self.csv_data)):
+            scene = {}
+            scene['file'] = self.csv_data['file_'][i]
+            scene['year'] = self.csv_data['year'][i]
+            scene['month'] = self.csv_data['month'][i]
+            scene_list.append (scene)
+
+        return writeSummaryState (self.input_dir + SUMMARY_STATE_FILE,  \
+            self.spatial_extent, scene_list, self.log_handler)
+
+
+    def summaryUpdates (self, start_year, end_year):
+        """Determines the updates to the seasonal summaries and annual
+           maximums from the saved summary state.
+        Description: summaryUpdates compares the scenes in the stack with the
+            scenes which have been added to the saved summary state, and
+            determines the years, seasons, and annual maximums affected by
+            the added and removed scenes.  The added scenes are added to the
+            saved state and the removed scenes are subtracted from it.  The
+            annual maximums can't be subtracted from, so they are rebuilt from
+            the scenes of the year if a scene is removed.  A year is rebuilt
+            from scratch if it has no saved state or if the files of a removed
+            scene are no longer available.  The updates are saved in
+            summary_updates for generateYearProducts.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args:
+          start_year - first year in the stack
+          end_year - last year in the stack
+
+        Returns:
+            year_list - list of the years to be processed; the years which
+                aren't in summary_updates are rebuilt
+        """
+
+        # determine the scenes which have been added to and removed from the
+        # stack since the state was saved
+        scene_dict = {}
+        for i in range (0, len(self.csv_data)):
+            scene = {}
+            scene['file'] = self.csv_data['file_'][i]
+            scene['year'] = self.csv_data['year'][i]
+            scene['month'] = self.csv_data['month'][i]
+            scene_name = os.path.basename (scene['file']).replace ('.xml', '')
+            scene_dict[scene_name] = scene
+        change_list = []
+        for scene_name in sorted (scene_dict.keys()):
+            if not (scene_name in self.summary_prior):
+                change_list.append ((scene_name, scene_dict[scene_name], 1))
+        for scene_name in sorted (self.summary_prior.keys()):
+            if not (scene_name in scene_dict):
+                change_list.append ((scene_name,  \
+                    self.summary_prior[scene_name], -1))
+        msg = 'Updating the seasonal summaries from the saved state: %d '  \
+            'scenes added, %d scenes removed' %  \
+            (len ([change for change in change_list if change[2] > 0]),  \
+             len ([change for change in change_list if change[2] < 0]))
+        logIt (msg, self.log_handler)
+
+        self.summary_updates = {}
+        year_list = []
+        for year in range (start_year, end_year+1):
+            # a year without saved state is rebuilt
+            product_dict = self.yearProductFiles (year)
+            rebuild = False
+            for season in SUMMARY_SEASONS:
+                for key in [season] +  \
+                    [(season, ind) for ind in SUMMARY_BANDS]:
+                    if not os.path.exists (stateFile (product_dict[key])):
+                        rebuild = True
+
+            # determine the seasons and maximums affected by the changes
+            scene_list = []
+            season_list = []
+            max_changed = False
+            max_removed = False
+            for (scene_name, scene, sign) in change_list:
+                season = self.sceneSeason (year, scene['year'],  \
+                    scene['month'])
+                if scene['year'] == year:
+                    max_changed = True
+                    if sign < 0:
+                        max_removed = True
+                if season is None:
+                    if sign > 0 and scene['year'] == year:
+                        scene_list.append ({'file':scene['file'],  \
+                            'season':None, 'maximum':True, 'sign':sign})
+                    continue
+                if not (season in season_list):
+                    season_list.append (season)
+
+                # the mask, bands, and indices of a removed scene are needed
+                # to subtract it from the state
+                if sign < 0:
+                    if self.virtual_stack and  \
+                        not (scene_name in self.scene_offsets):
+                        rebuild = True
+                        continue
+                    for ind in ['mask'] + SUMMARY_BANDS:
+                        if not os.path.exists (self.stackBandFile (  \
+                            scene['file'], ind)):
+                            rebuild = True
+                scene_list.append ({'file':scene['file'], 'season':season,  \
+                    'maximum':(sign > 0 and scene['year'] == year),  \
+                    'sign':sign})
+
+            if rebuild:
+                msg = '  %d will be rebuilt, since its saved state can not '  \
+                    'be updated' % year
+                logIt (msg, self.log_handler)
+                year_list.append (year)
+                continue
+            if len (season_list) == 0 and not max_changed:
+                continue
+
+            # the maximums are added to, unless a scene was removed or the
+            # maximums don't exist yet, in which case they are rebuilt from
+            # all the scenes of the year
+            max_mode = None
+            if max_changed:
+                max_mode = 'add'
+                for ind in MAXIMUM_INDICES:
+                    if not os.path.exists (product_dict[ind]):
+                        max_mode = 'build'
+                if max_removed:
+                    max_mode = 'build'
+            if max_mode == 'build':
+                added_list = [scene['file'] for scene in scene_list]
+                for scene in self.yearScenes (year):
+                    if scene['maximum'] and  \
+                        not (scene['file'] in added_list):
+                        scene['season'] = None
+                        scene_list.append (scene)
+                if len ([scene for scene in scene_list  \
+                    if scene['maximum']]) == 0:
+                    max_mode = None
+
+            # there are no longer any files for the year, so the maximums
+            # are removed
+            if max_changed and max_mode is None:
+                for ind in MAXIMUM_INDICES:
+                    for filename in [product_dict[ind],  \
+                        product_dict[ind].replace ('.img', '.hdr')]:
+                        if os.path.exists (filename):
+                            os.remove (filename)
+
+            # scenes which only contributed to the rebuilt maximums have
+            # nothing left to do
+            scene_list = [scene for scene in scene_list  \
+                if scene['season'] is not None or  \
+                (scene['maximum'] and max_mode is not None)]
+
+            update = {}
+            update['scene_list'] = scene_list
+            update['seasons'] = [season for season in SUMMARY_SEASONS  \
+                if season in season_list]
+            update['maximum'] = max_mode
+            self.summary_updates[year] = update
+            year_list.append (year)
+
+        return year_list
+
+
+    def sceneSeason (self, year, scene_year, month):
+        """Determines the season of a year to which a scene contributes.
+        Description: sceneSeason returns the season of the specified year to
+            which a scene acquired in the specified year and month
+            contributes.  Scenes from December of the previous year
+            contribute to the winter of the year.  Scenes from December of
+            the year belong to the winter of the following year.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+              Pulled from yearScenes.
+
+        Args:
+          year - year of the products
+          scene_year - year the scene was acquired
+          month - month the scene was acquired
+
+        Returns:
+            None - the scene doesn't contribute to the seasons of the year
+            season - season to which the scene contributes
+        """
+
+        if scene_year == year - 1 and month == 12:
+            return 'winter'
+        elif scene_year != year:
+            return None
+        elif month == 1 or month == 2:
+            return 'winter'
+        elif month >= 3 and month <= 5:
+            return 'spring'
+        elif month >= 6 and month <= 8:
+            return 'summer'
+        elif month >= 9 and month <= 11:
+            return 'fall'
+        return None
+
+
+    def yearScenes (self, year):
+        """Determines the scenes which contribute to the products of a year.
+        Description: yearScenes determines which scenes in the stack
+            contribute to the seasonal summaries and annual maximums of the
+            specified year.  Scenes from December of the previous year
+            contribute to the winter summaries only.  Scenes from December of
+            the current year contribute to the maximums only, since they
+            belong to the winter of the following year.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args:
+          year - year of the products
+
+        Returns:
+            scene_list - list of dictionaries, one per scene, with the file,
+                the season the scene contributes to (None if it doesn't
+                contribute to a seasonal summary), whether the scene
+                contributes to the annual maximums, and the sign (1) with
+                which the scene is added to the seasonal summaries
+        """
+
+        scene_list = []
+        for i in range (0, len(self.csv_data)):
+            scene_year = self.csv_data['year'][i]
+            month = self.csv_data['month'][i]
+            season = self.sceneSeason (year, scene_year, month)
+            if season is None and scene_year != year:
+                continue
+
+            scene = {}
+            scene['file'] = self.csv_data['file_'][i]
+            scene['season'] = season
+            scene['maximum'] = (scene_year == year)
+            scene['sign'] = 1
+            scene_list.append (scene)
+
+        return scene_list
+
+
+    def summaryBlockLines (self):
+        """Determines the number of lines to process at a time for the
+           seasonal summaries and annual maximums.
+        Description: summaryBlockLines determines the number of lines which
+            can be processed at a time for a year.  The memory budget for the
+            seasonal summaries is split between the parallel workers.  Each
+            line of the block needs the good looks count and sums for each
+            season, the maximums, and the line buffers.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Modified for the accumulators of the single pass through the
+              scenes of the year.
+
+        Args: None
+
+        Returns:
+            block_lines - number of lines to process at a time
+        """
+
+        budget = self.summary_memory * 1024 * 1024 //  \
+            max (self.num_processors, 1)
+        line_bytes = self.ncol * (len(SUMMARY_SEASONS) *  \
+            (4 + 4 * len(SUMMARY_BANDS)) + 2 * len(MAXIMUM_INDICES) +  \
+            2 + 1 + 8)
+        block_lines = budget // max (line_bytes, 1)
+        return int (max (min (block_lines, self.nrow), 1))
+
+
+    def summaryBandLines (self, num_years):
+        """Determines the number of lines in each parallel task for the
+           seasonal summaries and annual maximums.
+        Description: summaryBandLines splits the lines of each year into
+            bands, so there are SUMMARY_TASKS_PER_PROCESSOR tasks for each
+            processor over all the years.  Each task is a whole number of
+            blocks (see summaryBlockLines) where possible.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args:
+          num_years - number of years in the stack
+
+        Returns:
+            band_lines - number of lines in each task
+        """
+
+        num_bands = (SUMMARY_TASKS_PER_PROCESSOR * self.num_processors +  \
+            num_years - 1) // num_years
+        num_bands = max (num_bands, 1)
+        band_lines = (self.nrow + num_bands - 1) // num_bands
+
+        # round up to a whole number of blocks
+        block_lines = self.summaryBlockLines ()
+        if band_lines > block_lines:
+            band_lines = ((band_lines + block_lines - 1) // block_lines) *  \
+                block_lines
+        return int (max (min (band_lines, self.nrow), 1))
+
+
+    def createProductBand (self, filename, data_type, nodata):
+        """Creates an output product on the stack grid.
+        Description: createProductBand creates the single band ENVI product
+            on the stack grid and sets the noData value.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+              Pulled from generateYearSeasonalSummaries and
+              generateYearMaximums.
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Modified to allow the noData value to be left unset, for the
+              summary state files.
+
+        Args:
+          filename - name of the output ENVI file to create
+          data_type - GDAL data type of the output product
+          nodata - noData value of the output product; None to leave it unset
+
+        Returns:
+            None - error creating the product
+            (dataset, band) - GDAL dataset and band of the product
+        """
+
+        driver = gdal.GetDriverByName('ENVI')
+        driver.Create (filename, self.ncol, self.nrow, 1, data_type)
+        dataset = gdal.Open (filename, gdalconst.GA_Update)
+        if dataset is None:
+            msg = 'Could not create output file: ' + filename
+            logIt (msg, self.log_handler)
+            return None
+
+        dataset.SetGeoTransform(self.geotrans)
+        dataset.SetProjection(self.prj)
+        band = dataset.GetRasterBand(1)
+        if nodata is not None:
+            band.SetNoDataValue(nodata)
+        return (dataset, band)
+
+
+    def yearProductFiles (self, year):
+        """Determines the filenames of the products of a year.
+        Description: yearProductFiles returns the filenames of the good looks
+            and seasonal summaries for each season, and the annual maximums,
+            for the specified year.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args:
+          year - year of the products
+
+        Returns:
+            product_dict - dictionary of the product filenames, keyed by the
+                season for the good looks, (season, band) for the seasonal
+                summaries, and the index for the annual maximums
+        """
+
+        product_dict = {}
+        for season in SUMMARY_SEASONS:
+            product_dict[season] = self.mask_dir + str(year) + '_' +  \
+                season + '_good_count.img'
+            for ind in SUMMARY_BANDS:
+                product_dict[(season, ind)] = self.indexDir (ind) +  \
+                    str(year) + '_' + season + '_' + ind + '.img'
+        for ind in MAXIMUM_INDICES:
+            product_dict[ind] = self.indexDir (ind) + str(year) +  \
+                '_maximum_' + ind + '.img'
+        return product_dict
+
+
+    def createYearProducts (self, year):
+        """Creates the products of a year.
+        Description: createYearProducts creates the good looks and seasonal
+            summaries for each season of the specified year, along with their
+            int32 state files if the summary state is kept.  The annual
+            maximums are created if there are files for the year.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Modified to create the summary state files.
+
+        Args:
+          year - year of the products
+
+        Returns:
+            ERROR - error creating the products
+            SUCCESS - successful processing
+        """
+
+        scene_list = self.yearScenes (year)
+        product_dict = self.yearProductFiles (year)
+
+        # good looks are written as a byte since there won't be enough total
+        # files to go past 256.  the noData value for this set will be 0 vs.
+        # the traditional nodata value of -9999, since we are working with a
+        # byte product.
+        for season in SUMMARY_SEASONS:
+            if self.createProductBand (product_dict[season],  \
+                gdalconst.GDT_Byte, 0) is None:
+                return ERROR
+            for ind in SUMMARY_BANDS:
+                if self.createProductBand (product_dict[(season, ind)],  \
+                    gdalconst.GDT_Int16, self.nodata) is None:
+                    return ERROR
+
+        # the state holds the good looks counts and sums behind the seasonal
+        # summaries; the annual maximums are their own state
+        if self.summary_state:
+            for season in SUMMARY_SEASONS:
+                for key in [season] +  \
+                    [(season, ind) for ind in SUMMARY_BANDS]:
+                    state_file = stateFile (product_dict[key])
+                    if self.createProductBand (state_file,  \
+                        gdalconst.GDT_Int32, None) is None:
+                        return ERROR
+
+        if len ([scene for scene in scene_list if scene['maximum']]) > 0:
+            for ind in MAXIMUM_INDICES:
+                if self.createProductBand (product_dict[ind],  \
+                    gdalconst.GDT_Int16, self.nodata) is None:
+                    return ERROR
+
+        return SUCCESS
+
+
+    def indexDir (self, ind):
+        """Returns the directory of the stack of the band or index.
+        """
+
+        if (ind == 'ndvi'):
+            return self.ndvi_dir
+        elif (ind == 'ndmi'):
+            return self.ndmi_dir
+        elif (ind == 'nbr'):
+            return self.nbr_dir
+        elif (ind == 'nbr2'):
+            return self.nbr2_dir
+        else:   # refl file
+            return self.refl_dir
+
+
+    def generateYearProducts (self, year, start_line=0, end_line=None):
+        """Generates the seasonal summaries and annual maximums for the
+           specified year.
+        Description: generateYearProducts will generate the seasonal
+        summaries and the annual maximums for the current year.  The scenes
+        are processed in blocks of lines.  For each block, the mask and the
+        bands and indices of each scene are read once and added to the
+        running int32 sums and good looks counts of the scene's season, and
+        to the running maximums of the year.  The products for the block are
+        written once all the scenes have been added.  If the year is being
+        updated (see summaryUpdates), the sums and good looks counts start
+        from the saved state of the affected seasons, the added scenes are
+        added to them and the removed scenes are subtracted from them, and
+        only the affected products are written.  If a log file was specified
+        then the output from each application will be logged to that file.
         
         History:
-          Updated on 5/22/2013 by Gail Schmidt, USGS/EROS LSRD Project
-              Modified to process all the indices one line  at a time (vs. the
-              entire band) since this is faster.
-          Updated on 9/20/2013 by Gail Schmidt, USGS/EROS LSRD Project
-              Modified to process a summary product with fill if there aren't
-              any valid inputs for the current season/year.
-          Updated on 3/24/2014 by Gail Schmidt, USGS/EROS LSRD Project
-              Modified to utilize the ESPA internal raw binary format
+          Created on 10/17/2026, USGS/EROS LSRD Project
+              Replaces generateYearSeasonalSummaries and generateYearMaximums,
+              which each read the masks and indices of the scenes for the
+              year.  The output products are unchanged.
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Modified to process a band of lines of the products, which have
+              already been created by createYearProducts, so the bands of a
+              year can be processed in parallel.
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Modified to save the sums and good looks counts as state, and
+              to update the affected products of the year from that state.
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Modified to read the good pixels from the bit-packed masks.
 
         Args:
-          year - year to process the seasonal summaries
+          year - year to process the seasonal summaries and maximums
+          start_line - first line of the band of lines to process
+          end_line - line after the last line of the band of lines to
+              process; None for the last line of the stack
         
         Returns:
-            ERROR - error generating the seasonal summaries for this year
+            ERROR - error generating the products for this year
             SUCCESS - successful processing
         
         Notes:
-          1. Seasons are defined as:
-             winter = dec (previous year), jan, and feb
-             spring = mar, apr, may
-             summer = jun, jul, aug
-             fall = sep, oct, nov
-          2. Seasonal summaries are the mean value for each season for bands
-             3, 4, 5, 7, ndvi, ndmi, nbr, and nbr2.
-          3. Good count is the number of 'lloks' with no QA flag set
+          1. If there aren't any files for a season, the summary products are
+             written with fill.  If there aren't any files for the year, the
+             maximum products are not written.
         """
 
-        # loop through seasons
-        last_year = year - 1
-        for season in ['winter', 'spring', 'summer', 'fall']:
-            # determine which scenes apply to the current season in the
-            # current year
-            if season == 'winter':
-                season_files =  \
-                    ((self.csv_data['year'] == last_year) &  \
-                     (self.csv_data['month'] == 12)) |  \
-                    ((self.csv_data['year'] == year) &  \
-                    ((self.csv_data['month'] == 1) |    \
-                     (self.csv_data['month'] == 2)))
-            elif season == 'spring':
-                season_files = (self.csv_data['year'] == year) &  \
-                    ((self.csv_data['month'] >= 3) &   \
-                     (self.csv_data['month'] <= 5))
-            elif season == 'summer':
-                season_files = (self.csv_data['year'] == year) &  \
-                    ((self.csv_data['month'] >= 6) &   \
-                     (self.csv_data['month'] <= 8))
-            elif season=='fall':
-                season_files = (self.csv_data['year'] == year) &  \
-                    ((self.csv_data['month'] >= 9) &   \
-                     (self.csv_data['month'] <= 11))
- 
-            # how many scenes do we have for the current year and season?
-            # if there aren't any files to process then write out a
-            # product with fill
-            n_files = sum (season_files)
-            msg = '  season = %s,  file count = %d' % (season, n_files)
-            logIt (msg, self.log_handler)
- 
-            # pull the files for this year and season
-            files = self.csv_data['file_'][season_files]
-            
-            # create the mask datasets -- stack of nrow x ncols
-            mask_data = zeros((n_files, self.nrow, self.ncol), dtype=int16)
-
-            # loop through the current set of files, open the mask files,
-            # and stack them up in a 3D array
-            for i in range(0, n_files):
-                temp = files[i]
-                base_file = os.path.basename(temp.replace('.xml', '_mask.img'))
-                mask_file = '%s%s' % (self.mask_dir, base_file)
-                mask_dataset = gdal.Open (mask_file, gdalconst.GA_ReadOnly)
-                if mask_dataset is None:
-                    msg = 'Could not open mask file: ' + mask_file
+        # determine which scenes contribute to the products for this year,
+        # and which products are written; the file counts are logged by the
+        # first band of lines
+        update = None
+        if self.summary_updates is not None:
+            update = self.summary_updates.get (year)
+        if update is None:
+            scene_list = self.yearScenes (year)
+            season_list = SUMMARY_SEASONS
+            for season in SUMMARY_SEASONS:
+                n_files = len ([scene for scene in scene_list  \
+                    if scene['season'] == season])
+                if start_line == 0:
+                    msg = '  %d season = %s,  file count = %d' %  \
+                        (year, season, n_files)
                     logIt (msg, self.log_handler)
-                    return ERROR
-                mask_band = mask_dataset.GetRasterBand(1)
-                mask_data[i,:,:] = mask_band.ReadAsArray()
-                mask_band = None
-                mask_dataset = None
-            
-            # which voxels in the mask have good qa values?
-            mask_data_good = mask_data >= 0
-            mask_data_bad = mask_data < 0
-            mask_data = None
-            
-            # summarize the number of good pixels in the stack for each
-            # line/sample; if there aren't any files for this year and
-            # season then just fill with zeros; write data as a byte
-            # since there won't be enough total files to go past 256
-            msg = '    Generating %d %s good looks using %d '  \
-                'files ...' % (year, season, n_files)
-            logIt (msg, self.log_handler)
-            if n_files > 0:
-                good_looks = apply_over_axes(sum, mask_data_good,  \
-                    axes=[0])[0,:,:]
-            else:
-                good_looks = zeros((self.nrow, self.ncol), dtype=uint8)
-            
-            # save the good looks output to an ENVI file
-            good_looks_file = self.mask_dir + str(year) + '_' + season +  \
-                '_good_count.img'
-            
-            # write the good looks count to an output ENVI file as a
-            # byte product.  the noData value for this set will be 0 vs.
-            # the traditional nodata value of -9999, since we are working
-            # with a byte product.
-            driver = gdal.GetDriverByName('ENVI')
-            driver.Create (good_looks_file, self.ncol, self.nrow, 1,  \
-                gdalconst.GDT_Byte)
-            good_looks_dataset = gdal.Open (good_looks_file,  \
+            n_max_files = len ([scene for scene in scene_list  \
+                if scene['maximum']])
+            if start_line == 0:
+                msg = '  year = %d,  file count = %d' % (year, n_max_files)
+                logIt (msg, self.log_handler)
+            max_mode = None
+            if n_max_files > 0:
+                max_mode = 'build'
+        else:
+            scene_list = update['scene_list']
+            season_list = update['seasons']
+            max_mode = update['maximum']
+            if start_line == 0:
+                for season in season_list:
+                    n_added = len ([scene for scene in scene_list  \
+                        if scene['season'] == season and scene['sign'] > 0])
+                    n_removed = len ([scene for scene in scene_list  \
+                        if scene['season'] == season and scene['sign'] < 0])
+                    msg = '  %d season = %s,  files added = %d,  '  \
+                        'removed = %d' % (year, season, n_added, n_removed)
+                    logIt (msg, self.log_handler)
+                if max_mode is not None:
+                    msg = '  year = %d,  maximums = %s' % (year, max_mode)
+                    logIt (msg, self.log_handler)
+
+        # open the products for this year, and their state if it is kept;
+        # the lines for this task are written to each product
+        if end_line is None:
+            end_line = self.nrow
+        product_dict = self.yearProductFiles (year)
+        product_list = []
+        for season in season_list:
+            product_list += [season] + [(season, ind) for ind in SUMMARY_BANDS]
+        state_list = []
+        if self.summary_state or update is not None:
+            state_list = list (product_list)
+        if max_mode is not None:
+            product_list += MAXIMUM_INDICES
+        output_ds = {}
+        output_band = {}
+        state_ds = {}
+        state_band = {}
+        for key in product_list:
+            output_ds[key] = gdal.Open (product_dict[key],  \
                 gdalconst.GA_Update)
-            if good_looks_dataset is None:
-                msg = 'Could not create output file: ' + good_looks_file
+            if output_ds[key] is None:
+                msg = 'Could not open output file: ' + product_dict[key]
                 logIt (msg, self.log_handler)
                 return ERROR
-            
-            good_looks_dataset.SetGeoTransform(self.geotrans)
-            good_looks_dataset.SetProjection(self.prj)
-            
-            good_looks_band1 = good_looks_dataset.GetRasterBand(1)
-            good_looks_band1.SetNoDataValue(0)
-            good_looks_band1.WriteArray(good_looks)
-            
-            good_looks_band1 = None
-            good_looks_dataset = None
- 
-            # create the bad data mask that will hold a stack of
-            # mask_data_bad for a single row for all the files
-            curr_mask_data_bad = zeros((n_files, self.ncol),
-                dtype=mask_data_bad.dtype)
-            
-            # loop through bands and indices for which we want to generate
-            # summaries
-            for ind in ['band3', 'band4', 'band5', 'band7', 'ndvi', \
-                'ndmi', 'nbr', 'nbr2']:
-                msg = '    Generating %d %s summary for %s using %d '  \
-                    'files ...' % (year, season, ind, n_files)
+            output_band[key] = output_ds[key].GetRasterBand(1)
+        for key in state_list:
+            state_ds[key] = gdal.Open (stateFile (product_dict[key]),  \
+                gdalconst.GA_Update)
+            if state_ds[key] is None:
+                msg = 'Could not open state file: ' +  \
+                    stateFile (product_dict[key])
                 logIt (msg, self.log_handler)
-                
-                # generate the directory name for the index stack
-                if (ind == 'ndvi'):
-                    dir_name = self.ndvi_dir
-                    ext = '_%s.img' % ind
-                elif (ind == 'ndmi'):
-                    dir_name = self.ndmi_dir
-                    ext = '_%s.img' % ind
-                elif (ind == 'nbr'):
-                    dir_name = self.nbr_dir
-                    ext = '_%s.img' % ind
-                elif (ind == 'nbr2'):
-                    dir_name = self.nbr2_dir
-                    ext = '_%s.img' % ind
-                else:   # refl file
-                    dir_name = self.refl_dir
-                    ext = '_sr_%s.img' % ind
-    
-                # set up the season summaries file
-                temp_file = dir_name + str(year) + '_' + season + '_' +  \
-                    ind + '.img'
-                driver = gdal.GetDriverByName('ENVI')
-                driver.Create (temp_file, self.ncol, self.nrow, 1,  \
-                    gdalconst.GDT_Int16)
-                temp_out_dataset = gdal.Open (temp_file, gdalconst.GA_Update)
-                if temp_out_dataset is None:
-                    msg = 'Could not create output file: ' + temp_file
+                return ERROR
+            state_band[key] = state_ds[key].GetRasterBand(1)
+
+        # open the mask and the bands and indices needed from each scene;
+        # the bit-packed mask is used if the scene has one
+        for scene in scene_list:
+            scene['bands'] = {}
+            ind_list = []
+            if scene['season'] is not None:
+                ind_list = ['mask'] + SUMMARY_BANDS
+                if os.path.exists (self.stackBandFile (scene['file'],  \
+                    'mask_bits')):
+                    ind_list[0] = 'mask_bits'
+            elif scene['maximum']:
+                ind_list = MAXIMUM_INDICES
+            for ind in ind_list:
+                my_band = self.openStackBand (scene['file'], ind)
+                if my_band is None:
+                    msg = 'Could not open raster band %s for %s' %  \
+                        (ind, scene['file'])
                     logIt (msg, self.log_handler)
                     return ERROR
-    
-                temp_out_dataset.SetGeoTransform(self.geotrans)
-                temp_out_dataset.SetProjection(self.prj)
-                temp_out = temp_out_dataset.GetRasterBand(1)
-                temp_out.SetNoDataValue(self.nodata)
-
-                # create the index/band datasets --stack of ncols
-                band_data = zeros((n_files, self.ncol), dtype=int16)
-                
-                # loop through the current set of files, open them, and
-                # attach to the proper band
-                input_ds = {}
-                temp_band = {}
-                for i in range(0, n_files):
-                    base_file = os.path.basename(files[i]).replace('.xml', ext)
-                    temp_file = '%s%s' % (dir_name, base_file)
-                    my_ds = gdal.Open (temp_file, gdalconst.GA_ReadOnly)
-                    if my_ds is None:
-                        msg = 'Could not open index/band file: ' + temp_file
-                        logIt (msg, self.log_handler)
-                        return ERROR
-                    input_ds[i] = my_ds
-                    
-                    # open the appropriate band in the input image
-                    my_temp_band = my_ds.GetRasterBand(1)
-                    if my_temp_band is None:
-                        msg = 'Could not open raster band for ' + ind
-                        logIt (msg, self.log_handler)
-                        return ERROR
-                    temp_band[i] = my_temp_band
-
-                # loop through each line in the image and process
-                for y in range (0, self.nrow):
-#                    print 'Line: %d' % y
-                    # loop through the current set of files and process them
-                    for i in range(0, n_files):
-#                        print '  Stacking file: ' + files[i]
-                        # read the current row of data
-                        my_temp_band = temp_band[i]
-                        band_data[i,:] = my_temp_band.ReadAsArray(0, y,  \
-                            self.ncol, 1)[0,]
-
-                        # stack up the current row of the bad data mask
-                        curr_mask_data_bad[i,:] = mask_data_bad[i,y,:]
-                
-                    # summarize the good pixels in the stack for each
-                    # line/sample
-                    if n_files > 0:
-                        # replace bad QA values with zeros
-                        band_data[curr_mask_data_bad] = 0
-                    
-                        # calculate totals within each voxel
-                        sum_data = apply_over_axes(sum, band_data,  \
-                            axes=[0])[0,]
-                        
-                        # divide by the number of good looks within a voxel
-                        mean_data = sum_data / good_looks[y,]
-                        
-                        # fill with nodata values in places where we would
-                        # have divide by zero errors
-                        mean_data[good_looks[y,]== 0] = self.nodata
+                scene['bands'][ind] = my_band
+
+        # allocate the accumulators and buffers for the block
+        block_lines = min (self.summaryBlockLines (), end_line - start_line)
+        msg = '    Processing year %d, lines %d - %d, %d lines at a time' %  \
+            (year, start_line, end_line - 1, block_lines)
+        logIt (msg, self.log_handler)
+        shape = (block_lines, self.ncol)
+        good_buf = {}
+        sum_buf = {}
+        for season in season_list:
+            good_buf[season] = empty (shape, dtype=int32)
+            for ind in SUMMARY_BANDS:
+                sum_buf[(season, ind)] = empty (shape, dtype=int32)
+        max_buf = {}
+        for ind in MAXIMUM_INDICES:
+            max_buf[ind] = empty (shape, dtype=int16)
+        line_buf = empty (shape, dtype=int16)
+        mask_buf = empty (shape, dtype=bool)
+        mean_buf = empty (shape, dtype=float64)
+
+        # loop through each block of lines in the band and process
+        for y in range (start_line, end_line, block_lines):
+            nlines = min (block_lines, end_line - y)
+            line_data = line_buf[0:nlines,:]
+            curr_good = mask_buf[0:nlines,:]
+
+            # set up the accumulators for the block; an update starts from
+            # the saved state and the current maximums
+            good_looks = {}
+            sum_data = {}
+            max_data = {}
+            for season in season_list:
+                good_looks[season] = good_buf[season][0:nlines,:]
+                if update is None:
+                    good_looks[season].fill (0)
+                else:
+                    state_band[season].ReadAsArray (0, y, self.ncol,  \
+                        nlines, buf_obj=good_looks[season])
+                for ind in SUMMARY_BANDS:
+                    key = (season, ind)
+                    sum_data[key] = sum_buf[key][0:nlines,:]
+                    if update is None:
+                        sum_data[key].fill (0)
                     else:
-                       # create a line of nodata -- nrow=1 x ncols
-                        mean_data = zeros((self.ncol), dtype=uint16) +  \
-                            self.nodata
-    
-                    # write the season summaries to a file
-                    mean_data_2d = reshape (mean_data, (1, len(mean_data)))
-                    temp_out.WriteArray(mean_data_2d, 0, y)
-                # end for y
-    
-                # clean up the data for the current index
-                temp_out = None
-                temp_out_dataset = None
-                band_data = None
-                sum_data = None
-                mean_data = None
-                input_ds = None
-                temp_band = None
-            # end for ind
- 
-            # clean up the masked datasets for the current year and season
-            mask_data_good = None
-            mask_data_bad = None
-            good_looks = None
-        # end for season
+                        state_band[key].ReadAsArray (0, y, self.ncol,  \
+                            nlines, buf_obj=sum_data[key])
+            for ind in MAXIMUM_INDICES:
+                max_data[ind] = max_buf[ind][0:nlines,:]
+                if max_mode == 'add':
+                    output_band[ind].ReadAsArray (0, y, self.ncol, nlines,  \
+                        buf_obj=max_data[ind])
+                else:
+                    max_data[ind].fill (-32768)
+
+            # add (or subtract) each scene to the accumulators for its season
+            # and year; each band is read once for both the summaries and
+            # maximums
+            for scene in scene_list:
+                season = scene['season']
+                if season is not None:
+                    # which pixels in the mask have good qa values?
+                    if 'mask_bits' in scene['bands']:
+                        scene['bands']['mask_bits'].ReadAsArray (0, y,  \
+                            self.ncol, nlines, buf_obj=curr_good)
+                    else:
+                        scene['bands']['mask'].ReadAsArray (0, y,  \
+                            self.ncol, nlines, buf_obj=line_data)
+                        greater_equal (line_data, 0, out=curr_good)
+                    if scene['sign'] > 0:
+                        add (good_looks[season], curr_good,  \
+                            out=good_looks[season])
+                    else:
+                        subtract (good_looks[season], curr_good,  \
+                            out=good_looks[season])
+
+                for ind in SUMMARY_BANDS:
+                    if not (ind in scene['bands']):
+                        continue
+                    scene['bands'][ind].ReadAsArray (0, y, self.ncol,  \
+                        nlines, buf_obj=line_data)
+
+                    # sum the good pixels for the seasonal summaries; the
+                    # maximums include all the pixels
+                    if season is not None:
+                        if scene['sign'] > 0:
+                            add (sum_data[(season, ind)], line_data,  \
+                                out=sum_data[(season, ind)], where=curr_good)
+                        else:
+                            subtract (sum_data[(season, ind)], line_data,  \
+                                out=sum_data[(season, ind)], where=curr_good)
+                    if scene['maximum'] and ind in max_data:
+                        maximum (max_data[ind], line_data, out=max_data[ind])
+
+            # write the good looks and season summaries for the block; the
+            # mean is the sum divided by the number of good looks, filled
+            # with nodata values where we would have divide by zero errors
+            mean_data = mean_buf[0:nlines,:]
+            for season in season_list:
+                output_band[season].WriteArray (good_looks[season], 0, y)
+                for ind in SUMMARY_BANDS:
+                    true_divide (sum_data[(season, ind)], good_looks[season],  \
+                        out=mean_data)
+                    mean_data[good_looks[season] == 0] = self.nodata
+                    output_band[(season, ind)].WriteArray (mean_data, 0, y)
+
+            # save the state for the block
+            for key in state_list:
+                if key in good_looks:
+                    state_band[key].WriteArray (good_looks[key], 0, y)
+                else:
+                    state_band[key].WriteArray (sum_data[key], 0, y)
+
+            # write the annual maximums for the block
+            if max_mode is not None:
+                for ind in MAXIMUM_INDICES:
+                    output_band[ind].WriteArray (max_data[ind], 0, y)
+        # end for y
+
+        # clean up the files and buffers for the current year
+        for scene in scene_list:
+            scene['bands'] = None
+        output_band = None
+        output_ds = None
+        state_band = None
+        state_ds = None
+        good_buf = sum_buf = max_buf = None
+        line_buf = mask_buf = mean_buf = None
  
         return SUCCESS
 
 
-    def generateAnnualMaximums (self, stack_file):
-        """Generates the annual maximums for the temporal stack.
-        Description: generateAnnualMaximums will generate the maximum values
-        for each year in the temporal stack.  If a log file was specified then
-        the output from each application will be logged to that file.
-        
+    def generateFeatureCubes (self, start_year, end_year, year_list):
+        """Generates the feature cubes for the temporal stack.
+        Description: generateFeatureCubes packs the seasonal summaries and
+        annual maximums of each year into the year's feature cube, if the
+        feature cubes are kept.  The cubes of the processed years are
+        written, along with those of the years which don't have a cube yet.
+        Each cube is created up front as a temporary file, then bands of
+        lines of each year are processed in parallel.  The temporary file is
+        renamed once the cube is complete.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
         Args:
-          stack_file - name of stack file to create; list of the XML products
-              to be processed in addition to the date, path/row, sensor,
-              bounding coords, pixel size, and UTM zone
-        
+          start_year - first year of the stack
+          end_year - last year of the stack
+          year_list - years for which the seasonal summaries and annual
+              maximums were processed
+
         Returns:
-            ERROR - error generating the annual maximums
+            ERROR - error generating the feature cubes
             SUCCESS - successful processing
-        
+
         Notes:
-          1. The seasons will be ignored.
+          1. There is no feature cube for a year without annual maximums.
         """
 
-        # make sure the stack file exists
-        if not os.path.exists(stack_file):
-            msg = 'Could not open stack file: ' + stack_file
-            logIt (msg, self.log_handler)
-            return ERROR
+        if not self.feature_cube:
+            return SUCCESS
 
-        # ignore divide by zero and invalid (NaN) values when doing array
-        # division.  these will be handled on our own.
-        seterr(divide='ignore', invalid='ignore')
+        # determine the years which need a feature cube
+        cube_years = []
+        for year in range (start_year, end_year+1):
+            product_dict = self.yearProductFiles (year)
+            if not (year in year_list) and  \
+                os.path.exists (featureCubeFile (self.input_dir, year)):
+                continue
+            if len ([ind for ind in MAXIMUM_INDICES  \
+                if not os.path.exists (product_dict[ind])]) > 0:
+                continue
+            cube_years.append (year)
+        if len (cube_years) == 0:
+            return SUCCESS
 
-        # open and read the stack file
+        # create the temporary cube for each year at its full size, so the
+        # parallel tasks can each write their own window of lines
         startTime = time.time()
-        self.csv_data = recfromcsv (stack_file, delimiter=',', names=True)
-        if self.csv_data is None:
-            msg = 'Error reading the stack file: ' + stack_file
+        cube_dir = os.path.join (self.input_dir, FEATURE_CUBE_DIR)
+        if not os.path.exists (cube_dir):
+            msg = 'Creating directory for the feature cubes'
             logIt (msg, self.log_handler)
-            return ERROR
-
-        # get the sorted, unique years in the stack; grab the first and last
-        # year and use as the range of years to be processed.
-        years = unique (self.csv_data['year'])
-        start_year = years[0]
-        end_year = years[len(years)-1]
-        msg = '\nProcessing stack for %d - %d' % (start_year, end_year)
-        logIt (msg, self.log_handler)
-
-        # determine band1 file for the first scene listed in the stack
-        first_file = self.csv_data['file_'][0]
-        base_file = os.path.basename(  \
-            first_file.replace('.xml', '_sr_band1.img'))
-        first_file = '%s%s' % (self.refl_dir, base_file)
-
-        # open the mask for the first file in the stack to get ncols and nrows
-        # and other associated info for the stack of scenes
-        enviMask = ENVI_Scene (first_file, self.log_handler)
-        if enviMask is None:
-             msg = 'Error reading the ENVI file: ' + first_file
-             logIt (msg, self.log_handler)
-             return ERROR
-
-        self.ncol = enviMask.NCol
-        self.nrow = enviMask.NRow
-        self.geotrans = enviMask.dataset.GetGeoTransform()
-        self.prj = enviMask.dataset.GetProjectionRef()
-        self.nodata = enviMask.NoData
-        enviMask = None
+            os.makedirs (cube_dir)
+        cube_size = self.nrow * self.ncol * FEATURE_CUBE_NBANDS * 2
+        for year in cube_years:
+            temp_file = featureCubeTempFile (self.input_dir, year)
+            try:
+                cube = open (temp_file, 'wb')
+                cube.truncate (cube_size)
+                cube.close()
+            except IOError, e:
+                msg = 'Error creating the feature cube %s: %s' %  \
+                    (temp_file, str(e))
+                logIt (msg, self.log_handler)
+                return ERROR
 
-        # load up the work queue for processing annual maximums in parallel
+        # load up the work queue with a task for each band of lines of each
+        # year
+        band_lines = self.summaryBandLines (len (cube_years))
         work_queue = multiprocessing.Queue()
-        num_years = end_year - start_year + 1
-        for year in range (start_year, end_year+1):
-            work_queue.put(year)
-
-        # create a queue to pass to workers to store the processing status
+        num_tasks = 0
+        for year in cube_years:
+            for start_line in range (0, self.nrow, band_lines):
+                end_line = min (start_line + band_lines, self.nrow)
+                work_queue.put((year, start_line, end_line))
+                num_tasks += 1
         result_queue = multiprocessing.Queue()
- 
-        # spawn workers to process each year in the stack - generate the
-        # seasonal summaries
-        msg = 'Spawning %d years for processing annual maximums via %d '  \
-            'processors ....' % (num_years, self.num_processors)
+
+        msg = 'Spawning %d tasks (%d years, %d lines each) for processing '  \
+            'the feature cubes via %d processors ....' %  \
+            (num_tasks, len (cube_years), band_lines, self.num_processors)
         logIt (msg, self.log_handler)
         for i in range(self.num_processors):
-            worker = parallelMaxWorker(work_queue, result_queue, self)
+            worker = parallelFeatureCubeWorker(work_queue, result_queue, self)
             worker.start()
- 
-        # collect the results off the queue
-        for i in range(num_years):
+
+        for i in range(num_tasks):
             status = result_queue.get()
             if status != SUCCESS:
-                msg = 'Error processing annual maximums for year %d' %  \
-                    start_year + i
+                msg = 'Error processing the feature cubes'
                 logIt (msg, self.log_handler)
                 return ERROR
 
+        # the cubes are complete, so write their headers and put them in
+        # place
+        for year in cube_years:
+            cube_file = featureCubeFile (self.input_dir, year)
+            template_hdr = self.yearProductFiles (year)[  \
+                (FEATURE_CUBE_SEASONS[0], FEATURE_CUBE_BANDS[0])].replace (  \
+                '.img', '.hdr')
+            writeFeatureCubeHeader (cube_file, self.nrow, self.ncol,  \
+                template_hdr)
+            os.rename (featureCubeTempFile (self.input_dir, year), cube_file)
+
         endTime = time.time()
-        msg = 'Processing time = %f seconds' % (endTime-startTime)
+        msg = 'Feature cube processing time = %f seconds' %  \
+            (endTime-startTime)
         logIt (msg, self.log_handler)
- 
         return SUCCESS
 
 
-    def generateYearMaximums (self, year):
-        """Generates the annual maximums for the specified year.
-        Description: generateYearMaximums will generate the maximums for the
-        current year.  If a log file was specified then the output from each
-        application will be logged to that file.
-        
+    def generateFeatureCube (self, year, start_line, end_line):
+        """Generates a band of lines of the feature cube of a year.
+        Description: generateFeatureCube reads the seasonal summaries and
+        annual maximums of the year for the band of lines, a block of lines
+        at a time, and writes the values of each pixel together to the
+        temporary feature cube of the year.
+
         History:
-          Updated on 3/24/2014 by Gail Schmidt, USGS/EROS LSRD Project
-              Modified to utilize the ESPA internal raw binary format
-        
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
         Args:
-          year - year to process the maximums
-        
+          year - year of the seasonal summaries and annual maximums
+          start_line - first line of the band of lines to process
+          end_line - line after the last line of the band of lines to process
+
         Returns:
-            ERROR - error generating the maximums for this year
+            ERROR - error generating the feature cube
             SUCCESS - successful processing
-        
-        Notes:
-          1. Maximums are the max value for each year for ndvi, ndmi, nbr,
-             and nbr2.
         """
 
-        # determine which files apply to the current year
-        year_files = (self.csv_data['year'] == year)
-        n_files = sum (year_files)
- 
-        # if there aren't any files to process then skip to the next year
-        msg = '  year = %d,  file count = %d' % (year, n_files)
-        logIt (msg, self.log_handler)
-        if n_files == 0:
-            return SUCCESS
- 
-        # pull the files for the current year
-        files = self.csv_data['file_'][year_files]
-            
-        # create the mask datasets -- stack of nrow x ncols
-        mask_data = zeros((n_files, self.nrow, self.ncol), dtype=int16)
-
-        # loop through the current set of files, open the mask files,
-        # and stack them up in a 3D array
-        for i in range(0, n_files):
-            temp = files[i]
-            base_file = os.path.basename(temp.replace('.xml', '_mask.img'))
-            mask_file = '%s%s' % (self.mask_dir, base_file)
-            mask_dataset = gdal.Open (mask_file, gdalconst.GA_ReadOnly)
-            if mask_dataset is None:
-                msg = 'Could not open mask file: ' + mask_file
+        # open the products in the order of the bands of the cube
+        product_dict = self.yearProductFiles (year)
+        key_list = []
+        for season in FEATURE_CUBE_SEASONS:
+            key_list += [(season, ind) for ind in FEATURE_CUBE_BANDS]
+        key_list += FEATURE_CUBE_MAXIMUMS
+        product_ds = []
+        product_band = []
+        for key in key_list:
+            dataset = gdal.Open (product_dict[key])
+            if dataset is None:
+                msg = 'Could not open file: ' + product_dict[key]
                 logIt (msg, self.log_handler)
                 return ERROR
-            mask_band = mask_dataset.GetRasterBand(1)
-            mask_data[i,:,:] = mask_band.ReadAsArray()
-            mask_band = None
-            mask_dataset = None
-        
-        # which voxels in the mask have fill values?
-        mask_data_bad = mask_data < 0
-        mask_data = None
-            
-        # create the bad data mask that will hold a stack of mask_data_bad
-        # for a single row for all the files
-        curr_mask_data_bad = zeros((n_files, self.ncol),
-            dtype=mask_data_bad.dtype)
-            
-        # loop through indices for which we want to generate maximums
-        for ind in ['ndvi', 'ndmi', 'nbr', 'nbr2']:
-            msg = '    Generating %d maximums for %s using %d files ...' % \
-                (year, ind, n_files)
+            product_ds.append (dataset)
+            product_band.append (dataset.GetRasterBand(1))
+
+        temp_file = featureCubeTempFile (self.input_dir, year)
+        try:
+            cube = open (temp_file, 'r+b')
+        except IOError, e:
+            msg = 'Error opening the feature cube %s: %s' % (temp_file, str(e))
             logIt (msg, self.log_handler)
-                
-            # generate the directory name for the index stack
-            ext = '_%s.img' % ind
-            if (ind == 'ndvi'):
-                dir_name = self.ndvi_dir
-            elif (ind == 'ndmi'):
-                dir_name = self.ndmi_dir
-            elif (ind == 'nbr'):
-                dir_name = self.nbr_dir
-            elif (ind == 'nbr2'):
-                dir_name = self.nbr2_dir
-    
-            # set up the annual maximum ENVI file
-            temp_file = dir_name + str(year) + '_maximum_' + ind + '.img'
-            driver = gdal.GetDriverByName('ENVI')
-            driver.Create (temp_file, self.ncol, self.nrow, 1,  \
-                gdalconst.GDT_Int16)
-            temp_out_dataset = gdal.Open (temp_file, gdalconst.GA_Update)
-            if temp_out_dataset is None:
-                msg = 'Could not create output file: ' + temp_file
-                logIt (msg, self.log_handler)
-                return ERROR
-    
-            temp_out_dataset.SetGeoTransform(self.geotrans)
-            temp_out_dataset.SetProjection(self.prj)
-            temp_out = temp_out_dataset.GetRasterBand(1)
-            temp_out.SetNoDataValue(self.nodata)
-
-            # create the index dataset -- stack of ncols
-            indx_data = zeros((n_files, self.ncol), dtype=int16)
-                
-            # loop through the current set of files, open them, and attach
-            # to the proper band
-            input_ds = {}
-            indx_band = {}
-            for i in range(0, n_files):
-                temp = files[i]
-                base_file = os.path.basename(files[i]).replace('.xml', ext)
-                temp_file = '%s%s' % (dir_name, base_file)
-                my_ds = gdal.Open (temp_file, gdalconst.GA_ReadOnly)
-                if my_ds is None:
-                    msg = 'Could not open index file: ' + temp_file
-                    logIt (msg, self.log_handler)
-                    return ERROR
-                input_ds[i] = my_ds
-                
-                # open band 1 of the index product
-                my_indx_band = my_ds.GetRasterBand(1)
-                if my_indx_band is None:
-                    msg = 'Could not open raster band for ' + ind
-                    logIt (msg, self.log_handler)
-                    return ERROR
-                indx_band[i] = my_indx_band
-
-            # loop through each line in the image and process
-            for y in range (0, self.nrow):
-#                print 'Line: %d' % y
-                # loop through the current set of files and process them
-                for i in range(0, n_files):
-#                    print '  Stacking file: ' + files[i]
-                    # read the current row of data
-                    my_indx_band = indx_band[i]
-                    indx_data[i,:] = my_indx_band.ReadAsArray(0, y,  \
-                        self.ncol, 1)[0,]
-
-                    # stack up the current row of the bad data mask
-                    curr_mask_data_bad[i,:] = mask_data_bad[i,y,:]
-                
-                # determine maximum values in the stack for each line/sample
-                if n_files > 0:
-                    # calculate maximum values within each voxel
-                    max_data = apply_over_axes(amax, indx_data, axes=[0])[0,]
-                else:
-                   # create a line of nodata -- nrow=1 x ncols
-                    max_data = zeros((self.ncol), dtype=uint16) +  \
-                        self.nodata
-    
-                # write the annual maximums to an output file
-                max_data_2d = reshape (max_data, (1, len(max_data)))
-                temp_out.WriteArray(max_data_2d, 0, y)
-            # end for y
-    
-            # clean up the data for the current index
-            temp_out = None
-            temp_out_dataset = None
-            indx_data = None
-            max_data = None
-            input_ds = None
-            indx_band = None
-        # end for ind
- 
-        # clean up the masked datasets for the current year
-        mask_data_bad = None
- 
+            return ERROR
+        cube.seek (start_line * self.ncol * FEATURE_CUBE_NBANDS * 2)
+
+        # loop through each block of lines in the band, and pack the values
+        # of each pixel together
+        block_lines = min (self.summaryBlockLines (), end_line - start_line)
+        line_buf = empty ((block_lines, self.ncol), dtype=int16)
+        cube_buf = empty ((block_lines, self.ncol, FEATURE_CUBE_NBANDS),  \
+            dtype='<i2')
+        for y in range (start_line, end_line, block_lines):
+            nlines = min (block_lines, end_line - y)
+            line_data = line_buf[0:nlines,:]
+            for i in range (0, len (product_band)):
+                product_band[i].ReadAsArray (0, y, self.ncol, nlines,  \
+                    buf_obj=line_data)
+                cube_buf[0:nlines,:,i] = line_data
+            cube_buf[0:nlines].tofile (cube)
+
+        cube.close()
+        product_band = None
+        product_ds = None
         return SUCCESS
 
 
     def processStack (self, input_dir=None, exclude_l1g=None,  \
         exclude_rmse=None, exclude_cloud_cover=None, logfile=None,  \
-        num_processors=1, usebin=None):
+        num_processors=1, usebin=None, virtual_stack=False,  \
+        extra_indices=None, summary_memory=SUMMARY_MEMORY_MB,  \
+        incremental=False, feature_cube=False):
         """Processes the temporal stack of data to generate seasonal summaries
            and annual maximums for each year in the stack.
         Description: processStack will process the temporal stack of data
@@ -1323,6 +2249,17 @@ class temporalBAStack():
               the common geographic extents.
           Updated on 2/18/2015 by Gail Schmidt, USGS/EROS LSRD Project
               Added support for excluding high RMSE and high cloud cover scenes.
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Added support for the virtual stack.
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Added support for generating additional spectral indices.
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Added the memory budget for the seasonal summaries.
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Added support for incremental updates of the seasonal summaries
+              from the saved summary state.
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Added the feature cube of each year.
         
         Args:
           input_dir - name of the directory in which to find the surface
@@ -1344,6 +2281,28 @@ class temporalBAStack():
               processing sections of the application
           usebin - this specifies if the BA exes reside in the $BIN directory;
               if None then the BA exes are expected to be in the PATH
+          virtual_stack - if True, then the scenes are left at their native
+              size rather than being resampled to the maximum bounding extents
+              of the stack.  The location of each scene within the stack is
+              written to virtual_stack.csv in the input directory.
+          extra_indices - list of additional spectral indices (keys of
+              INDEX_REGISTRY) to generate for each scene, beyond the NDVI,
+              NDMI, NBR, and NBR2 needed by the burned area processing.  These
+              are written to the <index> subdirectory of the input directory,
+              scaled as described for INDEX_REGISTRY.
+          summary_memory - memory budget (MB) for the seasonal summaries,
+              shared by all the processors
+          incremental - if True, then the sums and good looks counts behind
+              the seasonal summaries are saved as state files next to the
+              products.  If the state from a previous run exists and the
+              stack extents are unchanged, only the scenes added since that
+              run are processed and only the affected years and seasons are
+              updated; removed scenes are subtracted from the state.
+          feature_cube - if True, then the seasonal summaries and annual
+              maximums of each year are also packed into a pixel interleaved
+              feature cube, <input_dir>/features/<year>_features.img, which
+              is used by the boosted regression in place of the individual
+              products.
         
         Returns:
             ERROR - error running the BA applications and script
@@ -1405,6 +2364,32 @@ class temporalBAStack():
                      'from the temporal stack. These high cloud cover files ' \
                      'are also moved to a directory called '  \
                      'exclude_cloud_cover in the input directory.')
+            parser.add_argument ('--virtual_stack', dest='virtual_stack',
+                default=False, action='store_true',
+                help='if True, then the scenes are left at their native size '  \
+                     'and read through their offsets into the stack extents, ' \
+                     'rather than being resampled to the stack extents.')
+            parser.add_argument ('--extra_indices', type=str,
+                dest='extra_indices',
+                help='comma-separated list of additional spectral indices '  \
+                     'to generate for each scene (%s)' %  \
+                     ', '.join (sorted (INDEX_REGISTRY.keys())))
+            parser.add_argument ('--summary_memory', type=int,
+                dest='summary_memory', default=SUMMARY_MEMORY_MB,
+                help='memory budget (MB) for generating the seasonal '  \
+                     'summaries, shared by all the processors '  \
+                     '(default = %d)' % SUMMARY_MEMORY_MB)
+            parser.add_argument ('--incremental', dest='incremental',
+                default=False, action='store_true',
+                help='if True, then the seasonal summary state is saved '  \
+                     'and the seasonal summaries and annual maximums are '  \
+                     'updated from the state saved by the previous run, '  \
+                     'for the scenes added to or removed from the stack.')
+            parser.add_argument ('--feature_cube', dest='feature_cube',
+                default=False, action='store_true',
+                help='if True, then the seasonal summaries and annual '  \
+                     'maximums of each year are also packed into a pixel '  \
+                     'interleaved feature cube for the boosted regression.')
 
             options = parser.parse_args()
     
@@ -1414,6 +2399,12 @@ class temporalBAStack():
             exclude_l1g = options.exclude_l1g
             exclude_rmse = options.exclude_rmse
             exclude_cloud_cover = options.exclude_cloud_cover
+            virtual_stack = options.virtual_stack
+            if options.extra_indices is not None:
+                extra_indices = options.extra_indices.split(',')
+            summary_memory = options.summary_memory
+            incremental = options.incremental
+            feature_cube = options.feature_cube
 
             # input directory
             input_dir = options.input_dir
@@ -1461,6 +2452,21 @@ class temporalBAStack():
         
         # make sure the input directory exists and is writable
         self.input_dir = input_dir
+        self.virtual_stack = virtual_stack
+        self.summary_memory = summary_memory
+        self.summary_state = incremental
+        self.feature_cube = feature_cube
+        self.extra_indices = []
+        if extra_indices is not None:
+            for index in extra_indices:
+                index = index.strip().lower()
+                if not (index in INDEX_REGISTRY):
+                    msg = 'Unsupported spectral index: ' + index
+                    logIt (msg, self.log_handler)
+                    return ERROR
+                if not (index in ['ndvi', 'ndmi', 'nbr', 'nbr2'] +  \
+                    self.extra_indices):
+                    self.extra_indices.append (index)
         if not os.path.exists(input_dir):
             msg = 'Input directory does not exist: ' + input_dir
             logIt (msg, self.log_handler)
@@ -1535,6 +2541,29 @@ class temporalBAStack():
             os.chdir (mydir)
             return ERROR
 
+        # use the saved summary state from the previous run if this is an
+        # incremental run and the stack extents haven't changed.  the summary
+        # state file is removed until the state has been updated, so a
+        # failed run isn't mistaken for a saved state.
+        self.summary_prior = None
+        if os.path.exists (SUMMARY_STATE_FILE):
+            summary_state = None
+            if incremental:
+                summary_state = readSummaryState (SUMMARY_STATE_FILE,  \
+                    self.log_handler)
+            spatial_extent = self.stackSpatialExtent (bounding_box_file)
+            if summary_state is not None and  \
+                summary_state[0] == spatial_extent:
+                msg = 'Updating the saved summary state for %d scenes' %  \
+                    len (summary_state[1])
+                logIt (msg, self.log_handler)
+                self.summary_prior = summary_state[1]
+            elif incremental:
+                msg = 'The saved summary state does not match the stack '  \
+                    'extents.  The seasonal summaries will be rebuilt.'
+                logIt (msg, self.log_handler)
+            os.remove (SUMMARY_STATE_FILE)
+
         # resample the files to the maximum bounding extent of the stack
         # and calculate the spectral indices
         status = self.resampleStack (bounding_box_file, stack_file)
@@ -1545,20 +2574,12 @@ class temporalBAStack():
             os.chdir (mydir)
             return ERROR
 
-        # generate the seasonal summaries for each year in the stack
-        status = self.generateSeasonalSummaries (stack_file)
-        if status != SUCCESS:
-            msg = 'Error generating the seasonal summaries. Processing will ' \
-                'terminate.'
-            logIt (msg, self.log_handler)
-            os.chdir (mydir)
-            return ERROR
-
-        # generate the annual maximums for each year in the stack
-        status = self.generateAnnualMaximums (stack_file)
+        # generate the seasonal summaries and annual maximums for each year
+        # in the stack
+        status = self.generateSummaryProducts (stack_file)
         if status != SUCCESS:
-            msg = 'Error generating the annual maximums. Processing will ' \
-                'terminate.'
+            msg = 'Error generating the seasonal summaries and annual '  \
+                'maximums. Processing will terminate.'
             logIt (msg, self.log_handler)
             os.chdir (mydir)
             return ERROR
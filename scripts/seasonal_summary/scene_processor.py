@@ -0,0 +1,282 @@
+#! /usr/bin/env python
+import sys
+import os
+import shutil
+
+from numpy import *
+from osgeo import gdal
+from osgeo import gdal_array
+from osgeo import gdalconst
+from spectral_index_from_espa import *
+from mask_bits import *
+from log_it import *
+
+# number of lines to process at a time for each scene
+SCENE_BLOCK_LINES = 256
+
+# surface reflectance bands needed by the downstream processing (seasonal
+# summaries and boosted regression); the thermal band is not used
+SCENE_REFL_BANDS = ['band1', 'band2', 'band3', 'band4', 'band5', 'band7']
+
+#############################################################################
+# Created on October 17, 2026, USGS/EROS LSRD Project
+# Created module to process a scene in a single blocked pass.  Each source
+# band is read once; in the same pass the QA bands are combined into the
+# single mask band, the bands are placed into the output grid, and the
+# spectral indices are computed.  Previously the combined QA band was
+# written, then each band (and the QA band) was resampled to the stack
+# grid, and then the resampled bands were read back a line at a time to
+# compute the spectral indices.
+#
+# The output values are identical to those from createQaBand,
+# resampleToExtent, and createSpectralIndices, since the spectral indices
+# are computed on the same (placed) band values and written the same way.
+############################################################################
+
+def createGridFile (filename, ncol, nrow, geotrans, projection, nodata,  \
+    log_handler=None):
+    """Creates a single band int16 ENVI file on the output grid.
+    Description: createGridFile creates the output file, creating the output
+        directory if needed, and sets the geographic info and noData value.
+
+    History:
+      Created on 10/17/2026, USGS/EROS LSRD Project
+
+    Args:
+      filename - name of the output ENVI file to create
+      ncol - number of samples in the output file
+      nrow - number of lines in the output file
+      geotrans - geographic transform of the output file
+      projection - projection of the output file; None to leave it unset
+      nodata - noData value of the output band
+      log_handler - open log file for logging or None for stdout
+
+    Returns:
+        None - error creating the file
+        (dataset, band) - GDAL dataset and band of the output file
+    """
+
+    output_dir = os.path.dirname (filename)
+    if output_dir != '' and not os.path.exists (output_dir):
+        msg = 'Creating output directory ' + output_dir
+        logIt (msg, log_handler)
+        os.makedirs (output_dir)
+
+    mydriver = gdal.GetDriverByName('ENVI')
+    my_ds = mydriver.Create (filename, ncol, nrow, 1, gdal.GDT_Int16)
+    if my_ds is None:
+        msg = 'GDAL could not create output file: ' + filename
+        logIt (msg, log_handler)
+        return None
+    my_ds.SetGeoTransform (geotrans)
+    if projection is not None:
+        my_ds.SetProjection (projection)
+    my_band = my_ds.GetRasterBand(1)
+    my_band.SetNoDataValue (nodata)
+    return (my_ds, my_band)
+
+
+def processScene (xmlAttr, refl_dict, mask_file, index_dict, grid=None,  \
+    window=None, fill_value=-9999, mask_bits_file=None, log_handler=None):
+    """Processes the bands of a scene in a single blocked pass.
+    Description: processScene reads the surface reflectance and QA bands of
+        the scene in blocks of lines.  For each block the QA bands are
+        combined into the single mask band, and the bands are placed into the
+        output grid and written along with the spectral indices.  The output
+        grid is either the stack grid, in which case the scene is placed at
+        its window within the grid and the remainder is set to fill, or the
+        scene itself (grid is None).  Only the files specified are written.
+
+    History:
+      Created on 10/17/2026, USGS/EROS LSRD Project
+      Updated on 10/17/2026, USGS/EROS LSRD Project
+          Modified to also write the bit-packed mask.
+
+    Args:
+      xmlAttr - XML_Scene for the scene to be processed
+      refl_dict - dictionary of the reflectance bands to write to the output
+          grid and the associated output filenames; may be empty
+      mask_file - name of the combined QA (mask) file to write to the output
+          grid; None if not needed
+      index_dict - dictionary of the index types (keys of INDEX_REGISTRY) and
+          the associated output filenames
+      grid - dictionary of the stack grid as returned by stackGrid, or None
+          to process the scene on its native grid
+      window - window of the scene within the stack grid as returned by
+          sceneWindow; must be aligned with the stack grid.  Not used if grid
+          is None.
+      fill_value - fill value for the pixels outside of the scene
+      mask_bits_file - name of the bit-packed mask file (see mask_bits) to
+          write to the output grid; None if not needed
+      log_handler - open log file for logging or None for stdout
+
+    Returns:
+        ERROR - error reading or writing the bands
+        SUCCESS - successful processing
+    """
+
+    # ignore divide by zero and invalid (NaN) values when doing array
+    # division.  these will be handled on our own.
+    seterr(divide='ignore', invalid='ignore')
+
+    for index in index_dict.keys():
+        if not (index in INDEX_REGISTRY):
+            msg = 'Algorithm for %s is not implemented' % index
+            logIt (msg, log_handler)
+            return ERROR
+
+    # determine the output grid and where the scene is placed in it
+    projection = xmlAttr.dataset1.GetProjection()
+    if grid is None:
+        ncol = xmlAttr.NCol
+        nrow = xmlAttr.NRow
+        geotrans = xmlAttr.dataset1.GetGeoTransform()
+        window = {'t_xoff':0, 't_yoff':0, 't_xsize':ncol, 't_ysize':nrow,  \
+            's_xoff':0, 's_yoff':0, 's_xsize':ncol, 's_ysize':nrow,  \
+            'aligned':True}
+        nodata = xmlAttr.band1.GetNoDataValue()
+        if nodata is None:
+            nodata = fill_value
+    else:
+        ncol = grid['ncol']
+        nrow = grid['nrow']
+        geotrans = grid['geotrans']
+        nodata = fill_value
+        if not window['aligned']:
+            msg = 'Scene is not aligned with the stack grid: ' +  \
+                xmlAttr.xml_file
+            logIt (msg, log_handler)
+            return ERROR
+
+    # create the output files
+    output_ds = {}
+    output_band = {}
+    for band in refl_dict.keys():
+        my_out = createGridFile (refl_dict[band], ncol, nrow, geotrans,  \
+            projection, fill_value, log_handler)
+        if my_out is None:
+            return ERROR
+        (output_ds[band], output_band[band]) = my_out
+
+    if mask_file is not None:
+        # the mask on the native grid gets the band 1 header, as done by
+        # createQaBand
+        if grid is None:
+            my_out = createGridFile (mask_file, ncol, nrow, geotrans, None,  \
+                -9999, log_handler)
+        else:
+            my_out = createGridFile (mask_file, ncol, nrow, geotrans,  \
+                projection, fill_value, log_handler)
+        if my_out is None:
+            return ERROR
+        (output_ds['band_qa'], output_band['band_qa']) = my_out
+
+    bits_band = None
+    if mask_bits_file is not None:
+        my_out = createMaskBitsFile (mask_bits_file, ncol, nrow, log_handler)
+        if my_out is None:
+            return ERROR
+        (bits_ds, bits_band) = my_out
+
+    for index in index_dict.keys():
+        my_out = createGridFile (index_dict[index], ncol, nrow, geotrans,  \
+            projection, nodata, log_handler)
+        if my_out is None:
+            return ERROR
+        (output_ds[index], output_band[index]) = my_out
+
+    # bands needed for the reflectance outputs and spectral indices
+    band_list = list (refl_dict.keys())
+    for band in indexBands (index_dict.keys()):
+        if not (band in band_list):
+            band_list.append (band)
+
+    # write the fill lines above and below the scene window; the spectral
+    # indices are fill as well, since the QA is fill
+    t_xoff = window['t_xoff']
+    t_yoff = window['t_yoff']
+    t_xsize = window['t_xsize']
+    t_ysize = window['t_ysize']
+    block_lines = min (SCENE_BLOCK_LINES, nrow)
+    fill_block = empty ((block_lines, ncol), dtype=int16)
+    fill_block.fill (fill_value)
+    for (start, end) in [(0, t_yoff), (t_yoff + t_ysize, nrow)]:
+        for y in range (start, end, block_lines):
+            nlines = min (block_lines, end - y)
+            for key in output_band.keys():
+                output_band[key].WriteArray (fill_block[0:nlines,:], 0, y)
+            if bits_band is not None:
+                bits_band.WriteArray (  \
+                    packMaskBlock (fill_block[0:nlines,:]), 0, y)
+
+    # set up the block buffers on the output grid; samples outside the scene
+    # window are set to fill once and the buffers are reused for each block
+    band_block = {}
+    for band in band_list + ['band_qa']:
+        band_block[band] = empty ((block_lines, ncol), dtype=int16)
+        band_block[band].fill (fill_value)
+    idx_block = {}
+    for index in index_dict.keys():
+        idx_block[index] = empty ((block_lines, ncol), dtype=int16)
+    work = indexWorkBuffers ((block_lines, ncol), dtype=int16)
+    terms = indexTerms ()
+
+    # process the scene window in blocks
+    for y in range (0, t_ysize, block_lines):
+        nlines = min (block_lines, t_ysize - y)
+        for band in band_list + ['band_qa']:
+            data = xmlAttr.getBandBlock (band, window['s_xoff'],  \
+                window['s_yoff'] + y, window['s_xsize'], nlines)
+            if data is None:
+                msg = 'Error reading %s for %s' % (band, xmlAttr.xml_file)
+                logIt (msg, log_handler)
+                return ERROR
+            band_block[band][0:nlines,t_xoff:t_xoff+t_xsize] = data
+        data = None
+
+        # write the reflectance bands and mask
+        for band in refl_dict.keys():
+            output_band[band].WriteArray (band_block[band][0:nlines,:], 0,  \
+                t_yoff + y)
+        if mask_file is not None:
+            output_band['band_qa'].WriteArray (  \
+                band_block['band_qa'][0:nlines,:], 0, t_yoff + y)
+        if bits_band is not None:
+            bits_band.WriteArray (  \
+                packMaskBlock (band_block['band_qa'][0:nlines,:]), 0,  \
+                t_yoff + y)
+
+        # compute and write the spectral indices
+        bands = {}
+        for band in band_list:
+            bands[band] = band_block[band][0:nlines,:]
+        terms.setBlock (bands, nodata)
+        for index in index_dict.keys():
+            newVals = spectralIndexBlock (index, bands,  \
+                band_block['band_qa'][0:nlines,:], nodata,  \
+                out=idx_block[index][0:nlines,:], work=work, terms=terms)
+            output_band[index].WriteArray (newVals, 0, t_yoff + y)
+        bands = None
+        newVals = None
+
+    # close the output files
+    band_block = None
+    idx_block = None
+    work = None
+    terms = None
+    fill_block = None
+    output_band = None
+    output_ds = None
+    bits_band = None
+    bits_ds = None
+
+    # the GDAL SetGeoTransform and SetProjection don't play completely well
+    # with our ENVI header.  just copy the ENVI header for band1 to the ENVI
+    # header for the native mask band, as done by createQaBand.
+    if mask_file is not None and grid is None:
+        qa_hdr = mask_file.replace ('.img', '.hdr')
+        band_hdr = xmlAttr.band_dict['band1'].replace ('.img', '.hdr')
+        shutil.copyfile (band_hdr, qa_hdr)
+
+    return SUCCESS
+
@@ -22,8 +22,206 @@ from log_it import *
 #       entire band) since this is faster.
 #   Updated on 3/17/2014 by Gail Schmidt, USGS/EROS LSRD Project
 #       Modified to use the ESPA internal raw binary format
+#   Updated on 10/17/2026, USGS/EROS LSRD Project
+#       Modified to process the indices in blocks of lines, reading into and
+#       writing from reusable buffers, rather than one line at a time.
+#   Updated on 10/17/2026, USGS/EROS LSRD Project
+#       Modified to compute the indices with the float32 int16 kernels.
+#   Updated on 10/17/2026, USGS/EROS LSRD Project
+#       Added the registry of spectral indices, so any of the indices in
+#       spectral_indices.py can be generated in the same pass.
+#   Updated on 10/17/2026, USGS/EROS LSRD Project
+#       Modified the registry to generate the indices with the functions of
+#       spectral_indices.py, which now compute the indices with reflectance
+#       constants from the scaled reflectance.
 #
 ############################################################################
+
+# number of lines to process at a time when generating the spectral indices;
+# rounded down to a multiple of the native block height of the input bands
+INDEX_BLOCK_LINES = 256
+
+# registry of the spectral indices which can be generated.  For each index:
+#   bands - surface reflectance bands used by the index, in the order of the
+#       arguments of its function in spectral_indices.py
+#   kernel - int16 kernel in spectral_indices.py which computes the scaled
+#       index, with the same values as the float64 function of the index
+#   scale - the index is multiplied by this value and stored as int16
+# MIRBI, BAI, BAIM, BAIM2, SAVI, EVI and EVI2 are computed from the
+# reflectance (the bands times SR_SCALE_FACTOR), as noted in
+# spectral_indices.py.  BAI, BAIM and BAIM2 are stored times 10, since
+# their values run into the thousands; the other indices are stored times
+# 1000.
+INDEX_REGISTRY = {
+    'ndvi':  {'bands':['band3', 'band4'], 'kernel':NDVIInt16, 'scale':1000.0},
+    'ndmi':  {'bands':['band4', 'band5'], 'kernel':NDMIInt16, 'scale':1000.0},
+    'nbr':   {'bands':['band4', 'band7'], 'kernel':NBRInt16, 'scale':1000.0},
+    'nbr2':  {'bands':['band5', 'band7'], 'kernel':NBR2Int16, 'scale':1000.0},
+    'csi':   {'bands':['band4', 'band5'], 'kernel':CSIInt16, 'scale':1000.0},
+    'mirbi': {'bands':['band5', 'band7'], 'kernel':MIRBIInt16,
+              'scale':1000.0},
+    'bai':   {'bands':['band3', 'band4'], 'kernel':BAIInt16, 'scale':10.0},
+    'baim':  {'bands':['band4', 'band5'], 'kernel':BAIMInt16, 'scale':10.0},
+    'baim2': {'bands':['band4', 'band7'], 'kernel':BAIM2Int16, 'scale':10.0},
+    'savi':  {'bands':['band3', 'band4'], 'kernel':SAVIInt16, 'scale':1000.0},
+    'evi':   {'bands':['band1', 'band3', 'band4'], 'kernel':EVIInt16,
+              'scale':1000.0},
+    'evi2':  {'bands':['band3', 'band4'], 'kernel':EVI2Int16, 'scale':1000.0},
+}
+
+
+def indexBands (index_list):
+    """Determines the bands needed for a set of spectral indices.
+    Description: indexBands returns the sorted list of the surface
+        reflectance bands needed to compute all the specified indices, so
+        each band is read once for all of the indices.
+
+    History:
+      Created on 10/17/2026, USGS/EROS LSRD Project
+
+    Args:
+      index_list - list of the spectral indices (keys of INDEX_REGISTRY)
+
+    Returns:
+        band_list - list of the bands needed by the indices
+    """
+
+    band_list = []
+    for index in index_list:
+        for band in INDEX_REGISTRY[index]['bands']:
+            if not (band in band_list):
+                band_list.append (band)
+    return sorted (band_list)
+
+
+#############################################################################
+# Created on October 17, 2026, USGS/EROS LSRD Project
+# Created class to hold the values shared between the spectral indices for
+# a block of band data.  Each noData mask is computed the first time an
+# index asks for it and reused by the remaining indices for that block, so
+# the noData mask for band4 and band7, for instance, is computed once for
+# both NBR and BAIM2.  The term buffers are allocated once and reused for
+# each block.
+############################################################################
+class indexTerms:
+    """Class for computing the terms shared between the spectral indices.
+    """
+
+    bands = None            # dictionary of the band data for the block
+    nodata = None           # noData value of the bands
+    shape = None            # shape of the block
+    values = None           # dictionary of the terms computed for the block
+    buffers = None          # dictionary of the term buffers
+
+    def __init__ (self):
+        """Class constructor.
+        """
+
+        self.values = {}
+        self.buffers = {}
+
+
+    def setBlock (self, bands, nodata):
+        """Sets the band data for the next block.
+        Description: setBlock saves the band data for the block and clears
+            the terms computed for the previous block.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args:
+          bands - dictionary of the band data needed for the indices
+          nodata - noData value for the bands
+
+        Returns: Nothing
+        """
+
+        self.bands = bands
+        self.nodata = nodata
+        self.shape = bands.values()[0].shape
+        self.values = {}
+
+
+    def buffer (self, key, dtype):
+        """Returns a buffer, the size of the block, to hold a term.
+        """
+
+        size = self.shape[0] * self.shape[1]
+        buf = self.buffers.get (key)
+        if buf is None or buf.size < size or buf.dtype != dtype:
+            buf = empty (size, dtype=dtype)
+            self.buffers[key] = buf
+        return buf[0:size].reshape (self.shape)
+
+
+    def nodataMask (self, band_list):
+        """Returns the mask of the pixels where any of the bands is noData.
+        """
+
+        key = ('nodata',) + tuple (sorted (band_list))
+        if not (key in self.values):
+            mask = self.buffer (key, bool)
+            equal (self.bands[key[1]], self.nodata, out=mask)
+            for band in key[2:]:
+                logical_or (mask, self.nodataMask ([band]), out=mask)
+            self.values[key] = mask
+        return self.values[key]
+######end of indexTerms class######
+
+
+def spectralIndexBlock (index, bands, qa, nodata, out=None, work=None,  \
+    terms=None):
+    """Computes a spectral index for a block of data.
+    Description: spectralIndexBlock computes the specified spectral index,
+        multiplied by the scale of the index in INDEX_REGISTRY, for the block
+        of band data as int16.  Pixels with noData in any of the bands are set
+        to noData before the index is scaled, and pixels flagged in the QA
+        band are set to the noData value.
+
+    History:
+      Created on 10/17/2026, USGS/EROS LSRD Project
+      Updated on 10/17/2026, USGS/EROS LSRD Project
+          Modified to use the float32 int16 kernels, which produce the same
+          values as the float64 index functions written to an int16 band.
+      Updated on 10/17/2026, USGS/EROS LSRD Project
+          Modified to compute any of the indices in INDEX_REGISTRY, sharing
+          the terms common to the indices.
+      Updated on 10/17/2026, USGS/EROS LSRD Project
+          Modified to compute the indices with their functions (or int16
+          kernels) in spectral_indices.py, rather than with a second copy
+          of the formulas.
+      Updated on 10/17/2026, USGS/EROS LSRD Project
+          Modified to compute all the indices with their int16 kernels.
+
+    Args:
+      index - spectral index to compute (key of INDEX_REGISTRY)
+      bands - dictionary of the band data needed for the index (see
+          indexBands)
+      qa - combined QA data for the block
+      nodata - noData value for the bands and the output index
+      out - optional int16 array, the same shape as the block, to hold the
+          output index
+      work - optional work buffers from indexWorkBuffers, at least the size
+          of the block
+      terms - optional indexTerms, set up for this block, holding the terms
+          shared with the other indices for the block
+
+    Returns:
+        Array - spectral index for the block
+    """
+
+    if terms is None:
+        terms = indexTerms ()
+        terms.setBlock (bands, nodata)
+
+    entry = INDEX_REGISTRY[index]
+    band_data = [bands[band] for band in entry['bands']]
+    out = entry['kernel'] (*band_data, nodata=nodata, scale=entry['scale'],  \
+        out=out, work=work, nod=terms.nodataMask (entry['bands']))
+
+    out[qa < 0] = nodata
+    return out
+
 class spectralIndex:
     """Class for producing the spectral indices.
     """
@@ -60,10 +258,13 @@ class spectralIndex:
               Modified to utilize the class constructor to open and set up
               band pointers from the file, so they are available for use by
               other methods within the class.
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Modified to only open the thermal band (band6) if it is in
+              band_dict, since none of the indices use it.
         
         Args:
           band_dict - dictionary of bands to be opened and processed for this
-              class
+              class; band6 is optional
           log_handler - open log file for logging or None for stdout
         
         Returns:
@@ -102,11 +303,13 @@ class spectralIndex:
             logIt (msg, log_handler)
             return None
 
-        self.dataset6 = gdal.Open(band_dict['band6'])
-        if self.dataset6 is None:
-            msg = 'GDAL could not open input file: ' + band_dict['band6']
-            logIt (msg, log_handler)
-            return None
+        # the thermal band isn't used by the indices, so it is optional
+        if 'band6' in band_dict:
+            self.dataset6 = gdal.Open(band_dict['band6'])
+            if self.dataset6 is None:
+                msg = 'GDAL could not open input file: ' + band_dict['band6']
+                logIt (msg, log_handler)
+                return None
 
         self.dataset7 = gdal.Open(band_dict['band7'])
         if self.dataset7 is None:
@@ -127,7 +330,8 @@ class spectralIndex:
         self.band3 = self.dataset3.GetRasterBand(1)
         self.band4 = self.dataset4.GetRasterBand(1)
         self.band5 = self.dataset5.GetRasterBand(1)
-        self.band6 = self.dataset6.GetRasterBand(1)
+        if self.dataset6 is not None:
+            self.band6 = self.dataset6.GetRasterBand(1)
         self.band7 = self.dataset7.GetRasterBand(1)
         self.band_mask = self.dataset_mask.GetRasterBand(1)
 
@@ -152,7 +356,7 @@ class spectralIndex:
             msg = 'Input band5 connection failed'
             logIt (msg, log_handler)
             return None
-        if self.band6 is None:
+        if self.dataset6 is not None and self.band6 is None:
             msg = 'Input band6 connection failed'
             logIt (msg, log_handler)
             return None
@@ -200,11 +404,13 @@ class spectralIndex:
         self.dataset_mask = None
 
 
-    def createSpectralIndices (self, index_dict, log_handler=None):
+    def createSpectralIndices (self, index_dict, log_handler=None,  \
+        block_lines=None):
         """Generates the specified spectral indices.
         Description: createSpectralIndices creates the desired spectral index
             products.  If mask is specified, then a combined mask file is
-            generated using the various input masks.
+            generated using the various input masks.  The bands are processed
+            in blocks of lines, using the same buffers for each block.
         
         History:
           Created in 2013 by Jodi Riegle and Todd Hawbaker, USGS Rocky Mountain
@@ -216,11 +422,25 @@ class spectralIndex:
           Updated on 5/21/2013 by Gail Schmidt, USGS/EROS LSRD Project
               Modified to process all the indices one line  at a time (vs. the
               entire band) since this is faster.
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Modified to process the indices in blocks of lines, with the
+              input and output buffers allocated once, rather than one line
+              at a time.  The output values are unchanged.
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Modified to compute the indices directly into int16 buffers
+              with the float32 kernels and reusable work buffers.
+          Updated on 10/17/2026, USGS/EROS LSRD Project
+              Modified to generate any of the indices in INDEX_REGISTRY,
+              reading each band once and sharing the common terms between
+              the indices.
         
         Args:
-          index_dict - dictionary of index types (ndvi, nbr, nbr2, ndmi, mask)
+          index_dict - dictionary of index types (keys of INDEX_REGISTRY)
               and the associated filename for the index file
           log_handler - open log file for logging or None for stdout
+          block_lines - number of lines to process at a time; if None then
+              INDEX_BLOCK_LINES, rounded to the native block height of the
+              input bands, is used
         
         Returns:
             ERROR - error generating the spectral indices or mask
@@ -231,6 +451,8 @@ class spectralIndex:
         print '    Processing %d indices: ' % num_indices
         for index in index_dict.keys():
             print '      ' + index
+        if num_indices == 0:
+            return SUCCESS
     
         # ignore divide by zero and invalid (NaN) values when doing array
         # division.  these will be handled on our own.
@@ -249,7 +471,7 @@ class spectralIndex:
         output_band = {}
         for index in index_dict.keys():
             # figure out which spectral index to generate
-            if not (index in ['ndvi','ndmi','nbr','nbr2']):
+            if not (index in INDEX_REGISTRY):
                 msg = 'Algorithm for %s is not implemented' % index
                 logIt (msg, log_handler)
                 return ERROR
@@ -261,8 +483,8 @@ class spectralIndex:
                 logIt (msg, log_handler)
                 os.makedirs(output_dir)
 
-            # create the output file; spectral indices are multiplied by 1000.0
-            # and the mask file is as-is.
+            # create the output file; spectral indices are multiplied by the
+            # scale in INDEX_REGISTRY and the mask file is as-is.
             mydriver = gdal.GetDriverByName('ENVI')
             my_ds = mydriver.Create (index_dict[index], ncol, nrow, 1,  \
                 gdal.GDT_Int16)
@@ -273,69 +495,57 @@ class spectralIndex:
             my_band.SetNoDataValue(nodata)
             output_band[index] = my_band
 
-        # loop through each line in the image and process
-        for y in range (0, nrow):
-            # read the QA data
-            qa = self.band_mask.ReadAsArray(0, y, ncol, 1)
-
-            # loop through the indices specified and process each index product
-            # reusing the line from each band where possible
-            b3 = b4 = b5 = b7 = None
+        # determine the number of lines to process at a time
+        if block_lines is None:
+            native_lines = self.band1.GetBlockSize()[1]
+            block_lines = max (INDEX_BLOCK_LINES // native_lines, 1) *  \
+                native_lines
+        block_lines = max (min (block_lines, nrow), 1)
+
+        # allocate the input buffers for the QA band and the bands needed by
+        # the indices, along with the output buffers for the indices
+        band_ptr = {'band1':self.band1, 'band3':self.band3,  \
+            'band4':self.band4, 'band5':self.band5, 'band7':self.band7}
+        band_buf = {}
+        for band in indexBands (index_dict.keys()):
+            band_buf[band] = empty ((block_lines, ncol),  \
+                dtype=gdal_array.GDALTypeCodeToNumericTypeCode (  \
+                    band_ptr[band].DataType))
+        qa_buf = empty ((block_lines, ncol),  \
+            dtype=gdal_array.GDALTypeCodeToNumericTypeCode (  \
+                self.band_mask.DataType))
+        idx_buf = {}
+        for index in index_dict.keys():
+            idx_buf[index] = empty ((block_lines, ncol), dtype=int16)
+        work = indexWorkBuffers ((block_lines, ncol),  \
+            dtype=band_buf.values()[0].dtype)
+        terms = indexTerms ()
+
+        # loop through each block of lines in the image and process
+        for y in range (0, nrow, block_lines):
+            nlines = min (block_lines, nrow - y)
+
+            # read the QA data and the bands needed for the indices
+            qa = qa_buf[0:nlines,:]
+            self.band_mask.ReadAsArray (0, y, ncol, nlines, buf_obj=qa)
+            bands = {}
+            for band in band_buf.keys():
+                bands[band] = band_buf[band][0:nlines,:]
+                band_ptr[band].ReadAsArray (0, y, ncol, nlines,  \
+                    buf_obj=bands[band])
+
+            # calculate and write each of the spectral indices, sharing the
+            # terms common to the indices
+            terms.setBlock (bands, nodata)
             for index in index_dict.keys():
-                # calculate the spectral index
-                if index == 'nbr':
-                    if b4 is None:
-                        b4 = self.band4.ReadAsArray(0, y, ncol,1)
-                    if b7 is None:
-                        b7 = self.band7.ReadAsArray(0, y, ncol, 1)
-                    newVals = 1000.0 * NBR(b4, b7, nodata)
-                    newVals[qa < 0] = nodata
-
-                    # write the output 
-                    my_output_band = output_band[index]
-                    my_output_band.WriteArray(newVals, 0, y)
-
-                elif index == 'nbr2':
-                    if b5 is None:
-                        b5 = self.band5.ReadAsArray(0, y, ncol, 1)
-                    if b7 is None:
-                        b7 = self.band7.ReadAsArray(0, y, ncol, 1)
-                    newVals = 1000.0 * NBR2(b5, b7, nodata)
-                    newVals[qa < 0] = nodata
-
-                    # write the output 
-                    my_output_band = output_band[index]
-                    my_output_band.WriteArray(newVals, 0, y)
-
-                elif index == 'ndmi':
-                    if b4 is None:
-                        b4 = self.band4.ReadAsArray(0, y, ncol, 1)
-                    if b5 is None:
-                        b5 = self.band5.ReadAsArray(0, y, ncol, 1)
-                    newVals = 1000.0 * NDMI(b4, b5, nodata)
-                    newVals[qa < 0] = nodata
-
-                    # write the output 
-                    my_output_band = output_band[index]
-                    my_output_band.WriteArray(newVals, 0, y)
-
-                elif index == 'ndvi':
-                    if b4 is None:
-                        b4 = self.band4.ReadAsArray(0, y, ncol, 1)
-                    if b3 is None:
-                        b3 = self.band3.ReadAsArray(0, y, ncol, 1)
-                    newVals = 1000.0 * NDVI(b3, b4, nodata)
-                    newVals[qa < 0] = nodata
-
-                    # write the output 
-                    my_output_band = output_band[index]
-                    my_output_band.WriteArray(newVals, 0, y)
-                # end if
-            # end for index
+                newVals = spectralIndexBlock (index, bands, qa, nodata,  \
+                    out=idx_buf[index][0:nlines,:], work=work, terms=terms)
+                output_band[index].WriteArray (newVals, 0, y)
         # end for y
 
-        # cleanup the bands
-        b3 = b4 = b5 = b7 = None
+        # cleanup the buffers
+        qa = qa_buf = None
+        bands = band_buf = idx_buf = newVals = work = terms = None
 
         # cleanup
         del (output_band)
@@ -17,8 +17,21 @@ from numpy import *
 #   2. To deal with infinity and NaN values, the nan_to_num method is used
 #      after the spectral index calculation to handle any associated NaNs
 #      due to the denomerator being zero.
+#   3. The bands are the surface reflectance bands as stored, scaled by
+#      10000.  The indices whose formulas include constants in reflectance
+#      units (MIRBI, BAI, BAIM, BAIM2, SAVI, EVI, EVI2) first multiply the
+#      bands by refl_scale, which defaults to SR_SCALE_FACTOR, so they are
+#      computed from the reflectance.  These indices used to apply the
+#      constants to the stored values; pass refl_scale=1.0 for the old
+#      values.  The ratios and normalized differences don't depend on the
+#      scale of the bands.
+#   4. INDEX_REGISTRY in spectral_index_from_espa.py generates the index
+#      products from these functions (or their int16 kernels below).
 #######################################################################
 
+# reflectance scale factor of the surface reflectance bands
+SR_SCALE_FACTOR = 0.0001
+
 # Normalized Burn Ratios
 # From Key and Benson 1999, Measuring and remote sensing of burn severity. In Proceedings of the Joint Fire Science Conference and Workshop, vol. II, Boise, ID, 15-17 June 1999. University of Idaho and International Association of Wildland Fire
 def NBR(b4, b7, nodata=-9999):
@@ -72,44 +85,54 @@ def CSI(b4, b5, nodata=-9999):
 
 # Mid-Infrared Burn Index 
 # Trigg and Flasse 2001, An evaluation of different bi-spectral spaces for discriminating burned shrub savanna.  International Journal of Remote Sensing 22(13):2641-2647
-def MIRBI(b5, b7, nodata=-9999):
+def MIRBI(b5, b7, nodata=-9999, refl_scale=SR_SCALE_FACTOR):
     """Computes the mid-infrared burn index.
     """
-    x = ( (10*b7) - (9.5*b5) + 2 )
+    r5 = b5 * refl_scale
+    r7 = b7 * refl_scale
+    x = ( (10*r7) - (9.5*r5) + 2 )
     x[(b5==nodata) | (b7==nodata)] = nodata
     return(x)
 
 # Burned Area Index
 # Martin et al. 2005, Performanec of a burned-area index (BAIM) for mapping Mediterranean burned scars from MODIS data. In J. Ria, F. Perez-Cabello, and E. Chuvieco (Editors), Proceedings of the 5th International Workshop on Remote Sensing and GIS Applications to Forest Fire Management: Fire Effects Assessment (pp. 193-198). Paris: Universidad de Zaragoza, GOFC-GOLD, EARSel.
-def BAI(b3, b4, nodata=-9999):
+def BAI(b3, b4, nodata=-9999, refl_scale=SR_SCALE_FACTOR):
     """Computes the burned area index.
     """
-    x = 1 / ( pow(b4-0.06,2) + pow(b3-0.1,2) )
+    r3 = b3 * refl_scale
+    r4 = b4 * refl_scale
+    x = 1 / ( pow(r4-0.06,2) + pow(r3-0.1,2) )
     x[(b4==nodata) | (b3==nodata)] = nodata
     return(x)
 
 # Martin et al. 2005, 
-def BAIM(b4, b5, nodata=-9999):
+def BAIM(b4, b5, nodata=-9999, refl_scale=SR_SCALE_FACTOR):
     """Computes the burned area index for mapping Mediterranean burn scars.
     """
-    x = 1 / ( pow(b4-0.05,2) + pow(b5-0.2,2) )
+    r4 = b4 * refl_scale
+    r5 = b5 * refl_scale
+    x = 1 / ( pow(r4-0.05,2) + pow(r5-0.2,2) )
     x[(b4==nodata) | (b5==nodata)] = nodata
     return(x)
 
-def BAIM2(b4, b7, nodata=-9999):
+def BAIM2(b4, b7, nodata=-9999, refl_scale=SR_SCALE_FACTOR):
     """Computes the burned area index for mapping Mediterranean burn scars 2.
     """
-    x = ( 1 / ( pow(b4-0.05,2) + pow(b7-0.2,2) ) )
+    r4 = b4 * refl_scale
+    r7 = b7 * refl_scale
+    x = ( 1 / ( pow(r4-0.05,2) + pow(r7-0.2,2) ) )
     x[(b4==nodata) | (b7==nodata)] = nodata
     return(x)
 
 # Soil-Adjusted Vegetation Index
 # Huete 1998, A soil adjusted vegetation index (SAVI). Remote Sensing of Environment, 25(3):295-309
-def SAVI(b3, b4, nodata=-9999):
+def SAVI(b3, b4, nodata=-9999, refl_scale=SR_SCALE_FACTOR):
     """Computes the soil adjusted vegetation index.
     """
     seterr(divide= 'ignore')  # ignore divide by zero
-    x = ( 1.5 * (b4-b3) / (b4 + b3 + 0.5) )
+    r3 = b3 * refl_scale
+    r4 = b4 * refl_scale
+    x = ( 1.5 * (r4-r3) / (r4 + r3 + 0.5) )
     nan_to_num(x)
     x[(b3==nodata) | (b4==nodata)] = nodata
     return(x)
@@ -117,22 +140,502 @@ def SAVI(b3, b4, nodata=-9999):
 # Enhanced Vegetaion Index
 # Huete et al. 2002, Overview of the radiometric and biophysical performance of the MODIS vegetation indices. Remote Sensing of Environment, 83(1-2):195-213
 # Enhanced Vegetation Index 2
-def EVI(b1, b3, b4, nodata=-9999):
+def EVI(b1, b3, b4, nodata=-9999, refl_scale=SR_SCALE_FACTOR):
     """Computes the enhanced vegetation index.
     """
     seterr(divide= 'ignore')  # ignore divide by zero
-    x = ( 2.5 * (b4-b3) / (b4 + 6*b3 - 7.5*b1 + 1) )
+    r1 = b1 * refl_scale
+    r3 = b3 * refl_scale
+    r4 = b4 * refl_scale
+    x = ( 2.5 * (r4-r3) / (r4 + 6*r3 - 7.5*r1 + 1) )
     nan_to_num(x)
     x[(b1==nodata) | (b3==nodata)| (b4==nodata)] = nodata
     return(x)
 
 # Jiang et al. 2008, Development of a two-band enhanced vegetation index without a blue band. Remote Sensing of Environment 112(10):3833-3845
-def EVI2(b3, b4, nodata=-9999):
+def EVI2(b3, b4, nodata=-9999, refl_scale=SR_SCALE_FACTOR):
     """Computes the enhanced vegetation index without a blue band.
     """
     seterr(divide= 'ignore')  # ignore divide by zero
-    x = ( 2.5 * (b4-b3) / (b4 + 2.4*b3 + 1) ) 
+    r3 = b3 * refl_scale
+    r4 = b4 * refl_scale
+    x = ( 2.5 * (r4-r3) / (r4 + 2.4*r3 + 1) ) 
     nan_to_num(x)
     x[(b3==nodata) | (b4==nodata)] = nodata
     return(x)
 
+
+########################################################################
+# Description: Int16 kernels for the spectral indices.  These compute scale
+# times the index in float32, using preallocated work buffers, and store
+# the result directly in an int16 array.  The results are identical to
+# storing scale times the float64 index functions above in an int16 band
+# via GDAL.
+#
+# Notes:
+#   1. For the normalized differences (NBR, NBR2, NDMI, NDVI), as with the
+#      functions above, the difference and sum are computed in the data type
+#      of the input bands.  Pixels where any of the bands is nodata are set
+#      to nodata before being scaled.
+#   2. The values are rounded half away from zero and clamped to the int16
+#      range, as done by GDAL.  NaN values (zero divided by zero) are stored
+#      as 0.
+#   3. Pixels whose float32 value is close enough to a rounding boundary
+#      that float32 and float64 could round differently, along with pixels
+#      with a zero denominator, are recomputed in float64.  There are very
+#      few of these.
+#   4. For the other indices, the float32 rounding error is bounded by
+#      INT16_KERNEL_EPS times the same expression with the absolute values
+#      of its terms, so pixels where the terms cancel are recomputed as
+#      well.  The float64 values are computed by the index functions above.
+#######################################################################
+
+# relative and absolute tolerance for flagging the float32 values which are
+# near a rounding boundary; well above the float32 rounding error
+INT16_KERNEL_REL_TOL = 5.0e-7
+INT16_KERNEL_ABS_TOL = 1.0e-6
+
+# relative rounding error bound of the float32 expressions of the indices,
+# relative to the sum of the absolute values of their terms; well above the
+# float32 rounding error of the few operations in each expression
+INT16_KERNEL_EPS = 1.0e-6
+
+def indexWorkBuffers(shape, dtype=int16):
+    """Allocates the work buffers for the int16 index kernels.
+    """
+    work = {}
+    work['num'] = empty(shape, dtype=dtype)
+    work['den'] = empty(shape, dtype=dtype)
+    work['val'] = empty(shape, dtype=float32)
+    work['frac'] = empty(shape, dtype=float32)
+    work['tmp'] = empty(shape, dtype=float32)
+    work['err'] = empty(shape, dtype=float32)
+    work['fa'] = empty(shape, dtype=float32)
+    work['fb'] = empty(shape, dtype=float32)
+    work['fc'] = empty(shape, dtype=float32)
+    work['fd'] = empty(shape, dtype=float32)
+    work['ival'] = empty(shape, dtype=int32)
+    work['nodata'] = empty(shape, dtype=bool)
+    work['fix'] = empty(shape, dtype=bool)
+    work['mask'] = empty(shape, dtype=bool)
+    return(work)
+
+def workViews(work, shape):
+    """Returns views of the work buffers for the size of a block.
+    """
+    buf = {}
+    size = shape[0] * shape[1]
+    for key in work.keys():
+        buf[key] = work[key].ravel()[0:size].reshape(shape)
+    return(buf)
+
+def sparseNonzero(mask):
+    """Returns the indices of the True values in a mostly False mask.
+    Description: The mask is scanned eight bytes at a time, which is much
+        faster than nonzero when there are few True values.
+    """
+    flat = mask.ravel()
+    if flat.size % 8 != 0 or not flat.flags['C_CONTIGUOUS']:
+        return(nonzero(mask))
+    words = flatnonzero(flat.view(uint64))
+    (word, byte) = nonzero(flat.reshape(-1, 8)[words])
+    return(unravel_index(words[word] * 8 + byte, mask.shape))
+
+def floatToInt16(x, out=None):
+    """Stores a floating point array as int16 in the same manner as GDAL.
+    Description: Values are clamped to the int16 range and rounded half away
+        from zero.  NaN values are stored as 0.
+    """
+    if out is None:
+        out = empty(x.shape, dtype=int16)
+    x = clip(where(isnan(x), 0, x), -32768, 32767)
+    copyto(out, trunc(where(x < 0, x - 0.5, x + 0.5)), casting='unsafe')
+    return(out)
+
+def normalizedDifferenceInt16(ba, bb, nodata=-9999, scale=1000.0, out=None,
+    work=None, nod=None):
+    """Computes scale * (ba-bb) / (ba+bb) as int16 using float32.
+    Description: nod is an optional mask of the pixels where either band is
+        nodata, if already computed.
+    """
+    if out is None:
+        out = empty(ba.shape, dtype=int16)
+    if work is None:
+        work = indexWorkBuffers(ba.shape, ba.dtype)
+
+    # views of the work buffers for the size of this block
+    buf = workViews(work, ba.shape)
+    val = buf['val']
+    frac = buf['frac']
+    tmp = buf['tmp']
+    ival = buf['ival']
+    fix = buf['fix']
+    mask = buf['mask']
+
+    # compute the scaled index
+    subtract(ba, bb, out=buf['num'])
+    add(ba, bb, out=buf['den'])
+    true_divide(buf['num'], buf['den'], out=val, dtype=float32)
+    multiply(val, float32(scale), out=val)
+
+    # pixels with nodata in either band are set to the scaled nodata value
+    # at the end.  pixels with a zero denominator (NaN or infinity) are
+    # recomputed in float64.
+    if nod is None:
+        nod = buf['nodata']
+        equal(ba, nodata, out=nod)
+        equal(bb, nodata, out=mask)
+        logical_or(nod, mask, out=nod)
+    equal(buf['den'], 0, out=fix)
+    logical_or(nod, fix, out=mask)
+    copyto(val, 0, where=mask)
+
+    # split the value into its integer part (truncated) and its fraction,
+    # then round half away from zero; the integer part plus twice the
+    # fraction, truncated, is the rounded value
+    copyto(ival, val, casting='unsafe')
+    copyto(frac, ival, casting='unsafe')
+    subtract(val, frac, out=frac)
+    add(val, frac, out=tmp)
+    copyto(ival, tmp, casting='unsafe')
+    copyto(out, ival, casting='unsafe')
+    copyto(out, int16(clip(nodata * scale, -32768, 32767)), where=nod)
+
+    # flag the values outside of the int16 range, and those whose fraction
+    # is near 0.5 where the float32 and float64 values could round
+    # differently; these are recomputed in float64
+    absolute(val, out=val)
+    greater(val, 32767.0, out=mask)
+    logical_or(fix, mask, out=fix)
+    multiply(val, INT16_KERNEL_REL_TOL, out=val)
+    add(val, INT16_KERNEL_ABS_TOL, out=val)
+    absolute(frac, out=tmp)
+    subtract(tmp, 0.5, out=tmp)
+    absolute(tmp, out=tmp)
+    less_equal(tmp, val, out=mask)
+    logical_or(fix, mask, out=fix)
+
+    # recompute the flagged values in float64, setting NaNs to 0
+    near = sparseNonzero(fix)
+    if len(near[0]) > 0:
+        a = ba[near]
+        b = bb[near]
+        x = (a-b) / (a+b)
+        x[(a==nodata) | (b==nodata)] = nodata
+        out[near] = floatToInt16(scale * x)
+
+    return(out)
+
+def NBRInt16(b4, b7, nodata=-9999, scale=1000.0, out=None, work=None,
+    nod=None):
+    """Computes the scaled normalized burn index as int16.
+    """
+    return(normalizedDifferenceInt16(b4, b7, nodata, scale, out, work,
+        nod))
+
+def NBR2Int16(b5, b7, nodata=-9999, scale=1000.0, out=None, work=None,
+    nod=None):
+    """Computes the scaled normalized burn index 2 as int16.
+    """
+    return(normalizedDifferenceInt16(b5, b7, nodata, scale, out, work,
+        nod))
+
+def NDMIInt16(b4, b5, nodata=-9999, scale=1000.0, out=None, work=None,
+    nod=None):
+    """Computes the scaled normalized difference moisture index as int16.
+    """
+    return(normalizedDifferenceInt16(b4, b5, nodata, scale, out, work,
+        nod))
+
+def NDVIInt16(b3, b4, nodata=-9999, scale=1000.0, out=None, work=None,
+    nod=None):
+    """Computes the scaled normalized difference vegetation index as int16.
+    """
+    return(normalizedDifferenceInt16(b4, b3, nodata, scale, out, work,
+        nod))
+
+def reflFloat32(b, refl_scale, out):
+    """Converts a band to float32 and multiplies it by the reflectance scale.
+    """
+    copyto(out, b, casting='unsafe')
+    if refl_scale != 1.0:
+        multiply(out, float32(refl_scale), out=out)
+    return(out)
+
+def boundedInt16(bands, index64, nodata, scale, out, buf, nod):
+    """Stores scale times the float32 index in buf['val'] as int16.
+    Description: buf['err'] is the bound of the float32 rounding error of
+        the index.  The pixels whose scaled value could round differently
+        in float64, or which are not finite or are near the int16 range,
+        are recomputed by index64 (the float64 index function) from the
+        bands.  nod is the optional mask of the pixels where any of the
+        bands is nodata.
+    """
+    val = buf['val']
+    err = buf['err']
+    frac = buf['frac']
+    tmp = buf['tmp']
+    ival = buf['ival']
+    fix = buf['fix']
+    mask = buf['mask']
+    if nod is None:
+        nod = buf['nodata']
+        equal(bands[0], nodata, out=nod)
+        for b in bands[1:]:
+            equal(b, nodata, out=mask)
+            logical_or(nod, mask, out=nod)
+
+    # scale the index and its error bound, adding the tolerance for the
+    # rounding of the scaled value
+    multiply(val, float32(scale), out=val)
+    multiply(err, float32(scale), out=err)
+    absolute(val, out=tmp)
+    greater(tmp, 32766.0, out=fix)
+    multiply(tmp, INT16_KERNEL_REL_TOL, out=tmp)
+    add(tmp, INT16_KERNEL_ABS_TOL, out=tmp)
+    add(err, tmp, out=err)
+
+    # flag the values which aren't finite (zero denominators) and set them,
+    # along with the nodata pixels, to 0 before they are converted
+    isfinite(val, out=mask)
+    logical_not(mask, out=mask)
+    logical_or(fix, mask, out=fix)
+    logical_or(fix, nod, out=mask)
+    copyto(val, 0, where=mask)
+
+    # round half away from zero, as in normalizedDifferenceInt16
+    copyto(ival, val, casting='unsafe')
+    copyto(frac, ival, casting='unsafe')
+    subtract(val, frac, out=frac)
+    add(val, frac, out=tmp)
+    copyto(ival, tmp, casting='unsafe')
+    copyto(out, ival, casting='unsafe')
+    copyto(out, int16(clip(nodata * scale, -32768, 32767)), where=nod)
+
+    # flag the values whose fraction is within the error bound of 0.5;
+    # this includes the values whose error bound isn't finite
+    absolute(frac, out=tmp)
+    subtract(tmp, 0.5, out=tmp)
+    absolute(tmp, out=tmp)
+    greater(tmp, err, out=mask)
+    logical_not(mask, out=mask)
+    logical_or(fix, mask, out=fix)
+    copyto(fix, False, where=nod)
+
+    # recompute the flagged values in float64
+    near = sparseNonzero(fix)
+    if len(near[0]) > 0:
+        x = index64(*[b[near] for b in bands], nodata=nodata)
+        out[near] = floatToInt16(scale * x)
+
+    return(out)
+
+def ratioError(num_err, den_err, buf):
+    """Sets buf['err'] to the error bound of buf['val'] = num / buf['fd'].
+    Description: num_err and den_err are the error bounds of the numerator
+        and the denominator.  The bound is infinite where the denominator
+        could be zero, or could change sign.
+    """
+    val = buf['val']
+    den = buf['fd']
+    err = buf['err']
+    frac = buf['frac']
+    mask = buf['mask']
+    absolute(val, out=frac)
+    multiply(frac, den_err, out=frac)
+    add(num_err, frac, out=err)
+    multiply(err, 2.0, out=err)
+    absolute(den, out=frac)
+    true_divide(err, frac, out=err)
+    multiply(den_err, 2.0, out=den_err)
+    greater_equal(den_err, frac, out=mask)
+    copyto(err, inf, where=mask)
+    return(err)
+
+def kernelSetup(b, out, work):
+    """Returns the output array and the views of the work buffers.
+    """
+    if out is None:
+        out = empty(b.shape, dtype=int16)
+    if work is None:
+        work = indexWorkBuffers(b.shape, b.dtype)
+    return(out, workViews(work, b.shape))
+
+def CSIInt16(b4, b5, nodata=-9999, scale=1000.0, out=None, work=None,
+    nod=None):
+    """Computes the scaled char soil index as int16.
+    """
+    (out, buf) = kernelSetup(b4, out, work)
+    val = buf['val']
+    true_divide(reflFloat32(b4, 1.0, buf['fa']),
+        reflFloat32(b5, 1.0, buf['fb']), out=val)
+    absolute(val, out=buf['err'])
+    multiply(buf['err'], INT16_KERNEL_EPS, out=buf['err'])
+    return(boundedInt16([b4, b5], CSI, nodata, scale, out, buf, nod))
+
+def MIRBIInt16(b5, b7, nodata=-9999, scale=1000.0, out=None, work=None,
+    nod=None, refl_scale=SR_SCALE_FACTOR):
+    """Computes the scaled mid-infrared burn index as int16.
+    """
+    (out, buf) = kernelSetup(b5, out, work)
+    r5 = reflFloat32(b5, refl_scale, buf['fa'])
+    r7 = reflFloat32(b7, refl_scale, buf['fb'])
+    val = buf['val']
+    err = buf['err']
+    tmp = buf['tmp']
+    multiply(r7, 10.0, out=val)
+    multiply(r5, 9.5, out=tmp)
+    subtract(val, tmp, out=val)
+    add(val, 2.0, out=val)
+    absolute(r7, out=err)
+    multiply(err, 10.0, out=err)
+    absolute(r5, out=tmp)
+    multiply(tmp, 9.5, out=tmp)
+    add(err, tmp, out=err)
+    add(err, 2.0, out=err)
+    multiply(err, INT16_KERNEL_EPS, out=err)
+    return(boundedInt16([b5, b7], lambda b5, b7, nodata:
+        MIRBI(b5, b7, nodata, refl_scale), nodata, scale, out, buf, nod))
+
+def burnedAreaInt16(ba, ca, bb, cb, index64, nodata, scale, out, work, nod,
+    refl_scale):
+    """Computes scale / ((ra-ca)^2 + (rb-cb)^2) as int16 using float32.
+    Description: ra and rb are the reflectance of bands ba and bb.  index64
+        is the float64 index function of the bands.
+    """
+    (out, buf) = kernelSetup(ba, out, work)
+    ra = reflFloat32(ba, refl_scale, buf['fa'])
+    rb = reflFloat32(bb, refl_scale, buf['fb'])
+    den = buf['fd']
+    tmp = buf['tmp']
+    derr = buf['fc']
+
+    # denominator and the bound of its error
+    subtract(ra, ca, out=den)
+    multiply(den, den, out=den)
+    subtract(rb, cb, out=tmp)
+    multiply(tmp, tmp, out=tmp)
+    add(den, tmp, out=den)
+    absolute(ra, out=derr)
+    add(derr, abs(ca), out=derr)
+    multiply(derr, derr, out=derr)
+    absolute(rb, out=tmp)
+    add(tmp, abs(cb), out=tmp)
+    multiply(tmp, tmp, out=tmp)
+    add(derr, tmp, out=derr)
+    multiply(derr, INT16_KERNEL_EPS, out=derr)
+
+    # the numerator is exact and the denominator isn't negative, so the
+    # error bound of the index is 2 * derr / den^2, as long as derr is less
+    # than half of den; otherwise the bound is infinite
+    val = buf['val']
+    err = buf['err']
+    true_divide(1.0, den, out=val)
+    multiply(val, val, out=err)
+    multiply(derr, 2.0, out=derr)
+    multiply(err, derr, out=err)
+    greater_equal(derr, den, out=buf['mask'])
+    copyto(err, inf, where=buf['mask'])
+    return(boundedInt16([ba, bb], index64, nodata, scale, out, buf, nod))
+
+def BAIInt16(b3, b4, nodata=-9999, scale=10.0, out=None, work=None,
+    nod=None, refl_scale=SR_SCALE_FACTOR):
+    """Computes the scaled burned area index as int16.
+    """
+    return(burnedAreaInt16(b4, 0.06, b3, 0.1, lambda b4, b3, nodata:
+        BAI(b3, b4, nodata, refl_scale), nodata, scale, out, work, nod,
+        refl_scale))
+
+def BAIMInt16(b4, b5, nodata=-9999, scale=10.0, out=None, work=None,
+    nod=None, refl_scale=SR_SCALE_FACTOR):
+    """Computes the scaled burned area index for mapping Mediterranean burn
+    scars as int16.
+    """
+    return(burnedAreaInt16(b4, 0.05, b5, 0.2, lambda b4, b5, nodata:
+        BAIM(b4, b5, nodata, refl_scale), nodata, scale, out, work, nod,
+        refl_scale))
+
+def BAIM2Int16(b4, b7, nodata=-9999, scale=10.0, out=None, work=None,
+    nod=None, refl_scale=SR_SCALE_FACTOR):
+    """Computes the scaled burned area index for mapping Mediterranean burn
+    scars 2 as int16.
+    """
+    return(burnedAreaInt16(b4, 0.05, b7, 0.2, lambda b4, b7, nodata:
+        BAIM2(b4, b7, nodata, refl_scale), nodata, scale, out, work, nod,
+        refl_scale))
+
+def vegetationInt16(b1, b3, b4, gain, c1, c3, c4, offset, bands, index64,
+    nodata, scale, out, work, nod, refl_scale):
+    """Computes scale * gain * (r4-r3) / (c4*r4 + c3*r3 + c1*r1 + offset) as
+    int16 using float32.
+    Description: r1, r3 and r4 are the reflectance of bands b1, b3 and b4;
+        b1 is None if c1 is 0.  bands are the bands of index64, the float64
+        index function.
+    """
+    (out, buf) = kernelSetup(b3, out, work)
+    r3 = reflFloat32(b3, refl_scale, buf['fb'])
+    r4 = reflFloat32(b4, refl_scale, buf['fc'])
+    val = buf['val']
+    den = buf['fd']
+    tmp = buf['tmp']
+    nerr = buf['frac']
+    derr = buf['fa']
+
+    # denominator; the bound of its error is computed before the
+    # reflectance of band 1 is computed in its place
+    multiply(r4, c4, out=den)
+    multiply(r3, c3, out=tmp)
+    add(den, tmp, out=den)
+    absolute(r4, out=nerr)
+    absolute(r3, out=tmp)
+    if c1 != 0:
+        r1 = reflFloat32(b1, refl_scale, buf['err'])
+        multiply(r1, c1, out=r1)
+        add(den, r1, out=den)
+        absolute(r1, out=derr)
+    else:
+        derr.fill(0)
+    add(den, offset, out=den)
+    multiply(nerr, abs(c4), out=val)
+    add(derr, val, out=derr)
+    multiply(tmp, abs(c3), out=val)
+    add(derr, val, out=derr)
+    add(derr, abs(offset), out=derr)
+    multiply(derr, INT16_KERNEL_EPS, out=derr)
+
+    # numerator and the bound of its error
+    add(nerr, tmp, out=nerr)
+    multiply(nerr, abs(gain) * INT16_KERNEL_EPS, out=nerr)
+    subtract(r4, r3, out=val)
+    multiply(val, gain, out=val)
+
+    true_divide(val, den, out=val)
+    copyto(tmp, nerr)
+    ratioError(tmp, derr, buf)
+    return(boundedInt16(bands, index64, nodata, scale, out, buf, nod))
+
+def SAVIInt16(b3, b4, nodata=-9999, scale=1000.0, out=None, work=None,
+    nod=None, refl_scale=SR_SCALE_FACTOR):
+    """Computes the scaled soil adjusted vegetation index as int16.
+    """
+    return(vegetationInt16(None, b3, b4, 1.5, 0.0, 1.0, 1.0, 0.5, [b3, b4],
+        lambda b3, b4, nodata: SAVI(b3, b4, nodata, refl_scale), nodata,
+        scale, out, work, nod, refl_scale))
+
+def EVIInt16(b1, b3, b4, nodata=-9999, scale=1000.0, out=None, work=None,
+    nod=None, refl_scale=SR_SCALE_FACTOR):
+    """Computes the scaled enhanced vegetation index as int16.
+    """
+    return(vegetationInt16(b1, b3, b4, 2.5, -7.5, 6.0, 1.0, 1.0,
+        [b1, b3, b4], lambda b1, b3, b4, nodata:
+        EVI(b1, b3, b4, nodata, refl_scale), nodata, scale, out, work, nod,
+        refl_scale))
+
+def EVI2Int16(b3, b4, nodata=-9999, scale=1000.0, out=None, work=None,
+    nod=None, refl_scale=SR_SCALE_FACTOR):
+    """Computes the scaled enhanced vegetation index without a blue band as
+    int16.
+    """
+    return(vegetationInt16(None, b3, b4, 2.5, 0.0, 2.4, 1.0, 1.0, [b3, b4],
+        lambda b3, b4, nodata: EVI2(b3, b4, nodata, refl_scale), nodata,
+        scale, out, work, nod, refl_scale))
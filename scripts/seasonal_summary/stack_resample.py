@@ -0,0 +1,255 @@
+#! /usr/bin/env python
+import sys
+import os
+
+from numpy import *
+from osgeo import gdal
+from osgeo import gdal_array
+from osgeo import gdalconst
+from log_it import *
+
+# number of lines to copy at a time when placing a scene into the stack grid
+RESAMPLE_BLOCK_LINES = 256
+
+#############################################################################
+# Created on October 17, 2026, USGS/EROS LSRD Project
+# Created module to hold the methods for placing the bands of a scene into
+# the common grid of the temporal stack, in process, rather than shelling
+# out to gdal_merge.py for each band.
+#
+# The stack grid and the placement window of each scene are computed with
+# the same arithmetic that gdal_merge.py uses (-ul_lr with integer corners,
+# -init/-n/-a_nodata of the fill value), so the output files are identical
+# to the gdal_merge.py output.
+############################################################################
+
+def stackGrid (spatial_extent, geotrans):
+    """Determines the stack grid for the specified spatial extent.
+    Description: stackGrid computes the geographic transform and size of the
+        stack grid covering the spatial extent, using the pixel size of the
+        specified scene.  The extents are truncated to integers in the same
+        manner as the gdal_merge.py -ul_lr command line arguments previously
+        built for the resampling.
+
+    History:
+      Created on 10/17/2026, USGS/EROS LSRD Project
+
+    Args:
+      spatial_extent - dictionary of the West, North, East, and South extents
+          of the stack
+      geotrans - geographic transform of the scene which defines the pixel
+          size of the stack grid
+
+    Returns:
+        grid - dictionary of the geotrans, ncol, and nrow of the stack grid
+    """
+
+    ulx = float (int (spatial_extent['West']))
+    uly = float (int (spatial_extent['North']))
+    lrx = float (int (spatial_extent['East']))
+    lry = float (int (spatial_extent['South']))
+    psize_x = geotrans[1]
+    psize_y = geotrans[5]
+
+    grid = {}
+    grid['geotrans'] = [ulx, psize_x, 0, uly, 0, psize_y]
+    grid['ncol'] = int ((lrx - ulx) / psize_x + 0.5)
+    grid['nrow'] = int ((lry - uly) / psize_y + 0.5)
+    return grid
+
+
+def sceneWindow (grid, geotrans, ncol, nrow):
+    """Determines where a scene falls within the stack grid.
+    Description: sceneWindow computes the intersection of the scene with the
+        stack grid as a target window (in stack pixels) and a source window
+        (in scene pixels).  If the source and target windows are the same
+        size then the scene sits on the stack grid at an integer pixel
+        offset and the data can be copied line for line.
+
+    History:
+      Created on 10/17/2026, USGS/EROS LSRD Project
+
+    Args:
+      grid - dictionary of the stack grid as returned by stackGrid
+      geotrans - geographic transform of the scene
+      ncol - number of columns in the scene
+      nrow - number of rows in the scene
+
+    Returns:
+        None - scene does not intersect the stack grid
+        window - dictionary of the target (t_*) and source (s_*) window
+            offsets and sizes, along with an 'aligned' flag
+    """
+
+    t_geotrans = grid['geotrans']
+    t_ulx = t_geotrans[0]
+    t_uly = t_geotrans[3]
+    t_lrx = t_geotrans[0] + grid['ncol'] * t_geotrans[1]
+    t_lry = t_geotrans[3] + grid['nrow'] * t_geotrans[5]
+
+    s_ulx = geotrans[0]
+    s_uly = geotrans[3]
+    s_lrx = geotrans[0] + ncol * geotrans[1]
+    s_lry = geotrans[3] + nrow * geotrans[5]
+
+    # figure out the intersection region; the stack is north up
+    ulx = max (t_ulx, s_ulx)
+    lrx = min (t_lrx, s_lrx)
+    uly = min (t_uly, s_uly)
+    lry = max (t_lry, s_lry)
+    if ulx >= lrx or uly <= lry:
+        return None
+
+    # compute the target window in stack pixel coordinates
+    t_xoff = int ((ulx - t_geotrans[0]) / t_geotrans[1] + 0.1)
+    t_yoff = int ((uly - t_geotrans[3]) / t_geotrans[5] + 0.1)
+    t_xsize = int ((lrx - t_geotrans[0]) / t_geotrans[1] + 0.5) - t_xoff
+    t_ysize = int ((lry - t_geotrans[3]) / t_geotrans[5] + 0.5) - t_yoff
+    if t_xsize < 1 or t_ysize < 1:
+        return None
+
+    # compute the source window in scene pixel coordinates
+    s_xoff = int ((ulx - geotrans[0]) / geotrans[1])
+    s_yoff = int ((uly - geotrans[3]) / geotrans[5])
+    s_xsize = int ((lrx - geotrans[0]) / geotrans[1] + 0.5) - s_xoff
+    s_ysize = int ((lry - geotrans[3]) / geotrans[5] + 0.5) - s_yoff
+    if s_xsize < 1 or s_ysize < 1:
+        return None
+
+    window = {}
+    window['t_xoff'] = t_xoff
+    window['t_yoff'] = t_yoff
+    window['t_xsize'] = t_xsize
+    window['t_ysize'] = t_ysize
+    window['s_xoff'] = s_xoff
+    window['s_yoff'] = s_yoff
+    window['s_xsize'] = s_xsize
+    window['s_ysize'] = s_ysize
+    window['aligned'] = (s_xsize == t_xsize) and (s_ysize == t_ysize)
+    return window
+
+
+def resampleToExtent (src_file, dst_file, spatial_extent, fill_value=-9999,
+    log_handler=None):
+    """Places a single band file into the stack grid.
+    Description: resampleToExtent writes the band in src_file to dst_file
+        on the stack grid covering the spatial extent.  Pixels outside the
+        scene are set to the fill value, which is also flagged as the noData
+        value of the output band.  When the scene lies on the stack grid
+        (same pixel size, integer pixel offset) the lines are copied in
+        blocks, and each output line is written exactly once.  Otherwise the
+        scene window is resampled (nearest neighbor) in a single read, the
+        same as gdal_merge.py.
+
+    History:
+      Created on 10/17/2026, USGS/EROS LSRD Project
+          Replaces the gdal_merge.py calls previously used by sceneResample.
+
+    Args:
+      src_file - name of the input band file
+      dst_file - name of the output ENVI file on the stack grid
+      spatial_extent - dictionary of the West, North, East, and South extents
+          of the stack
+      fill_value - fill value for pixels outside of the scene
+      log_handler - open log file for logging or None for stdout
+
+    Returns:
+        ERROR - error opening, reading, or writing the band
+        SUCCESS - successful processing
+    """
+
+    src_ds = gdal.Open (src_file)
+    if src_ds is None:
+        msg = 'GDAL could not open input file: ' + src_file
+        logIt (msg, log_handler)
+        return ERROR
+    src_band = src_ds.GetRasterBand(1)
+    if src_band is None:
+        msg = 'Input band connection failed: ' + src_file
+        logIt (msg, log_handler)
+        return ERROR
+
+    # determine the stack grid and where this scene falls in it
+    grid = stackGrid (spatial_extent, src_ds.GetGeoTransform())
+    ncol = grid['ncol']
+    nrow = grid['nrow']
+    window = sceneWindow (grid, src_ds.GetGeoTransform(),  \
+        src_ds.RasterXSize, src_ds.RasterYSize)
+
+    # create the output file in the same data type as the input band
+    mydriver = gdal.GetDriverByName('ENVI')
+    dst_ds = mydriver.Create (dst_file, ncol, nrow, 1, src_band.DataType)
+    if dst_ds is None:
+        msg = 'GDAL could not create output file: ' + dst_file
+        logIt (msg, log_handler)
+        return ERROR
+    dst_ds.SetGeoTransform (grid['geotrans'])
+    dst_ds.SetProjection (src_ds.GetProjection())
+    dst_band = dst_ds.GetRasterBand(1)
+    dst_band.SetNoDataValue (fill_value)
+
+    # data type of the line buffers to match the input band
+    buf_type = gdal_array.GDALTypeCodeToNumericTypeCode (src_band.DataType)
+
+    # scenes which don't intersect the stack are written as all fill
+    if window is None:
+        msg = 'Scene does not intersect the stack extents: ' + src_file
+        logIt (msg, log_handler)
+        t_yoff = nrow
+        t_ysize = 0
+    else:
+        t_yoff = window['t_yoff']
+        t_ysize = window['t_ysize']
+
+    # write the fill lines above and below the scene window
+    block_lines = min (RESAMPLE_BLOCK_LINES, nrow)
+    fill_block = empty ((block_lines, ncol), dtype=buf_type)
+    fill_block.fill (fill_value)
+    for (start, end) in [(0, t_yoff), (t_yoff + t_ysize, nrow)]:
+        for y in range (start, end, block_lines):
+            nlines = min (block_lines, end - y)
+            dst_band.WriteArray (fill_block[0:nlines,:], 0, y)
+
+    if window is not None:
+        t_xoff = window['t_xoff']
+        t_xsize = window['t_xsize']
+        if window['aligned']:
+            # copy the scene lines directly into the stack lines; the line
+            # buffer is filled outside the scene window once and reused
+            line_block = fill_block
+            for y in range (0, t_ysize, block_lines):
+                nlines = min (block_lines, t_ysize - y)
+                data = src_band.ReadAsArray (window['s_xoff'],  \
+                    window['s_yoff'] + y, window['s_xsize'], nlines)
+                if data is None:
+                    msg = 'Error reading input file: ' + src_file
+                    logIt (msg, log_handler)
+                    return ERROR
+                line_block[0:nlines,t_xoff:t_xoff+t_xsize] = data
+                dst_band.WriteArray (line_block[0:nlines,:], 0, t_yoff + y)
+        else:
+            # scene is not on the stack grid, so resample the window via
+            # GDAL (nearest neighbor) as gdal_merge.py does
+            msg = '    Scene is not aligned with the stack grid; ' \
+                'resampling the window'
+            logIt (msg, log_handler)
+            data = src_band.ReadAsArray (window['s_xoff'],  \
+                window['s_yoff'], window['s_xsize'], window['s_ysize'],  \
+                t_xsize, t_ysize)
+            if data is None:
+                msg = 'Error reading input file: ' + src_file
+                logIt (msg, log_handler)
+                return ERROR
+            line = empty ((1, ncol), dtype=buf_type)
+            line.fill (fill_value)
+            for y in range (0, t_ysize):
+                line[0,t_xoff:t_xoff+t_xsize] = data[y,:]
+                dst_band.WriteArray (line, 0, t_yoff + y)
+
+    # cleanup
+    dst_band = None
+    dst_ds = None
+    src_band = None
+    src_ds = None
+    return SUCCESS
+
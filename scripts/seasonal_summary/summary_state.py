@@ -0,0 +1,126 @@
+#! /usr/bin/env python
+import sys
+import os
+import csv
+
+from log_it import *
+
+# name of the file, in the input directory, which records the stack extents
+# and the scenes which have been added to the seasonal summary state
+SUMMARY_STATE_FILE = 'summary_state.csv'
+SUMMARY_STATE_EXTENTS = ['West', 'North', 'East', 'South']
+SUMMARY_STATE_HEADER = ['file', 'year', 'month']
+
+# suffix of the state files kept next to the good looks and seasonal summary
+# products; these hold the int32 good looks count and sum for each pixel.
+# the annual maximum products are their own state.
+SUMMARY_STATE_SUFFIX = '_state.img'
+
+#############################################################################
+# Created on October 17, 2026, USGS/EROS LSRD Project
+# Created module to support incremental seasonal summaries.  The int32 sums
+# and good looks counts behind the seasonal summaries are kept as state
+# files next to the products, and the scenes which have been added to that
+# state are recorded in the summary state file.  When scenes are added to
+# (or removed from) the stack, only the products of the affected years and
+# seasons are updated from the state, rather than rebuilding the products
+# for the whole stack.
+############################################################################
+
+def stateFile (product_file):
+    """Returns the name of the state file for a product.
+    """
+
+    return product_file.replace ('.img', SUMMARY_STATE_SUFFIX)
+
+
+def writeSummaryState (summary_state_file, spatial_extent, scene_list,  \
+    log_handler=None):
+    """Writes the summary state file.
+    Description: writeSummaryState writes the spatial extents of the stack,
+        followed by the file, year, and month of each scene which has been
+        added to the seasonal summary state, to the summary state CSV file.
+
+    History:
+      Created on 10/17/2026, USGS/EROS LSRD Project
+
+    Args:
+      summary_state_file - name of the summary state CSV file to write
+      spatial_extent - dictionary of the West, North, East, and South extents
+          of the stack
+      scene_list - list of dictionaries, one per scene, with the keys in
+          SUMMARY_STATE_HEADER
+      log_handler - open log file for logging or None for stdout
+
+    Returns:
+        ERROR - error writing the summary state file
+        SUCCESS - successful processing
+    """
+
+    try:
+        fd = open (summary_state_file, 'w')
+    except IOError:
+        msg = 'Could not create the summary state file: ' +  \
+            summary_state_file
+        logIt (msg, log_handler)
+        return ERROR
+
+    writer = csv.writer (fd)
+    writer.writerow (SUMMARY_STATE_EXTENTS)
+    writer.writerow ([repr (spatial_extent[key])  \
+        for key in SUMMARY_STATE_EXTENTS])
+    writer.writerow (SUMMARY_STATE_HEADER)
+    for scene in scene_list:
+        writer.writerow ([scene[key] for key in SUMMARY_STATE_HEADER])
+    fd.close()
+
+    return SUCCESS
+
+
+def readSummaryState (summary_state_file, log_handler=None):
+    """Reads the summary state file.
+    Description: readSummaryState reads the summary state CSV file and
+        returns the spatial extents of the stack along with a dictionary,
+        keyed by the scene name (XML basename without the .xml extension), of
+        the scenes which have been added to the seasonal summary state.
+
+    History:
+      Created on 10/17/2026, USGS/EROS LSRD Project
+
+    Args:
+      summary_state_file - name of the summary state CSV file to read
+      log_handler - open log file for logging or None for stdout
+
+    Returns:
+        None - error reading the summary state file
+        (spatial_extent, scene_dict) - spatial extents and scene information
+    """
+
+    if not os.path.exists (summary_state_file):
+        msg = 'Summary state file does not exist: ' + summary_state_file
+        logIt (msg, log_handler)
+        return None
+
+    reader = csv.reader (open (summary_state_file, 'r'))
+    try:
+        header = [elem.strip() for elem in reader.next()]
+        values = reader.next()
+        spatial_extent = {}
+        for key in SUMMARY_STATE_EXTENTS:
+            spatial_extent[key] = float (values[header.index(key)])
+
+        header = [elem.strip() for elem in reader.next()]
+        scene_dict = {}
+        for row in reader:
+            scene = {}
+            scene['file'] = row[header.index('file')].strip()
+            scene['year'] = int (row[header.index('year')])
+            scene['month'] = int (row[header.index('month')])
+            scene_name = os.path.basename (scene['file']).replace ('.xml', '')
+            scene_dict[scene_name] = scene
+    except (StopIteration, ValueError):
+        msg = 'Error reading the summary state file: ' + summary_state_file
+        logIt (msg, log_handler)
+        return None
+
+    return (spatial_extent, scene_dict)
@@ -0,0 +1,238 @@
+#! /usr/bin/env python
+import sys
+import os
+import csv
+
+from numpy import *
+from osgeo import gdal
+from osgeo import gdal_array
+from osgeo import gdalconst
+from log_it import *
+
+# name of the file, in the input directory, which records where each scene
+# resides relative to the stack grid
+VIRTUAL_STACK_FILE = 'virtual_stack.csv'
+VIRTUAL_STACK_HEADER = ['file', 'base_file', 'mask_file', 'line_offset',  \
+    'samp_offset', 'nlines', 'nsamps', 'resampled']
+
+#############################################################################
+# Created on October 17, 2026, USGS/EROS LSRD Project
+# Created module to support a "virtual" temporal stack.  Rather than copying
+# each band of each scene into the full stack grid (most of which is fill),
+# the scenes are left at their native size and the line/sample offset of
+# each scene within the stack grid is recorded.  Readers then read a window
+# of the stack grid through that offset, getting fill outside the footprint
+# of the scene.
+############################################################################
+
+def writeVirtualStack (virtual_stack_file, scene_list, log_handler=None):
+    """Writes the virtual stack file.
+    Description: writeVirtualStack writes the base filename, mask filename,
+        and the location of each scene within the stack grid to the virtual
+        stack CSV file.
+
+    History:
+      Created on 10/17/2026, USGS/EROS LSRD Project
+
+    Args:
+      virtual_stack_file - name of the virtual stack CSV file to write
+      scene_list - list of dictionaries, one per scene, with the keys in
+          VIRTUAL_STACK_HEADER
+      log_handler - open log file for logging or None for stdout
+
+    Returns:
+        ERROR - error writing the virtual stack file
+        SUCCESS - successful processing
+    """
+
+    try:
+        fd = open (virtual_stack_file, 'w')
+    except IOError:
+        msg = 'Could not create the virtual stack file: ' + virtual_stack_file
+        logIt (msg, log_handler)
+        return ERROR
+
+    writer = csv.writer (fd)
+    writer.writerow (VIRTUAL_STACK_HEADER)
+    for scene in scene_list:
+        writer.writerow ([scene[key] for key in VIRTUAL_STACK_HEADER])
+    fd.close()
+
+    return SUCCESS
+
+
+def readVirtualStack (virtual_stack_file, log_handler=None):
+    """Reads the virtual stack file.
+    Description: readVirtualStack reads the virtual stack CSV file and
+        returns a dictionary, keyed by the scene name (XML basename without
+        the .xml extension), of the information for each scene.
+
+    History:
+      Created on 10/17/2026, USGS/EROS LSRD Project
+
+    Args:
+      virtual_stack_file - name of the virtual stack CSV file to read
+      log_handler - open log file for logging or None for stdout
+
+    Returns:
+        None - error reading the virtual stack file
+        scene_dict - dictionary of scene information
+    """
+
+    if not os.path.exists (virtual_stack_file):
+        msg = 'Virtual stack file does not exist: ' + virtual_stack_file
+        logIt (msg, log_handler)
+        return None
+
+    scene_dict = {}
+    reader = csv.reader (open (virtual_stack_file, 'r'))
+    header = [elem.strip() for elem in reader.next()]
+    for row in reader:
+        scene = {}
+        for key in VIRTUAL_STACK_HEADER:
+            value = row[header.index(key)].strip()
+            if key in ['file', 'base_file', 'mask_file']:
+                scene[key] = value
+            else:
+                scene[key] = int (value)
+        scene_name = os.path.basename (scene['file']).replace ('.xml', '')
+        scene_dict[scene_name] = scene
+
+    return scene_dict
+
+
+#############################################################################
+# Created on October 17, 2026, USGS/EROS LSRD Project
+# Created class to read a band of a scene through its offset into the stack
+# grid.  The ReadAsArray method follows the GDAL band method of the same
+# name, so it can be used in place of a GDAL band when reading the stack.
+############################################################################
+class stackWindowBand:
+    """Class for reading a scene band in the stack grid coordinates.
+    """
+
+    dataset = None          # dataset created by gdal.Open
+    band = None             # band 1 of the dataset
+    line_offset = 0         # line offset of the scene in the stack grid
+    samp_offset = 0         # sample offset of the scene in the stack grid
+    nlines = 0              # number of lines in the scene
+    nsamps = 0              # number of samples in the scene
+    stack_nlines = 0        # number of lines in the stack grid
+    stack_nsamps = 0        # number of samples in the stack grid
+    fill_value = -9999      # value used outside of the scene footprint
+    data_type = None        # numpy data type of the band
+
+    def __init__ (self, filename, line_offset, samp_offset, stack_nlines,  \
+        stack_nsamps, fill_value=-9999, log_handler=None):
+        """Class constructor which opens the band file.
+        Description: stackWindowBand class constructor opens the band file
+            and saves the location of the scene within the stack grid.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args:
+          filename - name of the band file to be opened
+          line_offset - line in the stack grid of the first scene line
+          samp_offset - sample in the stack grid of the first scene sample
+          stack_nlines - number of lines in the stack grid
+          stack_nsamps - number of samples in the stack grid
+          fill_value - value to return outside of the scene footprint
+          log_handler - open log file for logging or None for stdout
+
+        Returns:
+            None - error opening the file
+            Object - successful processing
+        """
+
+        self.dataset = gdal.Open (filename, gdalconst.GA_ReadOnly)
+        if self.dataset is None:
+            msg = 'GDAL could not open input file: ' + filename
+            logIt (msg, log_handler)
+            return None
+
+        self.band = self.dataset.GetRasterBand(1)
+        if self.band is None:
+            msg = 'Input band connection failed: ' + filename
+            logIt (msg, log_handler)
+            return None
+
+        self.line_offset = line_offset
+        self.samp_offset = samp_offset
+        self.nlines = self.dataset.RasterYSize
+        self.nsamps = self.dataset.RasterXSize
+        self.stack_nlines = stack_nlines
+        self.stack_nsamps = stack_nsamps
+        self.fill_value = fill_value
+        self.data_type = gdal_array.GDALTypeCodeToNumericTypeCode (  \
+            self.band.DataType)
+
+
+    def __del__ (self):
+        """Class destructor to clean up the band pointers.
+        """
+
+        self.band = None
+        self.dataset = None
+
+
+    def ReadAsArray (self, xoff=0, yoff=0, win_xsize=None, win_ysize=None,  \
+        buf_obj=None):
+        """Reads a window of the stack grid from the scene band.
+        Description: ReadAsArray reads the specified window of the stack
+            grid.  The portion of the window within the scene footprint is
+            read from the scene band and the remainder is set to the fill
+            value.  If the scene covers the whole window then the read is
+            passed directly to GDAL.
+
+        History:
+          Created on 10/17/2026, USGS/EROS LSRD Project
+
+        Args:
+          xoff - starting sample of the window in the stack grid
+          yoff - starting line of the window in the stack grid
+          win_xsize - number of samples in the window; default is the
+              remainder of the stack line
+          win_ysize - number of lines in the window; default is the
+              remainder of the stack
+          buf_obj - optional preallocated array (win_ysize x win_xsize) to
+              read the data into
+
+        Returns:
+            Array - window of data
+        """
+
+        if win_xsize is None:
+            win_xsize = self.stack_nsamps - xoff
+        if win_ysize is None:
+            win_ysize = self.stack_nlines - yoff
+
+        # determine the window in scene coordinates
+        s_xoff = xoff - self.samp_offset
+        s_yoff = yoff - self.line_offset
+
+        # the scene covers the whole window, so read directly
+        if s_xoff >= 0 and s_yoff >= 0 and  \
+            s_xoff + win_xsize <= self.nsamps and  \
+            s_yoff + win_ysize <= self.nlines:
+            if buf_obj is None:
+                return self.band.ReadAsArray (s_xoff, s_yoff, win_xsize,  \
+                    win_ysize)
+            return self.band.ReadAsArray (s_xoff, s_yoff, win_xsize,  \
+                win_ysize, buf_obj=buf_obj)
+
+        # fill the window then read the portion which overlaps the scene
+        if buf_obj is None:
+            buf_obj = empty ((win_ysize, win_xsize), dtype=self.data_type)
+        buf_obj.fill (self.fill_value)
+
+        x0 = max (s_xoff, 0)
+        y0 = max (s_yoff, 0)
+        x1 = min (s_xoff + win_xsize, self.nsamps)
+        y1 = min (s_yoff + win_ysize, self.nlines)
+        if x1 > x0 and y1 > y0:
+            buf_obj[y0-s_yoff:y1-s_yoff,x0-s_xoff:x1-s_xoff] =  \
+                self.band.ReadAsArray (x0, y0, x1 - x0, y1 - y0)
+
+        return buf_obj
+######end of stackWindowBand class######
@@ -14,6 +14,9 @@ Date        Programmer       Reason
 ---------   --------------   -----------------------------------------
 12/7/2012   Jodi Riegle      Original development
 9/3/2013    Gail Schmidt     Modified to work in the ESPA environment
+10/17/2026  USGS/EROS LSRD   Added the server mode and split the reading of
+                             the configuration file into loadConfigFile.
+10/17/2026  USGS/EROS LSRD   Added the --num_threads command-line option.
 
 NOTES:
 *****************************************************************************/
@@ -26,6 +29,80 @@ NOTES:
 namespace po = boost::program_options;
 using namespace boost;
 
+/******************************************************************************
+MODULE: addConfigOptions
+
+PURPOSE: Adds the configuration file parameters to the options description.
+ 
+RETURN VALUE:
+Type = None
+Value          Description
+-----          -----------
+
+HISTORY:
+Date          Programmer       Reason
+----------    ---------------  -------------------------------------
+10/17/2026    USGS/EROS LSRD   Pulled from loadParametersFromFile
+
+NOTES:
+*****************************************************************************/
+static void addConfigOptions
+(
+    po::options_description &config   /* I/O: configuration file options */
+)
+{
+    config.add_options()
+        ("INPUT_BASE_FILE", po::value<string>(),
+            "base filename of the input surface reflectance file (resampled "
+            "to the same geographic extents as the seasonal summaries and "
+            "annual maximums")
+        ("INPUT_MASK_FILE", po::value<string>(),
+            "mask file for the input surface reflectance file (resampled "
+            "to the same geographic extents as the seasonal summaries and "
+            "annual maximums")
+        ("INPUT_FILL_VALUE", po::value<int>(),
+            "fill value used for the input surface reflectance files")
+        ("INPUT_LINE_OFFSET", po::value<int>(),
+            "line in the seasonal summaries grid of the first line of the "
+            "input surface reflectance file, if it has not been resampled")
+        ("INPUT_SAMP_OFFSET", po::value<int>(),
+            "sample in the seasonal summaries grid of the first sample of the "
+            "input surface reflectance file, if it has not been resampled")
+        ("SEASONAL_SUMMARIES_DIR", po::value<string>(),
+            "seasonal summaries directory")
+        ("OUTPUT_IMG_FILE", po::value<string>(), "output image filename (.img)")
+
+        /* training related */
+        ("SAVE_MODEL_XML", po::value<string>(),
+            "specifies to save the model after training to be used for "
+            "future prediction runs without the need for retraining "
+            "(default is to not save the model)")
+        ("LOAD_MODEL_XML", po::value<string>(),
+            "specifies to use model from previous training run; the specified "
+            "XML file is the name of the previously trained model XML file "
+            "(default is to run training)")
+        ("TREE_CNT", po::value<int>(),
+            "number of trees used for training (i.e. 1000)")
+        ("SHRINKAGE", po::value<float>(),
+            "shrinkage value for training (i.e. 0.05)")
+        ("MAX_DEPTH", po::value<int>(),
+            "maximal depth of each decision tree used for training (i.e. 3)")
+        ("SUBSAMPLE_FRACTION", po::value<float>(),
+            "fraction of input data to be used for training (i.e. 0.50)")
+        ("CSV_FILE", po::value<string>(),
+            "csv training file; reflectance inputs should be scaled as they "
+            "are in the lndsr files; indices should be scaled by 1000 as they "
+            "are in the input seasonal summaries")
+        ("NCSV_INPUTS", po::value<int>(),
+            "number of inputs per line in the training file, not counting "
+            "the response index; also the number of inputs used for each "
+            "prediction")
+        ("PREDICT_OUT", po::value<string>(),
+            "output file for training - includes test error, train error and "
+            "variables of importance (default is predict_out.txt)");
+}
+
+
 /******************************************************************************
 MODULE: loadParametersFromFile
 
@@ -51,6 +128,13 @@ Date          Programmer       Reason
                                maximums.  We will use the mask file generated
                                as part of the seasonal summaries for this
                                scene.
+10/17/2026    USGS/EROS LSRD   Added the optional INPUT_LINE_OFFSET and
+                               INPUT_SAMP_OFFSET parameters to support input
+                               scenes left at their native size (virtual
+                               stack).
+10/17/2026    USGS/EROS LSRD   Added the --server command-line option.  The
+                               configuration file is read by loadConfigFile.
+10/17/2026    USGS/EROS LSRD   Added the --num_threads command-line option.
 NOTES:
   1. The following parameters are required for training the model.
      TREE_CNT
@@ -72,6 +156,18 @@ NOTES:
   3. If saving the model, after training, then the following parameter is
      required in addition to the training parameters.
      SAVE_MODEL_XML
+
+  4. INPUT_LINE_OFFSET and INPUT_SAMP_OFFSET are optional.  If either is
+     specified, then the input surface reflectance and mask files are at their
+     native size and the offsets specify the location of the scene within the
+     grid of the seasonal summaries and annual maximums.
+
+  5. In the server mode the config_file is not used.  The names of the
+     configuration files are read from stdin, one per scene.  See
+     runServer in predict_burned_area.cpp.
+
+  6. --num_threads is the number of threads used to run the predictions.
+     All the threads share the one model.
 *****************************************************************************/
 bool PredictBurnedArea::loadParametersFromFile(int ac, char* av[]) {
     string config_filename;            /* configuration filename */
@@ -80,53 +176,16 @@ bool PredictBurnedArea::loadParametersFromFile(int ac, char* av[]) {
     po::options_description cmd_line("Command-line options");
     cmd_line.add_options()
         ("config_file", po::value<string>(), "configuration file")
+        ("server", "keep running and read the name of the configuration "
+            "file of each scene from stdin, loading each model only once "
+            "(default is off)")
+        ("num_threads", po::value<int>(), "number of threads used to run "
+            "the predictions (default is 1)")
         ("verbose", "print extra processing information (default is off)")
         ("help", "produce help message");
 
     po::options_description config("Configuration file parameters");
-    config.add_options()
-        ("INPUT_BASE_FILE", po::value<string>(),
-            "base filename of the input surface reflectance file (resampled "
-            "to the same geographic extents as the seasonal summaries and "
-            "annual maximums")
-        ("INPUT_MASK_FILE", po::value<string>(),
-            "mask file for the input surface reflectance file (resampled "
-            "to the same geographic extents as the seasonal summaries and "
-            "annual maximums")
-        ("INPUT_FILL_VALUE", po::value<int>(),
-            "fill value used for the input surface reflectance files")
-        ("SEASONAL_SUMMARIES_DIR", po::value<string>(),
-            "seasonal summaries directory")
-        ("OUTPUT_IMG_FILE", po::value<string>(), "output image filename (.img)")
-
-        /* training related */
-        ("SAVE_MODEL_XML", po::value<string>(),
-            "specifies to save the model after training to be used for "
-            "future prediction runs without the need for retraining "
-            "(default is to not save the model)")
-        ("LOAD_MODEL_XML", po::value<string>(),
-            "specifies to use model from previous training run; the specified "
-            "XML file is the name of the previously trained model XML file "
-            "(default is to run training)")
-        ("TREE_CNT", po::value<int>(),
-            "number of trees used for training (i.e. 1000)")
-        ("SHRINKAGE", po::value<float>(),
-            "shrinkage value for training (i.e. 0.05)")
-        ("MAX_DEPTH", po::value<int>(),
-            "maximal depth of each decision tree used for training (i.e. 3)")
-        ("SUBSAMPLE_FRACTION", po::value<float>(),
-            "fraction of input data to be used for training (i.e. 0.50)")
-        ("CSV_FILE", po::value<string>(),
-            "csv training file; reflectance inputs should be scaled as they "
-            "are in the lndsr files; indices should be scaled by 1000 as they "
-            "are in the input seasonal summaries")
-        ("NCSV_INPUTS", po::value<int>(),
-            "number of inputs per line in the training file, not counting "
-            "the response index; also the number of inputs used for each "
-            "prediction")
-        ("PREDICT_OUT", po::value<string>(),
-            "output file for training - includes test error, train error and "
-            "variables of importance (default is predict_out.txt)");
+    addConfigOptions (config);
 
     po::options_description cmdline_options;
     cmdline_options.add(cmd_line);
@@ -150,6 +209,23 @@ bool PredictBurnedArea::loadParametersFromFile(int ac, char* av[]) {
         return false;
     }
 
+    NUM_THREADS = 1;
+    if (vm.count("num_threads")) {
+        NUM_THREADS = vm["num_threads"].as<int>();
+        if (NUM_THREADS < 1) {
+            sprintf (errmsg, "num_threads must be at least 1: %d",
+                NUM_THREADS);
+            RETURN_ERROR (errmsg, "loadParametersFromFile", false);
+        }
+    }
+
+    /* The configuration files are read for each scene in the server mode */
+    server_mode = false;
+    if (vm.count("server")) {
+        server_mode = true;
+        return true;
+    }
+
     if (vm.count("config_file")) {
         config_filename = vm["config_file"].as<string>();
     }
@@ -159,16 +235,59 @@ bool PredictBurnedArea::loadParametersFromFile(int ac, char* av[]) {
         RETURN_ERROR (errmsg, "loadParametersFromFile", false);
     }
 
+    return loadConfigFile (config_filename, ac, av);
+}
+
+
+/******************************************************************************
+MODULE: loadConfigFile
+
+PURPOSE: Reads the configuration file parameters.
+ 
+RETURN VALUE:
+Type = bool
+Value          Description
+-----          -----------
+false          Error reading the config file parameters
+true           Successful processing of the parameters
+
+HISTORY:
+Date          Programmer       Reason
+----------    ---------------  -------------------------------------
+10/17/2026    USGS/EROS LSRD   Pulled from loadParametersFromFile
+
+NOTES:
+  1. See loadParametersFromFile for the required parameters.
+  2. Configuration file parameters on the command line, if any, take
+     precedence over those in the configuration file.
+*****************************************************************************/
+bool PredictBurnedArea::loadConfigFile
+(
+    string config_filename,  /* I: configuration filename */
+    int ac,                  /* I: number of command-line arguments */
+    char* av[]               /* I: command-line arguments */
+)
+{
+    char errmsg[MAX_STR_LEN];          /* error message */
+
+    po::options_description config("Configuration file parameters");
+    addConfigOptions (config);
+
+    po::options_description config_file_options;
+    config_file_options.add(config);
+
     /* Parse the config file options */
     po::variables_map config_vm;
-    po::store(po::command_line_parser(ac, av).options(config).allow_unregistered().run(), config_vm);
-    notify(config_vm);
+    if (ac > 0) {
+        po::store(po::command_line_parser(ac, av).options(config).allow_unregistered().run(), config_vm);
+        notify(config_vm);
+    }
 
     ifstream ifs(config_filename.c_str());
     if (!ifs) {
         sprintf (errmsg, "unable to open config file: %s",
             config_filename.c_str());
-        RETURN_ERROR (errmsg, "loadParametersFromFile", false);
+        RETURN_ERROR (errmsg, "loadConfigFile", false);
     } else {
         store (parse_config_file (ifs, config_file_options), config_vm);
         notify (config_vm);
@@ -194,7 +313,7 @@ bool PredictBurnedArea::loadParametersFromFile(int ac, char* av[]) {
         sprintf (errmsg, "INPUT_MASK_FILE is a required config file "
             "parameter for model prediction. Use predict_burned_area --help "
             "for more information.");
-        RETURN_ERROR (errmsg, "loadParametersFromFile", false);
+        RETURN_ERROR (errmsg, "loadConfigFile", false);
     }
 
     if (config_vm.count("INPUT_FILL_VALUE")) {
@@ -204,7 +323,21 @@ bool PredictBurnedArea::loadParametersFromFile(int ac, char* av[]) {
         sprintf (errmsg, "INPUT_FILL_VALUE is a required config file "
             "parameter for model prediction. Use predict_burned_area --help "
             "for more information.");
-        RETURN_ERROR (errmsg, "loadParametersFromFile", false);
+        RETURN_ERROR (errmsg, "loadConfigFile", false);
+    }
+
+    /* Offsets of the input scene within the seasonal summaries grid; only
+       used if the input scene has not been resampled to the grid */
+    virtual_input = false;
+    INPUT_LINE_OFFSET = 0;
+    INPUT_SAMP_OFFSET = 0;
+    if (config_vm.count("INPUT_LINE_OFFSET")) {
+        INPUT_LINE_OFFSET = config_vm["INPUT_LINE_OFFSET"].as<int>();
+        virtual_input = true;
+    }
+    if (config_vm.count("INPUT_SAMP_OFFSET")) {
+        INPUT_SAMP_OFFSET = config_vm["INPUT_SAMP_OFFSET"].as<int>();
+        virtual_input = true;
     }
 
     if (config_vm.count("SEASONAL_SUMMARIES_DIR")) {
@@ -215,7 +348,7 @@ bool PredictBurnedArea::loadParametersFromFile(int ac, char* av[]) {
         sprintf (errmsg, "SEASONAL_SUMMARIES_DIR is a required config file "
             "parameter for model prediction. Use predict_burned_area --help "
             "for more information.");
-        RETURN_ERROR (errmsg, "loadParametersFromFile", false);
+        RETURN_ERROR (errmsg, "loadConfigFile", false);
     }
 
     if (config_vm.count("OUTPUT_IMG_FILE")) {
@@ -225,7 +358,7 @@ bool PredictBurnedArea::loadParametersFromFile(int ac, char* av[]) {
         sprintf (errmsg, "OUTPUT_IMG_FILE is a required config file "
             "parameter for model prediction. Use predict_burned_area --help "
             "for more information.");
-        RETURN_ERROR (errmsg, "loadParametersFromFile", false);
+        RETURN_ERROR (errmsg, "loadConfigFile", false);
     }
 
     /* Training related inputs */
@@ -241,7 +374,7 @@ bool PredictBurnedArea::loadParametersFromFile(int ac, char* av[]) {
     else if (train_model) {
         sprintf (errmsg, "TREE_CNT is a required config file parameter for "
             "training. Use predict_burned_area --help for more information.");
-        RETURN_ERROR (errmsg, "loadParametersFromFile", false);
+        RETURN_ERROR (errmsg, "loadConfigFile", false);
     }
 
     if (config_vm.count("SHRINKAGE")) {
@@ -250,7 +383,7 @@ bool PredictBurnedArea::loadParametersFromFile(int ac, char* av[]) {
     else if (train_model) {
         sprintf (errmsg, "SHRINKAGE is a required config file parameter for "
             "training. Use predict_burned_area --help for more information.");
-        RETURN_ERROR (errmsg, "loadParametersFromFile", false);
+        RETURN_ERROR (errmsg, "loadConfigFile", false);
     }
 
     if (config_vm.count("MAX_DEPTH")) {
@@ -259,7 +392,7 @@ bool PredictBurnedArea::loadParametersFromFile(int ac, char* av[]) {
     else if (train_model) {
         sprintf (errmsg, "MAX_DEPTH is a required config file parameter for "
             "training. Use predict_burned_area --help for more information.");
-        RETURN_ERROR (errmsg, "loadParametersFromFile", false);
+        RETURN_ERROR (errmsg, "loadConfigFile", false);
     }
 
     if (config_vm.count("SUBSAMPLE_FRACTION")) {
@@ -269,7 +402,7 @@ bool PredictBurnedArea::loadParametersFromFile(int ac, char* av[]) {
         sprintf (errmsg, "SUBSAMPLE_FRACTION is a required config file "
             "parameter for training. Use predict_burned_area --help for more "
             "information.");
-        RETURN_ERROR (errmsg, "loadParametersFromFile", false);
+        RETURN_ERROR (errmsg, "loadConfigFile", false);
     }
 
     if (config_vm.count("PREDICT_OUT")) {
@@ -291,13 +424,13 @@ bool PredictBurnedArea::loadParametersFromFile(int ac, char* av[]) {
                 "expected/supported number of CSV inputs for training and "
                 "prediction. Expected number of CSV inputs (not including "
                 "the final classification value) is %d.", EXPECTED_CSV_INPUTS);
-            RETURN_ERROR (errmsg, "loadParametersFromFile", false);
+            RETURN_ERROR (errmsg, "loadConfigFile", false);
         }
     }
     else if (train_model) {
         sprintf (errmsg, "NCSV_INPUTS is a required config file parameter for "
             "training. Use predict_burned_area --help for more information.");
-        RETURN_ERROR (errmsg, "loadParametersFromFile", false);
+        RETURN_ERROR (errmsg, "loadConfigFile", false);
     }
     else
         NCSV_INPUTS = EXPECTED_CSV_INPUTS;
@@ -314,7 +447,7 @@ bool PredictBurnedArea::loadParametersFromFile(int ac, char* av[]) {
         sprintf (errmsg, "Both the input CSV_FILE for training the model "
             "and the LOAD_MODEL_XML file have been specified.  The model "
             "can only be trained or loaded from an XML file, but not both.");
-        RETURN_ERROR (errmsg, "loadParametersFromFile", false);
+        RETURN_ERROR (errmsg, "loadConfigFile", false);
     }
 
     return true;
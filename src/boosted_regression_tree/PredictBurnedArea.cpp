@@ -15,6 +15,10 @@ Date          Programmer       Reason
 ----------    ---------------  -------------------------------------
 11/26/2012    Jodi Riegle      Original development
 9/3/2013      Gail Schmidt     Modified to work in the ESPA environment
+10/17/2026    USGS/EROS LSRD   Modified to free the loaded models.
+10/17/2026    USGS/EROS LSRD   Initialized the number of threads.
+10/17/2026    USGS/EROS LSRD   Modified to unmap the feature cubes.
+10/17/2026    USGS/EROS LSRD   Modified to unmap the binary models.
 
 NOTES:
 *****************************************************************************/
@@ -25,11 +29,32 @@ NOTES:
 #include "PredictBurnedArea.h"
 #include "output.h"
 #include "input.h"
+#include "input_rb.h"
 
 PredictBurnedArea::PredictBurnedArea() {
     trueCnt = 0;
+    model = &gbtrees;
+    binModel = NULL;
+    server_mode = false;
+    NUM_THREADS = 1;
 }
 
 PredictBurnedArea::~PredictBurnedArea() {
+    map<string, CvGBTrees*>::iterator it;
+    for (it = models.begin(); it != models.end(); it++)
+        delete it->second;
+    models.clear();
+
+    map<string, Gbt_model_t*>::iterator bit;
+    for (bit = binModels.begin(); bit != binModels.end(); bit++)
+        CloseGbtModel (bit->second);
+    binModels.clear();
+
+    map<string, Input_Cube_t*>::iterator cit;
+    for (cit = cubes.begin(); cit != cubes.end(); cit++) {
+        CloseCubeInput (cit->second);
+        FreeCubeInput (cit->second);
+    }
+    cubes.clear();
 }
 
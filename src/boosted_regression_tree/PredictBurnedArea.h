@@ -15,6 +15,14 @@ Date        Programmer       Reason
 9/15/2012   Jodi Riegle      Original development (based largely on routines
                              from the LEDAPS lndsr application)
 9/3/2013    Gail Schmidt     Modified to work in the ESPA environment
+10/17/2026  USGS/EROS LSRD   Added the server mode, which keeps each loaded
+                             model for the scenes that follow.
+10/17/2026  USGS/EROS LSRD   Added the block of samples and the number of
+                             threads for predicting the blocks in parallel.
+10/17/2026  USGS/EROS LSRD   Added the feature cube, which holds the seasonal
+                             summaries and annual maximums of a year.
+10/17/2026  USGS/EROS LSRD   Added the indices of the valid samples.
+10/17/2026  USGS/EROS LSRD   Added the mapped binary models.
 
 NOTES:
 *****************************************************************************/
@@ -24,6 +32,7 @@ NOTES:
 
 #include <iostream>
 #include <fstream>
+#include <map>
 #include <stdint.h>
 #include "cv.h"
 #include "opencv2/ml/ml.hpp"
@@ -32,11 +41,15 @@ NOTES:
 #include "const.h"
 #include "error.h"
 #include "mystring.h"
+#include "gbt_binary.h"
 
 using namespace std;
 
 #define BA_VERSION "2.1.0"
 
+/* Prefix of the status line written for each scene in the server mode */
+#define PBA_SERVER_STATUS "PBA_SERVER_STATUS"
+
 /* Type definitions */
 typedef enum {WINTER=0, SPRING, SUMMER, FALL, PBA_NSEASONS} Season_t;
 typedef enum {B3=0, B4, B5, B7, BND_NDVI, BND_NDMI, BND_NBR, BND_NBR2,
@@ -61,6 +74,20 @@ typedef enum {PREDMAT_B1=0, PREDMAT_B2, PREDMAT_B3, PREDMAT_B4, PREDMAT_B5,
    band1,band2,band3,band4,band5,band7,ndvi,ndmi,nbr,nbr2,ly_wi_b3,ly_wi_b4,ly_wi_b5,ly_wi_b7,ly_wi_ndvi,ly_wi_ndmi,ly_wi_nbr,ly_wi_nbr2,ly_sp_b3,ly_sp_b4,ly_sp_b5,ly_sp_b7,ly_sp_ndvi,ly_sp_ndmi,ly_sp_nbr,ly_sp_nbr2,ly_su_b3,ly_su_b4,ly_su_b5,ly_su_b7,ly_su_ndvi,ly_su_ndmi,ly_su_nbr,ly_su_nbr2,ly_fa_b3,ly_fa_b4,ly_fa_b5,ly_fa_b7,ly_fa_ndvi,ly_fa_ndmi,ly_fa_nbr,ly_fa_nbr2,ly_max_ndvi,ly_max_ndmi,ly_max_nbr,ly_max_nbr2,dndvi,dndmi,dnbr,dnbr2,fire */
 #define EXPECTED_CSV_INPUTS 50
 
+/* Number of values stacked in each sample for the predictions: the
+   reflectance bands and indices, the seasonal summaries, the annual maximums,
+   and the deltas of the annual maximums */
+#define PBA_NSAMPLE_VALUES (PBA_NPREDMAT + PBA_NSEASONS*PBA_NBANDS + \
+    2*PBA_NINDXS)
+
+/* Number of values of each pixel in the feature cube: the seasonal summaries
+   (by season, then band/index) followed by the annual maximums */
+#define PBA_NCUBE_VALUES (PBA_NSEASONS*PBA_NBANDS + PBA_NINDXS)
+
+/* Number of lines of the grid stacked into a block of samples, which are
+   predicted together */
+#define PBA_BLOCK_LINES 32
+
 /* Typedefs for the integer types used by this application */
 typedef signed short int16;
 typedef char int8;
@@ -109,6 +136,16 @@ typedef struct {
   int16 *buf;              /* Input data buffer (one line of image data) */
 } Input_Rb_t;
 
+/* Structure for the 'input' feature cube, which is mapped into memory */
+typedef struct {
+  char *file_name;         /* Input feature cube file name */
+  bool open;               /* Open (mapped) flag; open = true */
+  Img_coord_int_t size;    /* Input file size */
+  size_t map_size;         /* Size of the mapped file, in bytes */
+  int16 *data;             /* Mapped pixel interleaved data, with
+                              PBA_NCUBE_VALUES values for each pixel */
+} Input_Cube_t;
+
 
 class PredictBurnedArea {
 
@@ -116,17 +153,21 @@ public:
     PredictBurnedArea();
     ~PredictBurnedArea();
 
-    bool GetInputData(Input_t *ds_input, int iband);
-    bool GetInputQALine(Input_t *ds_input);
+    bool GetInputData(Input_t *ds_input, int iband, int iline);
+    bool GetInputQALine(Input_t *ds_input, int iline);
     bool PutOutputLine(Output_t *ds_output, int iline);
     bool calcBands(Input_t *ds_input);
     void loadModel();
     bool trainModel();
-    bool predictModel(int iline, Output_t *ds_output);
+    bool stackSamples(int block_line);
+    bool predictModel(int nsamples, int16 *prob_buf);
     bool loadParametersFromFile(int ac, char* av[]);
+    bool loadConfigFile(string config_filename, int ac=0, char* av[]=NULL);
     bool GetRbInputLYSummaryData(Input_Rb_t *ds_input, int line,
         BandIndex_t band, Season_t season);
     bool GetRbInputAnnualMaxData(Input_Rb_t *ds_input, int line, Index_t indx);
+    Input_Cube_t *GetCubeInput(char *file_name);
+    bool GetCubeInputData(Input_Cube_t *ds_input, int line);
 
     CvMLData cvml;           // contains the training data
     cv::Mat predMat;         // array for input data and predictions
@@ -135,13 +176,31 @@ public:
                              // 1D array representing [PBA_NSEASONS][PBA_NBANDS]
     cv::Mat maxIndxMat;      // array for the maximum indices
                              // 1D array representing [PBA_NINDXS]
-    CvGBTrees gbtrees;
+    cv::Mat sampleMat;       // block of samples to be predicted, one row
+                             // per pixel for PBA_BLOCK_LINES lines
+    cv::Mat sampleQaMat;     // QA/mask data for the block of samples
+    cv::Mat sampleIdxMat;    // index in the block of each valid sample
+    CvGBTrees gbtrees;       // trained model
+    map<string, CvGBTrees*> models;  // loaded models, by XML file name
+    CvGBTrees *model;        // model used for the predictions
+    map<string, Gbt_model_t*> binModels;  // mapped binary models, by XML
+                                          // file name
+    Gbt_model_t *binModel;   // binary model used for the predictions instead
+                             // of model; NULL if the model is not binary
+    map<string, Input_Cube_t*> cubes;  // mapped feature cubes, by file name
     int trueCnt;
 
+    /* Command-line parameters */
+    bool server_mode;
+    int NUM_THREADS;
+
     /* Parameters from the input config file */
     string INPUT_BASE_FILE;
     string INPUT_MASK_FILE;
     int INPUT_FILL_VALUE;
+    int INPUT_LINE_OFFSET;
+    int INPUT_SAMP_OFFSET;
+    bool virtual_input;
     bool predict_model;
     string SEASONAL_SUMMARIES_DIR;
     string OUTPUT_IMG_FILE;
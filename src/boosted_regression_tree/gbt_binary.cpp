@@ -0,0 +1,319 @@
+/*****************************************************************************
+FILE: gbt_binary.cpp
+
+PURPOSE: Contains functions for mapping the binary models (.gbtb) of the
+gradient boosted trees and running their predictions.
+
+PROJECT:  Land Satellites Data System Science Research and Development (LSRD)
+at the USGS EROS
+
+LICENSE TYPE:  NASA Open Source Agreement Version 1.3
+
+HISTORY:
+Date          Programmer       Reason
+----------    ---------------  -------------------------------------
+10/17/2026    USGS/EROS LSRD   Original development
+
+NOTES:
+  1. The binary model format is documented in gbt_binary.h.
+*****************************************************************************/
+
+#include <stdio.h>
+#include <string.h>
+#include <math.h>
+#include <unistd.h>
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include "gbt_binary.h"
+#include "mystring.h"
+#include "error.h"
+
+/******************************************************************************
+MODULE:  GbtBinaryFile
+
+PURPOSE:  Determine the name of the binary model converted from an XML model,
+which is the XML model with the .xml extension replaced by .gbtb.
+
+RETURN VALUE:
+Type = bool
+Value           Description
+-----           -----------
+false           The name is too long
+true            Processing was successful
+
+PROJECT:  Land Satellites Data System Science Research and Development (LSRD)
+at the USGS EROS
+
+HISTORY:
+Date          Programmer       Reason
+----------    ---------------  -------------------------------------
+10/17/2026    USGS/EROS LSRD   Original Development
+
+NOTES:
+  1. bin_file is expected to hold MAX_STR_LEN characters.
+******************************************************************************/
+bool GbtBinaryFile
+(
+    char *xml_file,       /* I: XML model filename */
+    char *bin_file        /* O: binary model filename */
+)
+{
+    char *cptr = NULL;    /* character pointer */
+    char *sptr = NULL;    /* pointer to the last directory separator */
+
+    if (strlen (xml_file) + strlen (GBT_BINARY_SUFFIX) >= MAX_STR_LEN)
+        return false;
+
+    strcpy (bin_file, xml_file);
+    cptr = strrchr (bin_file, '.');
+    sptr = strrchr (bin_file, '/');
+    if (cptr != NULL && (sptr == NULL || cptr > sptr))
+        *cptr = '\0';
+    strcat (bin_file, GBT_BINARY_SUFFIX);
+
+    return true;
+}
+
+
+/******************************************************************************
+MODULE:  OpenGbtModel
+
+PURPOSE:  Map the binary model into memory and validate it.  The mapping is
+left in the returned Gbt_model_t data structure.
+
+RETURN VALUE:
+Type = Gbt_model_t *
+Value           Description
+-----           -----------
+NULL            An error occurred during processing
+non-NULL        Processing was successful
+
+PROJECT:  Land Satellites Data System Science Research and Development (LSRD)
+at the USGS EROS
+
+HISTORY:
+Date          Programmer       Reason
+----------    ---------------  -------------------------------------
+10/17/2026    USGS/EROS LSRD   Original Development
+
+NOTES:
+  1. The arrays of the model point into the mapping, so they are only read
+     from disk as they are used.  The indices of the nodes and the features
+     are validated once, so the predictions don't need to check them.
+******************************************************************************/
+Gbt_model_t *OpenGbtModel
+(
+    char *file_name       /* I: binary model filename */
+)
+{
+    char errmsg[MAX_STR_LEN];     /* error message */
+    int fd;                       /* file descriptor of the model */
+    int i;                        /* looping variable */
+    struct stat file_stat;        /* status of the model file */
+    void *data = NULL;            /* mapped data */
+    Gbt_header_t hdr;             /* header of the model */
+    const int32_t *arrays = NULL; /* start of the arrays */
+
+    /* Open the model and map it */
+    fd = open (file_name, O_RDONLY);
+    if (fd < 0)
+    {
+        sprintf (errmsg, "Error opening binary model: %s", file_name);
+        RETURN_ERROR (errmsg, "OpenGbtModel", NULL);
+    }
+    if (fstat (fd, &file_stat) != 0 ||
+        file_stat.st_size < GBT_BINARY_HEADER_SIZE)
+    {
+        close (fd);
+        sprintf (errmsg, "Error %s is not a binary model", file_name);
+        RETURN_ERROR (errmsg, "OpenGbtModel", NULL);
+    }
+    data = mmap (NULL, file_stat.st_size, PROT_READ, MAP_SHARED, fd, 0);
+    close (fd);
+    if (data == MAP_FAILED)
+    {
+        sprintf (errmsg, "Error mapping binary model: %s", file_name);
+        RETURN_ERROR (errmsg, "OpenGbtModel", NULL);
+    }
+
+    /* Validate the header and the size of the model */
+    memcpy (&hdr, data, sizeof (hdr));
+    if (memcmp (hdr.magic, GBT_BINARY_MAGIC, sizeof (hdr.magic)) != 0 ||
+        hdr.version != GBT_BINARY_VERSION)
+    {
+        munmap (data, file_stat.st_size);
+        sprintf (errmsg, "Error %s is not a version %d binary model",
+            file_name, GBT_BINARY_VERSION);
+        RETURN_ERROR (errmsg, "OpenGbtModel", NULL);
+    }
+    if (hdr.class_count < 1 || hdr.class_count > GBT_MAX_CLASSES ||
+        hdr.sample_size < 1 || hdr.ntrees < 0 || hdr.nnodes < 0 ||
+        file_stat.st_size != (off_t) (GBT_BINARY_HEADER_SIZE + 4 *
+        (2 * (size_t) hdr.ntrees + 6 * (size_t) hdr.nnodes)))
+    {
+        munmap (data, file_stat.st_size);
+        sprintf (errmsg, "Error the header of binary model %s doesn't match "
+            "the model", file_name);
+        RETURN_ERROR (errmsg, "OpenGbtModel", NULL);
+    }
+
+    /* Create and populate the model data structure */
+    Gbt_model_t *gbt = new Gbt_model_t();
+    gbt->file_name = DupString (file_name);
+    gbt->map = data;
+    gbt->map_size = file_stat.st_size;
+    gbt->hdr = hdr;
+    arrays = (const int32_t *) ((char *) data + GBT_BINARY_HEADER_SIZE);
+    gbt->roots = arrays;
+    gbt->tree_class = gbt->roots + hdr.ntrees;
+    gbt->feature = gbt->tree_class + hdr.ntrees;
+    gbt->threshold = (const float *) (gbt->feature + hdr.nnodes);
+    gbt->left = (const int32_t *) (gbt->threshold + hdr.nnodes);
+    gbt->right = gbt->left + hdr.nnodes;
+    gbt->inversed = gbt->right + hdr.nnodes;
+    gbt->value = (const float *) (gbt->inversed + hdr.nnodes);
+
+    /* Validate the indices of the trees and nodes */
+    for (i = 0; i < hdr.ntrees; i++)
+    {
+        if (gbt->roots[i] < 0 || gbt->roots[i] >= hdr.nnodes ||
+            gbt->tree_class[i] < 0 || gbt->tree_class[i] >= hdr.class_count)
+            break;
+    }
+    if (i == hdr.ntrees)
+    {
+        for (i = 0; i < hdr.nnodes; i++)
+        {
+            if (gbt->left[i] < 0 || gbt->left[i] >= hdr.nnodes ||
+                gbt->right[i] < 0 || gbt->right[i] >= hdr.nnodes ||
+                gbt->feature[i] < 0 || gbt->feature[i] >= hdr.sample_size)
+                break;
+        }
+        if (i == hdr.nnodes)
+            return (gbt);
+    }
+
+    CloseGbtModel (gbt);
+    sprintf (errmsg, "Error invalid trees in binary model %s", file_name);
+    RETURN_ERROR (errmsg, "OpenGbtModel", NULL);
+}
+
+
+/******************************************************************************
+MODULE:  CloseGbtModel
+
+PURPOSE:  Unmap the binary model and free the data structure.
+
+RETURN VALUE:
+Type = bool
+Value           Description
+-----           -----------
+false           An error occurred during processing
+true            Processing was successful
+
+PROJECT:  Land Satellites Data System Science Research and Development (LSRD)
+at the USGS EROS
+
+HISTORY:
+Date          Programmer       Reason
+----------    ---------------  -------------------------------------
+10/17/2026    USGS/EROS LSRD   Original Development
+
+NOTES:
+******************************************************************************/
+bool CloseGbtModel
+(
+    Gbt_model_t *gbt      /* I: binary model to be closed */
+)
+{
+    if (gbt != NULL)
+    {
+        /* Unmap the file */
+        if (gbt->map != NULL)
+            munmap (gbt->map, gbt->map_size);
+
+        /* Free the filename and the structure */
+        free (gbt->file_name);
+        delete gbt;
+    }
+
+    return true;
+}
+
+
+/******************************************************************************
+MODULE:  GbtPredictProb
+
+PURPOSE:  Predict the probability that the sample is of class k, the same way
+as CvGBTrees::predict_prob.
+
+RETURN VALUE:
+Type = float
+Value           Description
+-----           -----------
+0.0             k isn't a class of the model
+sum             Sum of the ensemble, if the model has only one class
+probability     Probability the sample is of class k
+
+PROJECT:  Land Satellites Data System Science Research and Development (LSRD)
+at the USGS EROS
+
+HISTORY:
+Date          Programmer       Reason
+----------    ---------------  -------------------------------------
+10/17/2026    USGS/EROS LSRD   Original Development
+
+NOTES:
+  1. The shrinkage is applied to the value of each tree and the values are
+     summed in tree order, in single precision, as done by the patched
+     CvGBTrees::predict_prob (see opencv_patches), so the probabilities
+     match those of the XML model.
+  2. The model only reads the mapping, so it can be shared by threads.
+******************************************************************************/
+float GbtPredictProb
+(
+    const Gbt_model_t *gbt,   /* I: binary model */
+    const float *sample,      /* I: sample, with hdr.sample_size values */
+    int k                     /* I: class to predict the probability of */
+)
+{
+    float sum[GBT_MAX_CLASSES];   /* sum of each ensemble */
+    float exp_sum = 0.0f;         /* sum of the exponentials of the sums */
+    int class_count = gbt->hdr.class_count;  /* number of classes */
+    int i;                        /* looping variable */
+    int node;                     /* current node of a tree */
+    int depth;                    /* depth of the current node */
+    bool go_left;                 /* true if the sample goes left at a node */
+
+    for (i = 0; i < class_count; i++)
+        sum[i] = 0.0f;
+
+    /* Push the sample down each tree to its terminal node, which is at most
+       max_depth levels down */
+    for (i = 0; i < gbt->hdr.ntrees; i++)
+    {
+        node = gbt->roots[i];
+        for (depth = 0; depth < gbt->hdr.max_depth &&
+            gbt->left[node] != node; depth++)
+        {
+            go_left = (sample[gbt->feature[node]] <= gbt->threshold[node]) !=
+                (gbt->inversed[node] != 0);
+            node = go_left ? gbt->left[node] : gbt->right[node];
+        }
+        sum[gbt->tree_class[i]] += gbt->hdr.shrinkage * gbt->value[node];
+    }
+
+    for (i = 0; i < class_count; i++)
+        sum[i] = sum[i] + gbt->hdr.base_value;
+
+    if (class_count == 1)
+        return sum[0];
+
+    if (k < 0 || k >= class_count)
+        return 0.0f;
+
+    for (i = 0; i < class_count; i++)
+        exp_sum += expf (sum[i]);
+    return expf (sum[k]) / exp_sum;
+}
@@ -0,0 +1,84 @@
+/*****************************************************************************
+FILE: gbt_binary.h
+
+PURPOSE: Contains the defines, structs, and prototypes for the binary model
+format (.gbtb) of the gradient boosted trees models.
+
+PROJECT:  Land Satellites Data System Science Research and Development (LSRD)
+at the USGS EROS
+
+LICENSE TYPE:  NASA Open Source Agreement Version 1.3
+
+HISTORY:
+Date        Programmer       Reason
+--------    ---------------  -------------------------------------
+10/17/2026  USGS/EROS LSRD   Original development
+
+NOTES:
+  1. The binary models are written by convert_gbt_model.py, from the XML
+     models saved by CvGBTrees::save.  The format must match gbt_model.py.
+  2. The file is a header of GBT_BINARY_HEADER_SIZE bytes, followed by the
+     arrays of the trees (roots, tree_class) and of the nodes (feature,
+     threshold, left, right, inversed, value).  Each array element is a
+     4-byte little endian int32 or float.
+  3. The nodes of all the trees are flattened into the node arrays.  The
+     children of a terminal node are the node itself.
+*****************************************************************************/
+
+#ifndef GBT_BINARY_H
+#define GBT_BINARY_H
+
+#include <stdlib.h>
+#include <stdint.h>
+
+/* Extension of the binary model, which replaces the .xml extension of the
+   XML model it was converted from */
+#define GBT_BINARY_SUFFIX ".gbtb"
+
+/* Magic string and version of the binary model format */
+#define GBT_BINARY_MAGIC "PBA-GBTB"
+#define GBT_BINARY_VERSION 1
+
+/* Size of the header, including the padding after the fields */
+#define GBT_BINARY_HEADER_SIZE 64
+
+/* Maximum number of classes (ensembles) supported in a binary model */
+#define GBT_MAX_CLASSES 16
+
+/* Fields at the start of the header */
+typedef struct {
+    char magic[8];           /* GBT_BINARY_MAGIC, without a terminator */
+    int32_t version;         /* GBT_BINARY_VERSION */
+    int32_t class_count;     /* number of classes (ensembles) */
+    int32_t sample_size;     /* number of values needed in each sample */
+    int32_t max_depth;       /* depth of the deepest tree */
+    int32_t ntrees;          /* number of trees */
+    int32_t nnodes;          /* number of nodes of all the trees */
+    float base_value;        /* base value added to the sums */
+    float shrinkage;         /* shrinkage applied to the node values */
+} Gbt_header_t;
+
+/* Structure for the mapped binary model */
+typedef struct {
+    char *file_name;         /* Binary model file name */
+    void *map;               /* Mapped file */
+    size_t map_size;         /* Size of the mapped file, in bytes */
+    Gbt_header_t hdr;        /* Header of the binary model */
+    const int32_t *roots;    /* Root node of each tree */
+    const int32_t *tree_class;  /* Class (ensemble) of each tree */
+    const int32_t *feature;  /* Sample value split on by each node */
+    const float *threshold;  /* Split value of each node */
+    const int32_t *left;     /* Left child of each node, or itself */
+    const int32_t *right;    /* Right child of each node, or itself */
+    const int32_t *inversed; /* Non-zero if the node goes left when the value
+                                is greater than the split value */
+    const float *value;      /* Value of each node */
+} Gbt_model_t;
+
+/* Prototypes */
+bool GbtBinaryFile (char *xml_file, char *bin_file);
+Gbt_model_t *OpenGbtModel (char *file_name);
+bool CloseGbtModel (Gbt_model_t *gbt);
+float GbtPredictProb (const Gbt_model_t *gbt, const float *sample, int k);
+
+#endif
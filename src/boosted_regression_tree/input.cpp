@@ -290,18 +290,28 @@ Date          Programmer       Reason
 4/9/2014      Gail Schmidt     Use a local image buffer for reading the data
                                vs. allocating space and freeing for each line
                                read.
+10/17/2026    USGS/EROS LSRD   Modified to read the line of the seasonal
+                               summaries grid, placing the input scene at its
+                               line/sample offset and filling the remainder.
 
 NOTES:
   1. Band data read is stored in class variable predMat (cv::Mat) as floating
      point values
+  2. Lines are expected to be read in order.  Lines of the grid outside of the
+     input scene are not read from the file.  For input scenes which have been
+     resampled to the grid, the offsets are zero and the grid matches the
+     input scene.
 *****************************************************************************/
 bool PredictBurnedArea::GetInputData
 (
   Input_t *ds_input,    /* I: input data structure */
-  int iband             /* I: input band (0-based) */
+  int iband,            /* I: input band (0-based) */
+  int iline             /* I: line in the seasonal summaries grid (0-based) */
 )
 {
   int samp;            /* looping variable */
+  int in_line;         /* line in the input scene */
+  int in_samp;         /* sample in the input scene */
 
   /* Check the parameters */
   if (ds_input == NULL)
@@ -311,14 +321,27 @@ bool PredictBurnedArea::GetInputData
   if (iband < 0 || iband >= ds_input->nband)
     RETURN_ERROR("invalid band number", "GetInputData", false);
 
+  /* Lines outside of the input scene are fill */
+  in_line = iline - INPUT_LINE_OFFSET;
+  if (in_line < 0 || in_line >= ds_input->size.l) {
+    for (samp = 0; samp < predMat.rows; samp++)
+      predMat.at<float>(samp,iband) = ds_input->meta.fill;
+    return true;
+  }
+
   /* Read the data */
   if (read_raw_binary (ds_input->fp_img[iband], 1, ds_input->size.s,
     sizeof (int16), ds_input->img_buf) != SUCCESS)
     RETURN_ERROR("reading input", "GetInputData", false)
 
   /* Grabbing bands 1-5 & 7 and putting value into predMat */
-  for (samp = 0; samp < ds_input->size.s; samp++)
-    predMat.at<float>(samp,iband) = ds_input->img_buf[samp];
+  for (samp = 0; samp < predMat.rows; samp++) {
+    in_samp = samp - INPUT_SAMP_OFFSET;
+    if (in_samp < 0 || in_samp >= ds_input->size.s)
+      predMat.at<float>(samp,iband) = ds_input->meta.fill;
+    else
+      predMat.at<float>(samp,iband) = ds_input->img_buf[in_samp];
+  }
 
   return true;
 }
@@ -353,15 +376,22 @@ Date          Programmer       Reason
 4/9/2014      Gail Schmidt     Use a local image buffer for reading the data
                                vs. allocating space and freeing for each line
                                read.
+10/17/2026    USGS/EROS LSRD   Modified to read the line of the seasonal
+                               summaries grid, placing the input scene at its
+                               line/sample offset and filling the remainder.
 
 NOTES:
+  1. See the notes for GetInputData regarding the input line.
 *****************************************************************************/
 bool PredictBurnedArea::GetInputQALine
 (
-  Input_t *ds_input    /* I: input data structure */
+  Input_t *ds_input,   /* I: input data structure */
+  int iline            /* I: line in the seasonal summaries grid (0-based) */
 )
 {
   int samp;            /* looping variable */
+  int in_line;         /* line in the input scene */
+  int in_samp;         /* sample in the input scene */
 
   /* Check the parameters */
   if (ds_input == (Input_t *)NULL)
@@ -369,14 +399,27 @@ bool PredictBurnedArea::GetInputQALine
   if (!ds_input->open)
     RETURN_ERROR("file not open", "GetInputQALine", false);
 
+  /* Lines outside of the input scene are fill */
+  in_line = iline - INPUT_LINE_OFFSET;
+  if (in_line < 0 || in_line >= ds_input->size.l) {
+    for (samp = 0; samp < qaMat.rows; samp++)
+      qaMat.at<short>(samp) = ds_input->meta.fill;
+    return true;
+  }
+
   /* Read the data */
   if (read_raw_binary (ds_input->fp_qa, 1, ds_input->size.s, sizeof (int16),
       ds_input->qa_buf) != SUCCESS)
     RETURN_ERROR("reading QA input", "GetInputQALine", false)
 
   /* Grabbing QA band and putting value into qaMat */
-  for (samp = 0; samp < ds_input->size.s; samp++)
-      qaMat.at<short>(samp) = ds_input->qa_buf[samp];
+  for (samp = 0; samp < qaMat.rows; samp++) {
+    in_samp = samp - INPUT_SAMP_OFFSET;
+    if (in_samp < 0 || in_samp >= ds_input->size.s)
+      qaMat.at<short>(samp) = ds_input->meta.fill;
+    else
+      qaMat.at<short>(samp) = ds_input->qa_buf[in_samp];
+  }
 
   return true;
 }
@@ -408,13 +451,15 @@ NOTES:
      as an integer, where the actual index has been multiplied by 1000.
   2. It is assumed the data for the current line has already been loaded into
      predMat via GetInputData.
+  3. predMat holds a line of the seasonal summaries grid, which is wider than
+     the input scene if the scene has not been resampled to the grid.
 *****************************************************************************/
 bool PredictBurnedArea::calcBands
 (
     Input_t *ds_input   /* I: input data structure for this data */
 )
 {
-    for (int i = 0; i < ds_input->size.s; i++) {
+    for (int i = 0; i < predMat.rows; i++) {
         /* NDVI - using bands 4 and 3 */
         if ((qaMat.at<short>(i) == INPUT_FILL_VALUE) ||
             (predMat.at<float>(i,PREDMAT_B4) + predMat.at<float>(i,PREDMAT_B3)
@@ -13,10 +13,16 @@ HISTORY:
 Date          Programmer       Reason
 ----------    ---------------  -------------------------------------
 4/9/2014      Gail Schmidt     Original Development
+10/17/2026    USGS/EROS LSRD   Added the feature cube, which is mapped into
+                               memory
 
 NOTES:
 *****************************************************************************/
 
+#include <unistd.h>
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
 #include "input_rb.h"
 
 /* The following libraries are external C libraries from ESPA */
@@ -336,3 +342,301 @@ bool PredictBurnedArea::GetRbInputAnnualMaxData
 
     return true;
 }
+
+
+/******************************************************************************
+MODULE:  OpenCubeInput
+
+PURPOSE:  Open the feature cube of the seasonal summaries and annual maximums,
+read its header, and map the file into memory.  The mapping is left in the
+returned Input_Cube_t data structure.
+
+RETURN VALUE:
+Type = Input_Cube_t *
+Value           Description
+-----           -----------
+NULL            An error occurred during processing
+non-NULL        Processing was successful
+
+PROJECT:  Land Satellites Data System Science Research and Development (LSRD)
+at the USGS EROS
+
+HISTORY:
+Date          Programmer       Reason
+----------    ---------------  -------------------------------------
+10/17/2026    USGS/EROS LSRD   Original Development
+
+NOTES:
+  1. The cube is written by the seasonal summaries processing as a pixel
+     interleaved (BIP) int16 file, with PBA_NCUBE_VALUES values per pixel.
+  2. The file is mapped read-only and shared, so the pages of the cube are
+     read once and shared by the processes predicting the scenes of a year.
+******************************************************************************/
+Input_Cube_t *OpenCubeInput
+(
+    char *file_name       /* I: input feature cube filename */
+)
+{
+    char errmsg[MAX_STR_LEN];     /* error message */
+    char input_hdr[MAX_STR_LEN];  /* input header file */
+    char *cptr = NULL;            /* character pointer */
+    int nlines;                   /* number of lines in image */
+    int nsamps;                   /* number of samples in image */
+    int fd;                       /* file descriptor of the cube */
+    struct stat file_stat;        /* status of the cube file */
+    void *data = NULL;            /* mapped data */
+
+    /* Read the header file to obtain the nlines and nsamps */
+    strcpy (input_hdr, file_name);
+    cptr = strrchr (input_hdr, '.');
+    if (cptr == NULL)
+    {
+        sprintf (errmsg, "Error input filename doesn't match the expected .img "
+            "file extension (%s)", file_name);
+        RETURN_ERROR (errmsg, "OpenCubeInput", NULL);
+    }
+    strcpy (cptr, ".hdr");
+
+    if (!ReadHdr (input_hdr, &nlines, &nsamps) || nlines <= 0 || nsamps <= 0)
+    {
+        sprintf (errmsg, "reading input header file: %s", input_hdr);
+        RETURN_ERROR (errmsg, "OpenCubeInput", NULL);
+    }
+
+    /* Open the cube and make sure it matches its header */
+    fd = open (file_name, O_RDONLY);
+    if (fd < 0)
+    {
+        sprintf (errmsg, "Error opening input feature cube: %s", file_name);
+        RETURN_ERROR (errmsg, "OpenCubeInput", NULL);
+    }
+    if (fstat (fd, &file_stat) != 0 || file_stat.st_size != (off_t)
+        ((size_t) nlines * nsamps * PBA_NCUBE_VALUES * sizeof (int16)))
+    {
+        close (fd);
+        sprintf (errmsg, "Error input feature cube %s doesn't match the size "
+            "in its header", file_name);
+        RETURN_ERROR (errmsg, "OpenCubeInput", NULL);
+    }
+
+    /* Map the cube; the mapping stays valid once the file is closed */
+    data = mmap (NULL, file_stat.st_size, PROT_READ, MAP_SHARED, fd, 0);
+    close (fd);
+    if (data == MAP_FAILED)
+    {
+        sprintf (errmsg, "Error mapping input feature cube: %s", file_name);
+        RETURN_ERROR (errmsg, "OpenCubeInput", NULL);
+    }
+
+    /* Create and populate the Input data structure */
+    Input_Cube_t* ds_input = new Input_Cube_t();
+    ds_input->file_name = DupString(file_name);
+    if (ds_input->file_name == NULL)
+    {
+        munmap (data, file_stat.st_size);
+        RETURN_ERROR ("Error duplicating input feature cube file name",
+            "OpenCubeInput", NULL);
+    }
+    ds_input->size.l = nlines;
+    ds_input->size.s = nsamps;
+    ds_input->map_size = file_stat.st_size;
+    ds_input->data = (int16 *) data;
+    ds_input->open = true;
+
+    return (ds_input);
+}
+
+
+/******************************************************************************
+MODULE:  CloseCubeInput
+
+PURPOSE:  Unmap the feature cube.
+
+RETURN VALUE:
+Type = bool
+Value           Description
+-----           -----------
+false           An error occurred during processing
+true            Processing was successful
+
+PROJECT:  Land Satellites Data System Science Research and Development (LSRD)
+at the USGS EROS
+
+HISTORY:
+Date          Programmer       Reason
+----------    ---------------  -------------------------------------
+10/17/2026    USGS/EROS LSRD   Original Development
+
+NOTES:
+******************************************************************************/
+bool CloseCubeInput
+(
+    Input_Cube_t *ds_input   /* I: Pointer to the feature cube data struct */
+)
+{
+    char errmsg[MAX_STR_LEN];   /* error message */
+
+    /* Make sure file is mapped */
+    if (!ds_input->open)
+    {
+        sprintf (errmsg, "file not open: %s", ds_input->file_name);
+        RETURN_ERROR (errmsg, "CloseCubeInput", false);
+    }
+
+    /* Unmap the file */
+    munmap (ds_input->data, ds_input->map_size);
+    ds_input->data = NULL;
+
+    /* Mark file as closed */
+    ds_input->open = false;
+
+    return true;
+}
+
+
+/******************************************************************************
+MODULE:  FreeCubeInput
+
+PURPOSE:  Free the feature cube data structure and memory.
+
+RETURN VALUE:
+Type = bool
+Value           Description
+-----           -----------
+false           An error occurred during processing
+true            Processing was successful
+
+PROJECT:  Land Satellites Data System Science Research and Development (LSRD)
+at the USGS EROS
+
+HISTORY:
+Date          Programmer       Reason
+----------    ---------------  -------------------------------------
+10/17/2026    USGS/EROS LSRD   Original Development
+
+NOTES:
+******************************************************************************/
+bool FreeCubeInput
+(
+    Input_Cube_t *ds_input   /* I: Pointer to the feature cube data struct */
+)
+{
+    if (ds_input != NULL)
+    {
+        if (ds_input->open)
+            RETURN_ERROR ("file still open", "FreeCubeInput", false);
+
+        /* Free the filename */
+        free (ds_input->file_name);
+
+        /* Free the structure */
+        delete ds_input;
+    }
+
+    return true;
+}
+
+
+/******************************************************************************
+MODULE:  GetCubeInput (class PredictBurnedArea)
+
+PURPOSE:  Return the mapped feature cube for the specified file, mapping it
+the first time it is used.
+
+RETURN VALUE:
+Type = Input_Cube_t *
+Value           Description
+-----           -----------
+NULL            The feature cube doesn't exist or couldn't be mapped
+non-NULL        Processing was successful
+
+PROJECT:  Land Satellites Data System Science Research and Development (LSRD)
+at the USGS EROS
+
+HISTORY:
+Date          Programmer       Reason
+----------    ---------------  -------------------------------------
+10/17/2026    USGS/EROS LSRD   Original Development
+
+NOTES:
+  1. The mapped cubes are kept for the scenes that follow in the server mode,
+     and are unmapped by the class destructor.
+  2. A missing feature cube isn't an error; the seasonal summaries and annual
+     maximums are read from their own files instead.
+******************************************************************************/
+Input_Cube_t *PredictBurnedArea::GetCubeInput
+(
+    char *file_name       /* I: input feature cube filename */
+)
+{
+    map<string, Input_Cube_t*>::iterator it = cubes.find (file_name);
+    if (it != cubes.end())
+        return it->second;
+
+    if (access (file_name, R_OK) != 0)
+        return NULL;
+
+    Input_Cube_t *ds_input = OpenCubeInput (file_name);
+    if (ds_input == NULL)
+        return NULL;
+
+    cubes[file_name] = ds_input;
+    return ds_input;
+}
+
+
+/******************************************************************************
+MODULE:  GetCubeInputData (class PredictBurnedArea)
+
+PURPOSE:  Copy one line of the seasonal summaries and annual maximums from the
+feature cube to the associated PBA class arrays.
+
+RETURN VALUE:
+Type = bool
+Value           Description
+-----           -----------
+false           An error occurred during processing
+true            Processing was successful
+
+PROJECT:  Land Satellites Data System Science Research and Development (LSRD)
+at the USGS EROS
+
+HISTORY:
+Date          Programmer       Reason
+----------    ---------------  -------------------------------------
+10/17/2026    USGS/EROS LSRD   Original Development
+
+NOTES:
+  1. The values of each pixel are contiguous in the cube, and in the same
+     order as the columns of lySummaryMat followed by those of maxIndxMat.
+******************************************************************************/
+bool PredictBurnedArea::GetCubeInputData
+(
+    Input_Cube_t *ds_input,  /* I: pointer to the feature cube data struct */
+    int line                 /* I: input line to be read */
+)
+{
+    char errmsg[MAX_STR_LEN];   /* error message */
+
+    /* Validate the line to be read */
+    if (line < 0 || line >= ds_input->size.l)
+        RETURN_ERROR("invalid line number", "GetCubeInputData", false);
+
+    /* Make sure file is mapped */
+    if (!ds_input->open)
+    {
+        sprintf (errmsg, "file not open: %s", ds_input->file_name);
+        RETURN_ERROR (errmsg, "GetCubeInputData", false);
+    }
+
+    /* Wrap the line of the cube, without copying it, and convert the
+       seasonal summaries and annual maximums */
+    cv::Mat cubeLine (ds_input->size.s, PBA_NCUBE_VALUES, CV_16S,
+        ds_input->data + (size_t) line * ds_input->size.s * PBA_NCUBE_VALUES);
+    cubeLine.colRange (0, PBA_NSEASONS*PBA_NBANDS).convertTo (lySummaryMat,
+        CV_32FC1);
+    cubeLine.colRange (PBA_NSEASONS*PBA_NBANDS, PBA_NCUBE_VALUES).convertTo (
+        maxIndxMat, CV_32FC1);
+
+    return true;
+}
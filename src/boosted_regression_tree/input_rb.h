@@ -16,6 +16,7 @@ Date        Programmer       Reason
                              from the LEDAPS lndsr application)
 9/3/2013    Gail Schmidt     Modified to work in the ESPA environment
 4/9/2014    Gail Schmidt     Updated to work with raw binary
+10/17/2026  USGS/EROS LSRD   Added the feature cube prototypes
 
 NOTES:
 *****************************************************************************/
@@ -33,5 +34,8 @@ NOTES:
 Input_Rb_t *OpenRbInput (char *file_name);
 bool CloseRbInput (Input_Rb_t *ds_input);
 bool FreeRbInput (Input_Rb_t *ds_input);
+Input_Cube_t *OpenCubeInput (char *file_name);
+bool CloseCubeInput (Input_Cube_t *ds_input);
+bool FreeCubeInput (Input_Cube_t *ds_input);
 
 #endif
@@ -38,8 +38,9 @@ int write_raw_binary (FILE *rb_fptr, int nlines, int nsamps, int size,
 /******************************************************************************
 MODULE: CreateOutputHeader
 
-PURPOSE: Creates an output header file for the output image, using band 1 of
-the input surface reflectance file
+PURPOSE: Creates an output header file for the output image, using the
+specified input header file (band 1 of the input surface reflectance file, or
+a seasonal summary file if the input scene has not been resampled)
  
 RETURN VALUE:
 Type = bool
@@ -52,23 +53,21 @@ HISTORY:
 Date          Programmer       Reason
 ----------    ---------------  -------------------------------------
 9/3/2013      Gail Schmidt     Modified to work in the ESPA environment
+10/17/2026    USGS/EROS LSRD   Modified to take the input header filename
+                               rather than the SR base filename
 
 NOTES:
 *****************************************************************************/
 bool CreateOutputHeader
 (
-  char *base_name,     /* I: input base filename of SR file to be processed */
+  char *input_hdr,     /* I: input header file to be copied */
   char *output_file    /* I: name of output image file to create */
 )
 {
   char errmsg[MAX_STR_LEN];         /* error string */
-  char band1_hdr[MAX_STR_LEN];      /* filename for band 1 header */
   char output_hdr[MAX_STR_LEN];     /* output header file */
   char *cptr = NULL;                /* character pointer */
 
-  /* Create the band 1 header filename */
-  sprintf (band1_hdr, "%s_sr_band1.hdr", base_name);
-
   /* Create the output header filename */
   strcpy (output_hdr, output_file);
   cptr = strrchr (output_hdr, '.');
@@ -80,9 +79,9 @@ bool CreateOutputHeader
   strcpy (cptr, ".hdr");
 
   /* Copy input header file to the output header file */
-  std::ifstream src (band1_hdr);
+  std::ifstream src (input_hdr);
   if (!src) {
-    sprintf (errmsg, "input header file doesn't exist (%s)", band1_hdr);
+    sprintf (errmsg, "input header file doesn't exist (%s)", input_hdr);
     RETURN_ERROR(errmsg, "CreateOutputHeader", false); 
   }
 
@@ -25,7 +25,7 @@ NOTES:
 #include "PredictBurnedArea.h"
 
 /* Prototypes */
-bool CreateOutputHeader (char *base_name, char *output_file);
+bool CreateOutputHeader (char *input_hdr, char *output_file);
 Output_t *OpenOutput(char *file_name, Img_coord_int_t *size);
 bool CloseOutput(Output_t *ds_output);
 bool FreeOutput(Output_t *ds_output);
@@ -16,6 +16,14 @@ Date          Programmer       Reason
 9/3/2013      Gail Schmidt     Modified to work in the ESPA environment
                                Modified to support saving the model and then
                                reload the model
+10/17/2026    USGS/EROS LSRD   Modified to keep each loaded model, so it is
+                               only loaded once in the server mode
+10/17/2026    USGS/EROS LSRD   Modified to stack the samples for a block of
+                               lines and predict them with multiple threads
+10/17/2026    USGS/EROS LSRD   Modified to only predict the valid samples of
+                               the block
+10/17/2026    USGS/EROS LSRD   Added the binary models, which are mapped
+                               rather than parsed
 
 NOTES:
 *****************************************************************************/
@@ -30,10 +38,26 @@ NOTES:
 #include "output.h"
 #include "error.h"
 #include <math.h>
+#include <pthread.h>
+#include <sys/stat.h>
 
 using namespace boost::posix_time;
 using namespace std;
 
+/* Number of samples each thread takes from the block of samples at a time */
+#define PBA_THREAD_SAMPLES 256
+
+/* Structure shared by the threads predicting a block of samples */
+typedef struct {
+    PredictBurnedArea *pba;      /* model, valid samples, and their indices */
+    int nsamples;                /* number of valid samples to be predicted */
+    int next_sample;             /* next sample to be taken by a thread */
+    int16 *prob_buf;             /* probability mapping of each sample */
+    bool status;                 /* false if a thread had an error */
+    char errmsg[MAX_STR_LEN];    /* error message of the thread */
+    pthread_mutex_t lock;        /* lock for next_sample and status */
+} Predict_threads_t;
+
 /******************************************************************************
 MODULE: loadModel (class PredictBurnedArea)
 
@@ -48,12 +72,65 @@ HISTORY:
 Date          Programmer       Reason
 ----------    ---------------  -------------------------------------
 9/3/2013      Gail Schmidt     Original development
+10/17/2026    USGS/EROS LSRD   Modified to keep the loaded models by XML file
+                               name and to only load a model the first time
+                               it is used.
+10/17/2026    USGS/EROS LSRD   Modified to map the binary model converted
+                               from the XML model, if there is one.
 
 NOTES:
+  1. The loaded models are freed by the class destructor.
+  2. The binary model is the XML model with the .gbtb extension, written by
+     convert_gbt_model.py.  It is used if it exists and is not older than the
+     XML model, and if it maps successfully; otherwise the XML model is
+     loaded.
 *****************************************************************************/
 void PredictBurnedArea::loadModel ()
 {
-  	gbtrees.load (LOAD_MODEL_XML.c_str());
+    char bin_file[MAX_STR_LEN];  /* binary model file name */
+    struct stat xml_stat;        /* status of the XML model file */
+    struct stat bin_stat;        /* status of the binary model file */
+
+    map<string, Gbt_model_t*>::iterator bit = binModels.find (LOAD_MODEL_XML);
+    if (bit != binModels.end()) {
+        binModel = bit->second;
+        return;
+    }
+
+    map<string, CvGBTrees*>::iterator it = models.find (LOAD_MODEL_XML);
+    if (it != models.end()) {
+        model = it->second;
+        binModel = NULL;
+        return;
+    }
+
+    /* Map the binary model, if it is up to date */
+    if (GbtBinaryFile ((char *) LOAD_MODEL_XML.c_str(), bin_file) &&
+        stat (bin_file, &bin_stat) == 0 &&
+        (stat (LOAD_MODEL_XML.c_str(), &xml_stat) != 0 ||
+        bin_stat.st_mtime >= xml_stat.st_mtime)) {
+        binModel = OpenGbtModel (bin_file);
+        if (binModel != NULL) {
+            if (VERBOSE)
+                cout << "Mapped binary model: " << bin_file << endl;
+            binModels[LOAD_MODEL_XML] = binModel;
+            return;
+        }
+        cout << "Loading the XML model instead of " << bin_file << endl;
+    }
+
+    binModel = NULL;
+
+    model = new CvGBTrees;
+    try {
+        model->load (LOAD_MODEL_XML.c_str());
+    }
+    catch (...) {
+        delete model;
+        model = NULL;
+        throw;
+    }
+    models[LOAD_MODEL_XML] = model;
 }
 
 
@@ -142,6 +219,8 @@ bool PredictBurnedArea::trainModel ()
     cout << second_clock::local_time() <<
         " ======Training Completed=====" << endl;
     predictOut.close();
+    model = &gbtrees;
+    binModel = NULL;
 
     /* Save the model if specified */
     if (save_model) {
@@ -152,6 +231,175 @@ bool PredictBurnedArea::trainModel ()
 }
 
 
+/******************************************************************************
+MODULE: stackSamples (class PredictBurnedArea)
+
+PURPOSE: Stacks the samples of the current line into the block of samples to
+be predicted.  The reflectance bands and indices, the last year seasonal
+summaries, the last year annual maximums, and the deltas of the annual
+maximums are copied a group of bands at a time for all the pixels of the line.
+ 
+RETURN VALUE:
+Type = bool
+Value          Description
+-----          -----------
+false          Error stacking the samples
+true           Samples stacked successfully
+
+HISTORY:
+Date          Programmer       Reason
+----------    ---------------  -------------------------------------
+10/17/2026    USGS/EROS LSRD   Pulled from predictModel, to stack the samples
+                               of a block of lines
+
+NOTES:
+  1. It's assumed the data for the current line has already been loaded into
+     predMat, qaMat, lySummaryMat, and maxIndxMat.
+  2. The order of the samples must match that of the training data, which is
+     documented in PredictBurnedArea.h.  The seasonal summaries are added as
+     a group of bands/indices per season, which is how they are stored in
+     lySummaryMat.
+*****************************************************************************/
+bool PredictBurnedArea::stackSamples
+(
+    int block_line        /* I: line within the block of samples (0-based) */
+)
+{
+    int nsamps = predMat.rows;   /* number of samples in the line */
+    int row = block_line * nsamps;  /* first row of the line in sampleMat */
+    int col = 0;                 /* first column of the current group */
+    char errmsg[MAX_STR_LEN];    /* error message */
+
+    /* Validate that the stack is not larger than the sample matrix was set
+       up for */
+    if (PBA_NSAMPLE_VALUES > NCSV_INPUTS ||
+        PBA_NSAMPLE_VALUES > sampleMat.cols) {
+        sprintf (errmsg, "The number of bands stacked in each sample (%d) is "
+            "greater than the defined matrix size (%d).", PBA_NSAMPLE_VALUES,
+            NCSV_INPUTS);
+        RETURN_ERROR (errmsg, "stackSamples", false);
+    }
+    if (block_line < 0 || row + nsamps > sampleMat.rows) {
+        sprintf (errmsg, "Invalid line in the block of samples: %d",
+            block_line);
+        RETURN_ERROR (errmsg, "stackSamples", false);
+    }
+    cv::Mat samples = sampleMat.rowRange (row, row + nsamps);
+
+    /* Add the surface reflectance and indices */
+    cv::Mat refl = samples.colRange (col, col + PBA_NPREDMAT);
+    predMat.copyTo (refl);
+    col += PBA_NPREDMAT;
+
+    /* Add the last year seasonal summaries */
+    cv::Mat summaries = samples.colRange (col,
+        col + PBA_NSEASONS*PBA_NBANDS);
+    lySummaryMat.copyTo (summaries);
+    col += PBA_NSEASONS*PBA_NBANDS;
+
+    /* Add the last year annual maximums for the indices */
+    cv::Mat maximums = samples.colRange (col, col + PBA_NINDXS);
+    maxIndxMat.copyTo (maximums);
+    col += PBA_NINDXS;
+
+    /* Add the deltas of the annual maximums for the indices, which are fill
+       for the fill pixels */
+    cv::Mat deltas = samples.colRange (col, col + PBA_NINDXS);
+    cv::subtract (predMat.colRange (PREDMAT_NDVI, PREDMAT_NDVI + PBA_NINDXS),
+        maxIndxMat, deltas);
+    deltas.setTo (cv::Scalar (INPUT_FILL_VALUE),
+        cv::repeat (qaMat == INPUT_FILL_VALUE, 1, PBA_NINDXS));
+
+    /* Keep the QA of the samples */
+    cv::Mat qa = sampleQaMat.rowRange (row, row + nsamps);
+    qaMat.copyTo (qa);
+
+    return true;
+}
+
+
+/******************************************************************************
+MODULE: predictThread
+
+PURPOSE: Runs the model predictions for the valid samples of a block, taking
+PBA_THREAD_SAMPLES samples at a time until all the valid samples of the block
+have been taken.
+ 
+RETURN VALUE:
+Type = void *
+Value          Description
+-----          -----------
+NULL           Always; the status is returned in the thread structure
+
+HISTORY:
+Date          Programmer       Reason
+----------    ---------------  -------------------------------------
+10/17/2026    USGS/EROS LSRD   Pulled from predictModel, to run the
+                               predictions with multiple threads
+10/17/2026    USGS/EROS LSRD   Modified to predict the valid samples gathered
+                               by predictModel
+
+NOTES:
+  1. The predictions only read the model, so all the threads share it.
+  2. The valid samples are the first rows of sampleMat, and the probability
+     mapping of each one is written to the sample it was gathered from.
+*****************************************************************************/
+static void *predictThread
+(
+    void *arg      /* I/O: Predict_threads_t structure shared by the threads */
+)
+{
+    Predict_threads_t *threads = (Predict_threads_t *) arg;
+    PredictBurnedArea *pba = threads->pba;
+    int start;           /* first sample taken by this thread */
+    int end;             /* last sample taken by this thread, plus one */
+    int y;               /* looping variable for the samples */
+
+    while (true) {
+        /* Take the next group of samples */
+        pthread_mutex_lock (&threads->lock);
+        if (!threads->status || threads->next_sample >= threads->nsamples) {
+            pthread_mutex_unlock (&threads->lock);
+            break;
+        }
+        start = threads->next_sample;
+        threads->next_sample += PBA_THREAD_SAMPLES;
+        pthread_mutex_unlock (&threads->lock);
+        end = start + PBA_THREAD_SAMPLES;
+        if (end > threads->nsamples)
+            end = threads->nsamples;
+
+        try {
+            /* do the probability mapping for burned (class 1) */
+            for (y = start; y < end; y++) {
+                float response;
+                if (pba->binModel != NULL)
+                    response = GbtPredictProb (pba->binModel,
+                        pba->sampleMat.ptr<float>(y), 1);
+                else
+                    response = pba->model->predict_prob (
+                        pba->sampleMat.row(y), 1);
+                threads->prob_buf[pba->sampleIdxMat.at<int>(y)] =
+                    (int16) (response * 100.0 + 0.5);
+            }
+        }
+        catch (cv::Exception &e) {
+            pthread_mutex_lock (&threads->lock);
+            if (threads->status) {
+                snprintf (threads->errmsg, MAX_STR_LEN, "running the "
+                    "prediction for sample %d: %s",
+                    pba->sampleIdxMat.at<int>(y), e.what());
+                threads->status = false;
+            }
+            pthread_mutex_unlock (&threads->lock);
+            break;
+        }
+    }
+
+    return NULL;
+}
+
+
 /******************************************************************************
 MODULE: predictModel (class PredictBurnedArea)
 
@@ -180,96 +428,120 @@ Date          Programmer       Reason
                                of the QA values
 4/7/2014      Gail Schmidt     Using a single QA/mask band now which is int16
                                vs. the old uint8 masks
+10/17/2026    USGS/EROS LSRD   Modified to predict with the current model,
+                               which is either trained or loaded
+10/17/2026    USGS/EROS LSRD   Modified to predict the block of samples
+                               stacked by stackSamples, using NUM_THREADS
+                               threads
+10/17/2026    USGS/EROS LSRD   Modified to gather the valid samples and only
+                               predict them
 
 NOTES:
   1. It's assumed the model has already been trained and/or loaded.
+  2. If the pixel is fill then it is set to PBA_FILL.  If the pixel is
+     cloud, shadow, or water, then it is set to PBA_CLOUD_WATER.  Otherwise
+     it is valid; the valid samples are gathered in order to the first rows
+     of sampleMat (overwriting the block), and their indices are kept in
+     sampleIdxMat.
+  3. The valid samples are predicted by predictThread.  With one thread the
+     predictions are run in the calling thread.
 *****************************************************************************/
 bool PredictBurnedArea::predictModel
 (
-    int iline,            /* I: line to be processed (0-based) */
-    Output_t *output      /* O: 'output' data structure where buf contains
-                                the probability mapping values */
+    int nsamples,         /* I: number of samples in sampleMat to predict */
+    int16 *prob_buf       /* O: probability mapping of each sample */
 )
 {
-    int bnd;                     /* band/index looping variable */
-    int season;                  /* season looping variable */
-    int indx;                    /* indices looping variable */
-    int sample_indx;             /* current sample index for stacking data */
+    int nthreads = NUM_THREADS;  /* number of threads to run */
+    int ncreated;                /* number of threads created */
+    int i;                       /* looping variable */
+    int y;                       /* looping variable for the samples */
+    int nvalid;                  /* number of valid samples */
+    short qa;                    /* QA value of the current sample */
     char errmsg[MAX_STR_LEN];    /* error message */
-    cv::Mat sample (1,NCSV_INPUTS+1,CV_32FC1);
-                                 /* cvMat to hold the stacks of prediction
-                                    information for each of the samples; size
-                                    of this must be the same size as the array
-                                    of data set to the training module */
-
-    /* Loop through the predicted matrix rows which currently represent
-       the samples in the input image.  The columns represent each band. */
-    for( int y = 0; y < predMat.rows; y++ ) {
-        /* Add the surface reflectance and indices */
-        sample.at<float>(0) = predMat.at<float>(y,PREDMAT_B1);
-        sample.at<float>(1) = predMat.at<float>(y,PREDMAT_B2);
-        sample.at<float>(2) = predMat.at<float>(y,PREDMAT_B3);
-        sample.at<float>(3) = predMat.at<float>(y,PREDMAT_B4);
-        sample.at<float>(4) = predMat.at<float>(y,PREDMAT_B5);
-        sample.at<float>(5) = predMat.at<float>(y,PREDMAT_B7);
-        sample.at<float>(6) = predMat.at<float>(y,PREDMAT_NDVI);
-        sample.at<float>(7) = predMat.at<float>(y,PREDMAT_NDMI);
-        sample.at<float>(8) = predMat.at<float>(y,PREDMAT_NBR);
-        sample.at<float>(9) = predMat.at<float>(y,PREDMAT_NBR2);
- 
-        /* Add the last year seasonal summaries, and add them as a group of
-           bands/indices per season. */
-        sample_indx = PREDMAT_NBR2+1;
-        for (season = 0; season < PBA_NSEASONS; season++) {
-            for (bnd = 0; bnd < PBA_NBANDS; bnd++) {
-                sample.at<float>(sample_indx++) =
-                    lySummaryMat.at<float>(y,season*PBA_NBANDS+bnd);
-            }
-        }
+    Predict_threads_t threads;   /* structure shared by the threads */
+    pthread_t *thread_ids = NULL;  /* IDs of the created threads */
 
-        /* Add the last year annual maximums for the indices */
-        for (indx = 0; indx < PBA_NINDXS; indx++)
-            sample.at<float>(sample_indx++) = maxIndxMat.at<float>(y,indx);
+    if (nsamples > sampleMat.rows) {
+        sprintf (errmsg, "The number of samples to predict (%d) is greater "
+            "than the block of samples (%d).", nsamples, sampleMat.rows);
+        RETURN_ERROR (errmsg, "predictModel", false);
+    }
+    if (nsamples > sampleIdxMat.rows)
+        RETURN_ERROR ("The sample indices aren't set up for the block of "
+            "samples", "predictModel", false);
+    if (binModel != NULL && binModel->hdr.sample_size > sampleMat.cols) {
+        sprintf (errmsg, "The binary model %s needs %d values in each "
+            "sample, but there are %d.", binModel->file_name,
+            binModel->hdr.sample_size, sampleMat.cols);
+        RETURN_ERROR (errmsg, "predictModel", false);
+    }
 
-        /* Add the deltas of the annual maximums for the indices */
-        if (qaMat.at<short>(y) == INPUT_FILL_VALUE) { // fill
-            for (indx = 0; indx < PBA_NINDXS; indx++)
-                sample.at<float>(sample_indx++) = INPUT_FILL_VALUE;
-        }
-        else { // not fill
-            for (indx = 0; indx < PBA_NINDXS; indx++) {
-                sample.at<float>(sample_indx++) =
-                    predMat.at<float>(y,PREDMAT_NDVI+indx) -
-                    maxIndxMat.at<float>(y,indx);
+    /* Flag the fill and the cloudy, snow, or water samples, and gather the
+       valid samples.  The valid samples only move toward the front, so they
+       are gathered in place. */
+    nvalid = 0;
+    for (y = 0; y < nsamples; y++) {
+        qa = sampleQaMat.at<short>(y);
+        if (qa == INPUT_FILL_VALUE)  /* fill pixel */
+            prob_buf[y] = PBA_FILL;
+        else if (qa < 0)   /* cloudy, snow, or water pixel */
+            prob_buf[y] = PBA_CLOUD_WATER;
+        else {
+            if (nvalid != y) {
+                cv::Mat valid = sampleMat.row(nvalid);
+                sampleMat.row(y).copyTo (valid);
             }
+            sampleIdxMat.at<int>(nvalid) = y;
+            nvalid++;
         }
+    }
 
-        /* Validate that the stack is not larger than the sample matrix was
-           set up for */
-        if (sample_indx > NCSV_INPUTS) {
-            sprintf (errmsg, "The number of bands stacked in this sample "
-                "(%d) is greater than the defined matrix size (%d).",
-            sample_indx, NCSV_INPUTS);
-            RETURN_ERROR (errmsg, "predict_model", false);
+    threads.pba = this;
+    threads.nsamples = nvalid;
+    threads.next_sample = 0;
+    threads.prob_buf = prob_buf;
+    threads.status = true;
+    threads.errmsg[0] = '\0';
+    pthread_mutex_init (&threads.lock, NULL);
+
+    /* There's no need for more threads than groups of valid samples */
+    if (nthreads > (nvalid + PBA_THREAD_SAMPLES - 1) / PBA_THREAD_SAMPLES)
+        nthreads = (nvalid + PBA_THREAD_SAMPLES - 1) / PBA_THREAD_SAMPLES;
+
+    if (nthreads <= 1)
+        predictThread (&threads);
+    else {
+        thread_ids = (pthread_t *) calloc (nthreads, sizeof (pthread_t));
+        if (thread_ids == NULL) {
+            pthread_mutex_destroy (&threads.lock);
+            RETURN_ERROR ("allocating memory for the thread IDs",
+                "predictModel", false);
         }
 
-        /* If the current pixel isn't cloudy, water, or fill, then run the
-           prediction for this pixel. If the pixel is cloud, shadow, or water,
-           then set it to PBA_CLOUD_WATER. If the pixel is fill then set it to
-           PBA_FILL. */
-        if (qaMat.at<short>(y) == INPUT_FILL_VALUE)  /* fill pixel */
-            output->buf[y] = PBA_FILL;
-        else if (qaMat.at<short>(y) < 0)   /* cloudy, snow, or water pixel */
-            output->buf[y] = PBA_CLOUD_WATER;
-        else {  /* do the probability mapping for burned (class of 1) */
-            float response = gbtrees.predict_prob (sample, 1);
-            output->buf[y] = (int16) (response * 100.0 + 0.5);
+        for (ncreated = 0; ncreated < nthreads; ncreated++) {
+            if (pthread_create (&thread_ids[ncreated], NULL, predictThread,
+                &threads) != 0) {
+                /* Stop the threads already created */
+                pthread_mutex_lock (&threads.lock);
+                if (threads.status) {
+                    sprintf (threads.errmsg, "creating prediction thread %d",
+                        ncreated);
+                    threads.status = false;
+                }
+                pthread_mutex_unlock (&threads.lock);
+                break;
+            }
         }
+
+        for (i = 0; i < ncreated; i++)
+            pthread_join (thread_ids[i], NULL);
+        free (thread_ids);
     }
 
-    /* Write the line of probability mappings to the output file */
-    PutOutputLine (output, iline);
-    sample.release();
+    pthread_mutex_destroy (&threads.lock);
+    if (!threads.status)
+        RETURN_ERROR (threads.errmsg, "predictModel", false);
 
     return true;
 }
@@ -35,12 +35,32 @@ Date        Programmer       Reason
                              Modified to use the single mask file created
                              during seasonal summary processing.  This single
                              mask is int16 vs. uint8.
+10/17/2026  USGS/EROS LSRD   Modified to support input scenes which have not
+                             been resampled to the maximum geographic extents
+                             (virtual stack).  The scene is placed in the
+                             seasonal summaries grid using the input line and
+                             sample offsets.
+10/17/2026  USGS/EROS LSRD   Added the server mode, which predicts a scene
+                             for each configuration file read from stdin and
+                             only loads each model once.
+10/17/2026  USGS/EROS LSRD   Modified to predict blocks of lines with
+                             multiple threads.
+10/17/2026  USGS/EROS LSRD   Modified to read the seasonal summaries and
+                             annual maximums from the feature cube of the
+                             previous year, if there is one.
+10/17/2026  USGS/EROS LSRD   Modified to only predict the valid pixels of each
+                             block.
+10/17/2026  USGS/EROS LSRD   Modified predictScene to close and free the
+                             scene files on errors, so the server mode
+                             doesn't leak them.
 
 NOTES:
 ******************************************************************************/
 
 #include <time.h>
 #include <sys/time.h>
+#include <unistd.h>
+#include <libgen.h>
 #include "error.h"
 #include "input.h"
 #include "input_rb.h"
@@ -60,59 +80,27 @@ char indx_str[PBA_NINDXS][MAX_STR_LEN] = {"ndvi", "ndmi", "nbr", "nbr2"};
     /* string to represent the indices in the annual maximums */
 
 /******************************************************************************
-MODULE:  main
+MODULE:  printParameters
 
-PURPOSE:  Reads the user specified arguments, reads the config file, handles
-training the model and/or loading and running the model on the user-specified
-file and using the user-specified configurations for the model.
+PURPOSE:  Prints the processing parameters, if running in verbose mode.
 
 RETURN VALUE:
-Type = int
+Type = None
 Value          Description
 -----          -----------
-EXIT_FAILURE   Non-zero value to indicate an error occurred during processing
-EXIT_SUCCESS   Zero value to indicate successful processing
 
 HISTORY:
 Date          Programmer       Reason
 ----------    ---------------  -------------------------------------
-9/15/2012     Jodi Riegle      Original development
-9/3/2013      Gail Schmidt     Modified to work in the ESPA environment
-12/8/2013     Gail Schmidt     Added support for the adjacent cloud mask for
-                               the overall QA values
+10/17/2026    USGS/EROS LSRD   Pulled from main
 
 NOTES:
-  1. predict_burned_area --help will provide input information.
-  2. This code is a mixture of true object-oriented C++ code and
-     traditional C-based code (error handling, file read/write)
 ******************************************************************************/
-int main(int argc, char* argv[]) {
-    PredictBurnedArea pba;
-    int bnd;                           /* band/index looping variable */
-    int season;                        /* season looping variable */
-    int indx;                          /* indices looping variable */
-    int ib;                            /* band and line counters */
-    int acq_year;                      /* acquisition year of input scene */
-    char errstr[MAX_STR_LEN];          /* error string */
-    char *output_file_name = NULL;     /* output filename */
-    char lySummaryFile[PBA_NSEASONS][PBA_NBANDS][MAX_STR_LEN];/* last year */
-    char maxIndxFile[PBA_NINDXS][MAX_STR_LEN];                /* max indices */
-    Input_t *input = NULL;             /* input data and metadata */
-    Output_t *output = NULL;           /* output structure and metadata */
-    Input_Rb_t *lySummaryPtr[PBA_NSEASONS][PBA_NBANDS];  /* last year ptr */
-    Input_Rb_t *maxIndxPtr[PBA_NINDXS];                  /* max indices ptr */
-
-    /* Read the config file */
-    if (!pba.loadParametersFromFile (argc, argv)) {
-        /* error message already printed in loadParametersFromFile so just
-           exit */
-        exit (EXIT_FAILURE);
-    }
-    char* baseFile = (char *) pba.INPUT_BASE_FILE.c_str();
-    char* maskFile = (char *) pba.INPUT_MASK_FILE.c_str();
-    char* seasonalSummaryDir = (char *) pba.SEASONAL_SUMMARIES_DIR.c_str();
-
-    /* Print some input processing info */
+static void printParameters
+(
+    PredictBurnedArea &pba       /* I: processing parameters */
+)
+{
     if (pba.VERBOSE) {
         if (pba.train_model) {
             cout << "Training the model using the following parameters -"
@@ -130,39 +118,128 @@ int main(int argc, char* argv[]) {
         if (pba.predict_model) {
             cout << "Model predictions will be completed using the following "
                     "parameters -" << endl;
-            cout << "  Input surface reflectance file: " << baseFile << endl;
-            cout << "  Input mask file: " << maskFile << endl;
+            cout << "  Input surface reflectance file: "
+                 << pba.INPUT_BASE_FILE << endl;
+            cout << "  Input mask file: " << pba.INPUT_MASK_FILE << endl;
             cout << "  Fill value: " << pba.INPUT_FILL_VALUE << endl;
-            cout << "  Input seasonal summaries file: " << seasonalSummaryDir
-                 << endl;
+            if (pba.virtual_input)
+                cout << "  Input line/sample offset: "
+                     << pba.INPUT_LINE_OFFSET << "/"
+                     << pba.INPUT_SAMP_OFFSET << endl;
+            cout << "  Input seasonal summaries file: " <<
+                pba.SEASONAL_SUMMARIES_DIR << endl;
             if (pba.load_model)
                 cout << "Model will be loaded from XML file: "
                      << pba.LOAD_MODEL_XML.c_str() << endl;
+            cout << "  Number of threads: " << pba.NUM_THREADS << endl;
         }
     }
+}
 
-    /* Train the model using the data provided in the input CSV file.  If
-       training is not specified then load the provided XML file for the
-       model. */
-    if (pba.train_model) {
-        if (!pba.trainModel ()) {
-            sprintf (errstr, "error training the model");
-            EXIT_ERROR(errstr, "main");
-        }
-    }
-    else if (pba.load_model) {
-        pba.loadModel ();
-    }
 
-    /* If not running model predictions, then we are done */
-    if (!pba.predict_model)
-        exit (EXIT_SUCCESS);
+/* Reports an error of predictScene and jumps to its cleanup, so the files
+   opened for the scene are closed and freed before it returns false */
+#define SCENE_ERROR(message) \
+          {Error((message), "predictScene", (__FILE__), (long)(__LINE__), \
+           false); status = false; goto cleanup;}
+
+/* Reports an error during the cleanup of predictScene, which carries on
+   closing and freeing the rest of the files */
+#define CLEANUP_ERROR(message) \
+          {Error((message), "predictScene", (__FILE__), (long)(__LINE__), \
+           false); status = false;}
+
+/******************************************************************************
+MODULE:  predictScene
+
+PURPOSE:  Runs the model predictions on the user-specified scene, using the
+previous year seasonal summaries and annual maximums, and writes the
+probability mappings to the output file.
+
+RETURN VALUE:
+Type = bool
+Value          Description
+-----          -----------
+false          Error running the model predictions
+true           Successful processing
+
+HISTORY:
+Date          Programmer       Reason
+----------    ---------------  -------------------------------------
+10/17/2026    USGS/EROS LSRD   Pulled from main, so the server mode can
+                               predict a scene without exiting on errors
+10/17/2026    USGS/EROS LSRD   Modified to stack the samples of
+                               PBA_BLOCK_LINES lines and predict them together
+                               with multiple threads
+10/17/2026    USGS/EROS LSRD   Modified to read the mapped feature cube of the
+                               previous year, if there is one, rather than the
+                               36 seasonal summary and annual maximum files
+10/17/2026    USGS/EROS LSRD   Modified to close and free the files opened
+                               for the scene on errors as well, so the server
+                               mode doesn't leak them
+
+NOTES:
+  1. It's assumed the model has already been trained and/or loaded.
+  2. The indices of a line are computed before the QA of that line is read,
+     so the fill pixels of the indices are those of the line before.  qaMat
+     is cleared before the first line, so no pixels of the line before the
+     first line are fill.  do_gbt_prediction.py depends on this to match the
+     predictions.
+  3. The input files are read one line at a time, in order, and the samples
+     of each line are stacked into the block of samples.  Once the block is
+     full (or at the last line) its samples are predicted and its lines are
+     written to the output file.
+  4. The feature cube of the previous year holds the seasonal summaries and
+     annual maximums of each pixel together.  If it exists it is mapped (and
+     kept mapped for the scenes that follow in the server mode), and each
+     line is converted directly from the mapping.
+******************************************************************************/
+static bool predictScene
+(
+    PredictBurnedArea &pba       /* I: processing parameters and model */
+)
+{
+    int bnd;                           /* band/index looping variable */
+    int season;                        /* season looping variable */
+    int indx;                          /* indices looping variable */
+    int ib;                            /* band and line counters */
+    int i;                             /* looping variable */
+    int block_lines;                   /* number of lines in a block */
+    int block_line;                    /* current line within the block */
+    int acq_year;                      /* acquisition year of input scene */
+    char errstr[MAX_STR_LEN];          /* error string */
+    char *output_file_name = NULL;     /* output filename */
+    char input_hdr[MAX_STR_LEN];       /* header to copy for the output */
+    char *cptr = NULL;                 /* character pointer */
+    Img_coord_int_t grid_size;         /* size of the seasonal summaries grid
+                                          and the output file */
+    char lySummaryFile[PBA_NSEASONS][PBA_NBANDS][MAX_STR_LEN];/* last year */
+    char maxIndxFile[PBA_NINDXS][MAX_STR_LEN];                /* max indices */
+    char cubeFile[MAX_STR_LEN];        /* feature cube of the previous year */
+    Input_t *input = NULL;             /* input data and metadata */
+    Output_t *output = NULL;           /* output structure and metadata */
+    Input_Rb_t *lySummaryPtr[PBA_NSEASONS][PBA_NBANDS];  /* last year ptr */
+    Input_Rb_t *maxIndxPtr[PBA_NINDXS];                  /* max indices ptr */
+    Input_Cube_t *cube = NULL;         /* feature cube; NULL if there isn't
+                                          one */
+    cv::Mat probMat;                   /* probability mappings of the block */
+    bool status = true;                /* status of the processing */
+    char* baseFile = (char *) pba.INPUT_BASE_FILE.c_str();
+    char* maskFile = (char *) pba.INPUT_MASK_FILE.c_str();
+    char* seasonalSummaryDir = (char *) pba.SEASONAL_SUMMARIES_DIR.c_str();
+
+    /* None of the seasonal summaries and annual maximums are open yet */
+    for (season = 0; season < PBA_NSEASONS; season++)
+        for (bnd = 0; bnd < PBA_NBANDS; bnd++)
+            lySummaryPtr[season][bnd] = NULL;
+    for (indx = 0; indx < PBA_NINDXS; indx++)
+        maxIndxPtr[indx] = NULL;
 
     /* Open the input image and mask files */
     input = OpenInput (baseFile, maskFile, pba.INPUT_FILL_VALUE);
     if (input == NULL) {
         sprintf (errstr, "opening the input image or mask files");
-        EXIT_ERROR(errstr, "main");
+        SCENE_ERROR(errstr);
     }
 
     /* Print some input metadata info */
@@ -180,23 +257,19 @@ int main(int argc, char* argv[]) {
     /* Pull the acquisition year from the acquisition date */
     acq_year = input->meta.acq_year;
 
-    /* Create and open output file */
-    output_file_name = strdup(pba.OUTPUT_IMG_FILE.c_str());
-    if (!CreateOutputHeader (baseFile, output_file_name)) {
-        sprintf(errstr, "creating output header file for %s", output_file_name);
-        EXIT_ERROR(errstr, "main");
-    }
-
-    output = OpenOutput (output_file_name, &input->size);
-    if (output == NULL) {
-        sprintf (errstr, "opening output file: %s", output_file_name);
-        EXIT_ERROR(errstr, "main");
-    }
+    /* Map the feature cube of the previous year, if there is one.  It is
+       expected to reside in the features subdirectory of the seasonal
+       summaries directory. */
+    sprintf (cubeFile, "%s/features/%d_features.img", seasonalSummaryDir,
+        acq_year-1);
+    cube = pba.GetCubeInput (cubeFile);
+    if (cube != NULL)
+        printf (".... Feature cube %s\n", cubeFile);
 
     /* Create the filenames for the seasonal summmaries and annual maximums.
        Files are expected to reside in the seasonal summaries directory with
        subdirectories of refl, ndvi, ndmi, nbr, nbr2.  Open the files and read
-       the associated metadata. */
+       the associated metadata, unless the feature cube is used. */
     printf (".... Seasonal summary products\n");
     for (season = 0; season < PBA_NSEASONS; season++) {
         for (bnd = 0; bnd < PBA_NBANDS; bnd++) {
@@ -214,11 +287,13 @@ int main(int argc, char* argv[]) {
             }
 
             /* Open the seasonal summary files */
+            if (cube != NULL)
+                continue;
             lySummaryPtr[season][bnd] = OpenRbInput(lySummaryFile[season][bnd]);
             if (lySummaryPtr[season][bnd] == NULL) {
                 sprintf (errstr, "opening file: %s",
                     lySummaryFile[season][bnd]);
-                EXIT_ERROR (errstr, "main");
+                SCENE_ERROR(errstr);
             }
         }
     }
@@ -230,31 +305,81 @@ int main(int argc, char* argv[]) {
             seasonalSummaryDir, indx_str[indx], acq_year-1, indx_str[indx]);
 
         /* Open the annual maximum files */
+        if (cube != NULL)
+            continue;
         maxIndxPtr[indx] = OpenRbInput (maxIndxFile[indx]);
         if (maxIndxPtr[indx] == NULL) {
             sprintf (errstr, "opening file: %s", maxIndxFile[indx]);
-            EXIT_ERROR (errstr, "main");
+            SCENE_ERROR(errstr);
         }
     }
 
+    /* Determine the size of the output grid.  If the input scene has been
+       resampled to the seasonal summaries then the grid is the size of the
+       input scene, and the output header is copied from band 1 of the input
+       scene.  Otherwise the grid is the size of the seasonal summaries and
+       the output header is copied from the seasonal summary. */
+    if (pba.virtual_input) {
+        if (cube != NULL)
+            grid_size = cube->size;
+        else
+            grid_size = lySummaryPtr[0][0]->size;
+        strcpy (input_hdr, lySummaryFile[0][0]);
+        cptr = strrchr (input_hdr, '.');
+        if (cptr != NULL)
+            strcpy (cptr, ".hdr");
+    }
+    else {
+        grid_size = input->size;
+        sprintf (input_hdr, "%s_sr_band1.hdr", baseFile);
+    }
+
+    /* Create and open output file */
+    output_file_name = strdup(pba.OUTPUT_IMG_FILE.c_str());
+    if (!CreateOutputHeader (input_hdr, output_file_name)) {
+        sprintf(errstr, "creating output header file for %s", output_file_name);
+        SCENE_ERROR(errstr);
+    }
+
+    output = OpenOutput (output_file_name, &grid_size);
+    if (output == NULL) {
+        sprintf (errstr, "opening output file: %s", output_file_name);
+        SCENE_ERROR(errstr);
+    }
+
     /* Set up arrays for the seasonal summaries and annual maximums */
-    pba.lySummaryMat.create (input->size.s, PBA_NBANDS*PBA_NSEASONS, CV_32FC1);
-    pba.maxIndxMat.create (input->size.s, PBA_NINDXS, CV_32FC1);
+    pba.lySummaryMat.create (grid_size.s, PBA_NBANDS*PBA_NSEASONS, CV_32FC1);
+    pba.maxIndxMat.create (grid_size.s, PBA_NINDXS, CV_32FC1);
 
     /* Set up arrays for the predicted data and QA/mask data.  These will hold
        a single line and single/multiple bands, depending on what is being
        represented.  For predMat (predicted matrix), bands 0-5 are the
        reflective bands (1-5, and 7), 6=NDVI, 7=NDMI, 8=NBR, 9=NBR2.  qaMat
        represents the QA band. */
-    pba.predMat.create (input->size.s, 10, CV_32FC1);
-    pba.qaMat.create (input->size.s, 1, CV_16S);
+    pba.predMat.create (grid_size.s, 10, CV_32FC1);
+    pba.qaMat.create (grid_size.s, 1, CV_16S);
+    pba.qaMat.setTo (cv::Scalar(0));
+
+    /* Set up the block of samples, which holds the samples and QA for
+       PBA_BLOCK_LINES lines, and the probability mappings for the block.
+       The samples have room for the class response, which isn't used. */
+    block_lines = PBA_BLOCK_LINES;
+    if (block_lines > grid_size.l)
+        block_lines = grid_size.l;
+    pba.sampleMat.create (block_lines * grid_size.s, pba.NCSV_INPUTS+1,
+        CV_32FC1);
+    pba.sampleMat.setTo (cv::Scalar(0));
+    pba.sampleQaMat.create (block_lines * grid_size.s, 1, CV_16S);
+    pba.sampleIdxMat.create (block_lines * grid_size.s, 1, CV_32SC1);
+    probMat.create (block_lines * grid_size.s, 1, CV_16S);
 
     cout << second_clock::local_time() << " ======= Predict Started ======== "
          << endl;
 
     /* Loop through the lines in the image, read the reflective data, compute
-       needed index products, read the QA data, and run the predictions */
-    for (int iline = 0; iline < input->size.l; iline++) {
+       needed index products, read the QA data, and stack the samples.  Run
+       the predictions for each block of lines. */
+    for (int iline = 0; iline < grid_size.l; iline++) {
         if (iline % 100 == 0) {
             cout << second_clock::local_time() << " ======= line " << iline
                  << " ======== " << endl;
@@ -262,10 +387,10 @@ int main(int argc, char* argv[]) {
 
         /* Read each reflective band for the current line */
         for (ib = 0; ib < input->nband; ib++) {
-            if (!pba.GetInputData (input, ib)) {
+            if (!pba.GetInputData (input, ib, iline)) {
                 sprintf (errstr, "reading input image data for line %d, "
                     "band %d", iline, ib);
-                EXIT_ERROR(errstr, "main");
+                SCENE_ERROR(errstr);
             }
         }
 
@@ -273,75 +398,117 @@ int main(int argc, char* argv[]) {
         if (!pba.calcBands (input)) {
             sprintf (errstr, "reading input image data for line %d, band %d",
                 0, 1);
-            EXIT_ERROR(errstr, "main");
+            SCENE_ERROR(errstr);
         }
 
         /* Read the QA band for the current line */
-        if (!pba.GetInputQALine (input)) {
+        if (!pba.GetInputQALine (input, iline)) {
             sprintf (errstr, "reading input QA data for line %d", iline);
-            EXIT_ERROR(errstr, "main");
+            SCENE_ERROR(errstr);
+        }
+
+        /* Read the seasonal summaries and annual maximums for the previous
+           year from the feature cube */
+        if (cube != NULL) {
+            if (!pba.GetCubeInputData (cube, iline)) {
+                sprintf (errstr, "reading the feature cube for line %d",
+                    iline);
+                SCENE_ERROR(errstr);
+            }
         }
 
         /* Read the seasonal summaries for the previous year */
-        for (bnd = 0; bnd < PBA_NBANDS; bnd++) {
+        for (bnd = 0; bnd < PBA_NBANDS && cube == NULL; bnd++) {
             for (season = 0; season < PBA_NSEASONS; season++) {
                 if (!pba.GetRbInputLYSummaryData (lySummaryPtr[season][bnd],
                     iline, (BandIndex_t) bnd, (Season_t) season)) {
                     sprintf (errstr, "reading previous year seasonal summary "
                         "data for line %d, band %s, season %s", iline,
                         band_indx_str[bnd], season_str[season]);
-                    EXIT_ERROR(errstr, "main");
+                    SCENE_ERROR(errstr);
                 }
             }
         }
 
         /* Read the annual maximums for last year */
-        for (indx = 0; indx < PBA_NINDXS; indx++) {
+        for (indx = 0; indx < PBA_NINDXS && cube == NULL; indx++) {
             if (!pba.GetRbInputAnnualMaxData (maxIndxPtr[indx], iline,
                 (Index_t) indx)) {
                 sprintf (errstr, "reading annual maximum data for line %d, "
                     "index %s", iline, indx_str[indx]);
-                EXIT_ERROR(errstr, "main");
+                SCENE_ERROR(errstr);
             }
         }
 
-        /* Run the predictions for the current line */
-        if (!pba.predictModel (iline, output)) {
-            sprintf (errstr, "running the probability mappings for line %d",
-                iline);
-            EXIT_ERROR(errstr, "main");
+        /* Stack the samples for the current line */
+        block_line = iline % block_lines;
+        if (!pba.stackSamples (block_line)) {
+            sprintf (errstr, "stacking the samples for line %d", iline);
+            SCENE_ERROR(errstr);
+        }
+
+        /* Run the predictions for the block once it is full, or at the last
+           line, and write the lines of the block */
+        if (block_line == block_lines-1 || iline == grid_size.l-1) {
+            if (!pba.predictModel ((block_line+1) * grid_size.s,
+                (int16 *) probMat.data)) {
+                sprintf (errstr, "running the probability mappings for lines "
+                    "%d-%d", iline-block_line, iline);
+                SCENE_ERROR(errstr);
+            }
+
+            for (i = 0; i <= block_line; i++) {
+                memcpy (output->buf, (int16 *) probMat.data + i*grid_size.s,
+                    grid_size.s * sizeof (int16));
+                if (!pba.PutOutputLine (output, iline-block_line+i)) {
+                    sprintf (errstr, "writing the probability mappings for "
+                        "line %d", iline-block_line+i);
+                    SCENE_ERROR(errstr);
+                }
+            }
         }
     }
 
     cout << second_clock::local_time()
          << " ======= Predict Completed ======== " << endl;
 
+cleanup:
     /* Close the input file and free the structure */
-    if (!CloseInput (input))
-        EXIT_ERROR("closing input surface reflectance file", "main");
-    if (!FreeInput (input))
-        EXIT_ERROR("freeing input surface reflectance file memory", "main");
+    if (input != NULL) {
+        if (input->open && !CloseInput (input))
+            CLEANUP_ERROR("closing input surface reflectance file");
+        if (!FreeInput (input))
+            CLEANUP_ERROR("freeing input surface reflectance file memory");
+    }
 
     /* Close the output file and free the structure */
-    if (!CloseOutput (output))
-        EXIT_ERROR("closing output burned area file", "main");
-    if (!FreeOutput (output))
-        EXIT_ERROR("freeing output burned area file memory", "main");
+    if (output != NULL) {
+        if (output->open && !CloseOutput (output))
+            CLEANUP_ERROR("closing output burned area file");
+        if (!FreeOutput (output))
+            CLEANUP_ERROR("freeing output burned area file memory");
+    }
 
-    /* Close the seasonal summaries and annual maximum files */
+    /* Close the seasonal summaries and annual maximum files that were
+       opened.  The feature cube stays mapped until the models are freed. */
     for (season = 0; season < PBA_NSEASONS; season++) {
         for (bnd = 0; bnd < PBA_NBANDS; bnd++) {
-            if (!CloseRbInput (lySummaryPtr[season][bnd]))
-                EXIT_ERROR("closing input seasonal summary file", "main");
+            if (lySummaryPtr[season][bnd] == NULL)
+                continue;
+            if (lySummaryPtr[season][bnd]->open &&
+                !CloseRbInput (lySummaryPtr[season][bnd]))
+                CLEANUP_ERROR("closing input seasonal summary file");
             if (!FreeRbInput (lySummaryPtr[season][bnd]))
-                EXIT_ERROR("freeing input seasonal summary file", "main");
+                CLEANUP_ERROR("freeing input seasonal summary file");
         }
     }
     for (indx = 0; indx < PBA_NINDXS; indx++) {
-        if (!CloseRbInput (maxIndxPtr[indx]))
-            EXIT_ERROR("closing input annual maximum file", "main");
+        if (maxIndxPtr[indx] == NULL)
+            continue;
+        if (maxIndxPtr[indx]->open && !CloseRbInput (maxIndxPtr[indx]))
+            CLEANUP_ERROR("closing input annual maximum file");
         if (!FreeRbInput (maxIndxPtr[indx]))
-            EXIT_ERROR("freeing input annual maximum file", "main");
+            CLEANUP_ERROR("freeing input annual maximum file");
     }
 
     /* Release the data arrays */
@@ -349,6 +516,192 @@ int main(int argc, char* argv[]) {
     pba.qaMat.release();
     pba.lySummaryMat.release();
     pba.maxIndxMat.release();
+    pba.sampleMat.release();
+    pba.sampleQaMat.release();
+    pba.sampleIdxMat.release();
+
+    free (output_file_name);
+    return status;
+}
+
+
+/******************************************************************************
+MODULE:  runServer
+
+PURPOSE:  Runs the model predictions for a series of scenes.  The name of the
+configuration file of each scene is read from stdin, one per line, until the
+end of the input or an empty line.  Each model is only loaded the first time
+it is used, and is kept for the scenes that follow.
+
+RETURN VALUE:
+Type = bool
+Value          Description
+-----          -----------
+false          Error reading the input or changing directories
+true           Successful processing of the input
+
+HISTORY:
+Date          Programmer       Reason
+----------    ---------------  -------------------------------------
+10/17/2026    USGS/EROS LSRD   Original development
+
+NOTES:
+  1. After each scene a status line is written to stdout and flushed:
+         PBA_SERVER_STATUS SUCCESS <config file>
+     or
+         PBA_SERVER_STATUS ERROR <config file>
+     An error for one scene doesn't stop the processing of the scenes that
+     follow.
+  2. Each scene is processed from the directory of its configuration file,
+     as is done by do_boosted_regression.py, so relative filenames in the
+     configuration file are relative to that directory.  The name of the
+     configuration file itself is relative to the starting directory.
+  3. Training the model is not supported in the server mode.
+******************************************************************************/
+static bool runServer
+(
+    PredictBurnedArea &pba       /* I/O: processing parameters and models */
+)
+{
+    char errstr[MAX_STR_LEN];          /* error string */
+    char cwd[MAX_STR_LEN];             /* starting working directory */
+    char config_dir[MAX_STR_LEN];      /* directory of the config file */
+    string config_file;                /* configuration filename */
+    bool status;                       /* status of the current scene */
+
+    if (getcwd (cwd, MAX_STR_LEN) == NULL) {
+        sprintf (errstr, "getting the current working directory");
+        RETURN_ERROR (errstr, "runServer", false);
+    }
+
+    while (getline (cin, config_file)) {
+        if (config_file.empty())
+            break;
+
+        /* Read the config file and make sure it's for predictions with a
+           saved model */
+        status = pba.loadConfigFile (config_file);
+        if (status &&
+            (pba.train_model || !pba.load_model || !pba.predict_model)) {
+            sprintf (errstr, "config file %s must specify LOAD_MODEL_XML "
+                "and INPUT_BASE_FILE, and not CSV_FILE, in the server mode",
+                config_file.c_str());
+            Error (errstr, "runServer", __FILE__, (long) __LINE__, false);
+            status = false;
+        }
+
+        /* Process the scene from the directory of its config file */
+        strncpy (config_dir, config_file.c_str(), MAX_STR_LEN-1);
+        config_dir[MAX_STR_LEN-1] = '\0';
+        if (status && chdir (dirname (config_dir)) != 0) {
+            sprintf (errstr, "changing to the directory of config file: %s",
+                config_file.c_str());
+            RETURN_ERROR (errstr, "runServer", false);
+        }
+
+        if (status) {
+            printParameters (pba);
+            try {
+                pba.loadModel ();
+                status = predictScene (pba);
+            }
+            catch (cv::Exception &e) {
+                sprintf (errstr, "loading model %s: %s",
+                    pba.LOAD_MODEL_XML.c_str(), e.what());
+                Error (errstr, "runServer", __FILE__, (long) __LINE__, false);
+                status = false;
+            }
+
+            if (chdir (cwd) != 0) {
+                sprintf (errstr, "changing back to directory: %s", cwd);
+                RETURN_ERROR (errstr, "runServer", false);
+            }
+        }
+
+        cout << PBA_SERVER_STATUS << (status ? " SUCCESS " : " ERROR ")
+             << config_file << endl;
+    }
+
+    return true;
+}
+
+
+/******************************************************************************
+MODULE:  main
+
+PURPOSE:  Reads the user specified arguments, reads the config file, handles
+training the model and/or loading and running the model on the user-specified
+file and using the user-specified configurations for the model.
+
+RETURN VALUE:
+Type = int
+Value          Description
+-----          -----------
+EXIT_FAILURE   Non-zero value to indicate an error occurred during processing
+EXIT_SUCCESS   Zero value to indicate successful processing
+
+HISTORY:
+Date          Programmer       Reason
+----------    ---------------  -------------------------------------
+9/15/2012     Jodi Riegle      Original development
+9/3/2013      Gail Schmidt     Modified to work in the ESPA environment
+12/8/2013     Gail Schmidt     Added support for the adjacent cloud mask for
+                               the overall QA values
+10/17/2026    USGS/EROS LSRD   Moved the predictions to predictScene and
+                               added the server mode
+
+NOTES:
+  1. predict_burned_area --help will provide input information.
+  2. This code is a mixture of true object-oriented C++ code and
+     traditional C-based code (error handling, file read/write)
+  3. predict_burned_area --server reads the configuration files from stdin.
+     See runServer.
+******************************************************************************/
+int main(int argc, char* argv[]) {
+    PredictBurnedArea pba;
+    char errstr[MAX_STR_LEN];          /* error string */
+
+    /* Read the config file */
+    if (!pba.loadParametersFromFile (argc, argv)) {
+        /* error message already printed in loadParametersFromFile so just
+           exit */
+        exit (EXIT_FAILURE);
+    }
+
+    /* Run the predictions for the configuration files read from stdin */
+    if (pba.server_mode) {
+        if (!runServer (pba)) {
+            sprintf (errstr, "running the predictions in the server mode");
+            EXIT_ERROR(errstr, "main");
+        }
+        exit (EXIT_SUCCESS);
+    }
+
+    /* Print some input processing info */
+    printParameters (pba);
+
+    /* Train the model using the data provided in the input CSV file.  If
+       training is not specified then load the provided XML file for the
+       model. */
+    if (pba.train_model) {
+        if (!pba.trainModel ()) {
+            sprintf (errstr, "error training the model");
+            EXIT_ERROR(errstr, "main");
+        }
+    }
+    else if (pba.load_model) {
+        pba.loadModel ();
+    }
+
+    /* If not running model predictions, then we are done */
+    if (!pba.predict_model)
+        exit (EXIT_SUCCESS);
+
+    /* Run the predictions for the scene */
+    if (!predictScene (pba)) {
+        sprintf (errstr, "running the model predictions");
+        EXIT_ERROR(errstr, "main");
+    }
 
     exit (EXIT_SUCCESS);
 };